@@ -0,0 +1,1949 @@
+"""
+#######################################
+filename    fake_hou.py
+author      Owen McCubbin
+Brief Description:
+    An in memory stand in for the part of hou the rig creator uses, so the
+    build stages can run (and be timed) in any python without a Houdini
+    licence. Nodes, parms, parm templates, HDA definitions and object
+    transforms behave like Houdini's, every call that changes the scene is
+    counted in stats, and the few SOPs the build reads geometry from (file,
+    object merge, the path objects, capture) cook just far enough to give the
+    build what it asks for.
+    What it doesn't do: expressions and channel references are stored but
+    never evaluated, constraints and kinematics don't move anything, curves
+    stay polylines and VEX doesn't run, the capture wrangles the build makes
+    are worked out in python instead. Timings are the tool's python plus
+    the fake's own bookkeeping, not Houdini's cooking, so they only compare
+    with other runs against the fake. The call counts carry over to Houdini.
+
+    import fake_hou
+    fake_hou.install()
+    import rig_creator
+#######################################
+"""
+
+import copy
+import itertools
+import json
+import math
+import random
+import re
+import sys
+import types
+
+import numpy as np
+
+try:
+    string_types = (str, unicode)
+except NameError:
+    string_types = (str,)
+
+
+####COUNTING####
+##name of every counted call -> times it was made, plus parms_written and expressions_written for the
+##parm values and expressions that went in, whichever call wrote them
+stats = {}
+
+def count(name, amount=1):
+    stats[name] = stats.get(name, 0) + amount
+
+def reset_stats():
+    stats.clear()
+
+def snapshot():
+    ##a copy of the counters so far
+    return (dict(stats))
+
+
+####ERRORS####
+class Error(Exception):
+    pass
+
+class OperationFailed(Error):
+    pass
+
+class ObjectWasDeleted(Error):
+    pass
+
+class InvalidInput(Error):
+    pass
+
+
+####ENUMS####
+class EnumValue(object):
+
+    def __init__(self, name):
+        self.enum_name = name
+
+    def name(self):
+        return (self.enum_name.split('.')[-1])
+
+    def __repr__(self):
+        return ('<hou.' + self.enum_name + '>')
+
+def make_enum(name, values):
+    return (type(name, (object,), dict((value, EnumValue(name + '.' + value)) for value in values)))
+
+parmTemplateType = make_enum('parmTemplateType', ('Int', 'Float', 'String', 'Toggle', 'Menu', 'Button', 'FolderSet',
+                                                  'Folder', 'Separator', 'Label', 'Ramp', 'Data'))
+folderType = make_enum('folderType', ('Tabs', 'RadioButtons', 'Collapsible', 'Simple', 'MultiparmBlock'))
+scriptLanguage = make_enum('scriptLanguage', ('Python', 'Hscript'))
+exprLanguage = make_enum('exprLanguage', ('Python', 'Hscript'))
+attribType = make_enum('attribType', ('Point', 'Prim', 'Vertex', 'Global'))
+primType = make_enum('primType', ('Polygon', 'NURBSCurve', 'BezierCurve', 'Mesh'))
+updateMode = make_enum('updateMode', ('AutoUpdate', 'OnMouseUp', 'Manual'))
+severityType = make_enum('severityType', ('Message', 'ImportantMessage', 'Warning', 'Error', 'Fatal'))
+
+
+####MATH####
+##row vectors like Houdini, a point is transformed as p * M and M1 * M2 applies M1 first
+
+class Vector3(object):
+
+    def __init__(self, *args):
+        if len(args) == 1:
+            args = tuple(args[0])
+        if not args:
+            args = (0.0, 0.0, 0.0)
+        self.values = [float(value) for value in args[:3]]
+
+    def __getitem__(self, index):
+        return (self.values[index])
+
+    def __setitem__(self, index, value):
+        self.values[index] = float(value)
+
+    def __len__(self):
+        return (3)
+
+    def __iter__(self):
+        return (iter(self.values))
+
+    def __add__(self, other):
+        return (Vector3([a + b for a, b in zip(self.values, other)]))
+
+    def __sub__(self, other):
+        return (Vector3([a - b for a, b in zip(self.values, other)]))
+
+    def __neg__(self):
+        return (Vector3([-a for a in self.values]))
+
+    def __mul__(self, other):
+        if isinstance(other, Matrix4):
+            return (Vector3(np.dot(np.append(self.values, 1.0), other.matrix)[:3]))
+        return (Vector3([a * other for a in self.values]))
+
+    __rmul__ = __mul__
+
+    def __eq__(self, other):
+        return (isinstance(other, Vector3) and self.values == other.values)
+
+    def __ne__(self, other):
+        return (not self == other)
+
+    def __repr__(self):
+        return ('<hou.Vector3 [%g, %g, %g]>' % tuple(self.values))
+
+    def x(self):
+        return (self.values[0])
+
+    def y(self):
+        return (self.values[1])
+
+    def z(self):
+        return (self.values[2])
+
+    def length(self):
+        return (math.sqrt(sum(a * a for a in self.values)))
+
+    def lengthSquared(self):
+        return (sum(a * a for a in self.values))
+
+    def normalized(self):
+        length = self.length()
+        if length == 0:
+            return (Vector3(self.values))
+        return (Vector3([a / length for a in self.values]))
+
+    def dot(self, other):
+        return (sum(a * b for a, b in zip(self.values, other)))
+
+    def cross(self, other):
+        return (Vector3(np.cross(self.values, list(other))))
+
+    def distanceTo(self, other):
+        return ((self - other).length())
+
+
+def axis_rotation(axis, degrees):
+    ##3x3 row vector rotation about one axis
+    radians = math.radians(degrees)
+    c = math.cos(radians)
+    s = math.sin(radians)
+    if axis == 'x':
+        return (np.array(((1, 0, 0), (0, c, s), (0, -s, c)), dtype=np.float64))
+    if axis == 'y':
+        return (np.array(((c, 0, -s), (0, 1, 0), (s, 0, c)), dtype=np.float64))
+    return (np.array(((c, s, 0), (-s, c, 0), (0, 0, 1)), dtype=np.float64))
+
+def rotation_matrix(rotate, rotate_order='xyz'):
+    ##3x3 rotation of x, y and z degrees applied in rotate_order
+    matrix = np.identity(3)
+    for axis in rotate_order:
+        matrix = matrix.dot(axis_rotation(axis, rotate['xyz'.index(axis)]))
+    return (matrix)
+
+def extract_rotates(matrix, rotate_order='xyz'):
+    ##degrees that build the rotation of a 3x3 (scale is taken out first), only xyz order is supported
+    if rotate_order != 'xyz':
+        raise OperationFailed('fake_hou only extracts xyz rotations')
+    rows = np.array(matrix, dtype=np.float64)[:3, :3]
+    rows = rows / np.maximum(np.linalg.norm(rows, axis=1), 1e-12)[:, np.newaxis]
+    y = math.asin(max(-1.0, min(1.0, -rows[0, 2])))
+    if abs(math.cos(y)) > 1e-6:
+        x = math.atan2(rows[1, 2], rows[2, 2])
+        z = math.atan2(rows[0, 1], rows[0, 0])
+    else:
+        ##gimbal lock, all of the roll goes into x
+        x = math.atan2(-rows[2, 1], rows[1, 1])
+        z = 0.0
+    return (Vector3(math.degrees(x), math.degrees(y), math.degrees(z)))
+
+
+class Matrix3(object):
+
+    def __init__(self, values=1.0):
+        if isinstance(values, (int, float)):
+            self.matrix = np.identity(3) * values
+        else:
+            self.matrix = np.array(values, dtype=np.float64).reshape(3, 3)
+
+    def extractRotates(self, rotate_order='xyz'):
+        return (extract_rotates(self.matrix, rotate_order))
+
+    def asTupleOfTuples(self):
+        return (tuple(tuple(row) for row in self.matrix.tolist()))
+
+
+class Matrix4(object):
+
+    def __init__(self, values=1.0):
+        if isinstance(values, Matrix4):
+            self.matrix = values.matrix.copy()
+        elif isinstance(values, (int, float)):
+            self.matrix = np.identity(4) * values
+        else:
+            self.matrix = np.array(values, dtype=np.float64).reshape(4, 4)
+
+    def __mul__(self, other):
+        if isinstance(other, Matrix4):
+            return (Matrix4(self.matrix.dot(other.matrix)))
+        return (Matrix4(self.matrix * other))
+
+    def __eq__(self, other):
+        return (isinstance(other, Matrix4) and np.allclose(self.matrix, other.matrix))
+
+    def __ne__(self, other):
+        return (not self == other)
+
+    def __repr__(self):
+        return ('<hou.Matrix4 %s>' % (self.matrix.tolist(),))
+
+    def at(self, row, col):
+        return (float(self.matrix[row, col]))
+
+    def setAt(self, row, col, value):
+        self.matrix[row, col] = value
+
+    def setToIdentity(self):
+        self.matrix = np.identity(4)
+
+    def inverted(self):
+        return (Matrix4(np.linalg.inv(self.matrix)))
+
+    def transposed(self):
+        return (Matrix4(self.matrix.T))
+
+    def isAlmostEqual(self, other, tolerance=0.00001):
+        return (np.allclose(self.matrix, other.matrix, atol=tolerance))
+
+    def extractTranslates(self, transform_order='srt'):
+        return (Vector3(self.matrix[3, :3]))
+
+    def extractRotates(self, transform_order='srt', rotate_order='xyz', pivot=None, pivot_rotate=None):
+        return (extract_rotates(self.matrix, rotate_order))
+
+    def extractScales(self, transform_order='srt', pivot=None, pivot_rotate=None):
+        return (Vector3(np.linalg.norm(self.matrix[:3, :3], axis=1)))
+
+    def asTuple(self):
+        return (tuple(self.matrix.flatten().tolist()))
+
+    def asTupleOfTuples(self):
+        return (tuple(tuple(row) for row in self.matrix.tolist()))
+
+
+def translate_matrix(values):
+    matrix = np.identity(4)
+    matrix[3, :3] = list(values)
+    return (matrix)
+
+class hmath(object):
+    ##hou.hmath, only used as a namespace
+
+    @staticmethod
+    def buildTranslate(*args):
+        if len(args) == 1:
+            args = tuple(args[0])
+        return (Matrix4(translate_matrix(args)))
+
+    @staticmethod
+    def buildRotate(*args):
+        rotate_order = 'xyz'
+        if len(args) in (1, 2):
+            if len(args) == 2:
+                rotate_order = args[1]
+            args = tuple(args[0])
+        matrix = np.identity(4)
+        matrix[:3, :3] = rotation_matrix(args[:3], rotate_order)
+        return (Matrix4(matrix))
+
+    @staticmethod
+    def buildScale(*args):
+        if len(args) == 1:
+            args = tuple(args[0])
+        matrix = np.identity(4)
+        matrix[0, 0], matrix[1, 1], matrix[2, 2] = args[:3]
+        return (Matrix4(matrix))
+
+    @staticmethod
+    def buildTransform(values_dict, transform_order='srt', rotate_order='xyz'):
+        ##only the srt order the build uses, pivots are ignored
+        if transform_order != 'srt':
+            raise OperationFailed('fake_hou only builds srt transforms')
+        scale = np.identity(4)
+        scale[0, 0], scale[1, 1], scale[2, 2] = list(values_dict.get('scale', (1, 1, 1)))
+        rotate = np.identity(4)
+        rotate[:3, :3] = rotation_matrix(list(values_dict.get('rotate', (0, 0, 0))), rotate_order)
+        translate = translate_matrix(values_dict.get('translate', (0, 0, 0)))
+        return (Matrix4(scale.dot(rotate).dot(translate)))
+
+
+class Color(object):
+
+    def __init__(self, rgb=(0.0, 0.0, 0.0)):
+        self.values = tuple(float(value) for value in rgb)
+
+    def rgb(self):
+        return (self.values)
+
+    def __eq__(self, other):
+        return (isinstance(other, Color) and self.values == other.values)
+
+    def __ne__(self, other):
+        return (not self == other)
+
+
+####PARM TEMPLATES####
+class ParmTemplate(object):
+    ##what every template has, the parms a template makes are named by components()
+    template_type = None
+
+    def __init__(self, name, label='', num_components=1, default_value=(), suffixes='xyzw'):
+        self.template_name = name
+        self.template_label = label
+        self.num_components = num_components
+        self.default_values = tuple(default_value)
+        self.suffixes = suffixes
+        self.callback = ''
+        self.callback_language = scriptLanguage.Hscript
+        self.hidden = False
+        self.default_expressions = ()
+
+    def name(self):
+        return (self.template_name)
+
+    def setName(self, name):
+        self.template_name = name
+
+    def label(self):
+        return (self.template_label)
+
+    def setLabel(self, label):
+        self.template_label = label
+
+    def type(self):
+        return (self.template_type)
+
+    def numComponents(self):
+        return (self.num_components)
+
+    def defaultValue(self):
+        return (self.default_values)
+
+    def defaultExpression(self):
+        return (self.default_expressions)
+
+    def scriptCallback(self):
+        return (self.callback)
+
+    def setScriptCallback(self, script):
+        self.callback = script
+
+    def scriptCallbackLanguage(self):
+        return (self.callback_language)
+
+    def setScriptCallbackLanguage(self, language):
+        self.callback_language = language
+
+    def isHidden(self):
+        return (self.hidden)
+
+    def hide(self, on):
+        self.hidden = on
+
+    def clone(self):
+        ##templates only hold immutable values, apart from the children of a folder
+        template = copy.copy(self)
+        if isinstance(template, FolderParmTemplate):
+            template.children = [child.clone() for child in template.children]
+        return (template)
+
+    def components(self):
+        ##names of the parms the template makes
+        if self.num_components == 1:
+            return ([self.template_name])
+        return ([self.template_name + suffix for suffix in self.suffixes[:self.num_components]])
+
+    def default_for(self, component):
+        if component < len(self.default_values):
+            return (self.default_values[component])
+        if self.template_type == parmTemplateType.String:
+            return ('')
+        return (0)
+
+    def default_expression_for(self, component):
+        ##the expression a new parm starts with, None for a plain value
+        if component < len(self.default_expressions) and self.default_expressions[component]:
+            return (self.default_expressions[component])
+        return (None)
+
+
+class FloatParmTemplate(ParmTemplate):
+    template_type = parmTemplateType.Float
+
+    def __init__(self, name, label, num_components, default_value=(), min=0.0, max=10.0, min_is_strict=False,
+                 max_is_strict=False, *args, **kwargs):
+        ParmTemplate.__init__(self, name, label, num_components, [float(value) for value in default_value],
+                              kwargs.get('suffixes', 'xyzw'))
+        self.range = (min, max, min_is_strict, max_is_strict)
+
+
+class IntParmTemplate(ParmTemplate):
+    template_type = parmTemplateType.Int
+
+    def __init__(self, name, label, num_components, default_value=(), *args, **kwargs):
+        ParmTemplate.__init__(self, name, label, num_components, [int(value) for value in default_value])
+        self.default_expressions = tuple(kwargs.get('default_expression', ()))
+
+
+class StringParmTemplate(ParmTemplate):
+    template_type = parmTemplateType.String
+
+    def __init__(self, name, label, num_components, default_value=(), *args, **kwargs):
+        ParmTemplate.__init__(self, name, label, num_components, default_value)
+
+
+class ToggleParmTemplate(ParmTemplate):
+    template_type = parmTemplateType.Toggle
+
+    def __init__(self, name, label, default_value=False, *args, **kwargs):
+        ParmTemplate.__init__(self, name, label, 1, (int(default_value),))
+
+
+class MenuParmTemplate(ParmTemplate):
+    template_type = parmTemplateType.Menu
+
+    def __init__(self, name, label, menu_items, menu_labels=(), default_value=0, *args, **kwargs):
+        ParmTemplate.__init__(self, name, label, 1, (default_value,))
+        self.menu_items = tuple(menu_items)
+        self.menu_labels = tuple(menu_labels)
+
+
+class ButtonParmTemplate(ParmTemplate):
+    template_type = parmTemplateType.Button
+
+    def __init__(self, name, label, *args, **kwargs):
+        ParmTemplate.__init__(self, name, label, 1, (0,))
+
+
+class SeparatorParmTemplate(ParmTemplate):
+    template_type = parmTemplateType.Separator
+
+    def __init__(self, name, *args, **kwargs):
+        ParmTemplate.__init__(self, name, '', 0)
+
+    def components(self):
+        return ([])
+
+
+class FolderParmTemplate(ParmTemplate):
+    template_type = parmTemplateType.Folder
+
+    def __init__(self, name, label, parm_templates=(), folder_type=folderType.Tabs, *args, **kwargs):
+        ParmTemplate.__init__(self, name, label, 0)
+        self.children = [template.clone() for template in parm_templates]
+        self.folder_type = folder_type
+
+    def components(self):
+        return ([])
+
+    def folderType(self):
+        return (self.folder_type)
+
+    def setFolderType(self, folder_type):
+        self.folder_type = folder_type
+
+    def parmTemplates(self):
+        return (tuple(template.clone() for template in self.children))
+
+    def setParmTemplates(self, parm_templates):
+        self.children = [template.clone() for template in parm_templates]
+
+    def addParmTemplate(self, parm_template):
+        self.children.append(parm_template.clone())
+
+
+class ParmTemplateGroup(object):
+    ##like Houdini, templates go in and come out as copies, change one and replace it to keep the change
+
+    def __init__(self, parm_templates=()):
+        self.templates = [template.clone() for template in parm_templates]
+
+    def entries(self):
+        return (tuple(template.clone() for template in self.templates))
+
+    def parmTemplates(self):
+        return (self.entries())
+
+    def append(self, parm_template):
+        self.templates.append(parm_template.clone())
+
+    def leaves(self):
+        ##every template that makes parms, folders opened all the way down
+        leaves = []
+        pending = list(self.templates)
+        while pending:
+            template = pending.pop(0)
+            if isinstance(template, FolderParmTemplate):
+                pending[0:0] = template.children
+            else:
+                leaves.append(template)
+        return (leaves)
+
+    def locate(self, match):
+        ##(list holding the template, index in it) of the first template match accepts, or None
+        pending = [self.templates]
+        while pending:
+            templates = pending.pop(0)
+            for number, template in enumerate(templates):
+                if match(template):
+                    return ((templates, number))
+                if isinstance(template, FolderParmTemplate):
+                    pending.append(template.children)
+        return (None)
+
+    def find(self, name):
+        found = self.locate(lambda template: template.name() == name)
+        return (found[0][found[1]].clone() if found else None)
+
+    def findFolder(self, label_or_labels):
+        label = label_or_labels if isinstance(label_or_labels, string_types) else label_or_labels[-1]
+        found = self.locate(lambda template: isinstance(template, FolderParmTemplate) and template.label() == label)
+        return (found[0][found[1]].clone() if found else None)
+
+    def replace(self, name_or_template, parm_template):
+        name = name_or_template if isinstance(name_or_template, string_types) else name_or_template.name()
+        found = self.locate(lambda template: template.name() == name)
+        if found is None:
+            raise OperationFailed('No parm template called ' + name)
+        found[0][found[1]] = parm_template.clone()
+
+    def remove(self, name_or_template):
+        name = name_or_template if isinstance(name_or_template, string_types) else name_or_template.name()
+        found = self.locate(lambda template: template.name() == name)
+        if found is not None:
+            del found[0][found[1]]
+
+    def hide(self, name_or_template, on):
+        name = name_or_template if isinstance(name_or_template, string_types) else name_or_template.name()
+        found = self.locate(lambda template: template.name() == name)
+        if found is None:
+            raise OperationFailed('No parm template called ' + name)
+        found[0][found[1]].hide(on)
+
+
+####PARMS####
+class Parm(object):
+
+    def __init__(self, node, parm_tuple, component):
+        self.owner = node
+        self.parm_tuple = parm_tuple
+        self.component = component
+        self.value = parm_tuple.template.default_for(component)
+        self.expression_text = parm_tuple.template.default_expression_for(component)
+        self.expression_language = exprLanguage.Hscript
+        self.locked = False
+        self.autoscope = False
+
+    def name(self):
+        return (self.parm_tuple.template.components()[self.component])
+
+    def node(self):
+        return (self.owner)
+
+    def path(self):
+        return (self.owner.path() + '/' + self.name())
+
+    def tuple(self):
+        return (self.parm_tuple)
+
+    def parmTemplate(self):
+        return (self.parm_tuple.template)
+
+    def eval(self):
+        ##expressions aren't evaluated, a parm always gives back the last value that was set
+        return (self.value)
+
+    def evalAsFloat(self):
+        return (float(self.value))
+
+    def evalAsInt(self):
+        return (int(self.value))
+
+    def evalAsString(self):
+        return (str(self.value))
+
+    def unexpandedString(self):
+        return (str(self.value))
+
+    def set(self, value):
+        count('Parm.set')
+        self.write(value)
+
+    def write(self, value):
+        ##a parm given a parm becomes a channel reference to it, like in Houdini
+        if isinstance(value, Parm):
+            self.write_expression('ch("%s/%s")' % (self.owner.relativePathTo(value.node()), value.name()),
+                                  exprLanguage.Hscript)
+            return
+        count('parms_written')
+        self.owner.check_alive()
+        if isinstance(value, string_types) and self.owner.permissive:
+            ##parms made on the fly find out they hold strings when they are given one
+            self.parm_tuple.template.__class__ = StringParmTemplate
+        self.value = value
+        self.expression_text = None
+
+    def setExpression(self, expression, language=None, replace_expression=True):
+        count('Parm.setExpression')
+        self.write_expression(expression, language or exprLanguage.Hscript)
+
+    def write_expression(self, expression, language):
+        count('expressions_written')
+        self.owner.check_alive()
+        self.expression_text = expression
+        self.expression_language = language
+
+    def expression(self):
+        if self.expression_text is None:
+            raise OperationFailed('Parameter has no expression')
+        return (self.expression_text)
+
+    def expressionLanguage(self):
+        if self.expression_text is None:
+            raise OperationFailed('Parameter has no expression')
+        return (self.expression_language)
+
+    def keyframes(self):
+        ##an expression lives on a keyframe in Houdini
+        if self.expression_text is None:
+            return (())
+        return ((self.expression_text,))
+
+    def deleteAllKeyframes(self):
+        self.expression_text = None
+
+    def lock(self, on):
+        self.locked = on
+
+    def isLocked(self):
+        return (self.locked)
+
+    def setAutoscope(self, on):
+        self.autoscope = on
+
+
+class ParmTuple(object):
+
+    def __init__(self, node, template):
+        self.owner = node
+        self.template = template
+        self.parms = [Parm(node, self, component) for component in range(len(template.components()))]
+
+    def name(self):
+        return (self.template.name())
+
+    def node(self):
+        return (self.owner)
+
+    def parmTemplate(self):
+        return (self.template)
+
+    def __len__(self):
+        return (len(self.parms))
+
+    def __getitem__(self, index):
+        return (self.parms[index])
+
+    def __iter__(self):
+        return (iter(self.parms))
+
+    def eval(self):
+        return (tuple(parm.eval() for parm in self.parms))
+
+    def set(self, values):
+        count('ParmTuple.set')
+        for parm, value in zip(self.parms, values):
+            parm.write(value)
+
+    def setAutoscope(self, values):
+        for parm, value in zip(self.parms, values):
+            parm.setAutoscope(value)
+
+    def lock(self, values):
+        for parm, value in zip(self.parms, values):
+            parm.lock(value)
+
+
+####NODE TYPES####
+def obj_transform_templates(extra=()):
+    ##the parms every object has, the Transform folder first like Houdini
+    return ([FolderParmTemplate('stdswitcher_transform', 'Transform', [
+                 FloatParmTemplate('t', 'Translate', 3),
+                 FloatParmTemplate('r', 'Rotate', 3),
+                 FloatParmTemplate('s', 'Scale', 3, (1, 1, 1)),
+                 FloatParmTemplate('p', 'Pivot Translate', 3),
+                 FloatParmTemplate('pr', 'Pivot Rotate', 3),
+                 FloatParmTemplate('scale', 'Uniform Scale', 1, (1,)),
+                 ToggleParmTemplate('keeppos', 'Keep Position When Parenting'),
+                 ToggleParmTemplate('constraints_on', 'Enable Constraints'),
+                 StringParmTemplate('constraints_path', 'Constraints', 1),
+                 StringParmTemplate('lookatpath', 'Look At', 1)]),
+             FolderParmTemplate('stdswitcher_render', 'Render', [
+                 ToggleParmTemplate('tdisplay', 'Display'),
+                 ToggleParmTemplate('display', 'Display', True),
+                 ToggleParmTemplate('use_dcolor', 'Set Wireframe Color'),
+                 FloatParmTemplate('dcolor', 'Wireframe Color', 3, (1, 1, 1), suffixes='rgb')])] + list(extra))
+
+NULL_TEMPLATES = [FolderParmTemplate('stdswitcher_misc', 'Misc', [
+    FloatParmTemplate('geoscale', 'Control Scale', 1, (1,)),
+    IntParmTemplate('controltype', 'Control Type', 1),
+    IntParmTemplate('orientation', 'Orientation', 1),
+    ToggleParmTemplate('shadedmode', 'Shaded'),
+    FloatParmTemplate('geosize', 'Size', 3, (1, 1, 1)),
+    FloatParmTemplate('geocenter', 'Center', 3),
+    FloatParmTemplate('georotate', 'Rotate', 3)])]
+
+BONE_TEMPLATES = [FolderParmTemplate('stdswitcher_bone', 'Bone', [
+    FloatParmTemplate('length', 'Length', 1, (1,)),
+    FloatParmTemplate('R', 'Rest Angles', 3),
+    StringParmTemplate('solver', 'Kinematic Solver', 1),
+    FloatParmTemplate('crtopcap', 'Top Cap', 3, (.25, .25, .25)),
+    FloatParmTemplate('crbotcap', 'Bottom Cap', 3, (.25, .25, .25)),
+    FloatParmTemplate('ccrtopcap', 'Capture Top Cap', 3, (.25, .25, .25)),
+    FloatParmTemplate('ccrbotcap', 'Capture Bottom Cap', 3, (.25, .25, .25))])]
+
+SUBNET_TEMPLATES = [FolderParmTemplate('stdswitcher_subnet', 'Subnet', [
+    StringParmTemplate('label1', 'Input #1 Label', 1)])]
+
+##object type -> (extra parm templates, SOPs made inside it as (name, type, input name), network its children are in)
+OBJECT_TYPES = {
+    'null': (NULL_TEMPLATES, [('control1', 'control', None)], 'Sop'),
+    'bone': (BONE_TEMPLATES, [('cregion', 'capture_region', None)], 'Sop'),
+    'geo': ([], [], 'Sop'),
+    'subnet': (SUBNET_TEMPLATES, [], 'Object'),
+    'path': ([], [('points_merge', 'object_merge', None), ('delete_endpoints', 'delete', 'points_merge'),
+                  ('connect_points', 'add', 'delete_endpoints'), ('output_curve', 'convert', 'connect_points')], 'Sop'),
+    'pathcv': ([], [('points', 'add', None)], 'Sop'),
+    'chopnet': ([], [], 'Chop'),
+}
+
+
+class NodeTypeCategory(object):
+
+    def __init__(self, name):
+        self.category_name = name
+
+    def name(self):
+        return (self.category_name)
+
+
+class NodeType(object):
+
+    def __init__(self, name, category, definition=None):
+        self.type_name = name
+        self.type_category = category
+        self.hda_definition = definition
+
+    def name(self):
+        return (self.type_name)
+
+    def category(self):
+        return (NodeTypeCategory(self.type_category))
+
+    def nameWithCategory(self):
+        return (self.type_category + '/' + self.type_name)
+
+    def definition(self):
+        return (self.hda_definition)
+
+
+class HDASection(object):
+
+    def __init__(self, name, contents):
+        self.section_name = name
+        self.section_contents = contents
+
+    def name(self):
+        return (self.section_name)
+
+    def contents(self):
+        return (self.section_contents)
+
+    def binaryContents(self):
+        if isinstance(self.section_contents, bytes):
+            return (self.section_contents)
+        return (self.section_contents.encode('utf-8'))
+
+    def setContents(self, contents):
+        self.section_contents = contents
+
+
+class HDADefinition(object):
+    ##kept in memory, updateFromNode and save only count, nothing is written to disk
+
+    def __init__(self, type_name, file_path):
+        self.type_name = type_name
+        self.file_path = file_path
+        self.section_map = {}
+        self.extra_options = {}
+        self.module = None
+
+    def nodeTypeName(self):
+        return (self.type_name)
+
+    def libraryFilePath(self):
+        return (self.file_path)
+
+    def sections(self):
+        return (dict(self.section_map))
+
+    def addSection(self, name, contents=''):
+        count('HDADefinition.addSection')
+        self.section_map[name] = HDASection(name, contents)
+        if name == 'PythonModule':
+            self.module = None
+        return (self.section_map[name])
+
+    def removeSection(self, name):
+        self.section_map.pop(name, None)
+
+    def setExtraFileOption(self, name, value, type_hint=None):
+        self.extra_options[name] = value
+
+    def extraFileOptions(self):
+        return (dict(self.extra_options))
+
+    def updateFromNode(self, node):
+        count('HDADefinition.updateFromNode')
+
+    def save(self, file_name, template_node=None, options=None):
+        count('HDADefinition.save')
+
+    def python_module(self):
+        ##the PythonModule section run as a module, like hdaModule() gives
+        if self.module is None:
+            self.module = types.ModuleType(self.type_name + '_hda_module')
+            self.module.hou = sys.modules[__name__]
+            section = self.section_map.get('PythonModule')
+            if section is not None:
+                exec(compile(section.contents(), self.type_name + '/PythonModule', 'exec'), self.module.__dict__)
+        return (self.module)
+
+
+class NetworkBox(object):
+
+    def __init__(self, network, name):
+        self.network = network
+        self.box_name = name
+        self.items_in_box = []
+        self.minimized = False
+        self.box_color = Color()
+
+    def name(self):
+        return (self.box_name)
+
+    def addItem(self, item):
+        self.items_in_box.append(item)
+
+    def items(self):
+        return (tuple(self.items_in_box))
+
+    def setMinimized(self, on):
+        self.minimized = on
+
+    def isMinimized(self):
+        return (self.minimized)
+
+    def setColor(self, color):
+        self.box_color = color
+
+
+class SubnetIndirectInput(object):
+
+    def __init__(self, subnet, number):
+        self.subnet = subnet
+        self.input_number = number
+        self.node_outputs = []
+
+    def number(self):
+        return (self.input_number)
+
+    def parent(self):
+        return (self.subnet)
+
+    def outputs(self):
+        return (tuple(self.node_outputs))
+
+
+####NODES####
+##every node of the session gets its own number, never reused after the node is destroyed
+session_ids = itertools.count(1)
+
+def unique_name(network, name):
+    ##Houdini's renaming, bump the number on the end of the name until it is free
+    if name not in network.child_map:
+        return (name)
+    match = re.match(r'^(.*?)(\d*)$', name)
+    base = match.group(1)
+    number = int(match.group(2)) if match.group(2) else 0
+    while True:
+        number += 1
+        candidate = base + str(number)
+        if candidate not in network.child_map:
+            return (candidate)
+
+
+class Node(object):
+    ##a node of any network, the subclasses add what objects and SOPs do on top
+
+    def __init__(self, parent, name, type_name, category):
+        self.session_id = next(session_ids)
+        self.node_name = name
+        self.parent_node = parent
+        self.node_type = NodeType(type_name, category)
+        self.child_map = {}
+        self.child_order = []
+        self.node_inputs = []
+        self.node_outputs = []
+        self.destroyed = False
+        self.flags = {'display': True, 'render': True, 'selectable': True, 'xray': False}
+        self.user_data = {}
+        self.node_color = Color((.8, .8, .8))
+        self.node_comment = ''
+        self.network_boxes = []
+        self.indirect_inputs = ()
+        ##SOPs and CHOPs make their parms as they are asked for, objects only have the parms of their type
+        self.permissive = category != 'Object'
+        templates, children, self.child_category = OBJECT_TYPES.get(type_name, ([], [], 'Sop'))
+        if category == 'Object':
+            templates = obj_transform_templates(templates)
+        elif category == 'Manager':
+            self.child_category = 'Object'
+        self.template_group = ParmTemplateGroup(templates)
+        self.tuple_map = {}
+        self.parm_map = {}
+        self.sync_parms()
+        ##the nodes Houdini puts inside a new node of this type
+        if category == 'Object':
+            for child_name, child_type, input_name in children:
+                child = self.make_child(child_type, child_name)
+                if input_name is not None:
+                    child.setInput(0, self.child_map[input_name])
+            if children:
+                self.child_map[children[-1][0]].set_display(True)
+        if type_name == 'subnet':
+            self.indirect_inputs = tuple(SubnetIndirectInput(self, number) for number in range(4))
+
+    def __repr__(self):
+        return ('<hou.%s %s>' % (type(self).__name__, self.path() if not self.destroyed else 'destroyed'))
+
+    def check_alive(self):
+        if self.destroyed:
+            raise ObjectWasDeleted('Attempt to access an object that no longer exists in Houdini.')
+
+    ####NETWORK####
+    def name(self):
+        self.check_alive()
+        return (self.node_name)
+
+    def sessionId(self):
+        return (self.session_id)
+
+    def path(self):
+        self.check_alive()
+        if self.parent_node is None:
+            return ('/')
+        parent_path = self.parent_node.path()
+        return (parent_path.rstrip('/') + '/' + self.node_name)
+
+    def parent(self):
+        return (self.parent_node)
+
+    def type(self):
+        return (self.node_type)
+
+    def children(self):
+        return (tuple(self.child_map[name] for name in self.child_order))
+
+    def allSubChildren(self, top_down=True, recurse_in_locked_nodes=True):
+        nodes = []
+        for child in self.children():
+            nodes.append(child)
+            nodes.extend(child.allSubChildren())
+        return (tuple(nodes))
+
+    def node(self, node_path):
+        ##absolute or relative path, None when there is nothing there
+        self.check_alive()
+        current = root if node_path.startswith('/') else self
+        for part in node_path.split('/'):
+            if part in ('', '.'):
+                continue
+            if part == '..':
+                current = current.parent_node
+            else:
+                current = current.child_map.get(part)
+            if current is None:
+                return (None)
+        return (current)
+
+    def relativePathTo(self, base_node):
+        ##path from this node to base_node
+        here = [part for part in self.path().split('/') if part]
+        there = [part for part in base_node.path().split('/') if part]
+        shared = 0
+        while shared < min(len(here), len(there)) and here[shared] == there[shared]:
+            shared += 1
+        parts = ['..'] * (len(here) - shared) + there[shared:]
+        return ('/'.join(parts) or '.')
+
+    def make_child(self, type_name, name=None):
+        ##a new child without counting it, for the nodes Houdini makes itself
+        name = unique_name(self, name or re.sub(r'::.*$', '', type_name) + '1')
+        node_class = NODE_CLASSES.get(self.child_category, Node)
+        node = node_class(self, name, type_name, self.child_category)
+        self.child_map[name] = node
+        self.child_order.append(name)
+        ##the first SOP of a network gets the display flag
+        if self.child_category == 'Sop':
+            node.flags['display'] = not any(child.flags['display'] for child in self.children() if child is not node)
+        return (node)
+
+    def createNode(self, node_type_name, node_name=None, run_init_scripts=True, load_contents=True,
+                   exact_type_name=False):
+        count('Node.createNode')
+        self.check_alive()
+        return (self.make_child(node_type_name, node_name))
+
+    def destroy(self):
+        count('Node.destroy')
+        self.check_alive()
+        for node in self.node_inputs:
+            if node is not None and self in node.node_outputs:
+                node.node_outputs.remove(self)
+        for node in list(self.node_outputs):
+            node.node_inputs = [None if each is self else each for each in node.node_inputs]
+        self.node_outputs = []
+        del self.parent_node.child_map[self.node_name]
+        self.parent_node.child_order.remove(self.node_name)
+        for node in (self,) + self.allSubChildren():
+            node.destroyed = True
+
+    def setName(self, name, unique_name=False):
+        count('Node.setName')
+        self.check_alive()
+        if name == self.node_name:
+            return
+        network = self.parent_node
+        if name in network.child_map:
+            if not unique_name:
+                raise OperationFailed('Node name already taken: ' + name)
+            name = globals()['unique_name'](network, name)
+        del network.child_map[self.node_name]
+        network.child_order[network.child_order.index(self.node_name)] = name
+        network.child_map[name] = self
+        self.node_name = name
+
+    def layoutChildren(self, items=(), horizontal_spacing=-1.0, vertical_spacing=-1.0):
+        count('Node.layoutChildren')
+
+    def moveToGoodPosition(self, relative_to_inputs=True, move_inputs=True, move_outputs=True, move_unconnected=True):
+        count('Node.moveToGoodPosition')
+
+    ####WIRING####
+    def inputs(self):
+        inputs = list(self.node_inputs)
+        while inputs and inputs[-1] is None:
+            inputs.pop()
+        return (tuple(inputs))
+
+    def input(self, input_index):
+        if input_index < len(self.node_inputs):
+            return (self.node_inputs[input_index])
+        return (None)
+
+    def outputs(self):
+        return (tuple(self.node_outputs))
+
+    def setInput(self, input_index, item_to_become_input, output_index=0):
+        count('Node.setInput')
+        self.connect(input_index, item_to_become_input)
+
+    def setFirstInput(self, item_to_become_input, output_index=0):
+        count('Node.setFirstInput')
+        self.connect(0, item_to_become_input)
+
+    def setNextInput(self, item_to_become_input, output_index=0, unordered_only=False):
+        count('Node.setNextInput')
+        self.connect(len(self.inputs()), item_to_become_input)
+
+    def connect(self, input_index, node):
+        self.check_alive()
+        while len(self.node_inputs) <= input_index:
+            self.node_inputs.append(None)
+        old = self.node_inputs[input_index]
+        if old is not None and self in old.node_outputs:
+            old.node_outputs.remove(self)
+        self.node_inputs[input_index] = node
+        if node is not None:
+            node.node_outputs.append(self)
+
+    ####PARMS####
+    def sync_parms(self):
+        ##make the parms of the template group, keeping the values of parms that were already there
+        old_parms = self.parm_map
+        self.tuple_map = {}
+        self.parm_map = {}
+        self.tuple_order = []
+        for template in self.template_group.leaves():
+            if not template.components():
+                continue
+            parm_tuple = ParmTuple(self, template)
+            for parm in parm_tuple:
+                old = old_parms.get(parm.name())
+                if old is not None:
+                    parm.value = old.value
+                    parm.expression_text = old.expression_text
+                    parm.expression_language = old.expression_language
+                self.parm_map[parm.name()] = parm
+            self.tuple_map[template.name()] = parm_tuple
+            self.tuple_order.append(template.name())
+
+    def add_parm(self, name):
+        ##a parm made on the fly on a SOP or CHOP, float until it is given a string
+        template = FloatParmTemplate(name, name, 1)
+        self.template_group.append(template)
+        parm_tuple = ParmTuple(self, self.template_group.templates[-1])
+        self.tuple_map[name] = parm_tuple
+        self.tuple_order.append(name)
+        self.parm_map[name] = parm_tuple[0]
+        return (parm_tuple[0])
+
+    def parm(self, parm_path):
+        self.check_alive()
+        parm = self.parm_map.get(parm_path)
+        if parm is None and self.permissive:
+            parm = self.add_parm(parm_path)
+        return (parm)
+
+    def parmTuple(self, parm_path):
+        self.check_alive()
+        parm_tuple = self.tuple_map.get(parm_path)
+        if parm_tuple is None and self.permissive:
+            parm_tuple = self.add_parm(parm_path).tuple()
+        return (parm_tuple)
+
+    def parms(self):
+        return (tuple(parm for name in self.tuple_order for parm in self.tuple_map[name]))
+
+    def parmTuples(self):
+        return (tuple(self.tuple_map[name] for name in self.tuple_order))
+
+    def evalParm(self, parm_path):
+        parm = self.parm(parm_path)
+        if parm is None:
+            raise OperationFailed('Invalid parameter name ' + parm_path)
+        return (parm.eval())
+
+    def evalParmTuple(self, parm_path):
+        parm_tuple = self.parmTuple(parm_path)
+        if parm_tuple is None:
+            raise OperationFailed('Invalid parameter name ' + parm_path)
+        return (parm_tuple.eval())
+
+    def setParms(self, parm_dict):
+        count('Node.setParms')
+        self.check_alive()
+        for name, value in parm_dict.items():
+            parm = self.parm(name)
+            if parm is None:
+                raise OperationFailed('Invalid parameter name ' + name)
+            parm.write(value)
+
+    def setParmExpressions(self, parm_dict, language=None, replace_expressions=True):
+        count('Node.setParmExpressions')
+        self.check_alive()
+        for name, expression in parm_dict.items():
+            parm = self.parm(name)
+            if parm is None:
+                raise OperationFailed('Invalid parameter name ' + name)
+            parm.write_expression(expression, language or exprLanguage.Hscript)
+
+    def parmTemplateGroup(self):
+        self.check_alive()
+        return (ParmTemplateGroup(self.template_group.templates))
+
+    def setParmTemplateGroup(self, parm_template_group, rename_conflicting_parms=False):
+        count('Node.setParmTemplateGroup')
+        self.check_alive()
+        self.template_group = ParmTemplateGroup(parm_template_group.templates)
+        self.sync_parms()
+
+    ####LOOKS####
+    def setColor(self, color):
+        self.node_color = color
+
+    def color(self):
+        return (self.node_color)
+
+    def setComment(self, comment):
+        self.node_comment = comment
+
+    def comment(self):
+        return (self.node_comment)
+
+    def setUserData(self, name, value):
+        self.user_data[name] = value
+
+    def userData(self, name):
+        return (self.user_data.get(name))
+
+    def setSelectableInViewport(self, on):
+        self.flags['selectable'] = on
+
+    def isSelectableInViewport(self):
+        return (self.flags['selectable'])
+
+    def useXray(self, on):
+        self.flags['xray'] = on
+
+    def setDisplayFlag(self, on):
+        count('Node.setDisplayFlag')
+        self.check_alive()
+        self.set_display(on)
+
+    def set_display(self, on):
+        if on and self.parent_node.child_category == 'Sop':
+            ##one displayed SOP per network
+            for child in self.parent_node.children():
+                child.flags['display'] = False
+        self.flags['display'] = on
+
+    def isDisplayFlagSet(self):
+        return (self.flags['display'])
+
+    def setRenderFlag(self, on):
+        self.flags['render'] = on
+
+    def isRenderFlagSet(self):
+        return (self.flags['render'])
+
+    def displayNode(self):
+        for child in self.children():
+            if child.flags['display']:
+                return (child)
+        return (None)
+
+    def renderNode(self):
+        return (self.displayNode())
+
+    def createNetworkBox(self, name=None):
+        box = NetworkBox(self, name or 'netbox%d' % (len(self.network_boxes) + 1))
+        self.network_boxes.append(box)
+        return (box)
+
+    def findNetworkBox(self, name):
+        for box in self.network_boxes:
+            if box.name() == name:
+                return (box)
+        return (None)
+
+    def networkBoxes(self):
+        return (tuple(self.network_boxes))
+
+    ####DIGITAL ASSETS####
+    def indirectInputs(self):
+        return (self.indirect_inputs)
+
+    def createDigitalAsset(self, name=None, hda_file_name=None, description=None, min_num_inputs=0, max_num_inputs=0,
+                           *args, **kwargs):
+        ##turns the node into an instance of a new asset, the same node is handed back
+        count('Node.createDigitalAsset')
+        self.check_alive()
+        self.node_type = NodeType(name, self.node_type.category().name(), HDADefinition(name, hda_file_name))
+        return (self)
+
+    def hdaModule(self):
+        definition = self.node_type.definition()
+        if definition is None:
+            raise OperationFailed('Node is not a digital asset')
+        return (definition.python_module())
+
+    def copy_to(self, network):
+        ##a copy of the node and everything inside it, wired the same inside, not connected outside
+        node = NODE_CLASSES.get(network.child_category, Node).__new__(NODE_CLASSES.get(network.child_category, Node))
+        node.__dict__.update(self.__dict__)
+        node.session_id = next(session_ids)
+        node.node_name = unique_name(network, self.node_name)
+        node.parent_node = network
+        node.node_inputs = []
+        node.node_outputs = []
+        node.flags = dict(self.flags)
+        node.user_data = dict(self.user_data)
+        node.network_boxes = []
+        node.template_group = ParmTemplateGroup(self.template_group.templates)
+        node.parm_map = {}
+        node.sync_parms()
+        for name, parm in self.parm_map.items():
+            node.parm_map[name].value = parm.value
+            node.parm_map[name].expression_text = parm.expression_text
+            node.parm_map[name].expression_language = parm.expression_language
+        if hasattr(self, 'pre_transform'):
+            node.pre_transform = Matrix4(self.pre_transform)
+        network.child_map[node.node_name] = node
+        network.child_order.append(node.node_name)
+        node.child_map = {}
+        node.child_order = []
+        copies = dict((child, child.copy_to(node)) for child in self.children())
+        for child, child_copy in copies.items():
+            for number, source in enumerate(child.node_inputs):
+                if source in copies:
+                    child_copy.connect(number, copies[source])
+        return (node)
+
+
+class ObjNode(Node):
+
+    def __init__(self, parent, name, type_name, category):
+        self.pre_transform = Matrix4()
+        Node.__init__(self, parent, name, type_name, category)
+
+    def preTransform(self):
+        return (Matrix4(self.pre_transform))
+
+    def setPreTransform(self, matrix):
+        count('ObjNode.setPreTransform')
+        self.check_alive()
+        self.pre_transform = Matrix4(matrix)
+
+    def parmTransform(self):
+        ##srt with xyz rotations, the Houdini defaults, pivots are left out
+        values = {'translate': self.evalParmTuple('t'), 'rotate': self.evalParmTuple('r'),
+                  'scale': [value * self.evalParm('scale') for value in self.evalParmTuple('s')]}
+        return (hmath.buildTransform(values))
+
+    def moveParmTransformIntoPreTransform(self):
+        count('ObjNode.moveParmTransformIntoPreTransform')
+        self.pre_transform = self.parmTransform() * self.pre_transform
+        for name, value in (('t', 0), ('r', 0), ('s', 1)):
+            for parm in self.parmTuple(name):
+                parm.value = value
+        self.parm('scale').value = 1
+
+    def input_frame(self, node):
+        ##the transform an input hands its children, bones give theirs the end of the bone
+        if isinstance(node, SubnetIndirectInput):
+            subnet = node.parent()
+            return (subnet.world() if isinstance(subnet, ObjNode) else Matrix4())
+        if not isinstance(node, ObjNode):
+            return (Matrix4())
+        world = node.world()
+        if node.type().name() == 'bone':
+            return (hmath.buildTranslate(0, 0, -node.evalParm('length')) * world)
+        return (world)
+
+    def world(self):
+        ##the world transform without counting it, parm transform then pre-transform then the parent
+        self.check_alive()
+        return (self.parmTransform() * self.pre_transform * self.input_frame(self.input(0)))
+
+    def worldTransform(self):
+        count('ObjNode.worldTransform')
+        return (self.world())
+
+    def origin(self):
+        count('ObjNode.worldTransform')
+        return (self.world().extractTranslates())
+
+    def connect(self, input_index, node):
+        ##with keep position on the pre-transform makes up for the new parent, which costs a transform evaluation
+        if input_index == 0 and self.parm('keeppos').eval() and node is not self.input(0):
+            count('keeppos_compensations')
+            world = self.world()
+            Node.connect(self, input_index, node)
+            self.pre_transform = self.parmTransform().inverted() * world * self.input_frame(node).inverted()
+            return
+        Node.connect(self, input_index, node)
+
+
+class SopNode(Node):
+
+    def geometry(self):
+        count('SopNode.geometry')
+        self.check_alive()
+        return (self.cook())
+
+    def cook(self):
+        cook = SOP_COOKS.get(self.type().name(), cook_first_input)
+        return (cook(self))
+
+    def input_geometry(self, input_index=0):
+        source = self.input(input_index)
+        if source is None:
+            return (Geometry())
+        return (source.cook())
+
+
+class ChopNode(Node):
+    pass
+
+
+NODE_CLASSES = {'Object': ObjNode, 'Sop': SopNode, 'Chop': ChopNode}
+
+
+####GEOMETRY####
+class Attrib(object):
+
+    def __init__(self, name, default_value, geometry=None):
+        self.attrib_name = name
+        self.default = default_value
+        self.geo = geometry
+
+    def name(self):
+        return (self.attrib_name)
+
+    def defaultValue(self):
+        return (self.default)
+
+    def size(self):
+        return (len(self.default) if isinstance(self.default, (tuple, list)) else 1)
+
+    def destroy(self):
+        del self.geo.point_attribs[self.attrib_name]
+        del self.geo.point_defaults[self.attrib_name]
+
+
+class Point(object):
+
+    def __init__(self, geometry, number):
+        self.geo = geometry
+        self.point_number = number
+
+    def number(self):
+        return (self.point_number)
+
+    def position(self):
+        return (Vector3(self.geo.positions[self.point_number]))
+
+    def setPosition(self, position):
+        self.geo.positions[self.point_number] = [float(value) for value in position]
+
+    def attribValue(self, name_or_attrib):
+        name = name_or_attrib if isinstance(name_or_attrib, string_types) else name_or_attrib.name()
+        if name == 'P':
+            return (tuple(self.geo.positions[self.point_number]))
+        return (self.geo.point_attribs[name][self.point_number])
+
+    def setAttribValue(self, name_or_attrib, value):
+        name = name_or_attrib if isinstance(name_or_attrib, string_types) else name_or_attrib.name()
+        self.geo.point_attribs[name][self.point_number] = value
+
+    def intListAttribValue(self, name_or_attrib):
+        return (tuple(int(value) for value in self.attribValue(name_or_attrib)))
+
+    def floatListAttribValue(self, name_or_attrib):
+        return (tuple(float(value) for value in self.attribValue(name_or_attrib)))
+
+
+class Vertex(object):
+
+    def __init__(self, geometry, number):
+        self.geo = geometry
+        self.point_number = number
+
+    def point(self):
+        return (Point(self.geo, self.point_number))
+
+
+class Prim(object):
+
+    def __init__(self, geometry, number):
+        self.geo = geometry
+        self.prim_number = number
+
+    def number(self):
+        return (self.prim_number)
+
+    def type(self):
+        return (primType.Polygon)
+
+    def vertices(self):
+        return (tuple(Vertex(self.geo, point) for point in self.geo.prim_points[self.prim_number][0]))
+
+    def points(self):
+        return (tuple(vertex.point() for vertex in self.vertices()))
+
+    def isClosed(self):
+        return (self.geo.prim_points[self.prim_number][1])
+
+    def curve_points(self):
+        points, closed = self.geo.prim_points[self.prim_number]
+        positions = np.array([self.geo.positions[point] for point in points], dtype=np.float64).reshape(-1, 3)
+        if closed and len(positions):
+            positions = np.vstack((positions, positions[:1]))
+        return (positions)
+
+    def intrinsicValue(self, intrinsic_name):
+        if intrinsic_name == 'measuredperimeter':
+            return (float(np.linalg.norm(np.diff(self.curve_points(), axis=0), axis=1).sum()))
+        if intrinsic_name == 'closed':
+            return (self.isClosed())
+        raise OperationFailed('fake_hou has no intrinsic ' + intrinsic_name)
+
+    def positionAt(self, u):
+        ##evenly spread over the edges, like u on a polygon curve
+        positions = self.curve_points()
+        if len(positions) < 2:
+            return (Vector3(positions[0]) if len(positions) else Vector3())
+        where = min(max(u, 0.0), 1.0) * (len(positions) - 1)
+        edge = min(int(where), len(positions) - 2)
+        blend = where - edge
+        return (Vector3(positions[edge] * (1.0 - blend) + positions[edge + 1] * blend))
+
+
+def copy_values(values):
+    ##attribute values of every point, array attributes are lists and the only values changed in place
+    return ([list(value) if isinstance(value, list) else value for value in values])
+
+
+class Geometry(object):
+    ##points, polygon prims (closed faces or open curves) and point and detail attributes,
+    ##prim and vertex attributes are only what the capture topology wrangle cooks and are never merged or saved
+
+    def __init__(self):
+        self.positions = []
+        self.prim_points = []
+        self.point_attribs = {}
+        self.point_defaults = {}
+        self.detail_attribs = {}
+        self.prim_attribs = {}
+        self.vertex_attribs = {}
+
+    def copy(self):
+        ##only lists are ever changed in place, so everything else is shared instead of deep copied
+        geometry = Geometry()
+        geometry.positions = [list(position) for position in self.positions]
+        geometry.prim_points = [(list(points), closed) for points, closed in self.prim_points]
+        geometry.point_attribs = dict((name, copy_values(values)) for name, values in self.point_attribs.items())
+        geometry.point_defaults = copy.deepcopy(self.point_defaults)
+        geometry.detail_attribs = copy.deepcopy(self.detail_attribs)
+        geometry.prim_attribs = dict((name, list(values)) for name, values in self.prim_attribs.items())
+        geometry.vertex_attribs = dict((name, list(values)) for name, values in self.vertex_attribs.items())
+        return (geometry)
+
+    def points(self):
+        return (tuple(Point(self, number) for number in range(len(self.positions))))
+
+    def point(self, index):
+        return (Point(self, index))
+
+    def prims(self):
+        return (tuple(Prim(self, number) for number in range(len(self.prim_points))))
+
+    def prim(self, index):
+        return (Prim(self, index))
+
+    def createPoint(self):
+        self.positions.append([0.0, 0.0, 0.0])
+        for name, values in self.point_attribs.items():
+            values.append(copy.deepcopy(self.point_defaults[name]))
+        return (Point(self, len(self.positions) - 1))
+
+    def add_prim(self, points, closed=True):
+        self.prim_points.append((list(points), closed))
+
+    def pointFloatAttribValues(self, name):
+        if name == 'P':
+            return (tuple(value for position in self.positions for value in position))
+        return (tuple(float(value) for values in self.point_attribs[name] for value in values))
+
+    def pointIntAttribValues(self, name):
+        return (tuple(int(value) for values in self.point_attribs[name] for value in values))
+
+    def primIntAttribValues(self, name):
+        return (tuple(int(value) for value in self.prim_attribs[name]))
+
+    def vertexIntAttribValues(self, name):
+        ##vertices are numbered prim by prim
+        return (tuple(int(value) for value in self.vertex_attribs[name]))
+
+    def set_point_values_from_string(self, name, values, dtype):
+        size = self.findPointAttrib(name).size()
+        values = np.frombuffer(values, dtype=dtype).reshape(len(self.positions), size)
+        self.point_attribs[name] = [tuple(row) for row in values.tolist()]
+
+    def setPointFloatAttribValuesFromString(self, name, values):
+        self.set_point_values_from_string(name, values, np.float32)
+
+    def setPointIntAttribValuesFromString(self, name, values):
+        self.set_point_values_from_string(name, values, np.int32)
+
+    def findPointAttrib(self, name):
+        if name not in self.point_attribs:
+            return (None)
+        return (Attrib(name, self.point_defaults[name], self))
+
+    def addAttrib(self, attrib_type, name, default_value):
+        if attrib_type is not attribType.Point:
+            raise OperationFailed('fake_hou only adds point attributes')
+        self.add_point_attrib(name, tuple(default_value) if isinstance(default_value, (tuple, list)) else default_value)
+        return (self.findPointAttrib(name))
+
+    def add_point_attrib(self, name, default_value):
+        if name not in self.point_attribs:
+            if isinstance(default_value, list):
+                self.point_attribs[name] = [list(default_value) for position in self.positions]
+            else:
+                self.point_attribs[name] = [default_value] * len(self.positions)
+            self.point_defaults[name] = default_value
+
+    def attribValue(self, name):
+        return (self.detail_attribs[name])
+
+    def setGlobalAttribValue(self, name, value):
+        self.detail_attribs[name] = value
+
+    def transform(self, matrix):
+        if self.positions:
+            points = np.hstack((np.array(self.positions), np.ones((len(self.positions), 1))))
+            self.positions = points.dot(matrix.matrix)[:, :3].tolist()
+
+    def merge(self, geometry):
+        offset = len(self.positions)
+        for name, default_value in geometry.point_defaults.items():
+            self.add_point_attrib(name, default_value)
+        for name in self.point_attribs:
+            values = geometry.point_attribs.get(name)
+            if values is None:
+                values = [self.point_defaults[name]] * len(geometry.positions)
+            self.point_attribs[name].extend(copy_values(values))
+        self.positions.extend([list(position) for position in geometry.positions])
+        self.prim_points.extend(([point + offset for point in points], closed) for points, closed in geometry.prim_points)
+        self.detail_attribs.update(copy.deepcopy(geometry.detail_attribs))
+
+    def data(self):
+        ##the geometry as bytes, what an HDA section or a .bgeo file would hold
+        return (json.dumps({'P': self.positions, 'prims': self.prim_points, 'point': self.point_attribs,
+                            'defaults': self.point_defaults, 'detail': self.detail_attribs},
+                           sort_keys=True).encode('utf-8'))
+
+
+def geometry_from_data(data):
+    if not isinstance(data, string_types):
+        data = data.decode('utf-8')
+    values = json.loads(data)
+    geometry = Geometry()
+    geometry.positions = values['P']
+    geometry.prim_points = [(points, closed) for points, closed in values['prims']]
+    geometry.point_attribs = values['point']
+    geometry.point_defaults = values['defaults']
+    geometry.detail_attribs = values['detail']
+    return (geometry)
+
+def mesh_geometry(points, polygons):
+    ##a Geometry from (n, 3) points and lists of point numbers, for registering models with add_file
+    geometry = Geometry()
+    geometry.positions = [[float(value) for value in point] for point in points]
+    for polygon in polygons:
+        geometry.add_prim([int(point) for point in polygon], True)
+    return (geometry)
+
+
+####COOKING####
+##model file path -> Geometry, what a file SOP finds when it isn't reading from an HDA section
+files = {}
+
+def add_file(file_path, geometry):
+    ##make a model loadable by file SOPs
+    files[file_path.replace('\\', '/')] = geometry
+
+def containing_object(node):
+    while node is not None and not isinstance(node, ObjNode):
+        node = node.parent()
+    return (node)
+
+def cook_first_input(node):
+    return (node.input_geometry(0).copy())
+
+def cook_file(node):
+    file_path = str(node.evalParm('file'))
+    if file_path.startswith('opdef:'):
+        ##opdef:<node path>?<section> reads a section of that node's asset
+        owner_path, section_name = file_path[len('opdef:'):].split('?', 1)
+        owner = node.node(owner_path)
+        definition = owner.type().definition() if owner is not None else None
+        if definition is None or section_name not in definition.sections():
+            raise OperationFailed('Unable to read file "%s"' % file_path)
+        return (geometry_from_data(definition.sections()[section_name].contents()))
+    if file_path not in files:
+        raise OperationFailed('Unable to read file "%s"' % file_path)
+    return (files[file_path].copy())
+
+def cook_xform(node):
+    geometry = node.input_geometry(0).copy()
+    geometry.transform(hmath.buildScale([node.evalParm('scale')] * 3))
+    return (geometry)
+
+def cook_add(node):
+    ##with nothing coming in this is the single point of a path cv, otherwise the points are joined into one curve
+    if node.input(0) is None:
+        geometry = Geometry()
+        geometry.createPoint()
+        return (geometry)
+    geometry = node.input_geometry(0).copy()
+    geometry.prim_points = [(list(range(len(geometry.positions))), False)]
+    return (geometry)
+
+def cook_object_merge(node):
+    ##every referenced SOP's geometry in world space, moved into this object's space
+    geometry = Geometry()
+    merge_count = int(node.parm('numobj').eval() or 1)
+    for number in range(1, merge_count + 1):
+        source = node.node(str(node.evalParm('objpath%d' % number)))
+        if isinstance(source, ObjNode):
+            source = source.displayNode()
+        if source is None:
+            continue
+        merged = source.cook()
+        source_object = containing_object(source)
+        if source_object is not None:
+            merged.transform(source_object.world())
+        geometry.merge(merged)
+    this_object = containing_object(node)
+    if this_object is not None:
+        geometry.transform(this_object.world().inverted())
+    return (geometry)
+
+def cook_capture(node):
+    ##the capture regions are every bone under the root path, in network order
+    geometry = node.input_geometry(0).copy()
+    root_node = node.node(str(node.evalParm('rootpath')))
+    bones = [bone for bone in root_node.allSubChildren() if bone.type().name() == 'bone'] if root_node else []
+    root_path = root_node.path() + '/' if root_node else ''
+    geometry.setGlobalAttribValue('boneCapture_pCaptPath',
+                                  tuple(bone.path()[len(root_path):] + '/cregion' for bone in bones))
+    return (geometry)
+
+def cook_capture_unpack(node):
+    geometry = node.input_geometry(0).copy()
+    geometry.add_point_attrib('boneCapture_index', [])
+    geometry.add_point_attrib('boneCapture_data', [])
+    return (geometry)
+
+def cook_capture_topology(node):
+    ##what TOPOLOGY_VEX writes, every prim is a polygon
+    geometry = node.input_geometry(0).copy()
+    sides = [len(points) for points, closed in geometry.prim_points]
+    geometry.prim_attribs['capture_sides'] = sides
+    geometry.prim_attribs['capture_first'] = [int(first) for first in np.cumsum([0] + sides[:-1])]
+    geometry.vertex_attribs['capture_point'] = [point for points, closed in geometry.prim_points for point in points]
+    return (geometry)
+
+def cook_capture_arrays(node):
+    ##what CAPTURE_ARRAYS_VEX writes, the capture tuples as arrays without the -1 padding
+    geometry = node.input_geometry(0).copy()
+    geometry.add_point_attrib('boneCapture_index', [])
+    geometry.add_point_attrib('boneCapture_data', [])
+    for number, (regions, weights) in enumerate(zip(geometry.point_attribs['capture_index'],
+                                                    geometry.point_attribs['capture_weight'])):
+        kept = [(region, weight) for region, weight in zip(regions, weights) if region >= 0]
+        geometry.point_attribs['boneCapture_index'][number] = [region for region, weight in kept]
+        geometry.point_attribs['boneCapture_data'][number] = [weight for region, weight in kept]
+    return (geometry)
+
+##VEX doesn't run, the wrangles the build reads geometry back from are cooked by name
+WRANGLE_COOKS = {'capture_topology': cook_capture_topology, 'capture_arrays': cook_capture_arrays}
+
+def cook_wrangle(node):
+    return (WRANGLE_COOKS.get(node.name(), cook_first_input)(node))
+
+SOP_COOKS = {'file': cook_file, 'xform': cook_xform, 'add': cook_add, 'object_merge': cook_object_merge,
+             'capture': cook_capture, 'captureattribunpack': cook_capture_unpack, 'attribwrangle': cook_wrangle}
+
+
+####SESSION####
+root = None
+
+def clear():
+    ##an empty scene with just /obj, like File > New
+    global root
+    root = Node(None, '', 'root', 'Director')
+    root.child_category = 'Manager'
+    manager = root.make_child('obj', 'obj')
+    manager.child_category = 'Object'
+    return (root)
+
+clear()
+
+def node(path):
+    return (root.node(path))
+
+def copyNodesTo(nodes, destination_node):
+    """ Copy nodes into destination_node, keeping the wiring between them.
+
+    Inputs from outside the copied nodes stay connected, like Houdini does when
+    copying into the same network.
+    """
+    count('copyNodesTo')
+    copies = dict((node, node.copy_to(destination_node)) for node in nodes)
+    for node in nodes:
+        for number, source in enumerate(node.node_inputs):
+            if source is not None:
+                Node.connect(copies[node], number, copies.get(source, source))
+    return (tuple(copies[node] for node in nodes))
+
+def hscript(command):
+    count('hscript')
+    return (('', ''))
+
+def isUIAvailable():
+    return (False)
+
+def phm():
+    raise OperationFailed('fake_hou has no current HDA for phm()')
+
+update_mode = [updateMode.AutoUpdate]
+
+def updateModeSetting():
+    return (update_mode[0])
+
+def setUpdateMode(mode):
+    update_mode[0] = mode
+
+current_frame = [1.0]
+
+def frame():
+    return (current_frame[0])
+
+def setFrame(value):
+    current_frame[0] = value
+
+
+class UndoBlock(object):
+    ##what hou.undos.group and hou.undos.disabler hand back
+
+    def __init__(self, kind):
+        self.kind = kind
+
+    def __enter__(self):
+        count('undos.' + self.kind)
+        return (self)
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        return False
+
+
+class undos(object):
+
+    @staticmethod
+    def group(label):
+        return (UndoBlock('group'))
+
+    @staticmethod
+    def disabler():
+        return (UndoBlock('disabler'))
+
+
+class playbar(object):
+
+    @staticmethod
+    def frameRange():
+        return ((1.0, 240.0))
+
+
+class hipFile(object):
+
+    @staticmethod
+    def save(file_name=None, save_to_recent_files=True):
+        count('hipFile.save')
+
+    @staticmethod
+    def clear(suppress_save_prompt=False):
+        clear()
+
+
+####RIGTOOLUTILS####
+##the three helpers of Houdini's rigtoolutils.rigutils the build calls
+def getRandomColor():
+    return (Color((random.random(), random.random(), random.random())))
+
+def setDisplayColor(node, color):
+    node.parm('use_dcolor').set(True)
+    node.parmTuple('dcolor').set(color.rgb())
+
+def setAllRestAngles(node, value):
+    node.parmTuple('R').set((value, value, value))
+
+
+def install():
+    """ Make `import hou` (and rigtoolutils.rigutils) give this stand in.
+
+    Raises:
+        RuntimeError when the real hou is already imported
+    """
+    module = sys.modules[__name__]
+    existing = sys.modules.get('hou')
+    if existing is not None and existing is not module:
+        raise RuntimeError('The real hou is already imported, fake_hou would hide it')
+    sys.modules['hou'] = module
+    rigtoolutils = types.ModuleType('rigtoolutils')
+    rigutils = types.ModuleType('rigtoolutils.rigutils')
+    for name in ('getRandomColor', 'setDisplayColor', 'setAllRestAngles'):
+        setattr(rigutils, name, getattr(module, name))
+    rigtoolutils.rigutils = rigutils
+    sys.modules['rigtoolutils'] = rigtoolutils
+    sys.modules['rigtoolutils.rigutils'] = rigutils
+    return (module)
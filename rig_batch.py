@@ -0,0 +1,254 @@
+"""
+#######################################
+filename    rig_batch.py
+author      Owen McCubbin
+Brief Description:
+    Rig a whole library of characters. Reads a manifest of characters and
+    runs rig_creator_cli.py for each of them in its own hython process, as
+    many at a time as there are cores (or Houdini licences, if fewer).
+    Every finished or failed character is written to a journal, so running
+    the same batch again only rigs what is left. The stage timings of every
+    character are collected and summed up at the end.
+    Runs in any python, it never imports hou itself.
+
+    python rig_batch.py characters.json --journal characters.journal --licences 8
+
+    The manifest is a json list with an entry per character:
+    {"model": "geo/hero.fbx", "name": "hero", "output": "rigs/hero.hda",
+     "template": "biped", "scale": 1.0, "from_maya": false, "proximity": false}
+    Only model is needed, relative paths are from the manifest's folder.
+#######################################
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import subprocess
+import sys
+import threading
+import time
+from multiprocessing.pool import ThreadPool
+
+CLI_SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'rig_creator_cli.py')
+HYTHON = os.environ.get('RIG_CREATOR_HYTHON', 'hython')
+##the pipeline stages in the order they run, the same as rig_creator_cli.STAGES
+STAGES = ('create_mesh', 'create_locators', 'create_bones', 'capture_mesh')
+
+
+def read_manifest(manifest_path):
+    """ Characters of a manifest with every path made absolute and every optional field filled in.
+
+    Raises:
+        ValueError for entries without a model or with a name that is already taken
+    """
+    with open(manifest_path) as manifest_file:
+        entries = json.load(manifest_file)
+    root = os.path.dirname(os.path.abspath(manifest_path))
+    jobs = []
+    names = set()
+    for number, entry in enumerate(entries):
+        if not entry.get('model'):
+            raise ValueError('Manifest entry %d has no model' % number)
+        job = {'model': os.path.join(root, entry['model']),
+               'name': entry.get('name') or os.path.splitext(os.path.basename(entry['model']))[0],
+               'template': entry.get('template'),
+               'scale': float(entry.get('scale', 1.0)),
+               'from_maya': bool(entry.get('from_maya', False)),
+               'proximity': bool(entry.get('proximity', False))}
+        job['output'] = os.path.join(root, entry.get('output') or job['name'] + '.hda')
+        if job['name'] in names:
+            raise ValueError('Manifest has two characters called %s' % job['name'])
+        names.add(job['name'])
+        jobs.append(job)
+    return (jobs)
+
+
+def read_journal(journal_path):
+    ##last record of every character in the journal, a line cut short by an interrupted batch is skipped
+    records = {}
+    if not os.path.exists(journal_path):
+        return (records)
+    with open(journal_path) as journal_file:
+        for line in journal_file:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue
+            records[record['name']] = record
+    return (records)
+
+
+class Journal(object):
+    ##append only record of the batch, one json line per finished character, safe to write from the worker threads
+
+    def __init__(self, journal_path):
+        self.journal_path = journal_path
+        self.lock = threading.Lock()
+
+    def write(self, record):
+        line = json.dumps(record, sort_keys=True) + '\n'
+        with self.lock:
+            with open(self.journal_path, 'a') as journal_file:
+                journal_file.write(line)
+                journal_file.flush()
+                os.fsync(journal_file.fileno())
+
+
+def pending_jobs(jobs, records, retry_failed=True):
+    ##the jobs that still have to run, a character is done when the journal says so and its HDA is still there
+    pending = []
+    for job in jobs:
+        record = records.get(job['name'])
+        if record is not None and record['status'] == 'done' and os.path.exists(job['output']):
+            continue
+        if record is not None and record['status'] == 'failed' and not retry_failed:
+            continue
+        pending.append(job)
+    return (pending)
+
+
+def job_command(job, report_path, hython=None):
+    ##hython command line that rigs one character
+    command = [hython or HYTHON, CLI_SCRIPT, job['model'], '--name', job['name'], '--output', job['output'],
+               '--scale', repr(job['scale']), '--report', report_path]
+    if job['template']:
+        command.extend(['--template', job['template']])
+    if job['from_maya']:
+        command.append('--from-maya')
+    if job['proximity']:
+        command.append('--proximity')
+    return (command)
+
+
+def run_job(job, log_dir, hython=None, timeout=None):
+    """ Rig one character in its own hython process.
+
+    The output of the process goes to <log_dir>/<name>.log.
+    Returns:
+        the journal record of the character
+    """
+    report_path = os.path.join(log_dir, job['name'] + '.report.json')
+    log_path = os.path.join(log_dir, job['name'] + '.log')
+    if os.path.exists(report_path):
+        os.remove(report_path)
+    start_time = time.time()
+    with open(log_path, 'w') as log_file:
+        try:
+            process = subprocess.Popen(job_command(job, report_path, hython), stdout=log_file, stderr=subprocess.STDOUT)
+        except OSError as error:
+            return ({'name': job['name'], 'status': 'failed', 'error': 'could not start hython: %s' % error,
+                     'seconds': 0.0, 'stages': {}, 'log': log_path, 'finished': time.time()})
+        ##poll instead of wait(timeout) so this also runs in python 2
+        while process.poll() is None:
+            if timeout is not None and time.time() - start_time > timeout:
+                process.kill()
+                process.wait()
+                break
+            time.sleep(.5)
+    record = {'name': job['name'], 'seconds': time.time() - start_time, 'stages': {}, 'log': log_path,
+              'finished': time.time(), 'returncode': process.returncode}
+    if process.returncode == 0 and os.path.exists(report_path):
+        with open(report_path) as report_file:
+            report = json.load(report_file)
+        record.update({'status': 'done', 'hda': report['hda'], 'stages': report['stages']})
+    else:
+        record.update({'status': 'failed', 'error': 'timed out' if timeout is not None and record['seconds'] > timeout
+                       else 'exited with %s, see the log' % process.returncode})
+    return (record)
+
+
+def worker_count(licences=None, workers=None):
+    ##one process per core, never more than there are licences
+    count = workers or multiprocessing.cpu_count()
+    if licences:
+        count = min(count, licences)
+    return (max(count, 1))
+
+
+def stage_summary(records):
+    ##stage -> (characters, total seconds, mean seconds, slowest seconds) over every finished character
+    summary = {}
+    for stage in STAGES:
+        times = [record['stages'][stage] for record in records if record['status'] == 'done' and stage in record['stages']]
+        if times:
+            summary[stage] = (len(times), sum(times), sum(times) / len(times), max(times))
+    return (summary)
+
+
+def run_batch(manifest_path, journal_path, workers=None, licences=None, hython=None, timeout=None, retry_failed=True,
+              log_dir=None):
+    """ Rig every character of the manifest that the journal doesn't have as done.
+
+    Returns:
+        the journal records of this run, in the order the characters finished
+    """
+    jobs = read_manifest(manifest_path)
+    records = read_journal(journal_path)
+    pending = pending_jobs(jobs, records, retry_failed)
+    log_dir = log_dir or os.path.splitext(os.path.abspath(journal_path))[0] + '_logs'
+    if not os.path.isdir(log_dir):
+        os.makedirs(log_dir)
+    for job in pending:
+        output_dir = os.path.dirname(job['output'])
+        if not os.path.isdir(output_dir):
+            os.makedirs(output_dir)
+    journal = Journal(journal_path)
+    count = worker_count(licences, workers)
+    print('%d of %d characters to rig on %d processes' % (len(pending), len(jobs), count))
+    finished = []
+
+    def run_and_record(job):
+        record = run_job(job, log_dir, hython, timeout)
+        journal.write(record)
+        finished.append(record)
+        print('[%d/%d] %s %s in %.1fs' % (len(finished), len(pending), job['name'], record['status'], record['seconds']))
+        return (record)
+
+    ##threads only wait on the hython processes, every character still gets a process of its own
+    pool = ThreadPool(count)
+    try:
+        pool.map(run_and_record, pending, chunksize=1)
+    finally:
+        pool.close()
+        pool.join()
+    return (finished)
+
+
+def print_summary(records):
+    done = [record for record in records if record['status'] == 'done']
+    failed = [record for record in records if record['status'] != 'done']
+    print('%d rigged, %d failed' % (len(done), len(failed)))
+    for record in failed:
+        print('    %s: %s' % (record['name'], record.get('error')))
+    summary = stage_summary(records)
+    if summary:
+        print('%-16s %6s %10s %10s %10s' % ('stage', 'rigs', 'total', 'mean', 'slowest'))
+        for stage in STAGES:
+            if stage in summary:
+                print('%-16s %6d %9.1fs %9.2fs %9.2fs' % ((stage,) + summary[stage]))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Rig every character of a manifest with the rig creator.')
+    parser.add_argument('manifest', help='json list of characters to rig')
+    parser.add_argument('-j', '--journal', default=None, help='status journal (default: <manifest>.journal)')
+    parser.add_argument('-w', '--workers', type=int, default=None, help='processes to run at once (default: cores)')
+    parser.add_argument('-l', '--licences', type=int, default=None, help='Houdini licences the batch can use')
+    parser.add_argument('--hython', default=None, help='hython executable (default: $RIG_CREATOR_HYTHON or hython)')
+    parser.add_argument('--timeout', type=float, default=None, help='seconds before a character is given up on')
+    parser.add_argument('--skip-failed', action='store_true', help="don't retry characters that failed last time")
+    parser.add_argument('--summary', action='store_true', help='only print the stage timings of the journal')
+    args = parser.parse_args(argv)
+    journal_path = args.journal or os.path.splitext(args.manifest)[0] + '.journal'
+    if args.summary:
+        print_summary(list(read_journal(journal_path).values()))
+        return (0)
+    records = run_batch(args.manifest, journal_path, args.workers, args.licences, args.hython, args.timeout,
+                        not args.skip_failed)
+    print_summary(records)
+    return (0 if all(record['status'] == 'done' for record in records) else 1)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
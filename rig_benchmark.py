@@ -0,0 +1,229 @@
+"""
+#######################################
+filename    rig_benchmark.py
+author      Owen McCubbin
+Brief Description:
+    Benchmark of a whole rig build that runs in any python, no Houdini
+    needed. hou is replaced by fake_hou, a procedural character mesh is
+    built, and every stage of the pipeline runs against it. The wall time
+    of each stage is printed along with how many calls it made into hou
+    (nodes created, parms set, transforms evaluated, ...).
+    The call counts don't depend on the machine, so they are compared with
+    rig_benchmark_baseline.json and the benchmark fails when a stage makes
+    more calls than it used to. After a change that is meant to cut calls,
+    run it with --update-baseline and commit the new baseline with it.
+
+    python rig_benchmark.py --repeat 3
+    python rig_benchmark.py --repeat 1 --rings 2084 --segments 96    (a 200k point mesh)
+#######################################
+"""
+
+import argparse
+import json
+import math
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, SCRIPT_DIR)
+
+import fake_hou
+fake_hou.install()
+
+import hou
+import rig_creator
+import rig_weight_cache
+
+BASELINE_FILE = os.path.join(SCRIPT_DIR, 'rig_benchmark_baseline.json')
+##bump when the benchmark itself changes what it builds, an old baseline is not compared against then
+BASELINE_VERSION = 1
+##the stages in the order they run, save_rig is the HDA write at the end of build_rig
+STAGES = ('create_mesh', 'create_locators', 'create_bones', 'capture_mesh', 'save_rig')
+CAPTURE_MODES = {'proximity': rig_creator.CAPTURE_PROXIMITY, 'clamped-biharmonic': rig_creator.CAPTURE_CLAMPED_BIHARMONIC}
+##what the file SOP of create_mesh is pointed at, only fake_hou ever reads it
+MESH_FILE = 'benchmark/character.bgeo'
+RIG_NAME = 'benchmark_rig'
+
+
+def character_mesh(rings=48, segments=24, height=2.0, radius=.25):
+    """ A closed tube the height of the biped template, symmetric in x like a character.
+
+    Input:
+        rings - rows of points from the bottom to the top
+        segments - points around every row, even so every point has a mirror partner
+    """
+    points = []
+    for ring in range(rings):
+        y = height * ring / (rings - 1.0)
+        for segment in range(segments):
+            angle = 2.0 * math.pi * segment / segments
+            points.append((radius * math.cos(angle), y, radius * math.sin(angle)))
+    polygons = []
+    for ring in range(rings - 1):
+        for segment in range(segments):
+            a = ring * segments + segment
+            b = ring * segments + (segment + 1) % segments
+            polygons.append((a, b, b + segments, a + segments))
+    ##caps on both ends
+    polygons.append(tuple(range(segments)))
+    polygons.append(tuple(range((rings - 1) * segments, rings * segments))[::-1])
+    return (fake_hou.mesh_geometry(points, polygons))
+
+
+def run_build(capture_mode, hda_dir):
+    """ Build the rig once in an empty scene.
+
+    Returns:
+        {stage: seconds} and {stage: {counter: calls}}
+    """
+    hou.hipFile.clear(suppress_save_prompt=True)
+    ##an empty weight cache every time, so the capture is solved and not just loaded
+    cache_dir = tempfile.mkdtemp(prefix='rig_benchmark_cache')
+    old_cache_dir = rig_weight_cache.CACHE_DIR
+    rig_weight_cache.CACHE_DIR = cache_dir
+    seconds = {}
+    counts = {}
+
+    def run_stage(stage, *args):
+        fake_hou.reset_stats()
+        start_time = time.time()
+        result = getattr(rig_creator, stage)(*args)
+        seconds[stage] = time.time() - start_time
+        counts[stage] = fake_hou.snapshot()
+        return (result)
+
+    try:
+        rig_net = run_stage('create_mesh', MESH_FILE, RIG_NAME, hda_dir)
+        run_stage('create_locators', rig_net.name())
+        run_stage('create_bones', rig_net.name())
+        run_stage('capture_mesh', rig_net.name(), capture_mode)
+        run_stage('save_rig', rig_net)
+    finally:
+        rig_weight_cache.CACHE_DIR = old_cache_dir
+        shutil.rmtree(cache_dir, ignore_errors=True)
+    return (seconds, counts)
+
+
+def read_baseline(baseline_path):
+    if not os.path.exists(baseline_path):
+        return (None)
+    with open(baseline_path) as baseline_file:
+        return (json.load(baseline_file))
+
+
+def write_baseline(baseline_path, capture, counts):
+    with open(baseline_path, 'w') as baseline_file:
+        json.dump({'version': BASELINE_VERSION, 'capture': capture, 'counts': counts}, baseline_file, indent=2,
+                  sort_keys=True)
+        baseline_file.write('\n')
+
+
+def compare_counts(baseline, counts, tolerance=0.0):
+    """ Calls that went up since the baseline.
+
+    Input:
+        tolerance - fraction a count may grow by before it counts as a regression
+    Returns:
+        list of (stage, counter, baseline calls, calls), a counter the baseline doesn't have started at 0
+    """
+    regressions = []
+    for stage in STAGES:
+        old_counts = baseline.get(stage, {})
+        for counter, calls in sorted(counts.get(stage, {}).items()):
+            old_calls = old_counts.get(counter, 0)
+            if calls > old_calls * (1.0 + tolerance):
+                regressions.append((stage, counter, old_calls, calls))
+    return (regressions)
+
+
+def print_timings(runs):
+    print('%-16s %10s %10s' % ('stage', 'mean ms', 'best ms'))
+    for stage in STAGES:
+        times = [seconds[stage] for seconds in runs]
+        print('%-16s %10.1f %10.1f' % (stage, 1000.0 * sum(times) / len(times), 1000.0 * min(times)))
+    totals = [sum(seconds.values()) for seconds in runs]
+    print('%-16s %10.1f %10.1f' % ('total', 1000.0 * sum(totals) / len(totals), 1000.0 * min(totals)))
+
+
+def print_counts(counts, baseline=None):
+    ##every counter of every stage, with the baseline next to it when there is one
+    for stage in STAGES:
+        print(stage)
+        old_counts = (baseline or {}).get(stage, {})
+        for counter, calls in sorted(counts[stage].items()):
+            if baseline is None:
+                print('    %-40s %8d' % (counter, calls))
+            else:
+                print('    %-40s %8d %8d' % (counter, calls, old_counts.get(counter, 0)))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark a rig build against an in memory hou.')
+    parser.add_argument('-r', '--repeat', type=int, default=3, help='builds to time')
+    parser.add_argument('--capture', choices=sorted(CAPTURE_MODES), default='proximity', help='capture to run')
+    parser.add_argument('--baseline', default=BASELINE_FILE, help='call count baseline to compare with')
+    parser.add_argument('--update-baseline', action='store_true', help='write the counts of this run as the baseline')
+    parser.add_argument('--tolerance', type=float, default=0.0,
+                        help='fraction a call count may grow by before it fails (default: 0, any growth fails)')
+    parser.add_argument('--counts', action='store_true', help='print every call count of every stage')
+    parser.add_argument('--profile', default=None, help='profile the last build and write a Chrome trace of it here')
+    parser.add_argument('--rings', type=int, default=48, help='rows of points of the character mesh')
+    parser.add_argument('--segments', type=int, default=24, help='points around every row of the character mesh')
+    args = parser.parse_args(argv)
+
+    fake_hou.add_file(MESH_FILE, character_mesh(args.rings, args.segments))
+    hda_dir = tempfile.mkdtemp(prefix='rig_benchmark_hda')
+    runs = []
+    all_counts = []
+    try:
+        for number in range(args.repeat):
+            profiler = None
+            if args.profile and number == args.repeat - 1:
+                import rig_profiler
+                profiler = rig_profiler.Profiler().start()
+            try:
+                seconds, counts = run_build(CAPTURE_MODES[args.capture], hda_dir)
+            finally:
+                if profiler is not None:
+                    profiler.stop()
+                    profiler.write_trace(args.profile)
+            runs.append(seconds)
+            all_counts.append(counts)
+    finally:
+        shutil.rmtree(hda_dir, ignore_errors=True)
+    counts = all_counts[0]
+    ##the profiler wraps hou as well, its build is left out of the check in case that shows in the counts
+    if any(other != counts for other in all_counts[1:len(all_counts) - (1 if args.profile else 0)]):
+        print('warning: the builds did not make the same calls, the counts are from the first one')
+
+    print_timings(runs)
+    if args.profile:
+        profiler.print_summary()
+        print('Wrote the trace to %s' % args.profile)
+    if args.update_baseline:
+        write_baseline(args.baseline, args.capture, counts)
+        print('Wrote the baseline to %s' % args.baseline)
+        return (0)
+    baseline = read_baseline(args.baseline)
+    if baseline is not None and (baseline.get('version') != BASELINE_VERSION or baseline.get('capture') != args.capture):
+        print('The baseline is for another version or capture, run with --update-baseline to replace it')
+        baseline = None
+    if args.counts or baseline is None:
+        print_counts(counts, baseline['counts'] if baseline else None)
+    if baseline is None:
+        print('No baseline to compare the call counts with')
+        return (0)
+    regressions = compare_counts(baseline['counts'], counts, args.tolerance)
+    for stage, counter, old_calls, calls in regressions:
+        print('REGRESSION %s %s: %d calls, the baseline has %d' % (stage, counter, calls, old_calls))
+    if regressions:
+        return (1)
+    print('Call counts are within the baseline')
+    return (0)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,592 @@
+"""
+#######################################
+filename    rig_capture.py
+author      Owen McCubbin
+Brief Description:
+    Houdini free skin weight solving for the rig creator. The mesh comes in as
+    numpy arrays (points and triangles) and the bones as line segments, the
+    weights go back out as the k strongest influences of every point.
+    The sparse solve needs scipy, it is only imported once a capture is run so
+    the rest of the tool still loads in a Houdini without it.
+#######################################
+"""
+
+import re
+
+import numpy as np
+
+##anything smaller than this is treated as zero (degenerate triangles, empty weight rows)
+EPSILON = 1e-12
+##how many points every bone is sampled with when finding its handle points
+HANDLE_SAMPLES = 12
+##how many mesh points around every sample can be fixed to the bone, and how much further than the closest they can be
+HANDLE_NEIGHBOURS = 8
+HANDLE_SPREAD = 1.25
+##how many bones can influence a single point
+MAX_INFLUENCES = 4
+##how many of the closest bone samples every point looks at in a proximity capture
+PROXIMITY_NEIGHBOURS = 16
+##rest data that moved less than this is treated as unchanged when re-capturing
+REST_TOLERANCE = 1e-4
+##rings of neighbouring points added around the part of the mesh a re-capture solves again
+REGION_MARGIN_RINGS = 3
+##past this share of the mesh a full solve is the better call
+REGION_LIMIT = 0.5
+##mirror partners can be this far apart, as a share of the mesh's bounding box size
+SYMMETRY_TOLERANCE = 1e-4
+##a mesh with more points than this share without a mirror partner is solved whole
+SYMMETRY_LIMIT = 0.01
+##side prefixes, only at the start of a name or after something that isn't a letter or number
+SIDE_PREFIX = re.compile(r'(?<![A-Za-z0-9])([LR])_')
+RIGHT_PREFIX = re.compile(r'(?<![A-Za-z0-9])R_')
+
+
+def import_scipy():
+    ##scipy does not ship with every Houdini, so only ask for it when a capture needs it
+    try:
+        from scipy import sparse
+        from scipy.sparse import linalg
+        from scipy import spatial
+    except ImportError:
+        raise ImportError('Biharmonic capture needs scipy, install it into the Houdini python to use it')
+    return (sparse, linalg, spatial)
+
+
+def triangulate(polygons):
+    """ Fan triangulate a list of polygons (lists of point numbers) into an (m, 3) int array. """
+    sides = np.array([len(polygon) for polygon in polygons], dtype=np.int64)
+    vertex_points = np.array([point for polygon in polygons for point in polygon], dtype=np.int64)
+    return (fan_triangles(vertex_points, np.cumsum(sides) - sides, sides))
+
+
+def fan_triangles(vertex_points, first_vertices, sides):
+    """ Fan triangulate polygons given as flat vertex arrays, the way Houdini stores them.
+
+    Input:
+        vertex_points - point number of every vertex
+        first_vertices - vertex number of the first vertex of every polygon
+        sides - vertex count of every polygon, polygons with fewer than 3 are skipped
+    Returns:
+        (m, 3) int array of point numbers, the triangles of a polygon stay together and in order
+    """
+    vertex_points = np.asarray(vertex_points, dtype=np.int64)
+    sides = np.asarray(sides, dtype=np.int64)
+    ##every polygon makes sides - 2 triangles, each one is the first vertex and the edge it fans over
+    counts = np.maximum(sides - 2, 0)
+    polygon = np.repeat(np.arange(len(sides)), counts)
+    first = np.asarray(first_vertices, dtype=np.int64)[polygon]
+    edge = np.arange(len(polygon)) - np.repeat(np.cumsum(counts) - counts, counts) + 1
+    return (vertex_points[np.stack((first, first + edge, first + edge + 1), axis=1)].reshape(-1, 3))
+
+
+def sample_segments(segments, samples=HANDLE_SAMPLES):
+    """ Evenly sample bone segments.
+
+    Input:
+        segments - (b, 2, 3) start and end of every bone
+    Returns:
+        (b * samples, 3) sample positions and the (b * samples,) bone each one belongs to
+    """
+    segments = np.asarray(segments, dtype=np.float64)
+    steps = np.linspace(0.0, 1.0, samples)[np.newaxis, :, np.newaxis]
+    positions = segments[:, 0:1] + steps * (segments[:, 1:2] - segments[:, 0:1])
+    owners = np.repeat(np.arange(len(segments)), samples)
+    return (positions.reshape(-1, 3), owners)
+
+
+def segments_from_rest(rest):
+    """ Start and end of every bone from its rest data.
+
+    Input:
+        rest - (b, 17) flattened world rest transform (row vectors) and length of every bone
+    Returns:
+        (b, 2, 3) segments, bones point down their -Z axis
+    """
+    rest = np.asarray(rest, dtype=np.float64)
+    matrices = rest[:, :16].reshape(-1, 4, 4)
+    starts = matrices[:, 3, :3]
+    ends = starts - rest[:, 16:17] * matrices[:, 2, :3]
+    return (np.stack((starts, ends), axis=1))
+
+
+def cotangent_laplacian(points, triangles):
+    """ Cotangent Laplacian and lumped mass of a triangle mesh.
+
+    Returns:
+        laplacian - (n, n) sparse matrix, negative semi definite
+        mass - (n,) area of every point (a third of every triangle around it)
+    """
+    sparse = import_scipy()[0]
+    points = np.asarray(points, dtype=np.float64)
+    num_points = len(points)
+    corners = [points[triangles[:, i]] for i in range(3)]
+    ##cotangent of the angle at every corner, it weights the edge opposite that corner
+    cotangents = []
+    for i in range(3):
+        edge_a = corners[(i + 1) % 3] - corners[i]
+        edge_b = corners[(i + 2) % 3] - corners[i]
+        sine = np.linalg.norm(np.cross(edge_a, edge_b), axis=1)
+        cotangents.append(np.einsum('ij,ij->i', edge_a, edge_b) / np.maximum(sine, EPSILON))
+    ##every corner adds half its cotangent to both directions of the opposite edge
+    rows = []
+    cols = []
+    values = []
+    for i in range(3):
+        start = triangles[:, (i + 1) % 3]
+        end = triangles[:, (i + 2) % 3]
+        rows.extend((start, end))
+        cols.extend((end, start))
+        values.extend((0.5 * cotangents[i], 0.5 * cotangents[i]))
+    weights = sparse.coo_matrix((np.concatenate(values), (np.concatenate(rows), np.concatenate(cols))),
+                                shape=(num_points, num_points)).tocsr()
+    laplacian = weights - sparse.diags(np.asarray(weights.sum(axis=1)).ravel())
+    ##lumped mass, points that are not on any triangle get the average so the solve stays well posed
+    areas = 0.5 * np.linalg.norm(np.cross(corners[1] - corners[0], corners[2] - corners[0]), axis=1)
+    mass = np.bincount(triangles.ravel(), weights=np.repeat(areas / 3.0, 3), minlength=num_points)
+    mass[mass < EPSILON] = mass.mean() if mass.any() else 1.0
+    return (laplacian.tocsr(), mass)
+
+
+def find_handles(points, segments, samples=HANDLE_SAMPLES, neighbours=HANDLE_NEIGHBOURS, spread=HANDLE_SPREAD):
+    """ Points that are fixed to a single bone during the solve.
+
+    Every bone is sampled along its length and the mesh points closest to each
+    sample (up to neighbours of them, no further than spread times the closest
+    one) are fixed to that bone. When two bones want the same point the closer one keeps it.
+    Returns:
+        (h,) point numbers and the (h,) bone each one is fixed to
+    """
+    spatial = import_scipy()[2]
+    bone_samples, owners = sample_segments(segments, samples)
+    neighbours = min(neighbours, len(points))
+    distances, nearest = spatial.cKDTree(points).query(bone_samples, k=neighbours)
+    distances = distances.reshape(len(bone_samples), neighbours)
+    nearest = nearest.reshape(len(bone_samples), neighbours)
+    ##only keep the points that are about as close as the closest one
+    keep = distances <= distances[:, 0:1] * spread + EPSILON
+    distances = distances[keep]
+    nearest = nearest[keep]
+    owners = np.repeat(owners[:, np.newaxis], neighbours, axis=1)[keep]
+    ##sort by distance so the closest bone is the one left after removing duplicates
+    order = np.argsort(distances, kind='mergesort')
+    handle_points, first = np.unique(nearest[order], return_index=True)
+    return (handle_points, owners[order][first])
+
+
+def check_bones(num_bones):
+    ##with no bones there is nothing to capture to, say so before the solve fails on an empty array
+    if not num_bones:
+        raise ValueError('Capture needs at least one bone, the rig has none to capture the mesh to')
+
+
+def limit_influences(weights, max_influences=MAX_INFLUENCES):
+    """ Keep the strongest influences of every point and normalize them.
+
+    Input:
+        weights - (n, b) weight of every bone on every point, b >= 1
+    Returns:
+        (n, k) bone indices and (n, k) normalized weights, k = min(max_influences, b)
+    """
+    weights = np.clip(np.asarray(weights, dtype=np.float64), 0.0, 1.0)
+    check_bones(weights.shape[1])
+    count = min(max_influences, weights.shape[1])
+    rows = np.arange(len(weights))[:, np.newaxis]
+    ##partition for the strongest few, then only sort those
+    indices = np.argpartition(-weights, count - 1, axis=1)[:, :count]
+    indices = indices[rows, np.argsort(-weights[rows, indices], axis=1)]
+    kept = weights[rows, indices]
+    totals = kept.sum(axis=1)
+    ##rows that lost all their weight go fully to their strongest bone
+    empty = totals < EPSILON
+    kept[empty] = 0.0
+    kept[empty, 0] = 1.0
+    totals[empty] = 1.0
+    return (indices, kept / totals[:, np.newaxis])
+
+
+def nearest_bone_weights(points, segments, samples=HANDLE_SAMPLES):
+    ##one hot weights of the closest bone, used for points the solve can't reach
+    spatial = import_scipy()[2]
+    bone_samples, owners = sample_segments(segments, samples)
+    nearest = spatial.cKDTree(bone_samples).query(points)[1]
+    weights = np.zeros((len(points), len(segments)))
+    weights[np.arange(len(points)), owners[nearest]] = 1.0
+    return (weights)
+
+
+def bilaplacian_matrix(points, triangles):
+    ##the bi-Laplacian L M^-1 L of the mesh
+    sparse = import_scipy()[0]
+    laplacian, mass = cotangent_laplacian(points, triangles)
+    bilaplacian = (laplacian.T.dot(sparse.diags(1.0 / mass)).dot(laplacian)).tocsr()
+    ##a touch of mass keeps pieces of the mesh that have no bone on them solvable
+    return (bilaplacian + sparse.diags(mass * 1e-8))
+
+
+def solve_free_points(bilaplacian, weights, free_points):
+    """ Solve the weights of the free points with every other point held where it is.
+
+    Input:
+        bilaplacian - (n, n) sparse bi-Laplacian of the mesh
+        weights - (n, b) weights, the rows of the fixed points are the boundary values
+        free_points - point numbers to solve, their rows are overwritten
+    """
+    linalg = import_scipy()[1]
+    if not len(free_points):
+        return (weights)
+    fixed = np.ones(len(weights), dtype=bool)
+    fixed[free_points] = False
+    fixed_points = np.nonzero(fixed)[0]
+    rows = bilaplacian[free_points]
+    free_block = rows[:, free_points].tocsc()
+    fixed_block = rows[:, fixed_points]
+    ##one factorization, every bone is just another column
+    factor = linalg.splu(free_block, permc_spec='COLAMD')
+    weights[free_points] = factor.solve(-fixed_block.dot(weights[fixed_points]))
+    return (weights)
+
+
+def handle_weights(points, segments, weights):
+    ##fix the handle points of every bone to one hot weights, returns the handle point numbers
+    handle_points, handle_bones = find_handles(points, segments)
+    weights[handle_points] = 0.0
+    weights[handle_points, handle_bones] = 1.0
+    return (handle_points)
+
+
+def reach_closest_bone(points, segments, weights, rows=None):
+    ##anything the solve left without weight (pieces with no bone on them) goes to the closest bone
+    rows = np.arange(len(weights)) if rows is None else rows
+    unreached = rows[np.clip(weights[rows], 0.0, 1.0).sum(axis=1) < 1e-6]
+    if len(unreached):
+        weights[unreached] = nearest_bone_weights(points[unreached], segments)
+    return (weights)
+
+
+def biharmonic_weights(points, triangles, segments, max_influences=MAX_INFLUENCES):
+    """ Biharmonic (clamped) skin weights for a mesh and a set of bones.
+
+    The bi-Laplacian (L M^-1 L) is factored once for the free points and every
+    bone is solved as another column of the same right hand side. The solve is
+    unconstrained, the weights are only clamped to 0-1 and normalized afterwards,
+    so they are not bounded biharmonic weights. Where the solve overshoots or goes
+    negative the clamp flattens it, a bounded solve would spread that weight elsewhere.
+    Input:
+        points - (n, 3) rest positions of the mesh
+        triangles - (m, 3) point numbers of every triangle
+        segments - (b, 2, 3) rest start and end of every bone
+    Returns:
+        (n, k) bone indices and (n, k) weights, see limit_influences
+    """
+    check_bones(len(segments))
+    points = np.asarray(points, dtype=np.float64)
+    weights = np.zeros((len(points), len(segments)))
+    ##fixed points are one hot on their bone, the rest get solved
+    free = np.ones(len(points), dtype=bool)
+    free[handle_weights(points, segments, weights)] = False
+    solve_free_points(bilaplacian_matrix(points, triangles), weights, np.nonzero(free)[0])
+    reach_closest_bone(points, segments, weights)
+    return (limit_influences(weights, max_influences))
+
+
+def proximity_weights(points, segments, radii, max_influences=MAX_INFLUENCES,
+                      samples=HANDLE_SAMPLES, neighbours=PROXIMITY_NEIGHBOURS):
+    """ Quick skin weights from the distance of every point to the bones.
+
+    Every bone is sampled into one KD-tree and all points look up their closest
+    samples in a single query. The bones those samples belong to are the candidate
+    influences, weighted by a smooth falloff of the distance to the sample over the
+    bone's capsule radius. Points outside every capsule go fully to their closest bone.
+    Input:
+        points - (n, 3) rest positions of the mesh
+        segments - (b, 2, 3) rest start and end of every bone
+        radii - (b,) capsule radius of every bone
+    Returns:
+        (n, k) bone indices and (n, k) weights, see limit_influences
+    """
+    check_bones(len(segments))
+    spatial = import_scipy()[2]
+    points = np.asarray(points, dtype=np.float64)
+    segments = np.asarray(segments, dtype=np.float64)
+    radii = np.maximum(np.asarray(radii, dtype=np.float64), EPSILON)
+    bone_samples, owners = sample_segments(segments, samples)
+    neighbours = min(neighbours, len(bone_samples))
+    distances, nearest = spatial.cKDTree(bone_samples).query(points, k=neighbours)
+    distances = distances.reshape(len(points), neighbours)
+    candidates = owners[nearest.reshape(len(points), neighbours)]
+
+    ##falloff of the distance to every candidate sample, (1 - (d / r)^2)^2 inside the capsule
+    falloff = np.clip(1.0 - (distances / radii[candidates]) ** 2, 0.0, 1.0) ** 2
+    ##a bone can show up more than once in the candidates, keep its strongest falloff
+    weights = np.zeros((len(points), len(segments)))
+    rows = np.repeat(np.arange(len(points)), neighbours)
+    np.maximum.at(weights, (rows, candidates.ravel()), falloff.ravel())
+
+    ##points outside every capsule go to the bone of their closest sample
+    outside = weights.sum(axis=1) < EPSILON
+    weights[outside, candidates[outside, 0]] = 1.0
+    return (limit_influences(weights, max_influences))
+
+
+def changed_bones(old_names, old_rest, new_names, new_rest, tolerance=REST_TOLERANCE):
+    """ Bones whose rest transform or length changed between two skeletons.
+
+    Returns:
+        new bone numbers that changed or are new, and old bone numbers that are gone
+    """
+    old_lookup = dict((name, number) for number, name in enumerate(old_names))
+    changed = []
+    for number, name in enumerate(new_names):
+        old_number = old_lookup.get(name)
+        if old_number is None or np.abs(np.asarray(new_rest[number]) - old_rest[old_number]).max() > tolerance:
+            changed.append(number)
+    kept_names = set(new_names)
+    removed = [number for number, name in enumerate(old_names) if name not in kept_names]
+    return (np.array(changed, dtype=np.int64), np.array(removed, dtype=np.int64))
+
+
+def remap_bones(indices, old_names, new_names):
+    ##bone indices from an old skeleton to the bone numbers of a new one by name, -1 for bones that are gone
+    lookup = dict((name, number) for number, name in enumerate(new_names))
+    remap = np.array([lookup.get(name, -1) for name in old_names], dtype=np.int64)
+    return (remap[np.asarray(indices)])
+
+
+def dense_weights(indices, weights, num_bones):
+    ##(n, k) influences back to (n, b) weights, negative indices are dropped
+    indices = np.asarray(indices)
+    dense = np.zeros((len(indices), num_bones))
+    rows = np.repeat(np.arange(len(indices)), indices.shape[1])
+    columns = indices.ravel()
+    values = np.asarray(weights, dtype=np.float64).ravel()
+    keep = columns >= 0
+    np.add.at(dense, (rows[keep], columns[keep]), values[keep])
+    return (dense)
+
+
+def grow_region(region, triangles, rings=REGION_MARGIN_RINGS):
+    ##add rings of neighbouring points around a (n,) bool region
+    sparse = import_scipy()[0]
+    num_points = len(region)
+    edges = sparse.coo_matrix((np.ones(triangles.size), (triangles.ravel(), np.roll(triangles, 1, axis=1).ravel())),
+                              shape=(num_points, num_points)).tocsr()
+    adjacency = edges + edges.T
+    for ring in range(rings):
+        region = region | (adjacency.dot(region.astype(np.float64)) > 0)
+    return (region)
+
+
+def update_weights(points, triangles, segments, old_indices, old_weights, old_names, old_rest, new_names, new_rest,
+                   radii=None, max_influences=MAX_INFLUENCES, rings=REGION_MARGIN_RINGS, region_limit=REGION_LIMIT):
+    """ Re-capture only the part of the mesh the changed bones touch.
+
+    The new skeleton is compared with the one the old weights were solved for.
+    The points the changed or removed bones had weight on, and the points around
+    where the changed bones are now, plus a margin of rings, are solved again with
+    every point outside held at its old weights. Everything else is kept as it was.
+    Input:
+        old_indices, old_weights - (n, k) capture of the old skeleton
+        old_names, old_rest - bone names and rest data of the old skeleton
+        new_names, new_rest - bone names and rest data of the new skeleton, segments are its bones
+        radii - capsule radii of the new bones for a proximity capture, None for biharmonic
+    Returns:
+        (n, k) bone indices and weights, or None when so much changed that a full solve is the better call
+    """
+    points = np.asarray(points, dtype=np.float64)
+    num_bones = len(new_names)
+    old_weights = np.asarray(old_weights, dtype=np.float64)
+    if old_weights.shape[1] != min(max_influences, num_bones):
+        return (None)
+    changed, removed = changed_bones(old_names, old_rest, new_names, new_rest)
+    remapped = remap_bones(old_indices, old_names, new_names)
+    indices = np.where(remapped < 0, 0, remapped)
+    weights = np.where(remapped < 0, 0.0, old_weights)
+    if len(changed) or len(removed):
+        ##points the changed and removed bones had weight on
+        touched = np.isin(np.asarray(old_indices), removed) | np.isin(remapped, changed)
+        region = (touched & (old_weights > 1e-6)).any(axis=1)
+        ##and points around where the changed bones are now
+        if len(changed):
+            region[find_handles(points, segments[changed])[0]] = True
+        region = grow_region(region, triangles, rings)
+        if region.mean() > region_limit:
+            return (None)
+        region_points = np.nonzero(region)[0]
+        if radii is not None:
+            ##proximity weights only depend on the point itself
+            region_indices, region_weights = proximity_weights(points[region_points], segments, radii, max_influences)
+        else:
+            ##the old weights around the region are the boundary of the solve
+            dense = dense_weights(remapped, old_weights, num_bones)
+            dense[region_points] = 0.0
+            free = region.copy()
+            free[handle_weights(points, segments, dense)] = False
+            solve_free_points(bilaplacian_matrix(points, triangles), dense, np.nonzero(free)[0])
+            reach_closest_bone(points, segments, dense, region_points)
+            region_indices, region_weights = limit_influences(dense[region_points], max_influences)
+        indices[region_points] = region_indices
+        weights[region_points] = region_weights
+    ##rows outside the region that still pointed at a removed bone get normalized again
+    totals = weights.sum(axis=1)
+    weights[totals > 0] /= totals[totals > 0, np.newaxis]
+    return (indices, weights)
+
+
+def mirror_name(name):
+    ##swap the L_ and R_ side prefixes of a name
+    return (SIDE_PREFIX.sub(lambda match: ('R_' if match.group(1) == 'L' else 'L_'), name))
+
+
+def mirror_points(points, tolerance=SYMMETRY_TOLERANCE):
+    """ Mirror partner of every point across X.
+
+    Returns:
+        (n,) point number of every point's partner (-1 when it has none) and the share of points without one
+    """
+    spatial = import_scipy()[2]
+    points = np.asarray(points, dtype=np.float64)
+    size = np.linalg.norm(points.max(axis=0) - points.min(axis=0))
+    mirrored = points * np.array([-1.0, 1.0, 1.0])
+    distances, partners = spatial.cKDTree(points).query(mirrored, distance_upper_bound=max(size * tolerance, EPSILON))
+    ##queries that found nothing come back with an infinite distance
+    partners = np.where(np.isfinite(distances), partners, -1)
+    return (partners, np.mean(partners < 0))
+
+
+def mirror_bones(names):
+    ##bone number of every bone's mirror (itself for centre bones), None when a side bone has no partner
+    lookup = dict((name, number) for number, name in enumerate(names))
+    partners = []
+    for name in names:
+        partner = lookup.get(mirror_name(name))
+        if partner is None:
+            return (None)
+        partners.append(partner)
+    return (np.array(partners, dtype=np.int64))
+
+
+def mirror_expansion(kept_points, partners, other_points, sign, num_points):
+    ##(n, m) matrix spreading values on the kept points over the mesh, the other side gets sign times its partner's value
+    sparse = import_scipy()[0]
+    columns = -np.ones(num_points, dtype=np.int64)
+    columns[kept_points] = np.arange(len(kept_points))
+    other_points = other_points[columns[partners[other_points]] >= 0]
+    rows = np.concatenate((kept_points, other_points))
+    cols = np.concatenate((np.arange(len(kept_points)), columns[partners[other_points]]))
+    values = np.concatenate((np.ones(len(kept_points)), np.full(len(other_points), float(sign))))
+    return (sparse.coo_matrix((values, (rows, cols)), shape=(num_points, len(kept_points))).tocsr())
+
+
+def symmetric_biharmonic(points, triangles, segments, partners, bone_partners, half, centre):
+    """ Biharmonic weights of a symmetric mesh with only one half of the points as unknowns.
+
+    Every L_/R_ bone pair is solved as the sum of its two weights, which is the same on
+    both sides, and their difference, which flips sign across the centre line. Centre
+    bones only need the sum. The energy is still measured on the whole mesh and the
+    handles are the ones a full solve finds on the solved half, mirrored, so when the
+    full solve's handles are symmetric too this is the same answer as a full solve.
+    Input:
+        half - (n,) bool, the +X half including the centre line
+        centre - (n,) bool, the centre line
+    Returns:
+        (n, b) weights
+    """
+    num_points = len(points)
+    num_bones = len(segments)
+    bilaplacian = bilaplacian_matrix(points, triangles)
+    other = np.nonzero(~half)[0]
+    ##one column per L_ bone (its pair) and per centre bone, the R_ bones come out of the pairs
+    solved_bones = np.array([number for number in range(num_bones) if bone_partners[number] >= number], dtype=np.int64)
+    left_bones = solved_bones[bone_partners[solved_bones] != solved_bones]
+    ##handles are looked for on the whole mesh like a full solve does, then only the ones on the half are kept
+    handle_points, handle_bones = find_handles(points, segments[solved_bones])
+    on_half = half[handle_points]
+    handle_points = handle_points[on_half]
+    handle_bones = solved_bones[handle_bones[on_half]]
+
+    results = []
+    for sign, kept, bones in ((1.0, half, solved_bones), (-1.0, half & ~centre, left_bones)):
+        ##the sum lives on the whole half, the difference is zero on the centre line so it drops out
+        kept_points = np.nonzero(kept)[0]
+        expansion = mirror_expansion(kept_points, partners, other, sign, num_points)
+        reduced = (expansion.T.dot(bilaplacian).dot(expansion)).tocsr()
+        position = -np.ones(num_points, dtype=np.int64)
+        position[kept_points] = np.arange(len(kept_points))
+        column = -np.ones(num_bones, dtype=np.int64)
+        column[bones] = np.arange(len(bones))
+        ##handles are one on their own pair (or centre bone) in both solves
+        weights = np.zeros((len(kept_points), len(bones)))
+        fixed = position[handle_points] >= 0
+        weights[position[handle_points[fixed]]] = 0.0
+        owned = fixed & (column[handle_bones] >= 0)
+        weights[position[handle_points[owned]], column[handle_bones[owned]]] = 1.0
+        free = np.ones(len(kept_points), dtype=bool)
+        free[position[handle_points[fixed]]] = False
+        solve_free_points(reduced, weights, np.nonzero(free)[0])
+        results.append(expansion.dot(weights))
+
+    sums, differences = results
+    weights = np.zeros((num_points, num_bones))
+    weights[:, solved_bones] = sums
+    pair_sums = sums[:, np.searchsorted(solved_bones, left_bones)]
+    weights[:, left_bones] = 0.5 * (pair_sums + differences)
+    weights[:, bone_partners[left_bones]] = 0.5 * (pair_sums - differences)
+    return (weights)
+
+
+def symmetric_weights(points, triangles, segments, names, radii=None, max_influences=MAX_INFLUENCES,
+                      tolerance=SYMMETRY_TOLERANCE, limit=SYMMETRY_LIMIT):
+    """ Capture a mesh that is symmetric across X by solving only one half of it.
+
+    Every point is matched with its mirror partner first. When too many points have
+    none, or a side bone has no partner on the other side, nothing is solved.
+    Returns:
+        (n, k) bone indices and weights (or None when the mesh or the bones aren't
+        symmetric) and the share of points without a partner
+    """
+    points = np.asarray(points, dtype=np.float64)
+    segments = np.asarray(segments, dtype=np.float64)
+    partners, unmatched = mirror_points(points, tolerance)
+    bone_partners = mirror_bones(names)
+    if unmatched > limit or bone_partners is None or np.all(bone_partners == np.arange(len(names))):
+        return (None, unmatched)
+    ##the half to solve, the centre line belongs to it
+    size = np.linalg.norm(points.max(axis=0) - points.min(axis=0))
+    centre = np.abs(points[:, 0]) <= max(size * tolerance, EPSILON)
+    half = (points[:, 0] > 0.0) | centre
+    ##partners have to be on the solved half for the mirror to work
+    partners = np.where(half[np.maximum(partners, 0)] & (partners >= 0), partners, -1)
+
+    if radii is not None:
+        ##proximity weights only depend on the point, so the other half is a straight mirror
+        half_points = np.nonzero(half)[0]
+        half_indices, half_weights = proximity_weights(points[half_points], segments, radii, max_influences)
+        weights = np.zeros((len(points), len(names)))
+        weights[half_points] = dense_weights(half_indices, half_weights, len(names))
+        other = np.nonzero(~half & (partners >= 0))[0]
+        weights[other[:, np.newaxis], bone_partners] = weights[partners[other]]
+        ##points on the centre line are their own partner, the closest bone fallback can't pick a side for them
+        weights[centre] = 0.5 * (weights[centre] + weights[centre][:, bone_partners])
+    else:
+        weights = symmetric_biharmonic(points, triangles, segments, partners, bone_partners, half, centre)
+    ##the few points without a partner go to their closest bone
+    reach_closest_bone(points, segments, weights, np.nonzero(~half & (partners < 0))[0])
+    return (limit_influences(weights, max_influences), unmatched)
+
+
+def capture_weights(points, triangles, segments, names, radii=None, max_influences=MAX_INFLUENCES):
+    """ Full capture of a mesh, solving only one half when the mesh and bones are symmetric.
+
+    radii selects the proximity capture, None the biharmonic (clamped) one.
+    Returns:
+        (n, k) bone indices, (n, k) weights and the share of points without a mirror partner
+    """
+    check_bones(len(names))
+    result, unmatched = symmetric_weights(points, triangles, segments, names, radii, max_influences)
+    if result is not None:
+        return (result[0], result[1], unmatched)
+    if radii is not None:
+        indices, weights = proximity_weights(points, segments, radii, max_influences)
+    else:
+        indices, weights = biharmonic_weights(points, triangles, segments, max_influences)
+    return (indices, weights, unmatched)
@@ -7,13 +7,13 @@ personal email   mccubbinowen@gmail.com
 course      PRJ450
 Brief Description:
     Use this tool to create a basic rig for characters in housini,
-    capture the skin weights of the character using Biharmonic
+    capture the skin weights of the character using biharmonic (clamped) weights (needs scipy in Houdini's python)
     and if desired create deforms that will allow for the creation of different shaped characters based off of the original.
 #######################################
 """
 
 ## PLEASE PASTE YOUR SCRIPT FOLDER BELOW
-script_folder = 'C:\Users\mccub\OneDrive\Documents\houdini18.0\Full_Rig'
+script_folder = r'C:\Users\mccub\OneDrive\Documents\houdini18.0\Full_Rig'
 """
 import sys
 if script_folder not in sys.path:
@@ -27,21 +27,422 @@ rig_creator.run()
 
 ##import needed packages
 import hou
-import math
+import functools
+import importlib
+import re
 import os
-from past.utils import old_div
+import time
 
-from PySide2 import QtCore
-from PySide2 import QtWidgets
-from PySide2 import QtUiTools
+import numpy as np
+import rig_math
+import rig_capture
+import rig_weight_cache
+import rig_templates
 
-from rigtoolutils import rigutils
-from rigtoolutils import iktwistnaming as naming
-from rigtoolutils import iktwistcontrols as controls
-from rigtoolutils import fkikinterfacecontrol as fkikinterface
-from rigtoolutils import iktwistnetworkeditor as networkedit
 
+class LazyModule(object):
+    ##stands in for a module until one of its functions is used, so importing the tool doesn't pay for it
+    
+    def __init__(self, module_name):
+        self.module_name = module_name
+        self.module = None
+    
+    def __getattr__(self, name):
+        ##only called for what the stand in doesn't have itself, which is everything of the module
+        if self.module is None:
+            self.module = importlib.import_module(self.module_name)
+        return (getattr(self.module, name))
+
+##the Houdini shelf tool helpers, only the bone and IK stages need them
+rigutils = LazyModule('rigtoolutils.rigutils')
+controls = LazyModule('rigtoolutils.iktwistcontrols')
+fkikinterface = LazyModule('rigtoolutils.fkikinterfacecontrol')
+networkedit = LazyModule('rigtoolutils.iktwistnetworkeditor')
+
+
+
+####NETWORK LAYOUT####
+##laying out a network after every node is quadratic on a full biped, so by default the helpers only record
+##what they touched and every network gets one layout pass when the build stage finishes
+##LAYOUT_IMMEDIATE = old behaviour, layout as each node is made
+##LAYOUT_DEFERRED = one layout per network at the end of the stage
+##LAYOUT_SKIP = never layout, for headless builds where nobody looks at the network editor
+LAYOUT_IMMEDIATE = 0
+LAYOUT_DEFERRED = 1
+LAYOUT_SKIP = 2
+
+##headless builds can turn layout off without touching the code
+if os.environ.get('RIG_CREATOR_SKIP_LAYOUT'):
+    layout_mode = LAYOUT_SKIP
+else:
+    layout_mode = LAYOUT_DEFERRED
+
+##networks waiting for their layout pass, keyed by path so each one is only laid out once
+pending_layouts = {}
+
+def set_layout_mode(mode):
+    global layout_mode
+    ##anything recorded under the old mode is laid out now so it doesn't leak into the next stage
+    flush_layouts()
+    layout_mode = mode
+
+def request_network_layout(network):
+    ##layout a whole network, or remember it for the end of the stage
+    if layout_mode == LAYOUT_IMMEDIATE:
+        network.layoutChildren()
+    elif layout_mode == LAYOUT_DEFERRED:
+        pending_layouts[network.path()] = network
+
+def request_layout(node):
+    ##place a single node, or remember its network for the end of the stage
+    if layout_mode == LAYOUT_IMMEDIATE:
+        node.moveToGoodPosition()
+    elif layout_mode == LAYOUT_DEFERRED:
+        network = node.parent()
+        pending_layouts[network.path()] = network
+
+def flush_layouts():
+    ##one layout pass for every network touched since the last flush
+    networks = list(pending_layouts.values())
+    pending_layouts.clear()
+    for network in networks:
+        try:
+            network.layoutChildren()
+        except hou.ObjectWasDeleted:
+            ##temporary networks (like the curve resample nodes) can be gone by now
+            pass
+
+def create_node(network, node_type, name=None):
+    ##all the helpers create their nodes through here so the deferred layout knows which networks changed
+    if name is None:
+        node = network.createNode(node_type)
+    else:
+        node = network.createNode(node_type, name)
+    if layout_mode == LAYOUT_DEFERRED:
+        pending_layouts[network.path()] = network
+    ##keep the network's index up to date if it has one
+    index = rig_indices.get(network.path())
+    if index is not None:
+        index.add(node)
+    return node
+
+def destroy_node(node):
+    ##destroy a node, take it out of its network's index and drop the parm writes queued for it
+    index = rig_indices.get(node.parent().path())
+    if index is not None:
+        index.remove(node)
+    if active_transaction is not None:
+        active_transaction.forget(node)
+    node.destroy()
+
+def rename_node(node, name, unique_name=False):
+    ##rename a node and file it under its new name in its network's index, the cached world of the old path goes
+    index = rig_indices.get(node.parent().path())
+    if index is not None:
+        index.remove(node)
+    forget_world(node)
+    node.setName(name, unique_name=unique_name)
+    if index is not None:
+        index.add(node)
+    return (node)
+
+####RIG INDEX####
+##the build looks nodes up by name and by what they are over and over, so every network it works in gets
+##an index that is filled with one scan and then kept up to date by create_node, destroy_node and rename_node
+##what a node is for, read from the end of its name, the first match wins
+NODE_ROLES = (('twist', re.compile(r'_twist_loc$')),
+              ('goal', re.compile(r'_goal_loc$')),
+              ('locator', re.compile(r'_locator$')),
+              ('ctrl', re.compile(r'_ctrl$')),
+              ('offset', re.compile(r'_offset$')),
+              ('auto', re.compile(r'_auto$')),
+              ('root', re.compile(r'_root$')),
+              ('roll', re.compile(r'_roll$')),
+              ('cv', re.compile(r'_cv\d*$')),
+              ('path', re.compile(r'_path$')),
+              ('bone', re.compile(r'bone\d*$')))
+##the limb is the first word of the name once the side and the split/KIN prefixes are taken off
+LIMB_NAME = re.compile(r'^(?:split_|KIN_)?(?:[LR]_)?([A-Za-z]+)')
+
+##network path -> RigIndex
+rig_indices = {}
+
+class RigIndex(object):
+    """ Lookup of the nodes of one network by name, role, side, limb and node type.
+
+    Every lookup is a dictionary lookup, a query on several fields intersects
+    the matching sets. Nodes come back in the order they were added, which is
+    the order children() would give.
+    """
+
+    def __init__(self, network):
+        self.network = network
+        ##name -> node
+        self.nodes = {}
+        ##node session id -> the name it was filed under
+        self.names = {}
+        ##name -> order the node was added in
+        self.order = {}
+        ##(field, value) -> set of names
+        self.groups = {}
+        self.count = 0
+        for child in network.children():
+            self.add(child)
+
+    def fields(self, node):
+        ##the (field, value) pairs a node is filed under
+        name = node.name()
+        role = None
+        for role_name, pattern in NODE_ROLES:
+            if pattern.search(name):
+                role = role_name
+                break
+        side = rig_capture.SIDE_PREFIX.search(name)
+        limb = LIMB_NAME.match(name)
+        return (('role', role), ('side', side.group(1) if side else 'C'),
+                ('limb', limb.group(1) if limb else None), ('type', node.type().name()))
+
+    def add(self, node):
+        ##a node added again, after a rename behind the index's back, is only filed under its new name
+        self.remove(node)
+        name = node.name()
+        if name in self.nodes:
+            self.remove(self.nodes[name])
+        self.nodes[name] = node
+        self.names[node.sessionId()] = name
+        self.order[name] = self.count
+        self.count += 1
+        for key in self.fields(node):
+            self.groups.setdefault(key, set()).add(name)
+
+    def remove(self, node):
+        name = self.names.pop(node.sessionId(), None)
+        if name is None:
+            return
+        del self.nodes[name]
+        del self.order[name]
+        for names in self.groups.values():
+            names.discard(name)
+
+    def node(self, name):
+        ##same as network.node(name) for a direct child, None if there is no such node
+        return (self.nodes.get(name.rstrip('/')))
+
+    def find(self, role=None, side=None, limb=None, node_type=None):
+        ##every node matching all the fields that were given
+        names = None
+        for key in (('role', role), ('side', side), ('limb', limb), ('type', node_type)):
+            if key[1] is None:
+                continue
+            matches = self.groups.get(key, set())
+            names = matches if names is None else names & matches
+        if names is None:
+            names = self.nodes
+        return ([self.nodes[name] for name in sorted(names, key=self.order.get)])
+
+def rig_index(network):
+    ##the index of a network, built the first time it is asked for
+    index = rig_indices.get(network.path())
+    if index is None:
+        index = RigIndex(network)
+        rig_indices[network.path()] = index
+    return (index)
 
+####PLACEMENT####
+##every parent/keeppos/unparent round trip makes Houdini evaluate transforms, so the helpers work out the world
+##transforms in Python from what they have already read or placed and only write pre-transforms.
+##world transforms by node path, the build transaction clears it at the start and end of every stage
+world_cache = {}
+
+def cached_world(node):
+    ##the world transform of a node, evaluated at most once per stage
+    path = node.path()
+    if path not in world_cache:
+        world_cache[path] = node.worldTransform()
+    return (world_cache[path])
+
+def node_origin(node):
+    ##world position of a node from the cache
+    return (cached_world(node).extractTranslates())
+
+def child_frame(node):
+    ##the transform a child with no transform of its own ends up at, bones hand their children the end of the bone
+    world = cached_world(node)
+    if node.type().name() == 'bone':
+        return (hou.hmath.buildTranslate(0, 0, -node.evalParm('length')) * world)
+    return (world)
+
+def forget_world(node):
+    ##drop the cached world of a node and everything parented under it after the node was moved
+    world_cache.pop(node.path(), None)
+    for child in node.outputs():
+        if isinstance(child, hou.ObjNode):
+            forget_world(child)
+
+def set_parent_and_pre(node, parent, pre):
+    ##keeppos off while the input changes, otherwise Houdini works out the compensation we are about to write,
+    ##and back on for anyone reparenting by hand later
+    node.parm('keeppos').set(False)
+    node.setFirstInput(parent)
+    node.setPreTransform(pre)
+    node.parm('keeppos').set(True)
+
+def place_at(node, frame, parent=None):
+    """ Put node where parenting it to something with frame as its child transform would, then move it under parent.
+
+    Does what setFirstInput(reference), keeppos and setFirstInput(parent) did, except the result is
+    written straight into the pre-transform so nothing has to be evaluated. Any parm transform the
+    node already has stays on top of frame.
+    """
+    if parent is None:
+        pre = frame
+    else:
+        pre = frame * child_frame(parent).inverted()
+    set_parent_and_pre(node, parent, pre)
+    ##the node moved, so did everything under it
+    forget_world(node)
+    world_cache[node.path()] = node.parmTransform() * frame
+    return (node)
+
+def reparent(node, parent):
+    ##move node under parent without it moving, like keeppos would, nothing under it moves either
+    pre = node.parmTransform().inverted() * cached_world(node)
+    if parent is not None:
+        pre = pre * child_frame(parent).inverted()
+    set_parent_and_pre(node, parent, pre)
+    return (node)
+
+def place_world(node, world, parent=None):
+    ##put a node with no parm transform at a world transform under parent
+    return (place_at(node, world, parent))
+
+####BUILD TRANSACTIONS####
+##every parm(...).set() makes its own undo entry and can kick off a viewport refresh, so the stages run inside
+##a transaction that groups (or disables) undos, holds the update mode at manual and buffers the parm writes
+##that nothing reads back during the build (display sizes, control shapes, colours, static SOP parms)
+##UNDO_GROUP = the whole stage is one undo entry
+##UNDO_DISABLED = no undo entries at all, for headless builds
+UNDO_GROUP = 0
+UNDO_DISABLED = 1
+##BATCH_ON = the transaction groups undos, holds the update mode and buffers the parm writes
+##BATCH_OFF = old behaviour, every write goes in straight away with its own undo entry and refresh, only there
+##to time a build both ways (rig_creator_cli.py --no-batch)
+BATCH_ON = 0
+BATCH_OFF = 1
+
+undo_mode = UNDO_GROUP
+batch_mode = BATCH_ON
+##the transaction the helpers are currently writing into, None outside of a build
+active_transaction = None
+##wall time of the last run of every stage, so before/after numbers can be compared in the python shell
+stage_timings = {}
+
+def set_undo_mode(mode):
+    global undo_mode
+    undo_mode = mode
+
+def set_batch_mode(mode):
+    global batch_mode
+    batch_mode = mode
+
+class BuildTransaction(object):
+
+    def __init__(self, label):
+        self.label = label
+        ##node session id -> (node, node path, {parm name: value}) waiting for a single setParms
+        self.parm_writes = {}
+        self.undo_context = None
+        self.old_update_mode = None
+        self.start_time = 0
+        self.batched = batch_mode == BATCH_ON
+
+    def __enter__(self):
+        global active_transaction
+        self.start_time = time.time()
+        ##world transforms and indices from an earlier stage can be stale by now, the user may have edited the rig
+        world_cache.clear()
+        rig_indices.clear()
+        interface_specs.clear()
+        active_transaction = self
+        if not self.batched:
+            return self
+        ##hold off viewport and cook refreshes until the stage is done
+        self.old_update_mode = hou.updateModeSetting()
+        hou.setUpdateMode(hou.updateMode.Manual)
+        ##group or switch off undos for everything the stage does
+        if undo_mode == UNDO_DISABLED:
+            self.undo_context = hou.undos.disabler()
+        else:
+            self.undo_context = hou.undos.group(self.label)
+        self.undo_context.__enter__()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        global active_transaction
+        try:
+            self.flush()
+        finally:
+            active_transaction = None
+            world_cache.clear()
+            rig_indices.clear()
+            interface_specs.clear()
+            if self.batched:
+                self.undo_context.__exit__(exc_type, exc_value, traceback)
+                hou.setUpdateMode(self.old_update_mode)
+            stage_timings[self.label] = time.time() - self.start_time
+        return False
+
+    def queue_parms(self, node, parms):
+        ##later writes to the same parm win, just like they would have with set()
+        ##keyed by session id, a node destroyed and made again under the same path is a different node
+        if not self.batched:
+            node.setParms(parms)
+            return
+        key = node.sessionId()
+        if key not in self.parm_writes:
+            self.parm_writes[key] = (node, node.path(), {})
+        self.parm_writes[key][2].update(parms)
+
+    def forget(self, node):
+        ##drop the pending writes of a node that is about to be destroyed, and of everything inside it
+        path = node.path()
+        for key, (queued_node, queued_path, parms) in list(self.parm_writes.items()):
+            if queued_path == path or queued_path.startswith(path + '/'):
+                del self.parm_writes[key]
+
+    def flush(self):
+        ##one setParms per node for everything buffered so far, nodes are only destroyed through destroy_node
+        ##which drops their writes, so a write to a deleted node is a bug and is left to raise
+        writes = list(self.parm_writes.values())
+        self.parm_writes.clear()
+        for node, path, parms in writes:
+            node.setParms(parms)
+
+def queue_parms(node, parms):
+    ##buffer the writes in the running build, or set them straight away when there is no build running
+    if active_transaction is None:
+        node.setParms(parms)
+    else:
+        active_transaction.queue_parms(node, parms)
+
+def build_stage(stage):
+    ##wrap a pipeline stage in a build transaction and flush the deferred layouts when it finishes,
+    ##even if it fails part way
+    @functools.wraps(stage)
+    def run_stage(*args, **kwargs):
+        try:
+            with BuildTransaction(stage.__name__):
+                return stage(*args, **kwargs)
+        finally:
+            flush_layouts()
+    return run_stage
+
+def status_message(message):
+    ##Houdini's status bar, or the console when there is no UI (hython)
+    if hou.isUIAvailable():
+        hou.ui.setStatusMessage(message)
+    else:
+        print(message)
 
 
 def create_bone_nonOrient(node_0, node_1, parent, prefix):
@@ -60,34 +461,30 @@ def create_bone_nonOrient(node_0, node_1, parent, prefix):
     bone_name = prefix + '_bone1'
     
     ##determine the length/distance between the null objs for later bone length
-    distance = (node_0.origin()-node_1.origin()).length()
+    start = node_origin(node_0)
+    distance = (node_origin(node_1) - start).length()
     #print distance
     
     ##create the new bone node in the net_parent level
-    newbone = net_parent.createNode('bone', bone_name)
+    newbone = create_node(net_parent, 'bone', bone_name)
     ##enable xray
     newbone.useXray(True)
     ##if the bone does not have a determined parent, ie 0, than place the bone at the start_node
     if parent == 0:
-        ##parent the bone to the start_node for proper placement
-        newbone.setInput(0, node_0, 0)
-        ##Unparent the new bone with keep position
-        newbone.parm('keeppos').set(1)
-        newbone.setInput(0, None, 0)
+        start = child_frame(node_0).extractTranslates()
+        parent = None
     else:
-        ##parent the new bone to the parent determined in the def call
-        newbone.setInput(0, parent, 0)
+        start = child_frame(parent).extractTranslates()
     ##set the length to the distance determined earlier
     newbone.parm('length').set(distance)
-    ##find the rotation needed for the bone to be pointed at the end_node
-    newbone_lookat = newbone.buildLookatRotation(node_1)
-    ##push that gather rotation info into the bone
-    newbone.setParmTransform(newbone_lookat)
+    ##point the bone at the end_node from where it starts, worked out here instead of with buildLookatRotation
+    frame = rig_math.lookat_frames([list(node_origin(node_1) - start)])[0]
+    place_world(newbone, hou.Matrix4(rig_math.world_matrix(frame, list(start)).tolist()), parent)
     ##get a random color and give it to the bone
     color = rigutils.getRandomColor()
     rigutils.setDisplayColor(newbone, color)
     ##layout the nodes in the node editor
-    net_parent.layoutChildren()
+    request_network_layout(net_parent)
     
     return newbone
 
@@ -104,40 +501,55 @@ def calculate_plane_normal(node_0, node_1, node_2):
     return hou.Vector3(plane_normal[0], plane_normal[1], plane_normal[2])
     
 
-def create_bone_in_chain(node_0, node_1, normal, bone_parent, prefix):
-    
-    ##create a new bone from the nonOrient def earlier
-    newbone = create_bone_nonOrient(node_0, node_1, bone_parent, prefix)
-    
-    ##The rest of this def is highly influenced by a default houdini shelf tool 'IK from Objects'
-    ##The python for said shelf tool can be found at  houdini instal directory/houdini/python2.7libs/rigtoolutils - see iktwisttool.py
-    
-    # The bones are not in a straight line and we can orient the bone
-    if normal.length() != 0:
-        bone_normal = hou.Vector4(1.0, 0.0, 0.0, 0.0)
-        bone_world_orient = bone_normal * newbone.worldTransform()
-        bone_world_orient_normal = hou.Vector3(bone_world_orient[0], bone_world_orient[1], bone_world_orient[2])
-        bone_world_orient_normal = bone_world_orient_normal.normalized()
-
-        plane_bone_dot = normal.dot(bone_world_orient_normal)
-        cos_angle = old_div(plane_bone_dot, ( normal.length() * bone_world_orient_normal.length() ))
-        cos_angle = max(-1, min(cos_angle, 1))
-        rotate_angle = math.degrees(math.acos(cos_angle))
-
-        plane_bone_orient_cross = (normal.cross(bone_world_orient_normal)).normalized()
-        bone_vector = (node_1.origin() - node_0.origin()).normalized();
-        plane_bone_orient_dot = bone_vector.dot(plane_bone_orient_cross)
+def create_bones_from_solve(root, objs, prefix):
+    """ Creates every bone of a chain from a single rig_math.solve_bone_chain call.
+    The locator positions and the root transform are read once, the lengths and the look at
+    rotations rolled onto the plane normal are solved together in numpy and Houdini is only
+    asked to write the final pre-transforms, so no bone has to cook while the chain is made.
 
-        if plane_bone_orient_dot < 0:
-            rotate_angle = -rotate_angle
+    The orientation follows the default houdini shelf tool 'IK from Objects'
+    (houdini instal directory/houdini/python2.7libs/rigtoolutils - see iktwisttool.py)
 
-        newbone.parm('rz').set(newbone.parm('rz').eval() + rotate_angle)
+    Input:
+        root - null the first bone is parented to
+        objs - list of objs to position the bones at (assumes to have length >= 2)
+        prefix - prefix for the name of the bones
+    """
+    ##get the network the bones go in
+    net_parent = root.parent()
+    ##read every locator position once
+    positions = [list(node_origin(node)) for node in objs]
+    ##solve all the lengths and orientations at once
+    lengths, frames = rig_math.solve_bone_chain(positions)
+    ##turn the world orientations into transforms relative to each bone's parent
+    root_world = cached_world(root).asTupleOfTuples()
+    local_matrices = rig_math.chain_local_matrices(root_world, positions, lengths, frames)
     
-    newbone.moveParmTransformIntoPreTransform()
-    rigutils.setAllRestAngles(newbone, 0)
-    newbone.parm('keeppos').set(True)
-
-    return newbone
+    bones = []
+    bone_parent = root
+    for i in range(len(lengths)):
+        ##create the bone
+        newbone = create_node(net_parent, 'bone', prefix + '_bone1')
+        ##enable xray
+        newbone.useXray(True)
+        ##parent the bone to the root or the bone before it
+        newbone.setFirstInput(bone_parent)
+        ##set the length and the solved orientation
+        newbone.parm('length').set(float(lengths[i]))
+        newbone.setPreTransform(hou.Matrix4(local_matrices[i].tolist()))
+        ##the solve already knows where the bone is
+        world_cache[newbone.path()] = hou.Matrix4(rig_math.world_matrix(frames[i], positions[i]).tolist())
+        rigutils.setAllRestAngles(newbone, 0)
+        ##get a random color and give it to the bone
+        color = rigutils.getRandomColor()
+        rigutils.setDisplayColor(newbone, color)
+        newbone.parm('keeppos').set(True)
+        bones.append(newbone)
+        bone_parent = newbone
+    ##layout the nodes in the node editor
+    request_network_layout(net_parent)
+    
+    return (bones)
     
     
 def create_root_bone_chain(parent, objs, prefix):
@@ -167,17 +579,17 @@ def create_root_bone_chain(parent, objs, prefix):
     parent_name = prefix + '_parent'
     
     ##create a root null node at the point of node_0
-    root = rigutils.createNullAtNode(net_parent, node_0, root_name)
-    root.parm('geoscale').set(.02)
-    root.parm('controltype').set(1)
+    root = create_node(net_parent, 'null', root_name)
+    queue_parms(root, {'geoscale': .02})
+    queue_parms(root, {'controltype': 1})
     ##if there is no parent, create on at the node_0 location
     if parent == 0:
         #create null node at node_0
-        parent = rigutils.createNullAtNode(net_parent, node_0, parent_name)
+        parent = place_at(create_node(net_parent, 'null', parent_name), child_frame(node_0))
         #change the null's visual to be circles
-        parent.parm('controltype').set(1)
+        queue_parms(parent, {'controltype': 1})
         ##change the size of the displayed circles to be super small
-        parent.parm('geoscale').set(0.02)
+        queue_parms(parent, {'geoscale': 0.02})
         """
         ##parent the bone to the start_node for proper placement
         root.setInput(0, node_0, 0)
@@ -185,35 +597,18 @@ def create_root_bone_chain(parent, objs, prefix):
         root.parm('keeppos').set(1)
         root.setInput(0, None, 0)
         """
-    ##parent the root under the parent
-    root.setFirstInput(parent)
+    ##put the root at node_0 under the parent
+    place_at(root, child_frame(node_0), parent)
     
     ##when the list of objs only has 2 items than create a bone nonOrient
     if len(objs) == 2:
         newbone = create_bone_nonOrient(node_0, node_1, root, prefix)
         return (root, newbone)
     
-    node_2 = objs[2]
-    
-    ##calculate the plane normal of the 3 nodes
-    plane_normal = calculate_plane_normal(node_0, node_1, node_2)
-    
-    ##create the first bone from node_0 to node_1
-    last_bone = create_bone_in_chain(node_0, node_1, plane_normal, root, prefix)
-    first_bone = last_bone
-    
-    ##createing bones after firstbone
-    for i, item in enumerate(objs[2:]):
-        ##set the new node_0 to be i (which the first i would be 2)
-        node_0 = objs[i]
-        ##set the new node_1 to be i+
-        node_1 = objs[i+1]
-        ##set node_2 to be item
-        node_2 = item
-        ##determie the new plane normal for the new 3 nodes
-        plane_normal = calculate_plane_normal(node_0, node_1, node_2)
-        ##create a new bone and parent it to the last_bone
-        last_bone = create_bone_in_chain(node_1, node_2, plane_normal, last_bone, prefix)
+    ##create all the bones of the chain from one solve
+    bones = create_bones_from_solve(root, objs, prefix)
+    first_bone = bones[0]
+    last_bone = bones[-1]
         
     return (root, first_bone, last_bone)
     
@@ -246,54 +641,59 @@ def rigutils_create_IK_FK(IK_type, start_bone, end_bone, parent, prefix):
     ##use the created data to hide and organize the new nodes
     networkedit.hideAndOrganizeCreatedObjs(created_controls)
 
-##def for easily creating null nodes with a conection to another null node
-##required inputs: net_parent = the network to make the node in,
-    ##pointer_node = the node to connect to
-    ##name = name of this new node must be str
-def create_null_pointer(net_parent, pointer_node, name):
-    ##create a new null node in the network
-    null_pointer = net_parent.createNode('null', name)
-    ##change the null size and display
-    null_pointer.parm('geoscale').set(.25)
-    null_pointer.parm('controltype').set(4)
-    ##create a name for the obj merge in the node
-    pointer_merge_name = pointer_node.name() + '_point_merge'
-    ##create the object merge node
-    point_merge = null_pointer.createNode('object_merge', pointer_merge_name)
-    ##create a path to the desired point of the node to connect to
-    point_node = pointer_node.path() + '/point1'
-    ##set parameters of object merge node to bring in the point
-    point_merge.parm('objpath1').set(point_node)
-    point_merge.parm('xformtype').set(1)
-    ##create a merge node
-    merge = null_pointer.createNode('merge', 'merge_points')
-    ##grab the point from within the node that gets created in this function
-    internal_point = net_parent.path() + '/' + name + '/point1'
-    internal_point = hou.node(internal_point)
-    ##set the merge nodes inputs
-    merge.setInput(0, internal_point, 0)
-    merge.setInput(1, point_merge, 0)
-    ##create a node that will make the line
-    line = null_pointer.createNode('add', 'connection_line')
-    ##parent the line under the merge
-    line.setFirstInput(merge)
-    ##switch the tab type from "By Pattern" to "By Group"
-    line.parm('switcher1').set(1)
-    ##create a merge for the line and the control visual
-    display_merge = null_pointer.createNode('merge', 'merge_display')
-    ##grab internal control node
-    internal_control = net_parent.path() + '/' + name + '/control1'
-    internal_control = hou.node(internal_control)
-    ##set display merge inputs
-    display_merge.setInput(0, internal_control, 0)
-    display_merge.setInput(1, line, 0)
-    ##set display flags
-    display_merge.setRenderFlag(True)
-    display_merge.setDisplayFlag(True)
-    ##return the node
-    return (null_pointer)
+####LOCATOR GUIDES####
+##the line from every locator to its parent is drawn by one geometry object for the whole rig instead of a small SOP
+##network inside every locator. A single detail wrangle reads the world position of every locator with optransform,
+##which also makes it recook when one is moved, and draws all the lines in one cook
+LOCATOR_GUIDES_NAME = 'locator_guides'
+LOCATOR_GUIDES_VEX = """string names[] = {%s};
+int parents[] = {%s};
+//paths are made from the rig so the guides keep working when the rig is renamed
+string rig = opfullpath("../..");
+matrix to_rig = invert(optransform(rig));
+int points[];
+foreach (string name; names) {
+    int pt = addpoint(0, {0, 0, 0} * optransform(rig + "/" + name) * to_rig);
+    setpointattrib(0, "Cd", pt, {0, 0.7, 0.7});
+    append(points, pt);
+}
+for (int number = 0; number < len(names); number++) {
+    if (parents[number] >= 0)
+        addprim(0, "polyline", points[parents[number]], points[number]);
+}
+"""
+
+def create_locator_guides(rig_net, locators, parents):
+    """ One geometry object drawing a line from every locator to its parent.
+
+    Input:
+        rig_net - the rig the locators are in
+        locators - the locator nulls
+        parents - index into locators of every locator's parent, -1 for none
+    Returns:
+        the guide object
+    """
+    guides = create_node(rig_net, 'geo', LOCATOR_GUIDES_NAME)
+    ##only there to look at, clicking in the viewport should get the locators
+    guides.setSelectableInViewport(False)
+    lines = create_node(guides, 'attribwrangle', 'guide_lines')
+    ##the names and parent numbers go straight into the snippet
+    snippet = LOCATOR_GUIDES_VEX % (', '.join('"' + locator.name() + '"' for locator in locators),
+                                    ', '.join(str(int(parent)) for parent in parents))
+    ##run over detail only
+    queue_parms(lines, {'class': 0, 'snippet': snippet})
+    lines.setDisplayFlag(True)
+    lines.setRenderFlag(True)
+    return (guides)
 
 def split_bone(bone, split_num):
+    """ Replace bone with split_num bones of equal length along it.
+
+    The first bone takes the place of the original under its parent and every
+    other one sits at the end of the one before it, so only the first needs
+    a pre-transform and nothing has to be unparented with keeppos.
+    Returns the last of the new bones.
+    """
     ##get the net parent
     net_parent = bone.parent()
     ##get the name of the bone to split
@@ -304,12 +704,18 @@ def split_bone(bone, split_num):
     bone_length = bone.parm('length').eval()
     ##devide that length by how many times you are going to split
     split_length = bone_length/int(split_num)
+    ##the original bone's orientation, moved onto the end of its parent like the old translate reset did
+    bone_world = cached_world(bone)
+    split_world = bone_world * hou.hmath.buildTranslate(child_frame(parent).extractTranslates() - bone_world.extractTranslates())
+    ##delete the original bone
+    world_cache.pop(bone.path(), None)
+    destroy_node(bone)
     ##create a bone for however many times you want to split
     for num in range(0, split_num):
         ##get a random color
         color = rigutils.getRandomColor()
         ##create the bone
-        split_bone = net_parent.createNode('bone', 'split_' + name)
+        split_bone = create_node(net_parent, 'bone', 'split_' + name)
         ##Set the length of new bone to the divided amount
         split_bone.parm('length').set(split_length)
         ##set the random color
@@ -318,17 +724,14 @@ def split_bone(bone, split_num):
         split_bone.setSelectableInViewport(False)
         ##Turn on xray
         split_bone.useXray(True)
-        ##parent the new bone to the old bone
-        split_bone.setFirstInput(bone)
-        ##keep the transform
-        split_bone.parm('keeppos').set(True)
-        ##if this is the first bone that reparent it under the root that was made for the original bone
         if num == 0:
-            split_bone.setFirstInput(parent)
-            ##delete the original bone
-            bone.destroy()
-        ##set all the transforms to be 0
-        split_bone.parmTuple('t').set((0,0,0))
+            ##the first bone goes where the original was
+            place_world(split_bone, split_world, parent)
+        else:
+            ##the rest sit at the end of the bone before with no transform of their own
+            split_bone.setFirstInput(bone)
+            split_bone.parm('keeppos').set(True)
+            world_cache[split_bone.path()] = hou.hmath.buildTranslate(0, 0, -split_length * num) * split_world
         ##turn on autoscope
         split_bone.parmTuple('t').setAutoscope((True, True, True))
         ##lock translates
@@ -336,7 +739,7 @@ def split_bone(bone, split_num):
         ##turn on autoscope for rotate
         split_bone.parmTuple('r').setAutoscope((True, True, True))
         ##place the node in a good position for node network
-        split_bone.moveToGoodPosition()
+        request_layout(split_bone)
         ##reset the bone variable for future iterations
         bone = split_bone
         
@@ -359,164 +762,536 @@ def create_FK_control(obj, size, name):
     
     name = obj.name()
     ##make offset null (1st of three nulls)
-    fk_offset = net_parent.createNode('null', fk_offset_name)
+    fk_offset = create_node(net_parent, 'null', fk_offset_name)
     ##set flags
     fk_offset.setSelectableInViewport(False)
     fk_offset.setDisplayFlag(False)
-    ##position the null in the spot of the given obj via parent
-    fk_offset.setFirstInput(obj)
-    ##unparent via keep position
-    fk_offset.parm('keeppos').set(True)
-    fk_offset.setFirstInput(None)
+    ##position the null in the spot of the given obj, unparented
+    place_at(fk_offset, child_frame(obj))
     ##move to nice place in network editor
-    fk_offset.moveToGoodPosition()
+    request_layout(fk_offset)
     ##set color
     fk_offset.setColor(grey)
     
     ##create fk_auto
-    fk_auto = net_parent.createNode('null', fk_auto_name)
+    fk_auto = create_node(net_parent, 'null', fk_auto_name)
     fk_auto.setSelectableInViewport(False)
     fk_auto.setDisplayFlag(False)
     fk_auto.setFirstInput(fk_offset)
     fk_auto.parm('keeppos').set(True)
-    fk_auto.moveToGoodPosition()
+    world_cache[fk_auto.path()] = cached_world(fk_offset)
+    request_layout(fk_auto)
     fk_auto.setColor(dull_red)
     
     ##create the fk_ctrl
-    fk_ctrl = net_parent.createNode('null', fk_control_name)
+    fk_ctrl = create_node(net_parent, 'null', fk_control_name)
     fk_ctrl.setFirstInput(fk_auto)
-    fk_ctrl.moveToGoodPosition()
+    request_layout(fk_ctrl)
     fk_ctrl.parm('keeppos').set(True)
-    ##change the visual to be circles
-    fk_ctrl.parm('controltype').set(1)
-    ##change to be the place that is perpendicular to the obj
-    fk_ctrl.parm('orientation').set(3)
-    ##change the size to desired size
-    fk_ctrl.parm('geoscale').set(size)
+    world_cache[fk_ctrl.path()] = cached_world(fk_offset)
+    ##a circle on the plane that is perpendicular to the obj, at the desired size
+    set_control_shape(fk_ctrl, 'circle_xy', size)
     fk_ctrl.setColor(turquoise)
     
     return (fk_offset, fk_auto, fk_ctrl)
 
 
+####CONTROL SHAPES####
+##the shapes the controls are drawn with are built once per rig in a hidden geometry object and object merged by
+##reference into every control, so each shape cooks once for the whole rig instead of once inside every control.
+##The control's own null parms (geoscale, geosize, geocenter, dcolor) still size and color its copy
+CONTROL_SHAPES_NAME = 'control_shapes'
+##every shape in the library, circle_<plane> are the circles the null's orientation menu used to pick
+CONTROL_SHAPES = ('circles', 'circle_yz', 'circle_zx', 'circle_xy', 'box', 'null', 'box_null', 'stick_ball')
+
+def build_control_shapes(network):
+    ##the library object with one null SOP named after every shape in CONTROL_SHAPES
+    library = create_node(network, 'geo', CONTROL_SHAPES_NAME)
+    ##only referenced, never drawn or picked itself
+    library.setDisplayFlag(False)
+    library.setSelectableInViewport(False)
+    outputs = {}
+    ##one open circle of radius .5 on every plane, the same size as the null's own circles
+    circles = create_node(library, 'merge', 'circles_merge')
+    for number, (plane, orient) in enumerate((('yz', 1), ('zx', 2), ('xy', 0))):
+        circle = create_node(library, 'circle', 'circle_' + plane + '_arc')
+        queue_parms(circle, {'type': 1, 'orient': orient, 'arc': 1, 'divs': 24, 'radx': .5, 'rady': .5})
+        circles.setInput(number, circle, 0)
+        outputs['circle_' + plane] = circle
+    outputs['circles'] = circles
+    ##unit box drawn as lines
+    box = create_node(library, 'box', 'box_polys')
+    box_lines = create_node(library, 'convertline', 'box_lines')
+    box_lines.setFirstInput(box)
+    outputs['box'] = box_lines
+    ##unit cross along the three axes
+    cross = create_node(library, 'merge', 'cross_merge')
+    for number, axis in enumerate(((1, 0, 0), (0, 1, 0), (0, 0, 1))):
+        line = create_node(library, 'line', 'cross_line' + str(number))
+        queue_parms(line, {'originx': -.5 * axis[0], 'originy': -.5 * axis[1], 'originz': -.5 * axis[2],
+                           'dirx': axis[0], 'diry': axis[1], 'dirz': axis[2], 'dist': 1})
+        cross.setInput(number, line, 0)
+    outputs['null'] = cross
+    box_null = create_node(library, 'merge', 'box_null_merge')
+    box_null.setInput(0, box_lines, 0)
+    box_null.setInput(1, cross, 0)
+    outputs['box_null'] = box_null
+    ##a ball on the end of a stick
+    ball = create_node(library, 'sphere', 'stick_ball_sphere')
+    stick = create_node(library, 'line', 'stick_ball_line')
+    copy = create_node(library, 'copytopoints::2.0', 'stick_ball_copy')
+    copy.setInput(0, ball, 0)
+    copy.setInput(1, stick, 0)
+    stick_ball = create_node(library, 'merge', 'stick_ball_merge')
+    stick_ball.setInput(0, copy, 0)
+    stick_ball.setInput(1, stick, 0)
+    queue_parms(copy, {'targetgroup': '1'})
+    queue_parms(ball, {'scale': .25})
+    queue_parms(stick, {'dist': 5})
+    outputs['stick_ball'] = stick_ball
+    ##a null SOP per shape is what the controls point at
+    for shape in CONTROL_SHAPES:
+        create_node(library, 'null', shape).setFirstInput(outputs[shape])
+    request_network_layout(library)
+    return (library)
+
+def control_shape_library(network):
+    ##the control shape library of the rig, built the first time a control asks for it
+    library = rig_index(network).node(CONTROL_SHAPES_NAME)
+    if library is None:
+        library = build_control_shapes(network)
+    return (library)
+
+def set_control_shape(node, shape, scale=None, color=None):
+    """ Draw a control null with a shape from its rig's control shape library.
+
+    Input:
+        node - the control null, calling this again swaps the shape
+        shape - one of CONTROL_SHAPES
+        scale - display scale (geoscale) of the shape, left as it is when None
+        color - (r, g, b) display color of the shape, left as it is when None
+    """
+    library = control_shape_library(node.parent())
+    ##one object merge in the control pointing at the shape, the control SOP draws whatever comes into it
+    shape_merge = node.node('shape')
+    if shape_merge is None:
+        shape_merge = create_node(node, 'object_merge', 'shape')
+        node.node('control1').setFirstInput(shape_merge)
+    queue_parms(shape_merge, {'objpath1': shape_merge.relativePathTo(library.node(shape)), 'xformtype': 0})
+    ##custom control type
+    parms = {'controltype': 7}
+    if scale is not None:
+        parms['geoscale'] = scale
+    if color is not None:
+        parms.update({'dcolorr': color[0], 'dcolorg': color[1], 'dcolorb': color[2]})
+    queue_parms(node, parms)
+    return (node)
+
 ##this def is a nearly the same as rigutils.createNullAtNode except this was designed for the spine locators where the scale and rotate need to be reset
 def create_null_at_node(netparent, node, name):
     ##creat null node
-    null = netparent.createNode('null', name)
-    ##parent it to chosen node
-    null.setFirstInput(node)
-    ##keep position
-    null.parm('keeppos').set(True)
-    ##unparent
-    null.setFirstInput(None)
-    ##set scale back to one
-    null.parmTuple('s').set((1,1,1))
-    ##set rotate back to 0
-    null.parmTuple('r').set((0,0,0))
-    ##clean the transforms
-    null.moveParmTransformIntoPreTransform()
+    null = create_node(netparent, 'null', name)
+    ##only the position of the chosen node, with no rotate or scale, straight into the pre-transform
+    place_at(null, hou.hmath.buildTranslate(child_frame(node).extractTranslates()))
     
     return (null)
 
 def create_stick_ball_null(netparent, node, name):
     turquoise = hou.Color((0,.67,.5))
     ##creat null node
-    null = netparent.createNode('null', name)
-    ##parent it to chosen node
-    null.setFirstInput(node)
-    ##keep position
-    null.parm('keeppos').set(True)
-    ##unparent
-    null.setFirstInput(None)
-    ##set scale back to one
-    null.parmTuple('s').set((1,1,1))
-    ##clean the transforms
-    null.moveParmTransformIntoPreTransform()
-    ##create new needed nodes
-    control = null.node('control1/')
-    ball = null.createNode('sphere')
-    line = null.createNode('line')
-    copy = null.createNode('copytopoints::2.0')
-    merge = null.createNode('merge')
-    ##parent them as needed
-    copy.setInput(0, ball, 0)
-    copy.setInput(1, line, 0)
-    merge.setInput(0, copy, 0)
-    merge.setInput(1, line, 0)
-    control.setFirstInput(merge)
-    ##set parms
-    copy.parm('targetgroup').set('1')
-    ball.parm('scale').set(.25)
-    line.parm('dist').set(5)
-    
-    null.parm('controltype').set(7)
+    null = create_node(netparent, 'null', name)
+    ##position and rotation of the chosen node with the scale taken out, straight into the pre-transform
+    frame = child_frame(node)
+    place_at(null, hou.hmath.buildTransform({'translate': frame.extractTranslates(), 'rotate': frame.extractRotates()}))
+    ##the stick and ball come from the rig's shape library
+    set_control_shape(null, 'stick_ball')
     null.setColor(turquoise)
     return (null)
 
+####PARM BINDINGS####
+##controls are driven by the HDA interface as if their parms were promoted. A binding is (node, parm tuple, HDA parm
+##tuple) and is written as one whole tuple channel reference, made by hou with parmTuple.set(hda_parm_tuple),
+##instead of an expression string per component. That only saves build calls (46 parmTuple.set instead of 130
+##setExpression for the default character). Every bound component still ends up with the same ch("../parm")
+##reference the expressions gave it, so the per frame cost of the rig does not change
+def bind_parms(rig_net, bindings):
+    """ Drive control parms from the HDA interface in one pass.
+
+    Every component ends up with a ch() reference to its interface parm, see
+    PARM BINDINGS for what that means for playback.
+    Input:
+        rig_net - the rig HDA the interface parms live on
+        bindings - list of (node, parm tuple name, HDA parm tuple name), the tuples need the same size
+    """
+    for node, parm_name, hda_parm_name in bindings:
+        node.parmTuple(parm_name).set(rig_net.parmTuple(hda_parm_name))
+
+def playback_benchmark(rig_net, start=None, end=None, repeats=3):
+    """ Per frame cost of the rig, for comparing builds in the python shell.
+
+    Steps through the frame range and asks every object of the rig for its world
+    transform, which makes every control, constraint and solver cook.
+    Returns:
+        the best of repeats runs in seconds per frame
+    """
+    frame_range = hou.playbar.frameRange()
+    start = frame_range[0] if start is None else start
+    end = frame_range[1] if end is None else end
+    objects = [node for node in rig_net.allSubChildren() if isinstance(node, hou.ObjNode)]
+    old_frame = hou.frame()
+    best = None
+    try:
+        for run in range(repeats):
+            start_time = time.time()
+            frame = start
+            while frame <= end:
+                hou.setFrame(frame)
+                for node in objects:
+                    node.worldTransform()
+                frame += 1
+            run_time = (time.time() - start_time) / max(end - start + 1, 1)
+            best = run_time if best is None else min(best, run_time)
+    finally:
+        hou.setFrame(old_frame)
+    return (best)
+
+####HDA INTERFACE####
+##the rig HDA's interface is described as data, one folder per limb holding its Display, Actions and Controls.
+##The stages only add their folders to the rig's pending interface, commit_interface builds the parm templates
+##of all of them and writes the HDA's interface once at the end of the build, then makes the bindings
+##the entries of a folder are
+##('folder', name, label, entries) - tabbed folder
+##('simple', name, label, entries) - simple folder
+##('menu', name, label, default, binding) - OFF/ON menu
+##('float', name, label, defaults, binding) - float tuple the size of its defaults
+##('slider', name, label, default, min, max, binding) - single float locked to its range
+##('button', name, label)
+##('separator', name)
+##a binding is (node key, parm tuple name) or None, the keys are looked up in the nodes given to add_interface
+MENU_ITEMS = ['0', '1']
+MENU_LABELS = ['OFF', 'ON']
+
+MASTER_INTERFACE = ('folder', 'master_folder', 'Master', [
+    ('simple', 'm_display_folder', 'Display', [
+        ('menu', 'm_display', 'Master Display', 1, ('master', 'display')),
+        ('menu', 'm_geo_display', 'Geo Display', 1, None),
+        ('menu', 'm_bone_display', 'Bone Display', 0, None),
+        ('menu', 'm_ctrl_display', 'Controls Display', 1, None)]),
+    ('simple', 'm_action_folder', 'Actions', [
+        ('button', 'set_all_to_default', 'Set ALL to Default'),
+        ('button', 'set_all_keys', 'Set ALL Keys'),
+        ('separator', 'm_action_sep'),
+        ('button', 'set_master_to_default', 'Set Master to Default'),
+        ('button', 'set_master_key', 'Set Master Key')]),
+    ('simple', 'm_ctrl_folder', 'Controls', [
+        ('float', 'master_trans', 'Master Translate', (0, 0, 0), ('master', 't')),
+        ('float', 'master_rot', 'Master Rotate', (0, 0, 0), ('master', 'r')),
+        ('float', 'master_scale', 'Master Scale', (1,), ('master', 'scale'))])])
+
+SPINE_INTERFACE = ('folder', 'spine_folder', 'Spine', [
+    ('simple', 's_display_folder', 'Display', [
+        ('menu', 's_bone_display', 'Bone Display', 0, None),
+        ('menu', 's_ctrl_display', 'Controls Display', 1, None)]),
+    ('simple', 's_action_folder', 'Actions', [
+        ('button', 'set_spine_to_default', 'Set Spine to Default'),
+        ('button', 'set_spine_key', 'Set Spine Keys')]),
+    ('simple', 's_ctrl_folder', 'Controls', [
+        ('float', 'COG_trans', 'COG Translate', (0, 0, 0), ('COG', 't')),
+        ('float', 'COG_rot', 'COG Rotate', (0, 0, 0), ('COG', 'r')),
+        ('float', 'FK_C_rot', 'FK C Rotate', (0, 0, 0), ('FK_C', 'r')),
+        ('float', 'FK_B_rot', 'FK B Rotate', (0, 0, 0), ('FK_B', 'r')),
+        ('float', 'FK_A_rot', 'FK A Rotate', (0, 0, 0), ('FK_A', 'r')),
+        ('float', 'chest_IK_trans', 'Chest IK Translate', (0, 0, 0), ('chest_IK', 't')),
+        ('float', 'chest_IK_rot', 'Chest IK Rotate', (0, 0, 0), ('chest_IK', 'r')),
+        ('float', 'mid_IK_trans', 'Mid IK Translate', (0, 0, 0), ('mid_IK', 't')),
+        ('float', 'hip_IK_trans', 'Hip IK Translate', (0, 0, 0), ('hip_IK', 't')),
+        ('float', 'hip_IK_rot', 'Hip IK Rotate', (0, 0, 0), ('hip_IK', 'r')),
+        ('float', 'pelvis_rot', 'Pelvis Rotate', (0, 0, 0), ('pelvis_ctrl', 'r'))])])
+
+ARM_INTERFACE = ('folder', 'L_arm_folder', 'L Arm', [
+    ('simple', 'L_arm_display_folder', 'Display', [
+        ('menu', 'L_arm_bone_display', 'Bone Display', 0, None),
+        ('menu', 'L_arm_ctrl_display', 'Controls Display', 1, None)]),
+    ('simple', 'L_arm_action_folder', 'Actions', [
+        ('button', 'set_L_arm_to_default', 'Set L Arm to Default'),
+        ('button', 'set_L_arm_key', 'Set L Arm Keys')]),
+    ('simple', 'L_arm_ctrl_folder', 'Controls', [
+        ('slider', 'L_arm_FK_IK', 'L Arm FK|IK', 1, 0, 1, ('arm_kin', 'blend')),
+        ('float', 'L_shoulder_rot', 'L Shoulder Rotate', (0, 0, 0), ('shoulder_ctrl', 'r')),
+        ('float', 'L_arm_IK_trans', 'L Arm IK Translate', (0, 0, 0), ('arm_goal', 't')),
+        ('float', 'L_arm_IK_rot', 'L Arm IK Rotate', (0, 0, 0), ('arm_goal', 'r')),
+        ('float', 'L_arm_twist_trans', 'L Arm Twist Translate', (0, 0, 0), ('arm_twist', 't')),
+        ('float', 'L_arm_bone1_FK_rot', 'L Arm Bone1 FK Rotate', (0, 0, 0), ('arm_ctrl1', 'r')),
+        ('float', 'L_arm_bone2_FK_rot', 'L Arm Bone2 FK Rotate', (0, 0, 0), ('arm_ctrl2', 'r')),
+        ('float', 'L_hand_FK_rot', 'L Hand FK Rotate', (0, 0, 0), ('hand_ctrl', 'r'))]),
+    ('simple', 'L_hand_folder', 'L hand', [
+        ('menu', 'L_hand_bone_display', 'Bone Display', 0, None),
+        ('menu', 'L_hand_ctrl_display', 'Controls Display', 1, None),
+        ('simple', 'L_hand_action_folder', 'Actions', [
+            ('button', 'set_L_hand_to_default', 'Set L hand to Default'),
+            ('button', 'set_L_hand_key', 'Set L hand Keys')]),
+        ('folder', 'L_thumb_folder', 'L Thumb', [
+            ('float', 'L_thumb_base_rot', 'L Thumb Base Rotate', (0, 0, 0), ('thumb_base_ctrl', 'r')),
+            ('float', 'L_thumb_mid_rot', 'L Thumb Mid Rotate', (0, 0, 0), ('thumb_mid_ctrl', 'r')),
+            ('float', 'L_thumb_end_rot', 'L Thumb End Rotate', (0, 0, 0), ('thumb_end_ctrl', 'r'))]),
+        ('folder', 'L_index_folder', 'L Index', [
+            ('float', 'L_index_base_rot', 'L Index Base Rotate', (0, 0, 0), ('index_base_ctrl', 'r')),
+            ('float', 'L_index_mid_rot', 'L Index Mid Rotate', (0, 0, 0), ('index_mid_ctrl', 'r')),
+            ('float', 'L_index_end_rot', 'L Index End Rotate', (0, 0, 0), ('index_end_ctrl', 'r'))]),
+        ('folder', 'L_middle_folder', 'L Middle', [
+            ('float', 'L_middle_base_rot', 'L Middle Base Rotate', (0, 0, 0), ('middle_base_ctrl', 'r')),
+            ('float', 'L_middle_mid_rot', 'L Middle Mid Rotate', (0, 0, 0), ('middle_mid_ctrl', 'r')),
+            ('float', 'L_middle_end_rot', 'L Middle End Rotate', (0, 0, 0), ('middle_end_ctrl', 'r'))]),
+        ('folder', 'L_ring_folder', 'L Ring', [
+            ('float', 'L_ring_base_rot', 'L Ring Base Rotate', (0, 0, 0), ('ring_base_ctrl', 'r')),
+            ('float', 'L_ring_mid_rot', 'L Ring Mid Rotate', (0, 0, 0), ('ring_mid_ctrl', 'r')),
+            ('float', 'L_ring_end_rot', 'L Ring End Rotate', (0, 0, 0), ('ring_end_ctrl', 'r'))]),
+        ('folder', 'L_pinky_folder', 'L Pinky', [
+            ('float', 'L_pinky_base_rot', 'L Pinky Base Rotate', (0, 0, 0), ('pinky_base_ctrl', 'r')),
+            ('float', 'L_pinky_mid_rot', 'L Pinky Mid Rotate', (0, 0, 0), ('pinky_mid_ctrl', 'r')),
+            ('float', 'L_pinky_end_rot', 'L Pinky End Rotate', (0, 0, 0), ('pinky_end_ctrl', 'r'))])])])
+
+LEG_INTERFACE = ('folder', 'L_leg_folder', 'L Leg', [
+    ('simple', 'L_leg_display_folder', 'Display', [
+        ('menu', 'L_leg_bone_display', 'Bone Display', 0, None),
+        ('menu', 'L_leg_ctrl_display', 'Controls Display', 1, None)]),
+    ('simple', 'L_leg_action_folder', 'Actions', [
+        ('button', 'set_L_leg_to_default', 'Set L Leg to Default'),
+        ('button', 'set_L_leg_key', 'Set L Leg Keys')]),
+    ('simple', 'L_leg_ctrl_folder', 'Controls', [
+        ('slider', 'L_leg_FK_IK', 'L Leg FK|IK', 1, 0, 1, ('leg_kin', 'blend')),
+        ('float', 'L_leg_IK_trans', 'L Leg IK Translate', (0, 0, 0), ('leg_goal', 't')),
+        ('float', 'L_leg_IK_rot', 'L Leg IK Rotate', (0, 0, 0), ('leg_goal', 'r')),
+        ('float', 'L_leg_twist_trans', 'L Leg Twist Translate', (0, 0, 0), ('leg_twist', 't')),
+        ('float', 'L_leg_bone1_FK_rot', 'L Leg Bone1 FK Rotate', (0, 0, 0), ('leg_ctrl1', 'r')),
+        ('float', 'L_leg_bone2_FK_rot', 'L Leg Bone2 FK Rotate', (0, 0, 0), ('leg_ctrl2', 'r')),
+        ('float', 'L_foot_FK_rot', 'L Foot FK Rotate', (0, 0, 0), ('foot_ctrl', 'r')),
+        ('float', 'L_toe_FK_rot', 'L Toe FK Rotate', (0, 0, 0), ('toe_ctrl', 'r'))]),
+    ##the foot rolls are driven by scaled expressions on the roll nulls, not bindings
+    ('simple', 'L_foot_folder', 'L Foot IK', [
+        ('button', 'set_L_foot_to_default', 'Set L foot to Default'),
+        ('button', 'set_L_foot_key', 'Set L foot Keys'),
+        ('slider', 'L_toe_roll_rot', 'L Toe Roll Rotate', 0, 0, 10, None),
+        ('slider', 'L_toe_twist_rot', 'L Toe Twist Rotate', 0, -10, 10, None),
+        ('slider', 'L_ball_roll_rot', 'L Ball Roll Rotate', 0, 0, 10, None),
+        ('slider', 'L_heel_roll_rot', 'L Heel Roll Rotate', 0, -10, 10, None),
+        ('slider', 'L_heel_twist_rot', 'L Heel Twist Rotate', 0, -10, 10, None),
+        ('slider', 'L_outer_roll_rot', 'L Outer Roll Rotate', 0, -10, 10, None),
+        ('slider', 'L_inner_roll_rot', 'L Inner Roll Rotate', 0, -10, 10, None)])])
+
+##rig path -> [(folder spec, {node key: node})] waiting for commit_interface
+interface_specs = {}
+
+def add_interface(rig_net, spec, nodes):
+    ##queue a limb's folder for the rig's interface, nodes maps the binding keys of the spec to the built nodes
+    interface_specs.setdefault(rig_net.path(), []).append((spec, nodes))
+
+def build_parm_template(spec, nodes, bindings):
+    ##parm template of one interface entry, the bindings of it and of everything inside it are added to bindings
+    kind = spec[0]
+    binding = None
+    if kind in ('folder', 'simple'):
+        template = hou.FolderParmTemplate(spec[1], spec[2])
+        if kind == 'simple':
+            template.setFolderType(hou.folderType.Simple)
+        for entry in spec[3]:
+            template.addParmTemplate(build_parm_template(entry, nodes, bindings))
+    elif kind == 'menu':
+        template = hou.MenuParmTemplate(spec[1], spec[2], MENU_ITEMS, MENU_LABELS, spec[3])
+        binding = spec[4]
+    elif kind == 'float':
+        template = hou.FloatParmTemplate(spec[1], spec[2], len(spec[3]), list(spec[3]))
+        binding = spec[4]
+    elif kind == 'slider':
+        template = hou.FloatParmTemplate(spec[1], spec[2], 1, [spec[3]], spec[4], spec[5], True, True)
+        binding = spec[6]
+    elif kind == 'button':
+        template = hou.ButtonParmTemplate(spec[1], spec[2])
+    elif kind == 'separator':
+        template = hou.SeparatorParmTemplate(spec[1])
+    else:
+        raise ValueError('Unknown interface entry ' + repr(kind))
+    if binding is not None:
+        bindings.append((nodes[binding[0]], binding[1], spec[1]))
+    return (template)
+
+def commit_interface(rig_net):
+    """ Write the pending interface of the rig onto the HDA with a single setParmTemplateGroup.
+
+    The folders of every stage are built, the visibility sets get their
+    parms and the L_ folders get their R_ copies on one copy of the
+    template group. The bindings are made afterwards since they need the HDA
+    parms to exist.
+    Returns:
+        the bindings that were made
+    """
+    pending = interface_specs.pop(rig_net.path(), [])
+    rig_ptg = rig_net.parmTemplateGroup()
+    bindings = []
+    for spec, nodes in pending:
+        rig_ptg.append(build_parm_template(spec, nodes, bindings))
+    add_visibility_parms(rig_ptg, visibility_sets.get(rig_net.path(), {}))
+    mirror_parm_folders(rig_ptg)
+    rig_net.setParmTemplateGroup(rig_ptg)
+    bind_parms(rig_net, bindings)
+    return (bindings)
+
+####VISIBILITY####
+##the display of bones and controls used to be an expression on every node that was evaluated all the time. Now the
+##nodes are grouped into visibility sets and every set is one hidden parm on the HDA, on when all of the set's toggles
+##have the right value, with the display of every node in the set a reference to it. Each condition is worked out
+##once per set and only again when one of its toggles changes, and unlike a parm callback that also covers keys on
+##the toggles (the FK|IK sliders), scripts and takes, not just edits in the parm pane
+##rig path -> {set name: (toggles, node names)} of the rig being built, written onto the HDA by commit_interface
+##and install_visibility
+visibility_sets = {}
+##the HDA parm of a visibility set
+VISIBILITY_PARM = 'vis_%s'
+
+def add_visibility_set(rig_net, name, toggles, nodes):
+    """ Show nodes only when every (HDA parm, value) pair in toggles matches.
+
+    Sets with the same name are merged, nothing is written to the rig until commit_interface and install_visibility.
+    """
+    rig_sets = visibility_sets.setdefault(rig_net.path(), {})
+    if name not in rig_sets:
+        rig_sets[name] = ([list(toggle) for toggle in toggles], [])
+    rig_sets[name][1].extend(node.name() for node in nodes)
+
+def visibility_expression(toggles):
+    ##1 when every toggle has its value, evaluated on the HDA so the toggles are its own parms
+    return (' && '.join('ch("%s") == %s' % (parm_name, value) for parm_name, value in toggles))
+
+def add_visibility_parms(rig_ptg, rig_sets):
+    ##a hidden parm for every visibility set and for the R_ copy of every L_ set, the R_ nodes are only made later
+    ##by mirror_side so their parms are made up front, written with the rest of the interface by commit_interface
+    for name, (toggles, members) in sorted(rig_sets.items()):
+        mirrored_toggles = [[mirror_string(toggle[0]), toggle[1]] for toggle in toggles]
+        for set_name, set_toggles in ((name, toggles), (mirror_string(name), mirrored_toggles)):
+            parm_name = VISIBILITY_PARM % set_name
+            if rig_ptg.find(parm_name) is not None:
+                continue
+            template = hou.IntParmTemplate(parm_name, set_name + ' Visible', 1, (0,),
+                                           default_expression=(visibility_expression(set_toggles),),
+                                           default_expression_language=(hou.scriptLanguage.Hscript,))
+            template.hide(True)
+            rig_ptg.append(template)
+
+def install_visibility(rig_net):
+    """ Point the display of every node in a visibility set at the set's parm on the HDA.
+
+    L_ sets get an R_ copy when the mirrored nodes exist. The nodes only reference
+    the set's parm, the toggles are looked at once per set and nothing is evaluated
+    while the rig plays unless a toggle is keyed.
+    """
+    rig_sets = visibility_sets.pop(rig_net.path(), {})
+    index = rig_index(rig_net)
+    for name in list(rig_sets.keys()):
+        mirrored = mirror_string(name)
+        if mirrored == name or mirrored in rig_sets:
+            continue
+        toggles, members = rig_sets[name]
+        members = [mirror_string(member) for member in members if index.node(mirror_string(member)) is not None]
+        if members:
+            rig_sets[mirrored] = ([[mirror_string(toggle[0]), toggle[1]] for toggle in toggles], members)
+    for name, (toggles, members) in sorted(rig_sets.items()):
+        reference = 'ch("../%s")' % (VISIBILITY_PARM % name)
+        for member in members:
+            node = index.node(member)
+            if node is None:
+                continue
+            queue_parms(node, {'tdisplay': True})
+            node.setParmExpressions({'display': reference})
+
+####CONSTRAINTS####
+##every constraint of a rig lives in one chop network next to the rig's objects instead of one chop network
+##inside every constrained object, the objects point their constraints_path at their own output node in it
+CONSTRAINT_NET_NAME = 'CONSTRAINTS'
+##the kinematic solvers of a rig share a chop network too
+KINEMATICS_NET_NAME = 'KIN_Chops'
+
+def shared_chopnet(network, name):
+    ##the chop network called name in network, made the first time something asks for it
+    chopnet = rig_index(network).node(name)
+    if chopnet is None:
+        chopnet = create_node(network, 'chopnet', name)
+    return (chopnet)
+
+def constraint_network(node):
+    ##the shared constraint network for node's rig
+    return (shared_chopnet(node.parent(), CONSTRAINT_NET_NAME))
+
+def kinematics_network(network):
+    ##the shared kinematics network of the rig in network
+    return (shared_chopnet(network, KINEMATICS_NET_NAME))
+
+def constraint_source(constraints, node_type, obj_node, suffix):
+    """ Constraint input that reads an object, shared by every constraint that reads the same object.
+
+    Input:
+        constraints - the shared constraint network
+        node_type - constraintgetworldspace, constraintgetparentspace or constraintobject
+        obj_node - the object to read
+        suffix - what the input reads, the node is called obj_node's name plus suffix
+    """
+    name = obj_node.name() + suffix
+    source = constraints.node(name)
+    if source is None:
+        source = create_node(constraints, node_type, name)
+        ##relative so the mirrored copies and copied rigs keep reading their own objects
+        source.parm('obj_path').set(source.relativePathTo(obj_node))
+    return (source)
+
+def set_constraint_output(constrained_node, output):
+    ##turn on constrainability on the node and point it at the chop that drives it
+    constrained_node.parm('constraints_on').set(True)
+    constrained_node.parm('constraints_path').set(constrained_node.relativePathTo(output))
+
 def simple_constraint(constrained_node, ctrl_node):
-    ##create the chop network in the constrained_node that will hold the constraint
-    constraints = constrained_node.createNode('chopnet', 'constraints')
+    """ Constrain constrained_node to ctrl_node with an offset, like the simple blend constraint shelf tool.
+
+    Returns:
+        the offset chop, its second input is the constrained node's world space so
+        callers can blend back to it
+    """
+    constraints = constraint_network(constrained_node)
+    name = constrained_node.name()
+    ##the world space and ctrl inputs are shared with any other constraint that reads the same objects
+    world_space = constraint_source(constraints, 'constraintgetworldspace', constrained_node, '_world')
+    ctrl_obj = constraint_source(constraints, 'constraintobject', ctrl_node, '_object')
     ##create constraint nodes as seen in simple blend constraint
-    offset = constraints.createNode('constraintoffset', 'offset')
-    ctrl_obj = constraints.createNode('constraintobject', 'ctrl_node')
-    world_space = constraints.createNode('constraintgetworldspace', 'getworldspace')
-    simple_blend = constraints.createNode('constraintsimpleblend', 'simpleblend')
+    simple_blend = create_node(constraints, 'constraintsimpleblend', name + '_simpleblend')
+    offset = create_node(constraints, 'constraintoffset', name + '_offset')
     ##set inputs
     offset.setInput(0, simple_blend, 0)
     offset.setInput(1, world_space, 0)
     simple_blend.setInput(0, world_space, 0)
     simple_blend.setInput(1, ctrl_obj, 0)
     ##set parameters
-    world_space.parm('obj_path').set('../..')
-    ctrl_node_path = ctrl_node.path()
-    ctrl_obj.parm('obj_path').set(ctrl_node_path)
     simple_blend.parm('blend').set(1)
-    ##turn on constrainability on the node
-    constrained_node.parm('constraints_on').set(True)
-    constrained_node.parm('constraints_path').set('constraints')
-    constraints.layoutChildren()
-    
-    return (constraints)
-
-def parent_constriant(constrained_node, constrainer_ctrls):
-    ##create chop network in the contrained node
-    constraints = constrained_node.createNode('chopnet', 'constraints')
-    ##create the parent constraint node
-    parent_constraint = constraints.createNode('constraintparentx', 'parent')
-    ##create worldspace node
-    world_space = constraints.createNode('constraintgetworldspace', 'getworldspace')
-    world_space.parm('obj_path').set('../..')
-    ##create parent space node
-    parent_space = constraints.createNode('constraintgetparentspace', 'getparentspace')
-    parent_space.parm('obj_path').set('../..')
-    ##create constraint blend node
-    blend = constraints.createNode('constraintblend', 'blend_parents')
-    ##get the number of parents plus 1 for world space
-    num_blends = len(constrainer_ctrls) + 1
-    ##set the blend to have that many inputs
-    blend.parm('numblends').set(num_blends)
-    ##set initial parents
-    parent_constraint.setInput(0, world_space, 0)
-    parent_constraint.setInput(1, parent_space, 0)
-    parent_constraint.setInput(2, blend, 0)
-    blend.setFirstInput(parent_space)
-    ##create and parent the parent ctrls
-    for node in constrainer_ctrls:
-        ##get the name of the node
-        name = node.name()
-        ##get the path of the node
-        node_path = node.path()
-        ##create an object constraint for that node
-        parent_ctrl = constraints.createNode('constraintobjectoffset', name)
-        ##parent that object constraint under the parent_space
-        parent_ctrl.setFirstInput(parent_space)
-        ##connect that new node to the blend 
-        blend.setNextInput(parent_ctrl)
-        ##set a reference to the node in the object constraint
-        parent_ctrl.parm('obj_path').setExpression(node_path)
-    ##layout the contraints network
-    constraints.layoutChildren()
-    
-    return (constraints)
+    set_constraint_output(constrained_node, offset)
+    request_network_layout(constraints)
+    
+    return (offset)
+
+def constraint_report(network):
+    """ Node counts of the constraint and kinematics setup of the rig in network.
+
+    Returns:
+        dict with the number of chop networks anywhere in the rig ('chopnets'), the
+        number of objects with constraints on ('constrained') and the number of
+        nodes in the shared constraint network ('constraint_nodes')
+    """
+    chopnets = 0
+    constrained = 0
+    for node in network.allSubChildren():
+        if node.type().name() == 'chopnet':
+            chopnets += 1
+        elif isinstance(node, hou.ObjNode) and node.parm('constraints_on') is not None and node.evalParm('constraints_on'):
+            constrained += 1
+    constraints = network.node(CONSTRAINT_NET_NAME)
+    constraint_nodes = len(constraints.children()) if constraints is not None else 0
+    return ({'chopnets': chopnets, 'constrained': constrained, 'constraint_nodes': constraint_nodes})
 
 
 ##this def is for creating nulls at end of bone similar to rigutils, but theirs didn't do what I wanted
@@ -524,22 +1299,9 @@ def create_null_at_bone_end(bone , name):
     ##grab network parent
     netparent = bone.parent()
     ##create null
-    null = netparent.createNode('null', name)
-    ##place at bone.
-    null.setFirstInput(bone)
-    ##get the bone length expression
-    bone_path = bone.path()
-    bone_length = bone_path + '/length'
-    bone_length_channel = '-ch("' + bone_length + '")'
-    ##move down the bone
-    null.parm('tz').setExpression(bone_length_channel)
-    ##keep pos and unparent
-    null.parm('keeppos').set(True)
-    null.setFirstInput(None)
-    ##delete keyframes
-    null.parm('tz').deleteAllKeyframes()
-    ##clean transforms
-    null.moveParmTransformIntoPreTransform()
+    null = create_node(netparent, 'null', name)
+    ##move down the bone by its length from where the bone places its children, unparented
+    place_at(null, hou.hmath.buildTranslate(0, 0, -bone.evalParm('length')) * child_frame(bone))
     
     return (null)
 
@@ -547,7 +1309,7 @@ def create_face_path(netparent, cvs, name):
     ##path name
     path_name = name + '_path'
     ##create path
-    path = netparent.createNode('path', path_name)
+    path = create_node(netparent, 'path', path_name)
     path.useXray(True)
     ##grab the points_merge node
     points_merge = path.node('points_merge')
@@ -558,13 +1320,13 @@ def create_face_path(netparent, cvs, name):
     ##grab output_curve
     output = path.node('output_curve')
     ##create a group by range node
-    extra_points = path.createNode('grouprange', 'needed_points')
+    extra_points = create_node(path, 'grouprange', 'needed_points')
     ##set to be points
     extra_points.parm('grouptype1').set(0)
     ##set to capture every 3rd point
     extra_points.parm('selecttotal1').set(3)
     ##create delete node for extra points
-    delete_extra = path.createNode('delete', 'delete_extra')
+    delete_extra = create_node(path, 'delete', 'delete_extra')
     ##set group
     delete_extra.parm('group').setExpression('group1')
     ##set to delete non selected
@@ -578,7 +1340,7 @@ def create_face_path(netparent, cvs, name):
     ##set to be NURBS curve
     output.parm('totype').set(4)
     ##organize
-    path.layoutChildren()
+    request_network_layout(path)
     ##set up for the cvs
     num_cvs = cvs
     points_merge.parm('numobj').set(num_cvs)
@@ -588,7 +1350,7 @@ def create_face_path(netparent, cvs, name):
         ##unique name
         cv_name = name + '_cv' + str(i)
         ##create cv
-        cv = netparent.createNode('pathcv', cv_name)
+        cv = create_node(netparent, 'pathcv', cv_name)
         ##cv point path
         cv_path = cv.path()
         cv_point = cv_path + '/points'
@@ -599,15 +1361,15 @@ def create_face_path(netparent, cvs, name):
         ##locator null name
         null_name = cv_name + '_locator'
         ##create a null to guide the cv
-        cv_loc = netparent.createNode('null', null_name)
+        cv_loc = create_node(netparent, 'null', null_name)
         ##parent cv to null
         cv.setFirstInput(cv_loc)
         ##set flags
         cv.setDisplayFlag(False)
         cv.setSelectableInViewport(False)
         ##make the null more resonable size and shape
-        cv_loc.parm('geoscale').set(.25)
-        cv_loc.parm('controltype').set(4)
+        queue_parms(cv_loc, {'geoscale': .25})
+        queue_parms(cv_loc, {'controltype': 4})
         cv_loc.parm('keeppos').set(True)
         ##append the cv_loc
         cv_locs.append(cv_loc)
@@ -615,6 +1377,65 @@ def create_face_path(netparent, cvs, name):
     return (cv_locs, path)
 
 
+####LOCATOR TEMPLATES####
+##the locators the user moves into place come from a template file (see rig_templates) instead of code, so other
+##body types can be shipped as data
+def build_locators(rig_net, template, scale=1.0, offset=(0, 0, 0)):
+    """ Create every locator and face path of a template in one pass.
+
+    Input:
+        rig_net - the rig to create them in
+        template - a rig_templates.LocatorTemplate
+        scale, offset - fit the template to the size and placement of the character
+    Returns:
+        the locators by name, the face paths' cv locators included
+    """
+    ##every position worked out at once, the parms are written in one batch when the stage finishes
+    positions, path_points = template.fitted(scale, offset)
+    local_positions = template.local_positions(positions)
+    locators = {}
+    locator_list = []
+    for number, name in enumerate(template.names):
+        parent = template.parents[number]
+        ##plain nulls, the lines to their parents are drawn by the guide object
+        locator = create_node(rig_net, 'null', name)
+        if parent < 0:
+            queue_parms(locator, {'controltype': 6})
+        else:
+            queue_parms(locator, {'controltype': 4})
+            locator.setFirstInput(locator_list[parent])
+        ##written relative to the parent, which is where keeppos used to put them, and kept on for the user
+        tx, ty, tz = local_positions[number]
+        queue_parms(locator, {'tx': tx, 'ty': ty, 'tz': tz, 'keeppos': 1, 'geoscale': template.display_scales[number]})
+        locators[name] = locator
+        locator_list.append(locator)
+    ##face paths
+    for (name, points, display_scale), cvs in zip(template.paths, path_points):
+        cv_locs = create_face_path(rig_net, len(cvs), name)[0]
+        for cv_loc, (tx, ty, tz) in zip(cv_locs, cvs):
+            queue_parms(cv_loc, {'tx': tx, 'ty': ty, 'tz': tz, 'geoscale': display_scale})
+            locators[cv_loc.name()] = cv_loc
+    ##every connection line of the locators in one object
+    guides = create_locator_guides(rig_net, locator_list, template.parents)
+    
+    ##layout all the new nodes
+    request_network_layout(rig_net)
+    ##create a network box to place all the locators
+    locators_box = rig_net.createNetworkBox('locator_nulls')
+    ##create some colors for coloring nodes
+    cyan = hou.Color((0,.7,.7))
+    dark_cyan = hou.Color((0,.4,.4))
+    ##color the locators and add them to the box, the face paths stay outside of it
+    for locator in locator_list:
+        locator.setColor(cyan)
+        locators_box.addItem(locator)
+    guides.setColor(cyan)
+    locators_box.addItem(guides)
+    ##minimize the box and color it
+    locators_box.setMinimized(True)
+    locators_box.setColor(dark_cyan)
+    return (locators)
+
 ##direction: -1 or 1 depending on which way the triangle the bones make is pointing
 def create_IK_FK_controls(start_bone, end_bone, parent, prefix, direction):
     ##get the parent_network from provided parent
@@ -628,25 +1449,25 @@ def create_IK_FK_controls(start_bone, end_bone, parent, prefix, direction):
     start_FK_auto = start_bone_FK[1]
     start_FK_ctrl = start_bone_FK[2]
     ##create FK constraints
-    start_FK_constraint = simple_constraint(start_bone, start_FK_ctrl)
+    start_FK_offset_chop = simple_constraint(start_bone, start_FK_ctrl)
     
     ##edit the CHOP constraint to allow for switching between the constraint and world space(Which will me IK when set up)
     ##create constraint blends
-    start_cblend = start_FK_constraint.createNode('constraintblend')
+    start_cblend = create_node(start_FK_offset_chop.parent(), 'constraintblend', start_bone.name() + '_FK_blend')
     ##allow for two blends (world and FK)
     start_cblend.parm('numblends').set(2)
     ##set the blend to only be rotation (the number for setting the correct blend was done through trial, other values of importance can be found in the journal)
     start_cblend.parm('writemask').set(56)
     ##set the inputs of the blends
-    start_cblend.setInput(0, start_FK_constraint.node('getworldspace'), 0)
-    start_cblend.setInput(1, start_FK_constraint.node('offset'), 0)
-    ##set the output flag
-    start_cblend.setCurrentFlag(True)
+    start_cblend.setInput(0, start_FK_offset_chop.input(1), 0)
+    start_cblend.setInput(1, start_FK_offset_chop, 0)
+    ##drive the bone from the blend instead of the offset
+    set_constraint_output(start_bone, start_cblend)
     ##set the blend to be IK (world) by default
     start_cblend.parm('blend0').set(1)
     start_cblend.parm('blend1').set(0)
     ##set up the FK parent hierachy
-    start_FK_offset.setFirstInput(parent)
+    reparent(start_FK_offset, parent)
     
     ##create a check that if the same bone was used for both start and end, that it only makes a second FK if it doesnt match
     if end_bone != start_bone:
@@ -655,16 +1476,16 @@ def create_IK_FK_controls(start_bone, end_bone, parent, prefix, direction):
         end_FK_offset = end_bone_FK[0]
         end_FK_auto = end_bone_FK[1]
         end_FK_ctrl = end_bone_FK[2]
-        end_FK_constraint = simple_constraint(end_bone, end_FK_ctrl)
-        end_cblend = end_FK_constraint.createNode('constraintblend')
+        end_FK_offset_chop = simple_constraint(end_bone, end_FK_ctrl)
+        end_cblend = create_node(end_FK_offset_chop.parent(), 'constraintblend', end_bone.name() + '_FK_blend')
         end_cblend.parm('numblends').set(2)
         end_cblend.parm('writemask').set(56)
-        end_cblend.setInput(0, end_FK_constraint.node('getworldspace'), 0)
-        end_cblend.setInput(1, end_FK_constraint.node('offset'), 0)
-        end_cblend.setCurrentFlag(True)
+        end_cblend.setInput(0, end_FK_offset_chop.input(1), 0)
+        end_cblend.setInput(1, end_FK_offset_chop, 0)
+        set_constraint_output(end_bone, end_cblend)
         end_cblend.parm('blend0').set(1)
         end_cblend.parm('blend1').set(0)
-        end_FK_offset.setFirstInput(start_FK_ctrl)
+        reparent(end_FK_offset, start_FK_ctrl)
     
     
     ####Create IK Twist and Goal Controls####
@@ -685,13 +1506,9 @@ def create_IK_FK_controls(start_bone, end_bone, parent, prefix, direction):
         twist_move = .4
     else:
         twist_move = -.4
-    ##move the twist control based on drirection
-    twist_loc.parm('ty').set(twist_move)
-    ##move the pre transforms out of pretransform for the purpose of zeroing out rotate
-    twist_loc.movePreTransformIntoParmTransform()
-    twist_loc.parmTuple('r').set((0,0,0))
-    ##move transforms back into pre transforms
-    twist_loc.moveParmTransformIntoPreTransform()
+    ##move the twist control based on drirection along its own y, then zero out the rotate
+    twist_pos = (hou.hmath.buildTranslate(0, twist_move, 0) * cached_world(twist_loc)).extractTranslates()
+    place_world(twist_loc, hou.hmath.buildTranslate(twist_pos))
     ##unique names
     twist_name = prefix + '_twist'
     goal_name = prefix + '_goal'
@@ -707,28 +1524,20 @@ def create_IK_FK_controls(start_bone, end_bone, parent, prefix, direction):
     goal_ctrl = goal_nulls[2]
     ##set the ctrls to look a bit differant than my default FK ctrl
     ##box
-    twist_ctrl.parm('controltype').set(2)
+    set_control_shape(twist_ctrl, 'box')
     ##box and null
-    goal_ctrl.parm('controltype').set(5)
+    set_control_shape(goal_ctrl, 'box_null')
     ##set parents
-    twist_loc.setFirstInput(twist_ctrl)
-    goal_loc.setFirstInput(goal_ctrl)
+    reparent(twist_loc, twist_ctrl)
+    reparent(goal_loc, goal_ctrl)
     
     ####CREATE KINEMATICS####
-    ##search for chop net and if it doesn't exist make one
-    chop_list = []
-    for node in netparent.children():
-        if node.type().name() == 'chopnet':
-            chop_list.append(node)
-    ##check if any nodes where added to the list, if yes than that is out kin_net
-    if chop_list == []:
-        kin_net = netparent.createNode('chopnet', 'KIN_Chops')
-    else:
-        kin_net = chop_list[0]
+    ##the rig's kinematics network, made if it doesn't exist yet
+    kin_net = kinematics_network(netparent)
     ##inverskin unique name
     kin_name = 'KIN_' + prefix
     ##create kinematics node
-    kin_node = kin_net.createNode('inversekin', kin_name)
+    kin_node = create_node(kin_net, 'inversekin', kin_name)
     ##set to parms to be inverse kin with twist
     kin_node.parm('solvertype').set(2)
     ##get paths to all our nodes that will make the kinematics
@@ -764,6 +1573,23 @@ def create_IK_FK_controls(start_bone, end_bone, parent, prefix, direction):
     
     return(start_FK_ctrl, twist_ctrl, goal_ctrl, kin_node)
 
+def get_curve_points(geo, numberofbones, samples_per_bone=8):
+    """ Read the points of the first curve in geo as an (n, 3) numpy array.
+
+    Polylines are read in one call with pointFloatAttribValues. Bezier and NURBS
+    curves only hold their cvs as points, so the curve itself is sampled instead,
+    dense enough that the arc length resample after it stays on the curve.
+    """
+    prim = geo.prims()[0]
+    if prim.type() == hou.primType.Polygon:
+        ##one flat float list for every point instead of one call per point
+        points = np.array(geo.pointFloatAttribValues('P')).reshape(-1, 3)
+        ##follow the vertex order of the curve in case the points are numbered differently
+        order = [vertex.point().number() for vertex in prim.vertices()]
+        return (points[order])
+    samples = max(int(numberofbones) * samples_per_bone, 2)
+    return (np.array([tuple(prim.positionAt(u)) for u in np.linspace(0.0, 1.0, samples)]))
+
 def makeBonesFromCurve(curve, chainname, numberofbones, kintype, stretch):
     ##get the netparent
     network = hou.node(curve.parent().path())
@@ -775,108 +1601,33 @@ def makeBonesFromCurve(curve, chainname, numberofbones, kintype, stretch):
     chainname = str(chainname)
     ##get the curve length
     curve_geo_len = curve_display.geometry().prims()[0].intrinsicValue("measuredperimeter")
-    ##create a list for appending nodes to that we can then use the list later to delete uneeded nodes
-    nodes = []
     # make a root null
-    chain_root = network.createNode("null", chainname + "_root")
-    chain_root.moveToGoodPosition()
+    chain_root = create_node(network, "null", chainname + "_root")
+    request_layout(chain_root)
     
-    chop_node = []
     # make Follow Curve IK if kintype is 1, if 0 than no kinematics
     if kintype is 1:
-        ##check if a chop node already exsists
-        for node in network.children():
-            if node.type().name() == 'chopnet':
-                chop_node.append(node)
-                ##print chop_node
-        if chop_node == []:
-            curveIK = network.createNode("chopnet", 'KIN_Chops')
-            
-        else:
-            curveIK = chop_node[0]
-        curveIK.moveToGoodPosition()
+        ##the rig's kinematics network, made if it doesn't exist yet
+        curveIK = kinematics_network(network)
+        request_layout(curveIK)
         ##create an inverse kin and set it to follow curve
-        chainFollowIK = curveIK.createNode("inversekin", chainname + "bone_IK")
+        chainFollowIK = create_node(curveIK, "inversekin", chainname + "bone_IK")
         chainFollowIK.parm("solvertype").set(4)
-        curveIK.moveToGoodPosition()
+        request_layout(curveIK)
     ##determine the parent 
     parent = chain_root
     
-    # make resample node and make the number of segmants equal to number of bones
-    resample = curve_path.createNode("resample", "slideframe_resample")
-    nodes.append(resample)
-    ##turn off segmant length
-    resample.parm("dolength").set(0)
-    ##turn on segment count
-    resample.parm("dosegs").set(1)
-    ##set segments to be number of bones
-    resample.parm("segs").set(numberofbones)
-    ##parent the resample to curve display node
-    resample.setFirstInput(curve_display)
-    resample.moveToGoodPosition()
-    
-    # make slideframe
-    slideframe = curve_path.createNode("attribwrangle", "slideframe")
-    nodes.append(slideframe)
-    slideframe.parm("class").set(0)
-    slideframesnippet = slideframe.parm("snippet")
-    slideframestr = """
-int n = npoints(0);
-
-addpointattrib(geoself(), "tan", {0, 0, 0});
-addpointattrib(geoself(), "nml", {0, 0, 0});
-addpointattrib(geoself(), "binml", {0, 0, 0});
-
-vector nml[];
-vector tan[];
-
-resize(nml, n);
-resize(tan, n);
-
-
-tan[0] = normalize(point(0, "P", 1) - point(0, "P", 0));
-nml[0] = set(0,1,0);
-if (normalize(nml[0]) == normalize(tan[0])){
-    nml[0] = set(0,0,1);
-    }
-
-nml[0] = cross(nml[0], tan[0]);
-
-for (int i = 1; i < n; i++)
-{
-    vector p0 = point(0, "P", i - 1);
-    vector p1 = point(0, "P", i);
-    vector t;
-    
-    if (i < n - 1)
-        t = normalize(point(0, "P", i + 1) - p1);
-    else
-        t = normalize(p1 - p0);
-        
-    tan[i] = t;
-    nml[i] = slideframe(p0, tan[i - 1], nml[i - 1], p1, t);   
-}
-
-for (int i = 0; i < n; i++)
-{
-    setpointattrib(geoself(), "nml", i, nml[i]);
-    setpointattrib(geoself(), "tan", i, -1*tan[i]);
-    setpointattrib(geoself(), "binml", i, -1*cross(tan[i], nml[i]));
-}
-    """
-    
-    slideframesnippet.set(slideframestr)    
-    slideframe.setFirstInput(resample)
-    slideframe.moveToGoodPosition()
-    curve_geo = slideframe.geometry()
+    ##sample the curve once and solve every bone frame in numpy, no resample or wrangle nodes needed
+    curve_points = rig_math.resample_polyline(get_curve_points(curve_display.geometry(), numberofbones), numberofbones)
+    curve_frames = rig_math.rotation_minimizing_frames(curve_points)
     
     bones = []
     ##creating bones
     for b in range(int(numberofbones)):
         ##create bone
-        bone = network.createNode("bone", chainname + "bone" + str(b +1))
+        bone = create_node(network, "bone", chainname + "bone" + str(b +1))
         ##move to a good position in network editor
-        bone.moveToGoodPosition()
+        request_layout(bone)
         ##get a random color and assign it to the bone
         color = rigutils.getRandomColor()
         rigutils.setDisplayColor(bone, color)
@@ -885,39 +1636,25 @@ for (int i = 0; i < n; i++)
         if b is 0 and kintype is 1:
             chainFollowIK.parm("bonerootpath").set(bone.path())
         
-        ##get the b (iteration number) point of the resample curve
-        cur_pt = curve_geo.iterPoints()[b]
-        ##get the b+1 (iteration number + 1) point of the resample curve
-        cur_pt1 = curve_geo.iterPoints()[b+1]
-        ##get the position of the curent point
-        cur_pt_loc = cur_pt.attribValue("P")
-        ##place the bone at the b point
-        bone.parmTuple("t").set(cur_pt_loc)
+        ##get the position of the b (iteration number) point of the resampled curve
+        cur_pt_loc = tuple(curve_points[b])
         ##set the bone length by doing messurement math between b and b+1
-        blength = hou.Vector3(cur_pt1.attribValue("P")) - hou.Vector3(cur_pt.attribValue("P"))
-        bone_length = blength.length()
+        bone_length = float(np.linalg.norm(curve_points[b+1] - curve_points[b]))
         bone.parm("length").set(bone_length)
 
-        ##use attributes set up in the wrangle to orient the bone correctly
-        tan = cur_pt.attribValue("tan")
-        nml = cur_pt.attribValue("nml")
-        binml = cur_pt.attribValue("binml")
-        rot = hou.Matrix3([nml, binml, tan]).extractRotates('zyx')
-        rot_null = hou.Matrix3([nml, binml, tan]).extractRotates('xyz')
-        bone.parmTuple("r").set(rot)
-        ##clean transforms
-        bone.moveParmTransformIntoPreTransform()
-        ##if this is the first bone parent it to the root
+        ##the rotation minimizing frame of the point at the b point is the bone's world transform
+        bone_world = hou.Matrix4(rig_math.world_matrix(curve_frames[b], curve_points[b]).tolist())
+        ##if this is the first bone the root goes in the same spot
         if b is 0:
+            rot_null = hou.Matrix3(curve_frames[b].tolist()).extractRotates('xyz')
             chain_root.parmTuple("t").set(cur_pt_loc)
             chain_root.parmTuple("r").set(rot_null)
-            chain_root.parm("geoscale").set(bone_length/5)
-            chain_root.parm("controltype").set(1)
-            chain_root.parm("shadedmode").set(1)
+            world_cache[chain_root.path()] = bone_world
+            queue_parms(chain_root, {'geoscale': bone_length/5})
+            queue_parms(chain_root, {'controltype': 1})
+            queue_parms(chain_root, {'shadedmode': 1})
         ##parent the created bone to the parent, which if 0 will be root, and after that will be the most recent bone
-        bone.parm("keeppos").set(True)
-        bone.setFirstInput(parent)
-        bone.parmTuple("R").set((0, 0, 0))
+        place_world(bone, bone_world, parent)
         parent = bone
         bones.append(bone)
         
@@ -935,13 +1672,10 @@ for (int i = 0; i < n; i++)
         bone.parmTuple('ccrbotcap').set((newval, newval, newval))
         bone.parmTuple("crtopcap").set((newval, newval, newval))
         bone.parmTuple("crbotcap").set((newval, newval, newval)) 
-        bone.moveToGoodPosition()
-        ##set up stretch if desired
-        if stretch == 1:
-            path_name = curve.name()
-            arc_expression = 'arclen("../' + path_name + '", 1, 0, 1)/' + str(numberofbones)
-            ##print arc_expression
-            bone.parm('length').setExpression(arc_expression)
+        request_layout(bone)
+    ##set up stretch if desired, every bone shares the curve's measured length
+    if stretch == 1:
+        stretch_chain(curve, bones, 1)
     ##finish setting up the IK settup
     if kintype is 1:
         chainFollowIK.parm("boneendpath").set(parent.path())
@@ -949,11 +1683,6 @@ for (int i = 0; i < n; i++)
         for bone in bones:
             bone.parm("solver").set(chainFollowIK.path())
     
-    for node in nodes:
-        node.destroy()
-        
-    ##kepp position if parented
-    chain_root.parm('keeppos').set(True)
     ##grab the first cv to parent the root to
     ##get the points merge of the path that holds reference paths to the cvs
     points_merge = curve.node('points_merge')
@@ -963,2156 +1692,1554 @@ for (int i = 0; i < n; i++)
     cv0_path = points_path.replace('points','')
     ##make that path into a node
     cv0 = hou.node(cv0_path)
-    ##parent the root
-    chain_root.setFirstInput(cv0)
+    ##parent the root where it is
+    reparent(chain_root, cv0)
         
     return (bones)
     
+####ARC LENGTH####
+##stretchy chains used to measure their curve once per bone. Now the curve measures itself once per cook in a detail
+##wrangle and exposes the result as an 'arclength' spare parm on the curve object that every bone references
+ARCLENGTH_NODE = 'arclength'
+ARCLENGTH_PARM = 'arclength'
+
+def curve_arclength_parm(curve, prim=0):
+    """ The shared arc length channel of a curve object, made the first time it is asked for.
+
+    The length is the measured perimeter of prim in the curve's display geometry. It is
+    stored as a detail attribute by a wrangle next to the display node, which only
+    cooks again when the curve does.
+    """
+    parm = curve.parm(ARCLENGTH_PARM)
+    if parm is not None:
+        return (parm)
+    measure = create_node(curve, 'attribwrangle', ARCLENGTH_NODE)
+    measure.setFirstInput(curve.displayNode())
+    ##run over detail only
+    measure.parm('class').set(0)
+    measure.parm('snippet').set('f@arclength = primintrinsic(0, "measuredperimeter", %d);' % prim)
+    request_layout(measure)
+    ##spare parm on the curve object the bones can reference
+    curve_ptg = curve.parmTemplateGroup()
+    curve_ptg.append(hou.FloatParmTemplate(ARCLENGTH_PARM, 'Arc Length', 1))
+    curve.setParmTemplateGroup(curve_ptg)
+    parm = curve.parm(ARCLENGTH_PARM)
+    parm.setExpression('detail("./%s", "arclength", 0)' % ARCLENGTH_NODE)
+    return (parm)
+
+def stretch_chain(curve, bones, prim=0, weights=None):
+    """ Make the bones of a chain share the length of curve.
+
+    Input:
+        curve - curve object the chain follows
+        bones - the bones, in chain order
+        prim - primitive of the curve to measure
+        weights - share of the length each bone gets, even when not given, normalized so they can be any scale
+    """
+    arclength = curve_arclength_parm(curve, prim)
+    if weights is None:
+        weights = [1.0] * len(bones)
+    total = float(sum(weights))
+    for bone, weight in zip(bones, weights):
+        bone.parm('length').setExpression('ch("%s") * %r' % (bone.relativePathTo(curve) + '/' + ARCLENGTH_PARM, weight / total))
+
+####MIRRORING####
+##reflection across the YZ plane, a transform M is mirrored as S * M * S
+MIRROR_MATRIX = hou.Matrix4(((-1, 0, 0, 0), (0, 1, 0, 0), (0, 0, 1, 0), (0, 0, 0, 1)))
+##side prefix in node names, parm names and paths, only at the start or after something that isn't a letter or number
+LEFT_PREFIX = re.compile(r'(?<![A-Za-z0-9])L_')
+##side word in parm labels, like 'L Arm'
+LEFT_LABEL = re.compile(r'(?<![A-Za-z0-9])L(?= )')
+##transform parm tuples and the components that flip sign when mirrored across X
+MIRRORED_PARMS = (('t', (0,)), ('r', (1, 2)), ('p', (0,)), ('pr', (1, 2)), ('R', (1, 2)))
+
+def mirror_string(text):
+    ##point a name, path or expression at the R side
+    return (LEFT_PREFIX.sub('R_', text))
+    
+def left_side_nodes(network):
+    ##every direct child of the network that is on the L side
+    return (rig_index(network).find(side='L'))
+    
+def mirror_node_parms(node):
+    ##rename the node's children and point every path and expression of the node and its children at the R side
+    for each in (node,) + node.allSubChildren():
+        if each is not node and LEFT_PREFIX.search(each.name()):
+            rename_node(each, mirror_string(each.name()), unique_name=True)
+        for parm in each.parms():
+            ##keyframed parms can hold expressions, plain string parms hold paths
+            if parm.keyframes():
+                expression = parm.expression()
+                mirrored = mirror_string(expression)
+                if mirrored != expression:
+                    parm.setExpression(mirrored, parm.expressionLanguage())
+            elif parm.parmTemplate().type() == hou.parmTemplateType.String:
+                value = parm.unexpandedString()
+                mirrored = mirror_string(value)
+                if mirrored != value:
+                    parm.set(mirrored)
+    
+def mirror_transform(node, mirrored_nodes):
+    ##mirror the pre transform and the plain transform parms of a copied object
+    pre = node.preTransform()
+    parent = node.input(0)
+    if parent is None or parent in mirrored_nodes or not isinstance(parent, hou.ObjNode):
+        ##parented to something that gets mirrored too (or nothing), so the local transform mirrors as it is
+        pre = MIRROR_MATRIX * pre * MIRROR_MATRIX
+    else:
+        ##parented to a centre node, mirror the world transform against the frame the parent hands its children,
+        ##which for a bone is the end of the bone and not its world transform
+        parent_frame = child_frame(parent)
+        pre = MIRROR_MATRIX * pre * parent_frame * MIRROR_MATRIX * parent_frame.inverted()
+    node.setPreTransform(pre)
+    ##parms driven by expressions or keys are left alone, they follow the mirrored parms of the HDA
+    for name, components in MIRRORED_PARMS:
+        parm_tuple = node.parmTuple(name)
+        if parm_tuple is None:
+            continue
+        for index in components:
+            if not parm_tuple[index].keyframes():
+                parm_tuple[index].set(-parm_tuple[index].eval())
+    
+def mirror_parm_template(template):
+    ##R side copy of an HDA parm template, folders are mirrored all the way down
+    mirrored = template.clone()
+    mirrored.setName(mirror_string(template.name()))
+    mirrored.setLabel(LEFT_LABEL.sub('R', template.label()))
+    if template.scriptCallback():
+        mirrored.setScriptCallback(mirror_string(template.scriptCallback()))
+    if template.type() == hou.parmTemplateType.Folder:
+        mirrored.setParmTemplates([mirror_parm_template(child) for child in template.parmTemplates()])
+    return (mirrored)
+    
+def mirror_parm_folders(rig_ptg):
+    ##add an R side folder for every L side folder of an HDA's template group, the caller writes it back
+    for template in rig_ptg.entries():
+        if template.type() == hou.parmTemplateType.Folder and LEFT_PREFIX.match(template.name()):
+            if rig_ptg.find(mirror_string(template.name())) is None:
+                rig_ptg.append(mirror_parm_template(template))
+    
+def mirror_side(rig_net):
+    """ Build the R side of the rig by reflecting the finished L side.
+
+    Every L_ node of the rig, and every L_ node inside the rig's chop networks, is
+    copied in one go so the wiring between them comes along. The copies are renamed
+    to R_, their paths and expressions are pointed at the R side and their
+    transforms are mirrored across X straight from the L side's. The parm writes
+    the build transaction is holding are flushed first so the copies get them. Nothing is
+    oriented or reparented again, so keeppos never has to do its work twice.
+    The R_ folders of the HDA interface the R side expressions use are made by
+    commit_interface, which has to run first.
+    Returns:
+        the R side nodes
+    """
+    ##the copies have to take the L side's queued parm writes (control shapes, sizes, colours) with them
+    if active_transaction is not None:
+        active_transaction.flush()
+    right_nodes = []
+    ##objects first, the chop networks hold the kinematics of both sides
+    networks = [rig_net] + rig_index(rig_net).find(side='C', node_type='chopnet')
+    for network in networks:
+        left_nodes = left_side_nodes(network)
+        ##skip anything that was already mirrored
+        index = rig_index(network)
+        left_nodes = [node for node in left_nodes if index.node(mirror_string(node.name())) is None]
+        if not left_nodes:
+            continue
+        copies = hou.copyNodesTo(left_nodes, network)
+        for left_node, copy in zip(left_nodes, copies):
+            copy.setName(mirror_string(left_node.name()), unique_name=True)
+            index.add(copy)
+        for left_node, copy in zip(left_nodes, copies):
+            mirror_node_parms(copy)
+            if isinstance(copy, hou.ObjNode):
+                mirror_transform(copy, copies)
+        right_nodes.extend(copies)
+    return (right_nodes)
+    
+####SKIN CAPTURE####
+##capture modes, the full biharmonic (clamped) solve or a quick proximity preview
+CAPTURE_CLAMPED_BIHARMONIC = 0
+CAPTURE_PROXIMITY = 1
+##python only reads and writes whole attributes at once, a wrangle on either side turns the mesh topology and the
+##capture arrays (which have a different length on every point) into attributes that can be
+TOPOLOGY_VEX = """int vertices[] = primvertices(0, @primnum);
+i@capture_first = len(vertices) ? vertices[0] : 0;
+i@capture_sides = primintrinsic(0, "typename", @primnum) == "Poly" ? len(vertices) : 0;
+foreach (int vertex; vertices)
+    setvertexattrib(0, "capture_point", -1, vertex, vertexpoint(0, vertex));
+"""
+CAPTURE_INDEX_ATTRIB = 'capture_index'
+CAPTURE_WEIGHT_ATTRIB = 'capture_weight'
+##the padding set_capture_weights adds has a region of -1 and is left out of the arrays
+CAPTURE_ARRAYS_VEX = """int regions[] = point(0, "capture_index", @ptnum);
+float weights[] = point(0, "capture_weight", @ptnum);
+int indices[];
+float data[];
+foreach (int number; int region; regions) {
+    if (region >= 0) {
+        append(indices, region);
+        append(data, weights[number]);
+    }
+}
+i[]@boneCapture_index = indices;
+f[]@boneCapture_data = data;
+"""
+
+def read_mesh_arrays(geo_ref, mesh):
+    ##every point position and the triangles of every polygon of mesh, each attribute in one call
+    topology = create_node(geo_ref, 'attribwrangle', 'capture_topology')
+    topology.setFirstInput(mesh)
+    ##read straight away, so the parms can't wait for the build transaction
+    topology.setParms({'class': 1, 'snippet': TOPOLOGY_VEX})
+    geo = topology.geometry()
+    points = np.array(geo.pointFloatAttribValues('P')).reshape(-1, 3)
+    triangles = rig_capture.fan_triangles(geo.vertexIntAttribValues('capture_point'),
+                                          geo.primIntAttribValues('capture_first'),
+                                          geo.primIntAttribValues('capture_sides'))
+    destroy_node(topology)
+    return (points, triangles)
+    
+def bone_rest_data(bones):
+    ##world rest transform and length of every bone, this is what the weight cache is keyed on
+    matrices = [bone.worldTransform().asTuple() for bone in bones]
+    lengths = [bone.evalParm('length') for bone in bones]
+    return (rig_weight_cache.rest_data(matrices, lengths))
+    
+def bone_capture_radii(bones):
+    ##capsule radius of every bone, the larger of its capture region caps set when the bone was made
+    radii = []
+    for bone in bones:
+        radii.append(max(bone.evalParmTuple('ccrtopcap')[0], bone.evalParmTuple('crtopcap')[0]))
+    return (np.array(radii))
+    
+def set_capture_weights(geo, indices, weights, max_influences=rig_capture.MAX_INFLUENCES):
+    """ Write the solved influences into an editable geometry, one call per attribute.
+
+    They go into fixed size tuple attributes, padded with region -1, and the
+    capture_arrays wrangle turns them into the capture arrays when the geometry
+    is read back. The region capture's own arrays are removed so they aren't stored.
+    """
+    padded_indices = np.full((len(indices), max_influences), -1, dtype=np.int32)
+    padded_weights = np.zeros((len(indices), max_influences), dtype=np.float32)
+    padded_indices[:, :indices.shape[1]] = indices
+    padded_weights[:, :weights.shape[1]] = weights
+    geo.addAttrib(hou.attribType.Point, CAPTURE_INDEX_ATTRIB, (-1,) * max_influences)
+    geo.addAttrib(hou.attribType.Point, CAPTURE_WEIGHT_ATTRIB, (0.0,) * max_influences)
+    geo.setPointIntAttribValuesFromString(CAPTURE_INDEX_ATTRIB, padded_indices.tobytes())
+    geo.setPointFloatAttribValuesFromString(CAPTURE_WEIGHT_ATTRIB, padded_weights.tobytes())
+    for name in ('boneCapture_index', 'boneCapture_data'):
+        attrib = geo.findPointAttrib(name)
+        if attrib is not None:
+            attrib.destroy()
+    
+def read_capture_weights(geo):
+    ##read the tuple attributes set_capture_weights wrote back into (n, k) index and weight arrays
+    index_attrib = geo.findPointAttrib(CAPTURE_INDEX_ATTRIB)
+    if index_attrib is None:
+        raise ValueError('The capture was made by an older version of the rig creator, capture the rig again')
+    indices = np.array(geo.pointIntAttribValues(CAPTURE_INDEX_ATTRIB), dtype=np.int32).reshape(-1, index_attrib.size())
+    weights = np.array(geo.pointFloatAttribValues(CAPTURE_WEIGHT_ATTRIB)).reshape(indices.shape)
+    ##padding reads back as no weight on region 0, like the unpacked arrays always did
+    indices[indices < 0] = 0
+    return (indices, weights)
+    
+def capture_mesh_key(rig_net, geo_ref):
+    ##hash of the mesh section create_mesh embedded in the HDA, plus the maya scale down if there is one
+    section = rig_net.type().definition().sections()[geo_ref.name() + '.bgeo']
+    if hasattr(section, 'binaryContents'):
+        mesh_data = section.binaryContents()
+    else:
+        mesh_data = section.contents()
+        ##contents() is text under python 3, the hash needs bytes
+        if not isinstance(mesh_data, bytes):
+            mesh_data = mesh_data.encode('utf-8')
+    scale_down = geo_ref.node('maya_scale_down')
+    if scale_down is not None:
+        mesh_data += ('scale %f' % scale_down.evalParm('scale')).encode('utf-8')
+    return (rig_weight_cache.mesh_hash(mesh_data))
+    
+def capture_bones(rig_net, geo):
+    ##the regions are listed as bone/cregion, keep the bones in that order so the weights give region numbers
+    region_paths = geo.attribValue('boneCapture_pCaptPath')
+    return ([rig_net.node(path.rsplit('/', 1)[0]) for path in region_paths])
+    
+def export_capture_weights(rig_net, file_path):
+    """ Export the current capture of the rig to file_path, keyed by bone name.
+
+    The file can be read back with import_capture_weights after the rig has been
+    rebuilt, as long as the mesh and the bone names are the same.
+    """
+    geo_ref = rig_net.node(rig_net.name() + '_geo')
+    ##the stored capture still has the weights as tuples and the capture paths
+    geo = geo_ref.node('capture_weights').geometry()
+    indices, weights = read_capture_weights(geo)
+    rig_weight_cache.export_weights(file_path, [bone.name() for bone in capture_bones(rig_net, geo)], indices, weights)
+    
+def import_capture_weights(rig_net, file_path):
+    ##capture the rig with exported weights instead of solving, returns the names of bones that were not found
+    geo_ref = rig_net.node(rig_net.name() + '_geo')
+    return (capture_skin(rig_net, geo_ref, import_path=file_path)[1])
+    
+def rest_mesh_node(geo_ref):
+    ##the character mesh before any capture, scaled down if it came from maya
+    scale_down = geo_ref.node('maya_scale_down')
+    if scale_down is not None:
+        return (scale_down)
+    return (geo_ref.node(geo_ref.parent().name() + '_ref'))
+    
+def capture_skin(rig_net, geo_ref, mode=CAPTURE_CLAMPED_BIHARMONIC, import_path=None):
+    """ Capture the character mesh to every bone of the rig.
+
+    A region capture is cooked once to get the capture paths and rest data bone deform
+    needs, the weights themselves come from rig_capture, either the biharmonic (clamped) solve or
+    the quick proximity preview. Solves are looked up in the weight cache first, keyed
+    on the embedded mesh and the bone rest data. On a miss the last capture of the same
+    mesh is updated where the skeleton changed, and only a new mesh gets a full solve.
+    Weights exported from an earlier build can be brought in with import_path instead. The result is frozen into the HDA
+    as a geometry section so the solve never runs again when the rig is loaded, and the capture_arrays wrangle
+    turns the weights stored there into the capture arrays bone deform needs.
+    Returns:
+        the bone deform SOP and the names of imported bones that were not found
+    """
+    hda_def = rig_net.type().definition()
+    ##clear out a previous capture so a preview can be replaced by the full solve
+    for name in ('capture_weights', 'capture_arrays', 'capture_pack', 'bone_deform'):
+        old_node = geo_ref.node(name)
+        if old_node is not None:
+            destroy_node(old_node)
+    mesh = rest_mesh_node(geo_ref)
+    ##region capture for the capture paths, unpacked so the weights can be written as plain arrays
+    capture = create_node(geo_ref, 'capture', 'capture_regions')
+    capture.setFirstInput(mesh)
+    capture.parm('rootpath').set(capture.relativePathTo(rig_net))
+    unpack = create_node(geo_ref, 'captureattribunpack', 'capture_unpack')
+    unpack.setFirstInput(capture)
+    capture_geo = hou.Geometry()
+    capture_geo.merge(unpack.geometry())
+    bones = capture_bones(rig_net, capture_geo)
+    bone_names = [bone.name() for bone in bones]
+    
+    missing = []
+    if import_path is not None:
+        ##weights from an earlier build, remapped by bone name
+        indices, weights, missing = rig_weight_cache.import_weights(import_path, bone_names, len(capture_geo.points()))
+    else:
+        ##look for the same mesh and skeleton in the cache before solving
+        rest = bone_rest_data(bones)
+        mesh_key = capture_mesh_key(rig_net, geo_ref)
+        cache_key = rig_weight_cache.cache_key(mesh_key, bone_names, rest, mode)
+        cached = rig_weight_cache.load(cache_key)
+        if cached is not None:
+            indices, weights = cached['indices'], cached['weights']
+        else:
+            ##solve on plain arrays
+            segments = rig_capture.segments_from_rest(rest)
+            points, triangles = read_mesh_arrays(geo_ref, mesh)
+            radii = None
+            if mode == CAPTURE_PROXIMITY:
+                radii = bone_capture_radii(bones)
+            ##when this mesh was captured before, only solve again where the skeleton changed
+            result = None
+            previous = rig_weight_cache.latest(mesh_key, mode)
+            if previous is not None:
+                result = rig_capture.update_weights(points, triangles, segments, previous['indices'], previous['weights'],
+                                                    previous['bones'], previous['rest'], bone_names, rest, radii)
+            if result is not None:
+                indices, weights = result
+            else:
+                ##symmetric meshes only get one half solved
+                indices, weights, unmatched = rig_capture.capture_weights(points, triangles, segments, bone_names, radii)
+                status_message('Capture symmetry: {:.1f}% of points have no mirror partner'.format(unmatched * 100))
+            rig_weight_cache.store(cache_key, mesh_key, bone_names, rest, mode, indices, weights)
+    set_capture_weights(capture_geo, indices, weights)
+    
+    ##store the captured geometry in the HDA and read it back from there
+    capture_name = geo_ref.name() + '_capture.bgeo'
+    hda_def.addSection(capture_name, capture_geo.data())
+    destroy_node(capture)
+    destroy_node(unpack)
+    capture_file = create_node(geo_ref, 'file', 'capture_weights')
+    capture_file.parm('file').set('opdef:../..?' + capture_name)
+    arrays = create_node(geo_ref, 'attribwrangle', 'capture_arrays')
+    arrays.setFirstInput(capture_file)
+    queue_parms(arrays, {'snippet': CAPTURE_ARRAYS_VEX})
+    pack = create_node(geo_ref, 'captureattribpack', 'capture_pack')
+    pack.setFirstInput(arrays)
+    deform = create_node(geo_ref, 'bonedeform', 'bone_deform')
+    deform.setFirstInput(pack)
+    deform.setDisplayFlag(True)
+    deform.setRenderFlag(True)
+    request_network_layout(geo_ref)
+    return (deform, missing)
+    
 def get_script_dir():
     script_file = os.path.abspath(__file__)
     #print script_path
     return os.path.dirname(script_file)
 
 
-class RigCreatorUI(QtWidgets.QDialog):
+####PIPELINE STAGES####
+##every stage of the rig runs from these functions, the dialog and rig_creator_cli.py only gather their arguments.
+##None of them touch Qt so a rig can be built under hython on a machine with no display
+@build_stage
+def create_mesh(geo_file, rig_name='', hda_save_loc='', from_maya=False, hda_file_name=None):
+    """ Make the rig HDA with the character geometry embedded in it.
+
+    Input:
+        geo_file - the character model
+        rig_name - name of the rig and its HDA, 'character_rig' when empty
+        hda_save_loc - folder the HDA is saved to as <rig_name>.hda, the script folder when empty
+        from_maya - scale the model down from centimetres
+        hda_file_name - full path of the HDA file, overrides hda_save_loc
+    Returns:
+        the rig HDA node
+    """
+    if geo_file == '':
+        raise ValueError('Character Geometry Not Chosen')
+    ##make sure the path has forward slashes
+    geo_file = geo_file.replace(os.path.sep, '/')
+    ##if the name feild is empty, than use the default name
+    if rig_name == '':
+        rig_name = 'character_rig'
+    ##debug print
+    ##print (rig_name)
+    ##grab the object level
+    obj_level = hou.node('/obj')
     
-    def __init__(self):
-        ##Rin the initialization on the inherited QDialog class
-        super(RigCreatorUI, self).__init__()
-        
-        ##set the window title
-        self.setWindowTitle('Rig Creator')
-        
-        #Assemble the file path for the ui file
-        ui_file_path = os.path.join(get_script_dir(), 'rig_creator_ui.ui')
-        #replace any os path seperators with forwardslashes for houdini to laod ui
-        ui_file_path = ui_file_path.replace(os.path.sep, '/')
-        ##print (ui_file_path)
-        
-        #create a Qfile object from the file path
-        qfile_object = QtCore.QFile(ui_file_path)
-        #open the QFile object
-        qfile_object.open(QtCore.QFile.ReadOnly)
-        
-        #create a QUI loader
-        loader = QtUiTools.QUiLoader()
-        #load the file and save it to a property
-        self.ui = loader.load(qfile_object, parentWidget = self)
-        """
-        above two line can be written as:
-        self.ui = QtUiTools.QUiLoader().load(qfile_object, parentWidget=self)
-        """
-        ######BUTTON CALLS#########
-        ##button call for browsing files to import
-        self.ui.btnImportBrowse.clicked.connect(self.import_browse)
-        
-        ##button call for browsing files to save to 
-        self.ui.btnHDABrowse.clicked.connect(self.save_browse)
-        
-        ##button call for importing the model
-        self.ui.btnImport.clicked.connect(self.create_mesh)
-        
-        ##button call for placing locators
-        self.ui.btnCreateLocators.clicked.connect(self.create_locators)
-        
-        ##button call for create bones
-        self.ui.btnCreateBones.clicked.connect(self.create_bones)
-        
-        ##button call for capturing skin wieghts
-        self.ui.btnCaptureMesh.clicked.connect(self.capture_mesh)
-        
-        
-        ##close the file handle
-        qfile_object.close()
-        
-        ##set window parent to houdini main window
-        self.setParent(hou.qt.mainWindow(), QtCore.Qt.Window)
-        
-        ##show the UI
-        self.show()
-        
-    ##def to close the window and unparent it from the main qt Window
-    def closeEvent(self, event):
-        self.setParent(None)
-        
-    ## defs needed for button calls and UI elements
-    def import_browse(self):
-        ##grab the script directory, we are going to use this as the starting point of our browse
-        default_folder = get_script_dir()
-        ##make sure that the directory has forward slashes and not backslashes
-        default_folder = default_folder.replace(os.path.sep, '/')
-        ##debug print
-        ##print (default_folder)
-        ##create a variable that calls a houdini browse function
-        result = hou.ui.selectFile(default_folder, 'Choose your Model')
-        ##if nothing was selected, do nothing
-        if result is None:
-            return
-        ##update the text feild next to the browse button with the selected file's path
-        self.ui.lineImportModel.setText(result)
-        
-    def save_browse(self):
-        ##grab the script directory, we are going to use this as the starting point of our browse
-        default_folder = get_script_dir()
-        ##make sure that the directory has forward slashes and not backslashes
-        default_folder = default_folder.replace(os.path.sep, '/')
-        ##debug print
-        ##print (default_folder)
-        ##create a variable that calls a houdini browse function
-        result = hou.ui.selectFile(default_folder, 'Choose HDA save directory', False, hou.fileType.Directory)
-        ##if nothing was selected, do nothing
-        if result is None:
-            return
-        ##update the text feild next to the browse button with the selected file's path
-        self.ui.lineHDASave.setText(result)
+    ##if the user din't choose a location, just save to where the script is
+    if hda_save_loc == '':
+        hda_save_loc = get_script_dir()
     
-    def create_mesh(self):
-        if self.ui.lineImportModel.text() == '':
-            hou.ui.displayMessage('Character Geometry Not Chosen', ('OK',), hou.severityType.Warning)
-            return
-        ##create a varaible storing the file path from the browse function
-        geo_file = self.ui.lineImportModel.text()
-        geo_file = geo_file.replace(os.path.sep, '/')
-        ##debug print
-        ##print (geo_file)
-        ##create a variable holding the rig name that was chosen
-        rig_name = self.ui.lineRigName.text()
-        ##if the name feild is empty, than use the default name
-        if rig_name == '':
-            rig_name = 'character_rig'
-        ##debug print
-        ##print (rig_name)
-        ##grab the object level
-        obj_level = hou.node('/obj')
-        
-        ##grab the custom save location for the HDA if it exists
-        hda_save_loc = self.ui.lineHDASave.text()
-        ##if the user din't choose a location, just save to where the script is
-        if hda_save_loc == '':
-            hda_save_loc = get_script_dir()
-        
-        ##create a custom HDA name based off the chosen rig name
-        hda_name = rig_name + '.hda'
-        
-        ##create a complete file directory to where the HDA will be saved using the hda_name and hda_save_loc
+    ##create a custom HDA name based off the chosen rig name
+    hda_name = rig_name + '.hda'
+    
+    ##create a complete file directory to where the HDA will be saved using the hda_name and hda_save_loc
+    if hda_file_name is None:
         hda_file_name = os.path.join(hda_save_loc, hda_name)
-        hda_file_name = hda_file_name.replace(os.path.sep, '/')
-        
-        ##create a subnetwork node and save it to a varible for later use
-        rig_net = obj_level.createNode('subnet', rig_name)
-        #create the digital asset from the subnet
-        rig_net = rig_net.createDigitalAsset(rig_name, hda_file_name, None, 0, 1)
-        ##grab the true Hda definition
-        hda_def = rig_net.type().definition()
-        
-        ####set the HDA's default parameter folders to be hidden####
-        ##Make a copy of the parmTempalteGroup
-        parm_temp_group = rig_net.parmTemplateGroup()
-        ##fine the transform folder
-        trans_folder = parm_temp_group.findFolder('Transform')
-        ##set it to hidden
-        parm_temp_group.hide(trans_folder, True)
-        ##find the subnet folder
-        subnet_folder = parm_temp_group.findFolder('Subnet')
-        ##set it to hidden
-        parm_temp_group.hide(subnet_folder, True)
-        ##reset the template group to the HDA
-        rig_net.setParmTemplateGroup(parm_temp_group)
-        
-        ####create a geo node in the new HDA for referenceing the geo chosen by user####
-        #create a unique name for the geo node
-        geo_ref_name = rig_name + '_geo'
-        #create the node
-        geo_ref = rig_net.createNode('geo', geo_ref_name)
-        #create a file node in the geo node holding the user chosen geometry
-        file_ref_name = rig_name + '_ref'
-        file_ref = geo_ref.createNode('file', file_ref_name)
-        ##set the geometry file to reference the chosen geo
-        file_ref.parm('file').set(geo_file)
-        ##inject the user selected geo into the HDA itself
-        ##grab the name of the geo node earlier created
-        node_name = geo_ref.name()
-        ##create a name based on the geo node name that will be a Houdini geometry
-        geometry_name = node_name + '.bgeo'
-        ##grab the folder data
-        geometry = file_ref.geometry().data()
-        ##add the geometry to the hda
-        hda_def.addSection(geometry_name, geometry) 
-        ##set the file node to the new geometry in HDA
-        file_ref.parm('file').set('opdef:../..?'+geometry_name)
-        
-        ##check if it is being imported from maya and scale it down if it is
-        if self.ui.chkFromMaya.isChecked() == True:
-            ##create a transform to scale down the geo
-            scale_down = geo_ref.createNode('xform', 'maya_scale_down')
-            ##parent the node to the file ref
-            scale_down.setFirstInput(file_ref)
-            ##set the scale to be 1/100
-            scale_down.parm('scale').set(.01)
-            ##set render and display flag
-            scale_down.setRenderFlag(True)
-            scale_down.setDisplayFlag(True)
-            ##layout the nodes in the geo network
-            geo_ref.layoutChildren()
-        
-        
-        ##create starting null objects
-        hidden_trans = rig_net.createNode('null', 'hidden_transform')
-        master = rig_net.createNode('null', 'master')
-        
-        #parent the hidden transform under the subnet's indirect input by accessing it's indirect input and choosing first of the list
-        hidden_trans.setFirstInput(rig_net.indirectInputs()[0])
-        
-        ##set visibility and selectability and inputs
-        geo_ref.setSelectableInViewport(False)
-        hidden_trans.setDisplayFlag(False)
-        hidden_trans.setSelectableInViewport(False)
-        master.setDisplayFlag(False)
-        master.setSelectableInViewport(False)
-        master.setFirstInput(hidden_trans)
-        ####change master's shape####
-        ##set the control display to be circles
-        master.parm('controltype').set(1)
-        ##set the control to only be on ZX plane
-        master.parm('orientation').set(2)
-        ##make the control slightly larger
-        master.parm('geoscale').set(1.75)
-        
-        ##comment and color nodes
-        geo_ref.setComment('This node holds the Character Geo reference')
-        hidden_trans.setComment('This node is for any Layout Work when the charater needs to be moved without affecting the animation')
-        ##set a color rgb value
-        purple = hou.Color((.27,.185,.6))
-        grey = hou.Color((.3,.3,.3))
-        turquoise = hou.Color((0,.67,.5))
-        ##set the node color 
-        geo_ref.setColor(purple)
-        hidden_trans.setColor(grey)
-        master.setColor(turquoise)
-        
-        ##layout nodes in the rig net so far
-        rig_net.layoutChildren()
-        
-        ##Enable the group box holding the AutoRig Functions and disable import functions
-        self.ui.grpAutoRig.setEnabled(True)
-        self.ui.grpImport.setEnabled(False)
-    
-    ##def for creating all null nodes that will be used as locators for creating bones
-    def create_locators(self):
-        ####grab a reference back to the rig subnet network####
-        ##grab the rig name
-        rig_name = self.ui.lineRigName.text()
-        ##create a full directory to that node
-        hda_node = '/obj/' + rig_name
-        ##select that node
-        rig_net = hou.node(hda_node)
-        
-        ##create an empty lists for appending nodes to for creating for loops later
-        locator_list = []
-        L_side_list = []
-        foot_list = []
-        finger_list = []
-        face_list = []
-        
-        ##create a COG locator
-        COG = rig_net.createNode('null', 'spine_base_locator')
-        COG.setParms({'ty':.95, 'tz':.015})
-        COG.parm('controltype').set(6)
-        locator_list.append(COG)
-        
-        ##create spine_top locator
-        ##call def for creating a null node that has a line to another node
-        spine_top = create_null_pointer(rig_net, COG, 'spine_top_locator')
-        ##place that node in a space that makes sence
-        spine_top.setParms({'ty':1.445, 'tz':-.006})
-        ##keep position when parenting
-        spine_top.parm('keeppos').set(1)
-        ##parent to previous node
-        spine_top.setFirstInput(COG)
-        ##apend node to any list that it relates to for later
-        locator_list.append(spine_top)
-        
-        ##create mid neck locator
-        mid_neck = create_null_pointer(rig_net, spine_top, 'mid_neck_locator')
-        mid_neck.setParms({'ty':1.5, 'tz':.012})
-        mid_neck.parm('keeppos').set(1)
-        mid_neck.setFirstInput(spine_top)
-        locator_list.append(mid_neck)
-        face_list.append(mid_neck)
-        
-        ##create skull base
-        skull_base = create_null_pointer(rig_net, mid_neck, 'skull_base_locator')
-        skull_base.setParms({'ty':1.568, 'tz':.015})
-        skull_base.parm('keeppos').set(1)
-        skull_base.setFirstInput(mid_neck)
-        locator_list.append(skull_base)
-        face_list.append(skull_base)
-        
-        ##create head top
-        head_top = create_null_pointer(rig_net, skull_base, 'head_top_locator')
-        head_top.setParms({'ty': 1.725, 'tz':.015})
-        head_top.parm('keeppos').set(1)
-        head_top.setFirstInput(skull_base)
-        locator_list.append(head_top)
-        face_list.append(head_top)
-        
-        ##create jaw hindge
-        jaw_hindge = create_null_pointer(rig_net, skull_base, 'jaw_hindge_locator')
-        jaw_hindge.setParms({'ty':1.587, 'tz':.055})
-        jaw_hindge.parm('keeppos').set(1)
-        jaw_hindge.setFirstInput(skull_base)
-        locator_list.append(jaw_hindge)
-        face_list.append(jaw_hindge)
-        
-        ##create chin locator
-        chin = create_null_pointer(rig_net, jaw_hindge, 'chin_locator')
-        chin.setParms({'ty':1.521, 'tz':.136})
-        chin.parm('keeppos').set(1)
-        chin.setFirstInput(jaw_hindge)
-        locator_list.append(chin)
-        face_list.append(chin)
-        
-        ##create tailbone locator
-        tailbone = create_null_pointer(rig_net, COG, 'tailbone_locator')
-        tailbone.setParms({'ty':.89, 'tz':-.03})
-        tailbone.parm('keeppos').set(1)
-        tailbone.setFirstInput(COG)
-        locator_list.append(tailbone)
-        
-        ##create left hip
-        L_hip = create_null_pointer(rig_net, COG, 'L_hip_locator')
-        L_hip.setParms({'tx':.094,'ty':.893,'tz':.018})
-        L_hip.parm('keeppos').set(1)
-        L_hip.setFirstInput(COG)
-        locator_list.append(L_hip)
-        L_side_list.append(L_hip)
-        
-        ##create left knee
-        L_knee = create_null_pointer(rig_net, L_hip, 'L_knee_locator')
-        L_knee.setParms({'tx':.15,'ty':.5,'tz':.039})
-        L_knee.parm('keeppos').set(1)
-        L_knee.setFirstInput(L_hip)
-        locator_list.append(L_knee)
-        L_side_list.append(L_knee)
-        
-        ##create L ankle 
-        L_ankle = create_null_pointer(rig_net, L_knee, 'L_ankle_locator')
-        L_ankle.setParms({'tx':.203,'ty':.087,'tz':.012})
-        L_ankle.parm('keeppos').set(1)
-        L_ankle.setFirstInput(L_knee)
-        locator_list.append(L_ankle)
-        L_side_list.append(L_ankle)
-        
-        ##create L ball
-        L_ball = create_null_pointer(rig_net, L_ankle, 'L_ball_locator')
-        L_ball.setParms({'tx':.203,'ty':.015,'tz':.137})
-        L_ball.parm('keeppos').set(1)
-        L_ball.setFirstInput(L_ankle)
-        locator_list.append(L_ball)
-        L_side_list.append(L_ball)
-        foot_list.append(L_ball)
-        
-        ##create L toe tip
-        L_toe_tip = create_null_pointer(rig_net, L_ball, 'L_toe_tip_locator')
-        L_toe_tip.setParms({'tx':.203, 'ty':.015, 'tz':.214})
-        L_toe_tip.parm('keeppos').set(1)
-        L_toe_tip.setFirstInput(L_ball)
-        locator_list.append(L_toe_tip)
-        L_side_list.append(L_toe_tip)
-        foot_list.append(L_toe_tip)
-        
-        ##create L heel
-        L_heel = create_null_pointer(rig_net, L_ankle, 'L_heel_locator')
-        L_heel.setParms({'tx':.2, 'tz':-0.033})
-        L_heel.parm('keeppos').set(1)
-        L_heel.setFirstInput(L_ankle)
-        locator_list.append(L_heel)
-        L_side_list.append(L_heel)
-        foot_list.append(L_heel)
-        
-        ##create L_foot_inner
-        L_foot_inner = create_null_pointer(rig_net, L_ball, 'L_foot_inner_locator')
-        L_foot_inner.setParms({'tx':.16,'tz':.136})
-        L_foot_inner.parm('keeppos').set(1)
-        L_foot_inner.setFirstInput(L_ball)
-        locator_list.append(L_foot_inner)
-        L_side_list.append(L_foot_inner)
-        foot_list.append(L_foot_inner)
-        
-        ##create L_foot_outer
-        L_foot_outer = create_null_pointer(rig_net, L_ball, 'L_foot_outer_locator')
-        L_foot_outer.setParms({'tx':.253, 'tz':.136})
-        L_foot_outer.parm('keeppos').set(1)
-        L_foot_outer.setFirstInput(L_ball)
-        locator_list.append(L_foot_outer)
-        L_side_list.append(L_foot_outer)
-        foot_list.append(L_foot_outer)
-        
-        ##create L_shoulder
-        L_shoulder = create_null_pointer(rig_net, spine_top, 'L_shoulder_locator')
-        L_shoulder.setParms({'tx':.17,'ty':1.4,'tz':-.005})
-        L_shoulder.parm('keeppos').set(1)
-        L_shoulder.setFirstInput(spine_top)
-        locator_list.append(L_shoulder)
-        L_side_list.append(L_shoulder)
-        
-        ##create L_elbow
-        L_elbow = create_null_pointer(rig_net, L_shoulder, 'L_elbow_locator')
-        L_elbow.setParms({'tx':.369,'ty':1.18,'tz':-.01})
-        L_elbow.parm('keeppos').set(1)
-        L_elbow.setFirstInput(L_shoulder)
-        locator_list.append(L_elbow)
-        L_side_list.append(L_elbow)
-        
-        ##create L_ wrist
-        L_wrist = create_null_pointer(rig_net, L_elbow, 'L_wrist_locator')
-        L_wrist.setParms({'tx':.545,'ty':1.003,'tz':.078})
-        L_wrist.parm('keeppos').set(1)
-        L_wrist.setFirstInput(L_elbow)
-        locator_list.append(L_wrist)
-        L_side_list.append(L_wrist)
-        
-        ##create thumb_base
-        thumb_base = create_null_pointer(rig_net, L_wrist, 'L_thumb_base_locator')
-        thumb_base.setParms({'tx':.543,'ty':.985,'tz':.12})
-        thumb_base.parm('keeppos').set(1)
-        thumb_base.setFirstInput(L_wrist)
-        locator_list.append(thumb_base)
-        L_side_list.append(thumb_base)
-        finger_list.append(thumb_base)
-        
-        ##create thumb_mid
-        thumb_mid = create_null_pointer(rig_net, thumb_base, 'L_thumb_mid_locator')
-        thumb_mid.setParms({'tx':.544,'ty':.973,'tz':.14})
-        thumb_mid.parm('keeppos').set(1)
-        thumb_mid.setFirstInput(thumb_base)
-        locator_list.append(thumb_mid)
-        L_side_list.append(thumb_mid)
-        finger_list.append(thumb_mid)
-        
-        ##create thumb_end
-        thumb_end = create_null_pointer(rig_net, thumb_mid, 'L_thumb_end_locator')
-        thumb_end.setParms({'tx':.545,'ty':.946,'tz':.168})
-        thumb_end.parm('keeppos').set(1)
-        thumb_end.setFirstInput(thumb_mid)
-        locator_list.append(thumb_end)
-        L_side_list.append(thumb_end)
-        finger_list.append(thumb_end)
-        
-        ##create thumb_tip_point
-        thumb_tip_point = create_null_pointer(rig_net, thumb_end, 'L_thumb_tip_point_locator')
-        thumb_tip_point.setParms({'tx':.5455,'ty':.923,'tz':.187})
-        thumb_tip_point.parm('keeppos').set(1)
-        thumb_tip_point.setFirstInput(thumb_end)
-        locator_list.append(thumb_tip_point)
-        L_side_list.append(thumb_tip_point)
-        finger_list.append(thumb_tip_point)
-        
-        ##create index_base
-        index_base = create_null_pointer(rig_net, L_wrist, 'L_index_base_locator')
-        index_base.setParms({'tx':.599,'ty':.9377,'tz':.145})
-        index_base.parm('keeppos').set(1)
-        index_base.setFirstInput(L_wrist)
-        locator_list.append(index_base)
-        L_side_list.append(index_base)
-        finger_list.append(index_base)
-        
-        ##create index_mid
-        index_mid = create_null_pointer(rig_net, index_base, 'L_index_mid_locator')
-        index_mid.setParms({'tx':.611,'ty':.9164,'tz':.159})
-        index_mid.parm('keeppos').set(1)
-        index_mid.setFirstInput(index_base)
-        locator_list.append(index_mid)
-        L_side_list.append(index_mid)
-        finger_list.append(index_mid)
-        
-        ##create index_end
-        index_end = create_null_pointer(rig_net, index_mid, 'L_index_end_locator')
-        index_end.setParms({'tx':.617,'ty':.8937,'tz':.171})
-        index_end.parm('keeppos').set(1)
-        index_end.setFirstInput(index_mid)
-        locator_list.append(index_end)
-        L_side_list.append(index_end)
-        finger_list.append(index_end)
-        
-        ##create index_tip_point
-        index_tip_point = create_null_pointer(rig_net, index_end, 'L_index_tip_point_locator')
-        index_tip_point.setParms({'tx':.62,'ty':.8682,'tz':.183})
-        index_tip_point.parm('keeppos').set(1)
-        index_tip_point.setFirstInput(index_end)
-        locator_list.append(index_tip_point)
-        L_side_list.append(index_tip_point)
-        finger_list.append(index_tip_point)
-        
-        ##create middle_base
-        middle_base = create_null_pointer(rig_net, L_wrist, 'L_middle_base_locator')
-        middle_base.setParms({'tx':.6061,'ty':.9320,'tz':.1181})
-        middle_base.parm('keeppos').set(1)
-        middle_base.setFirstInput(L_wrist)
-        locator_list.append(middle_base)
-        L_side_list.append(middle_base)
-        finger_list.append(middle_base)
-        
-        ##create middle_mid
-        middle_mid = create_null_pointer(rig_net, middle_base, 'L_middle_mid_locator')
-        middle_mid.setParms({'tx':.623,'ty':.9006,'tz':.129})
-        middle_mid.parm('keeppos').set(1)
-        middle_mid.setFirstInput(middle_base)
-        locator_list.append(middle_mid)
-        L_side_list.append(middle_mid)
-        finger_list.append(middle_mid)
-        
-        ##create middle_end
-        middle_end = create_null_pointer(rig_net, middle_mid, 'L_middle_end_locator')
-        middle_end.setParms({'tx':.632,'ty':.8729,'tz':.137})
-        middle_end.parm('keeppos').set(1)
-        middle_end.setFirstInput(middle_mid)
-        locator_list.append(middle_end)
-        L_side_list.append(middle_end)
-        finger_list.append(middle_end)
-        
-        ##create middle_tip_point
-        middle_tip_point = create_null_pointer(rig_net, middle_end, 'L_middle_tip_point_locator')
-        middle_tip_point.setParms({'tx':.636,'ty':.8465,'tz':.144})
-        middle_tip_point.parm('keeppos').set(1)
-        middle_tip_point.setFirstInput(middle_end)
-        locator_list.append(middle_tip_point)
-        L_side_list.append(middle_tip_point)
-        finger_list.append(middle_tip_point)
-        
-        ##create ring_base
-        ring_base = create_null_pointer(rig_net, L_wrist, 'L_ring_base_locator')
-        ring_base.setParms({'tx':.608,'ty':.9270,'tz':.0958})
-        ring_base.parm('keeppos').set(1)
-        ring_base.setFirstInput(L_wrist)
-        locator_list.append(ring_base)
-        L_side_list.append(ring_base)
-        finger_list.append(ring_base)
-        
-        ##create ring_mid
-        ring_mid = create_null_pointer(rig_net, ring_base, 'L_ring_mid_locator')
-        ring_mid.setParms({'tx':.623,'ty':.9018,'tz':.099})
-        ring_mid.parm('keeppos').set(1)
-        ring_mid.setFirstInput(ring_base)
-        locator_list.append(ring_mid)
-        L_side_list.append(ring_mid)
-        finger_list.append(ring_mid)
-        
-        ##create ring_end
-        ring_end = create_null_pointer(rig_net, ring_mid, 'L_ring_end_locator')
-        ring_end.setParms({'tx':.632,'ty':.8764,'tz':.102})
-        ring_end.parm('keeppos').set(1)
-        ring_end.setFirstInput(ring_mid)
-        locator_list.append(ring_end)
-        L_side_list.append(ring_end)
-        finger_list.append(ring_end)
-        
-        ##create ring_tip_point
-        ring_tip_point = create_null_pointer(rig_net, ring_end, 'L_ring_tip_point_locator')
-        ring_tip_point.setParms({'tx':.638,'ty':.8485,'tz':.105})
-        ring_tip_point.parm('keeppos').set(1)
-        ring_tip_point.setFirstInput(ring_end)
-        locator_list.append(ring_tip_point)
-        L_side_list.append(ring_tip_point)
-        finger_list.append(ring_tip_point)
-        
-        ##create pinky_base
-        pinky_base = create_null_pointer(rig_net, L_wrist, 'L_pinky_base_locator')
-        pinky_base.setParms({'tx':.602,'ty':.9297,'tz':.072})
-        pinky_base.parm('keeppos').set(1)
-        pinky_base.setFirstInput(L_wrist)
-        locator_list.append(pinky_base)
-        L_side_list.append(pinky_base)
-        finger_list.append(pinky_base)
-        
-        ##create pinky_mid
-        pinky_mid = create_null_pointer(rig_net, pinky_base, 'L_pinky_mid_locator')
-        pinky_mid.setParms({'tx':.611,'ty':.9065,'tz':.072})
-        pinky_mid.parm('keeppos').set(1)
-        pinky_mid.setFirstInput(pinky_base)
-        locator_list.append(pinky_mid)
-        L_side_list.append(pinky_mid)
-        finger_list.append(pinky_mid)
-        
-        ##create pinky_end
-        pinky_end = create_null_pointer(rig_net, pinky_mid, 'L_pinky_end_locator')
-        pinky_end.setParms({'tx':.616,'ty':.8895,'tz':.072})
-        pinky_end.parm('keeppos').set(1)
-        pinky_end.setFirstInput(pinky_mid)
-        locator_list.append(pinky_end)
-        L_side_list.append(pinky_end)
-        finger_list.append(pinky_end)
-        
-        ##create pinky_tip_point
-        pinky_tip_point = create_null_pointer(rig_net, pinky_end, 'L_pinky_tip_point_locator')
-        pinky_tip_point.setParms({'tx':.618,'ty':.8679,'tz':.072})
-        pinky_tip_point.parm('keeppos').set(1)
-        pinky_tip_point.setFirstInput(pinky_end)
-        locator_list.append(pinky_tip_point)
-        L_side_list.append(pinky_tip_point)
-        finger_list.append(pinky_tip_point)
-        
-        ####FACE CURVES AND LOCATORS####
-        ##left cheek
-        cheek = create_face_path(rig_net, 3, 'L_cheek')
-        ##extract nodes
-        cheek_locs = cheek[0]
-        cheek_loc0 = cheek_locs[0]
-        cheek_loc0.parmTuple('t').set((.065, 1.586, 0.061))
-        cheek_loc1 = cheek_locs[1]
-        cheek_loc1.parmTuple('t').set((.053, 1.58, 0.103))
-        cheek_loc2 = cheek_locs[2]
-        cheek_loc2.parmTuple('t').set((.043, 1.538, 0.103))
-        face_list.append(cheek_loc0)
-        face_list.append(cheek_loc1)
-        face_list.append(cheek_loc2)
-        
-        ##left brow
-        brow = create_face_path(rig_net, 3, 'L_brow')
-        ##extract nodes and place in a default space that makes sence
-        brow_locs = brow[0]
-        brow_loc0 = brow_locs[0]
-        brow_loc0.parmTuple('t').set((.007, 1.63, .137))
-        brow_loc1 = brow_locs[1]
-        brow_loc1.parmTuple('t').set((.034, 1.643, .137))
-        brow_loc2 = brow_locs[2]
-        brow_loc2.parmTuple('t').set((.053, 1.626, .115))
-        face_list.append(brow_loc0)
-        face_list.append(brow_loc1)
-        face_list.append(brow_loc2)
-        
-        ##left squint
-        squint = create_face_path(rig_net, 3, 'L_squint')
-        squint_locs = squint[0]
-        squint_loc0 = squint_locs[0]
-        squint_loc0.parmTuple('t').set((.016, 1.607, .127))
-        squint_loc1 = squint_locs[1]
-        squint_loc1.parmTuple('t').set((.038, 1.6, .127))
-        squint_loc2 = squint_locs[2]
-        squint_loc2.parmTuple('t').set((.052, 1.608, .114))
-        face_list.append(squint_loc0)
-        face_list.append(squint_loc1)
-        face_list.append(squint_loc2)
-        
-        ##left smile_line
-        smile_line = create_face_path(rig_net, 3, 'L_smile_line')
-        smile_locs = smile_line[0]
-        smile_loc0 = smile_locs[0]
-        smile_loc0.parmTuple('t').set((.016, 1.6, .13))
-        smile_loc1 = smile_locs[1]
-        smile_loc1.parmTuple('t').set((.033, 1.58, .128))
-        smile_loc2 = smile_locs[2]
-        smile_loc2.parmTuple('t').set((.034, 1.557, .124))
-        face_list.append(smile_loc0)
-        face_list.append(smile_loc1)
-        face_list.append(smile_loc2)
-        
-        ##left nostril
-        nostril = create_face_path(rig_net, 3, 'L_nostril')
-        nostril_locs = nostril[0]
-        nostril_loc0 = nostril_locs[0]
-        nostril_loc0.parmTuple('t').set((.014, 1.593, .135))
-        nostril_loc1 = nostril_locs[1]
-        nostril_loc1.parmTuple('t').set((.022, 1.584, .128))
-        nostril_loc2 = nostril_locs[2]
-        nostril_loc2.parmTuple('t').set((.015, 1.578, .135))
-        face_list.append(nostril_loc0)
-        face_list.append(nostril_loc1)
-        face_list.append(nostril_loc2)
-        
-        ##upper lip locs
-        upper_lip = create_face_path(rig_net, 5, 'upper_lip')
-        u_lip_locs = upper_lip[0]
-        u_lip_loc0 = u_lip_locs[0]
-        u_lip_loc0.parmTuple('t').set((-.024, 1.557, .131))
-        u_lip_loc1 = u_lip_locs[1]
-        u_lip_loc1.parmTuple('t').set((-.014, 1.561, .143))
-        u_lip_loc2 = u_lip_locs[2]
-        u_lip_loc2.parmTuple('t').set((0, 1.561, .146))
-        u_lip_loc3 = u_lip_locs[3]
-        u_lip_loc3.parmTuple('t').set((.014, 1.562, .143))
-        u_lip_loc4 = u_lip_locs[4]
-        u_lip_loc4.parmTuple('t').set((.024, 1.557, .131))
-        face_list.append(u_lip_loc0)
-        face_list.append(u_lip_loc1)
-        face_list.append(u_lip_loc2)
-        face_list.append(u_lip_loc3)
-        face_list.append(u_lip_loc4)
-        u_lip_path = upper_lip[1]
-        
-        ##lower lip locs
-        lower_lip = create_face_path(rig_net, 5, 'lower_lip')
-        l_lip_locs = lower_lip[0]
-        l_lip_loc0 = l_lip_locs[0]
-        l_lip_loc0.parmTuple('t').set((-.023, 1.555, .13))
-        l_lip_loc1 = l_lip_locs[1]
-        l_lip_loc1.parmTuple('t').set((-.014, 1.554, .14))
-        l_lip_loc2 = l_lip_locs[2]
-        l_lip_loc2.parmTuple('t').set((0, 1.552, .143))
-        l_lip_loc3 = l_lip_locs[3]
-        l_lip_loc3.parmTuple('t').set((.014, 1.554, .14))
-        l_lip_loc4 = l_lip_locs[4]
-        l_lip_loc4.parmTuple('t').set((.023, 1.555, .13))
-        face_list.append(l_lip_loc0)
-        face_list.append(l_lip_loc1)
-        face_list.append(l_lip_loc2)
-        face_list.append(l_lip_loc3)
-        face_list.append(l_lip_loc4)
-        l_lip_path = upper_lip[1]
-        
-        
-        ##layout all the new nodes
-        rig_net.layoutChildren()
-        ##create a network box to place all the locators
-        locators_box = rig_net.createNetworkBox('locator_nulls')
-        
-        ##create some colors for coloring nodes
-        cyan = hou.Color((0,.7,.7))
-        dark_cyan = hou.Color((0,.4,.4))
-        ##for every node in the locator_list change its network color and its display scale and add it to the box
-        for node in locator_list:
-            node.setColor(cyan)
-            node.parm('geoscale').set(.2)
-            locators_box.addItem(node)
-        ##minimize the box and color it
-        locators_box.setMinimized(True)
-        locators_box.setColor(dark_cyan)
-        ##for all null nodes that relate to the foot change the display scale
-        for node in foot_list:
-            node.parm('geoscale').set(.1)
-        ##for all null nodes that relate to the hand change the display scale
-        for node in finger_list:
-            node.parm('geoscale').set(.03)
-        for node in face_list:
-            node.parm('geoscale').set(.02)
-        ##re-layout everything
-        rig_net.layoutChildren()
-        
-    def create_bones(self):
-        
-        ##grab all the references back to the different levels of the node network
-        ##top level
-        obj_level = hou.node('/obj')
-        ##grab the rig name
-        rig_name = self.ui.lineRigName.text()
-        #reset rig name to be a full path
-        rig_name = rig_name + '/'
-        ##get the rig network
-        rig_net = obj_level.node(rig_name)
-        ##grab the master null node
-        master = rig_net.node('master/')
-        
-        ##for every null node in the rig_net (locators) turn off its display and selectability
-        for each in rig_net.children():
-            ##debug print
-            ##print (each.type().name())
-            if each.type().name() == 'null':
-                each.setDisplayFlag(False)
-                each.setSelectableInViewport(False)
-        
-        ##create a list of the spine locators
-        spine_nodes = []
-        spine_nodes.append(rig_net.node('spine_base_locator/'))
-        spine_nodes.append(rig_net.node('spine_top_locator/'))
-        
-        ##create a bone for the spine and split it 6 times
-        spine_bone = create_root_bone_chain(master, spine_nodes, 'spine')
-        spine_root = spine_bone[0]
-        spine_bone = spine_bone[1]
-        ##get the spine root from the created bones from earlier
-        spine_split = split_bone(spine_bone, 6)
-        
-        ##create a null in the middle of the last spine bone for creation of a shoulder bone
-        wing_locator = rig_net.createNode('null', 'wing_locator')
-        ##place that locator in the middle of the last spine bone by
-        ##parent to last spine bone
-        wing_locator.setFirstInput(rig_net.node('split_spine_bone6/'))
-        ##moving the locator halfway up the bone length
-        wing_locator.parm('tz').setExpression('-ch("../split_spine_bone6/length")/2')
-        ##uparenting it
-        wing_locator.parm('keeppos').set(True)
-        wing_locator.setFirstInput(None)
-        ##move the locator away fromt he center axis
-        wing_locator.parm('tx').set(.05)
-        ##set flags
-        wing_locator.setSelectableInViewport(False)
-        wing_locator.setDisplayFlag(False)
-        ##grab the locator box
-        locator_nulls = rig_net.findNetworkBox('locator_nulls')
-        locator_nulls.addItem(wing_locator)
-        
-        ##shoulder list
-        shoulder_list =  []
-        shoulder_list.append(wing_locator)
-        shoulder_list.append(rig_net.node('L_shoulder_locator'))
-        
-        ##create a list for the arm locators
-        arm_locators = []
-        arm_locators.append(rig_net.node('L_shoulder_locator'))
-        arm_locators.append(rig_net.node('L_elbow_locator'))
-        arm_locators.append(rig_net.node('L_wrist_locator'))
-        
-        ##hand
-        hand_locators = []
-        hand_locators.append(rig_net.node('L_wrist_locator'))
-        hand_locators.append(rig_net.node('L_middle_base_locator'))
-        
-        ##create a list for the finger locators
-        ##thumb
-        thumb_locators = []
-        thumb_locators.append(rig_net.node('L_thumb_base_locator'))
-        thumb_locators.append(rig_net.node('L_thumb_mid_locator'))
-        thumb_locators.append(rig_net.node('L_thumb_end_locator'))
-        thumb_locators.append(rig_net.node('L_thumb_tip_point_locator'))
-        ##index
-        index_locators = []
-        index_locators.append(rig_net.node('L_index_base_locator'))
-        index_locators.append(rig_net.node('L_index_mid_locator'))
-        index_locators.append(rig_net.node('L_index_end_locator'))
-        index_locators.append(rig_net.node('L_index_tip_point_locator'))
-        ##middle
-        middle_locators = []
-        middle_locators.append(rig_net.node('L_middle_base_locator'))
-        middle_locators.append(rig_net.node('L_middle_mid_locator'))
-        middle_locators.append(rig_net.node('L_middle_end_locator'))
-        middle_locators.append(rig_net.node('L_middle_tip_point_locator'))
-        ##ring
-        ring_locators = []
-        ring_locators.append(rig_net.node('L_ring_base_locator'))
-        ring_locators.append(rig_net.node('L_ring_mid_locator'))
-        ring_locators.append(rig_net.node('L_ring_end_locator'))
-        ring_locators.append(rig_net.node('L_ring_tip_point_locator'))
-        ##pinky
-        pinky_locators = []
-        pinky_locators.append(rig_net.node('L_pinky_base_locator'))
-        pinky_locators.append(rig_net.node('L_pinky_mid_locator'))
-        pinky_locators.append(rig_net.node('L_pinky_end_locator'))
-        pinky_locators.append(rig_net.node('L_pinky_tip_point_locator'))
-        
-        ##create a list for the leg locators
-        leg_locators = []
-        leg_locators.append(rig_net.node('L_hip_locator'))
-        leg_locators.append(rig_net.node('L_knee_locator'))
-        leg_locators.append(rig_net.node('L_ankle_locator'))
-        
-        foot_locators = []
-        foot_locators.append(rig_net.node('L_ankle_locator'))
-        foot_locators.append(rig_net.node('L_ball_locator'))
-        foot_locators.append(rig_net.node('L_toe_tip_locator'))
-        
-        ##tailbone list
-        tailbone_locators = []
-        tailbone_locators.append(rig_net.node('spine_base_locator'))
-        tailbone_locators.append(rig_net.node('tailbone_locator'))
-        
-        ##neck list
-        neck_locators = []
-        neck_locators.append(rig_net.node('spine_top_locator'))
-        neck_locators.append(rig_net.node('mid_neck_locator'))
-        neck_locators.append(rig_net.node('skull_base_locator'))
-        
-        ##head list
-        head_locators = []
-        head_locators.append(rig_net.node('skull_base_locator'))
-        head_locators.append(rig_net.node('head_top_locator'))
-        
-        ##jaw locators
-        jaw_locators = []
-        jaw_locators.append(rig_net.node('jaw_hindge_locator'))
-        jaw_locators.append(rig_net.node('chin_locator'))
-        
-        ####creating the bones####
-        ##create pelvis root and bones
-        pelvis = create_root_bone_chain(spine_root, tailbone_locators, 'pelvis')
-        ##grab the pelvis bone
-        pelvis_bone = pelvis[1]
-        ##create neck root and bones
-        neck_bones = create_root_bone_chain(spine_split, neck_locators, 'neck')
-        ##grab the neck last bone
-        neck_last = neck_bones[2]
-        head_bone = create_root_bone_chain(neck_last, head_locators, 'head')
-        head_last = head_bone[1]
-        jaw_bone = create_root_bone_chain(head_last, jaw_locators, 'jaw')
-        jaw_last = jaw_bone[1]
-        shoulder_bone = create_root_bone_chain(spine_split, shoulder_list, 'L_shoulder')
-        shoulder_last = shoulder_bone[1]
-        ##Rotating the hand and shoulder bone to be a good position for my default model that I am basing this tool off of and will ship the tool with        
-        shoulder_last.parm('rz').set(-170)
-        arm_bones = create_root_bone_chain(shoulder_last, arm_locators, 'L_arm')
-        arm_last = arm_bones[2]
-        hand_bone = create_root_bone_chain(arm_last, hand_locators, 'L_hand')
-        hand_last = hand_bone[1]
-        ##Rotating the hand and shoulder bone to be a good position for my default model that I am basing this tool off of and will ship the tool with
-        hand_last.parm('rz').set(-20)
-        leg_bones = create_root_bone_chain(pelvis_bone, leg_locators, 'L_leg')
-        leg_last = leg_bones[2]
-        foot_bones = create_root_bone_chain(leg_last, foot_locators, 'L_foot')
-        foot_last = foot_bones[2]
-        thumb_bones = create_root_bone_chain(hand_last, thumb_locators, 'L_thumb')
-        index_bones = create_root_bone_chain(hand_last, index_locators, 'L_index')
-        middle_bones = create_root_bone_chain(hand_last, middle_locators, 'L_middle')
-        ring_bones = create_root_bone_chain(hand_last, ring_locators, 'L_ring')
-        pinky_bones = create_root_bone_chain(hand_last, pinky_locators, 'L_pinky')
-        
-        ####FACE BONES####
-        L_cheek_path = rig_net.node('L_cheek_path')
-        makeBonesFromCurve(L_cheek_path, 'L_cheek', 6, 1, 1)
-        brow_path = rig_net.node('L_brow_path')
-        makeBonesFromCurve(brow_path, 'L_brow', 6, 1, 1)
-        squint_path = rig_net.node('L_squint_path')
-        makeBonesFromCurve(squint_path, 'L_squint', 3, 1, 1)
-        smile_line_path = rig_net.node('L_smile_line_path')
-        makeBonesFromCurve(smile_line_path, 'L_smile_line', 4, 1, 1)
-        nostril_path = rig_net.node('L_nostril_path')
-        makeBonesFromCurve(nostril_path, 'L_nostril', 3, 1, 1)
-        lower_lip_path = rig_net.node('lower_lip_path')
-        makeBonesFromCurve(lower_lip_path, 'lower_lip', 6, 1, 1)
-        upper_lip_path = rig_net.node('upper_lip_path')
-        makeBonesFromCurve(upper_lip_path, 'upper_lip', 6, 1, 1)
-        
-        ##turn keep position on in case user wants to reorient bones
-        for bone in rig_net.children():
-            if bone.type().name() == 'bone':
-                bone.parm('keeppos').set(True)
-                
-        rig_net.layoutChildren()
-        
-    def capture_mesh(self):
-        ##grab all the references back to the different levels of the node network
-        ##top level
-        obj_level = hou.node('/obj')
-        ##grab the rig name
-        rig_name = self.ui.lineRigName.text()
-        #reset rig name to be a full path
-        rig_name = rig_name + '/'
-        ##get the rig network
-        rig_net = obj_level.node(rig_name)
-        ##grab the master null node
-        master = rig_net.node('master/')
-        
-        ##colors
-        purple = hou.Color((.27,.185,.6))
-        dull_red = hou.Color((.5,.12,.12))
-        grey = hou.Color((.3,.3,.3))
-        turquoise = hou.Color((0,.67,.5))
-        
-        ##create a list for all the bones
-        bones_list = []
-        
-        ##gather all the bones into a list
-        for each in rig_net.children():
-            if each.type().name() == 'bone':
-                bones_list.append(each)
-                each.setSelectableInViewport(False)
-                ##"zero" out the rotation and position of the bones
-                each.moveParmTransformIntoPreTransform()
-                ##set all rest angles to 0
-                each.parmTuple('R').set((0,0,0))
-            ##turn off all null display including root nulls
-            if each.type().name() == 'null':
-                each.setDisplayFlag(False)
-                each.setSelectableInViewport(False)
-        
-        ##create a list for ctrls
-        ctrl_list = []
-        
-        ####MASTER CONTROL####
-        ##turn master control back on
-        master.setDisplayFlag(True)
-        master.setSelectableInViewport(True)
-        ##add master to control list
-        ctrl_list.append(master)
-        
-        ####MASTER UI ELEMENTS####
-        ##create the master folder for the HDA
-        ##grab the hda parmTemplateGroup
-        rig_ptg = rig_net.parmTemplateGroup()
-        ##create master folder
-        master_folder = hou.FolderParmTemplate('master_folder', 'Master')
-        
-        ##create the needed folders in master folder
-        m_display_folder = hou.FolderParmTemplate('m_display_folder', 'Display')
-        m_action_folder = hou.FolderParmTemplate('m_action_folder', 'Actions')
-        m_ctrl_folder = hou.FolderParmTemplate('m_ctrl_folder', 'Controls')
-        ##change to simple
-        m_display_folder.setFolderType(hou.folderType.Simple)
-        m_action_folder.setFolderType(hou.folderType.Simple)
-        m_ctrl_folder.setFolderType(hou.folderType.Simple)
-        
-        ##create the needed menu parameters to the display folder
-        ##create a menu item with name 'm_display' label 'Master Display', Menu items of 0 and 1, with names for those items as OFF and ON and set it to be ON by default
-        m_display = hou.MenuParmTemplate('m_display', 'Master Display', ['0', '1'], ['OFF', 'ON'], 1)
-        m_geo_display = hou.MenuParmTemplate('m_geo_display', 'Geo Display', ['0', '1'], ['OFF', 'ON'], 1)
-        m_bone_display = hou.MenuParmTemplate('m_bone_display', 'Bone Display', ['0', '1'], ['OFF', 'ON'], 0)
-        m_ctrl_dispaly = hou.MenuParmTemplate('m_ctrl_display', 'Controls Display', ['0', '1'], ['OFF', 'ON'], 1)
-        ##add the menu items to the folder
-        m_display_folder.addParmTemplate(m_display)
-        m_display_folder.addParmTemplate(m_geo_display)
-        m_display_folder.addParmTemplate(m_bone_display)
-        m_display_folder.addParmTemplate(m_ctrl_dispaly)
-        ##add the m_display folder to the master folder
-        master_folder.addParmTemplate(m_display_folder)
-        
-        ##create buttons for the actions folder
-        all_default = hou.ButtonParmTemplate('set_all_to_default', 'Set ALL to Default')
-        all_key = hou.ButtonParmTemplate('set_all_keys', 'Set ALL Keys')
-        m_action_sep = hou.SeparatorParmTemplate('m_action_sep')
-        master_default = hou.ButtonParmTemplate('set_master_to_default', 'Set Master to Default')
-        master_key = hou.ButtonParmTemplate('set_master_key', 'Set Master Key')
-        ##add the buttons to the actions folder
-        m_action_folder.addParmTemplate(all_default)
-        m_action_folder.addParmTemplate(all_key)
-        m_action_folder.addParmTemplate(m_action_sep)
-        m_action_folder.addParmTemplate(master_default)
-        m_action_folder.addParmTemplate(master_key)
-        ##add the action folder to the master folder
-        master_folder.addParmTemplate(m_action_folder)
-        
-        ##create floats for the master control
-        m_trans = hou.FloatParmTemplate('master_trans', 'Master Translate', 3)
-        m_rot = hou.FloatParmTemplate('master_rot', 'Master Rotate', 3)
-        m_scale = hou.FloatParmTemplate('master_scale', 'Master Scale', 1, [1])
-        ##add the floats to the control folder
-        m_ctrl_folder.addParmTemplate(m_trans)
-        m_ctrl_folder.addParmTemplate(m_rot)
-        m_ctrl_folder.addParmTemplate(m_scale)
-        ##add the ctrl folder to master
-        master_folder.addParmTemplate(m_ctrl_folder)
-        
-        ##add the master folder to the template group
-        rig_ptg.addParmTemplate(master_folder)
-        ##reset the rig_net template back to the copy we have been editing
-        rig_net.setParmTemplateGroup(rig_ptg)
-        
-        ####MASTER UI TO CONTROL IMPLEMENTATION####
-        ##set parameters to reference the HDA created parameters as if "promoting"
-        master.parm('tx').setExpression('ch("../master_transx")')
-        master.parm('ty').setExpression('ch("../master_transy")')
-        master.parm('tz').setExpression('ch("../master_transz")')
-        master.parm('rx').setExpression('ch("../master_rotx")')
-        master.parm('ry').setExpression('ch("../master_roty")')
-        master.parm('rz').setExpression('ch("../master_rotz")')
-        master.parm('scale').setExpression('ch("../master_scale")')
-        ##display
-        master.parm('tdisplay').set(True)
-        master.parm('display').setExpression('ch("../m_display")')
-        
-        
-        ####CREATE COG CTRL####
-        spine_1 = rig_net.node('split_spine_bone1/')
-        COG = create_null_at_node(rig_net, spine_1, 'COG_ctrl')
-        COG.parm('ty').setExpression('ch("../split_spine_bone1/length")/2')
-        COG.parm('ty').deleteAllKeyframes()
-        COG.moveParmTransformIntoPreTransform()
-        COG.setFirstInput(master)
-        COG.setColor(turquoise)
-        COG.parm('controltype').set(1)
-        COG.parm('orientation').set(2)
-        COG.parmTuple('dcolor').set((1,0,1))
-        ctrl_list.append(COG)
-        
-        
-        ####SPINE CURVE####
-        ##create the spine curve for FK and IK functions
-        spine_path = rig_net.createNode('path', 'spine_path')
-        ##find the points merge node in the path node
-        points_merge = spine_path.node('points_merge/')
-        ##allow for three objects to link to the path
-        points_merge.parm('numobj').set(3)
-        ##find the rest of the needed nodes in the path network
-        delete_endpoints = spine_path.node('delete_endpoints/')
-        connect_points = spine_path.node('connect_points/')
-        output_curve = spine_path.node('output_curve/')
-        ##create the path cv points
-        spine_base_cv = rig_net.createNode('pathcv', 'spine_base_cv')
-        spine_mid_cv = rig_net.createNode('pathcv', 'spine_mid_cv')
-        spine_top_cv = rig_net.createNode('pathcv', 'spine_top_cv')
-        ##shink the z axis on the cvs for a smoother path creation
-        spine_base_cv.parm('sz').set(.1)
-        spine_mid_cv.parm('sz').set(.1)
-        spine_top_cv.parm('sz').set(.1)
-        ##get the path to the cv's points node
-        spine_base_cv_path = spine_base_cv.path() + '/points'
-        spine_mid_cv_path = spine_mid_cv.path() + '/points'
-        spine_top_cv_path = spine_top_cv.path() + '/points'
-        ##input the cvs into the points merge
-        points_merge.parm('objpath1').set(spine_base_cv_path)
-        points_merge.parm('objpath2').set(spine_mid_cv_path)
-        points_merge.parm('objpath3').set(spine_top_cv_path)
-        ##delete the mid_cv's extension points in preperation of changing to a NURBS 
-        delete_mid = spine_path.createNode('delete', 'delete_midpoints')
-        delete_mid.setFirstInput(delete_endpoints)
-        connect_points.setFirstInput(delete_mid)
-        spine_path.layoutChildren()
-        ##set parms on the delete node for getting rid of those mid cvs
-        delete_mid.parm('entity').set(1)
-        delete_mid.parm('group').set('2 4')
-        ##turn the curve to a NURBS
-        output_curve.parm('totype').set(4)
-        ####position the cvs in the correct spots####
-        ##spine base
-        spine_base_cv.setFirstInput(rig_net.node('split_spine_bone1'))
-        spine_base_cv.parm('keeppos').set(True)
-        spine_base_cv.setFirstInput(None)
-        ##spine mid
-        spine_mid_cv.setFirstInput(rig_net.node('split_spine_bone4'))
-        spine_mid_cv.parm('keeppos').set(True)
-        spine_mid_cv.setFirstInput(None)
-        ##spine top
-        spine_top_cv.setFirstInput(rig_net.node('split_spine_bone6'))
-        spine_top_cv.parm('tz').setExpression('-ch("../split_spine_bone6/length")')
-        spine_top_cv.parm('keeppos').set(True)
-        spine_top_cv.setFirstInput(None)
-        spine_top_cv.parm('tz').deleteAllKeyframes()
-        ##set flags
-        spine_base_cv.setSelectableInViewport(False)
-        spine_base_cv.setDisplayFlag(False)
-        spine_mid_cv.setSelectableInViewport(False)
-        spine_mid_cv.setDisplayFlag(False)
-        spine_top_cv.setSelectableInViewport(False)
-        spine_top_cv.setDisplayFlag(False)
-        spine_path.setSelectableInViewport(False)
-        spine_path.setDisplayFlag(False)
-        
-        ####Spine Controls####
-        ##create the IK controls
-        hip_IK = create_null_at_node(rig_net, spine_base_cv, 'hip_IK_ctrl')
-        mid_IK = create_null_at_node(rig_net, spine_mid_cv, 'mid_IK_ctrl')
-        chest_IK = create_null_at_node(rig_net, spine_top_cv, 'chest_IK_ctrl')
-        ##set some parameters so the ctrls look nicer
-        ##control type to box
-        hip_IK.parm('controltype').set(2)
-        mid_IK.parm('controltype').set(2)
-        chest_IK.parm('controltype').set(2)
-        ##change display scale (not actual scale)
-        hip_IK.setParms({'geosizex':.7, 'geosizey':.1, 'geosizez':.6})
-        mid_IK.setParms({'geosizex':.6, 'geosizey':.025, 'geosizez':.5})
-        chest_IK.setParms({'geosizex':.7, 'geosizey':.1, 'geosizez':.4})
-        ##move the center of the mid IK forward a bit to compensate for spine curve
-        mid_IK.parm('geocenterz').set(.03)
-        ##changing the node color
-        hip_IK.setColor(turquoise)
-        mid_IK.setColor(turquoise)
-        chest_IK.setColor(turquoise)
-        ##create the FK controls
-        FK_A = create_null_at_node(rig_net, rig_net.node('split_spine_bone1'), 'spine_A_FK_ctrl')
-        FK_B = create_null_at_node(rig_net, rig_net.node('split_spine_bone3'), 'spine_B_FK_ctrl')
-        FK_C = create_null_at_node(rig_net, rig_net.node('split_spine_bone5'), 'spine_C_FK_ctrl')
-        ##set parms for the looks
-        ##cotnrol type to be circle in ZX plaen
-        FK_A.parm('controltype').set(1)
-        FK_B.parm('controltype').set(1)
-        FK_C.parm('controltype').set(1)
-        FK_A.parm('orientation').set(2)
-        FK_B.parm('orientation').set(2)
-        FK_C.parm('orientation').set(2)
-        ##change display and center to be nice looking by default
-        FK_A.parmTuple('geosize').set((.8,.8,.6))
-        FK_B.parmTuple('geosize').set((.8,.8,.6))
-        FK_B.parm('geocenterz').set(.02)
-        FK_C.parmTuple('geosize').set((.8,.8,.6))
-        FK_C.parm('geocenterz').set(.03)
-        ##changing the controls color
-        FK_A.parmTuple('dcolor').set((0,1,.5))
-        FK_B.parmTuple('dcolor').set((0,1,.5))
-        FK_C.parmTuple('dcolor').set((0,1,.5))
-        ##change the node color
-        FK_A.setColor(turquoise)
-        FK_B.setColor(turquoise)
-        FK_C.setColor(turquoise)
-        ##set inputs
-        FK_A.setFirstInput(COG)
-        FK_B.setFirstInput(FK_A)
-        FK_C.setFirstInput(FK_B)
-        hip_IK.setFirstInput(FK_A)
-        mid_IK.setFirstInput(FK_B)
-        chest_IK.setFirstInput(FK_C)
-        spine_base_cv.setFirstInput(hip_IK)
-        spine_mid_cv.setFirstInput(mid_IK)
-        spine_top_cv.setFirstInput(chest_IK)
-        spine_root = rig_net.node('spine_root')
-        spine_path.setFirstInput(spine_root)
-        spine_root.setFirstInput(hip_IK)
-        ##append controls to list
-        ctrl_list.append(FK_A)
-        ctrl_list.append(FK_B)
-        ctrl_list.append(FK_C)
-        ctrl_list.append(chest_IK)
-        ctrl_list.append(mid_IK)
-        ctrl_list.append(hip_IK)
-        
-        ####Spine Kinematics####
-        chop_node = []
-        #check if a chop node already exsists
-        for node in rig_net.children():
-            if node.type().name() == 'chopnet':
-                chop_node.append(node)
-                ##print chop_node
-        if chop_node == []:
-            kin_net = rig_net.createNode("chopnet", 'KIN_Chops')
-        else:
-            kin_net = chop_node[0]
-        ##create a kinematics solver
-        spine_kin = kin_net.createNode('inversekin', 'KIN_spine')
-        ##change the solver type to follow curve
-        spine_kin.parm('solvertype').set(4)
-        ##set the root and end bones
-        spine_kin.parm('bonerootpath').set('../../split_spine_bone1')
-        spine_kin.parm('boneendpath').set('../../split_spine_bone6')
-        ##set the curve
-        spine_kin.parm('curvepath').set('../../spine_path')
-        ##set spine bones to follow the spine kinematics
-        rig_net.node('split_spine_bone1').parm('solver').set('../KIN_Chops/KIN_spine/')
-        rig_net.node('split_spine_bone2').parm('solver').set('../KIN_Chops/KIN_spine/')
-        rig_net.node('split_spine_bone3').parm('solver').set('../KIN_Chops/KIN_spine/')
-        rig_net.node('split_spine_bone4').parm('solver').set('../KIN_Chops/KIN_spine/')
-        rig_net.node('split_spine_bone5').parm('solver').set('../KIN_Chops/KIN_spine/')
-        rig_net.node('split_spine_bone6').parm('solver').set('../KIN_Chops/KIN_spine/')
-        ##set spine to be able to stretch with curve
-        rig_net.node('split_spine_bone1').parm('length').setExpression('arclen("../spine_path", 0, 0, 1)/6')
-        rig_net.node('split_spine_bone2').parm('length').setExpression('arclen("../spine_path", 0, 0, 1)/6')
-        rig_net.node('split_spine_bone3').parm('length').setExpression('arclen("../spine_path", 0, 0, 1)/6')
-        rig_net.node('split_spine_bone4').parm('length').setExpression('arclen("../spine_path", 0, 0, 1)/6')
-        rig_net.node('split_spine_bone5').parm('length').setExpression('arclen("../spine_path", 0, 0, 1)/6')
-        rig_net.node('split_spine_bone6').parm('length').setExpression('arclen("../spine_path", 0, 0, 1)/6')
-        
-        ####PELVIS CONTROL####
-        pelvis_root = rig_net.node('pelvis_root')
-        pelvis_ctrl = create_stick_ball_null(rig_net, pelvis_root, 'pelvis_ctrl')
-        pelvis_ctrl.parm('rx').set(-85)
-        pelvis_ctrl.parm('geoscale').set(.04)
-        pelvis_ctrl.parmTuple('dcolor').set((.5,.25,0))
-        pelvis_ctrl.setColor(turquoise)
-        pelvis_root.setFirstInput(pelvis_ctrl)
-        pelvis_ctrl.setFirstInput(hip_IK)
-        pelvis_ctrl.moveParmTransformIntoPreTransform()
-        ctrl_list.append(pelvis_ctrl)
-        
-        ####SPINE UI####
-        ##grab the hda parmTemplateGroup
-        rig_ptg = rig_net.parmTemplateGroup()
-        ##create spine folder
-        spine_folder = hou.FolderParmTemplate('spine_folder', 'Spine')
-        
-        ##create the needed folders in master folder
-        s_display_folder = hou.FolderParmTemplate('s_display_folder', 'Display')
-        s_action_folder = hou.FolderParmTemplate('s_action_folder', 'Actions')
-        s_ctrl_folder = hou.FolderParmTemplate('s_ctrl_folder', 'Controls')
-        ##change to simple
-        s_display_folder.setFolderType(hou.folderType.Simple)
-        s_action_folder.setFolderType(hou.folderType.Simple)
-        s_ctrl_folder.setFolderType(hou.folderType.Simple)
-        
-        ##create the needed menu parameters to the display folder
-        s_bone_display = hou.MenuParmTemplate('s_bone_display', 'Bone Display', ['0', '1'], ['OFF', 'ON'], 0)
-        s_ctrl_dispaly = hou.MenuParmTemplate('s_ctrl_display', 'Controls Display', ['0', '1'], ['OFF', 'ON'], 1)
-        ##add to the folder
-        s_display_folder.addParmTemplate(s_bone_display)
-        s_display_folder.addParmTemplate(s_ctrl_dispaly)
-        ##add folder to spine_folder
-        spine_folder.addParmTemplate(s_display_folder)
-        
-        ##create buttons for the actions folder
-        spine_default = hou.ButtonParmTemplate('set_spine_to_default', 'Set Spine to Default')
-        spine_key = hou.ButtonParmTemplate('set_spine_key', 'Set Spine Keys')
-        ##add the buttons to the actions folder
-        s_action_folder.addParmTemplate(spine_default)
-        s_action_folder.addParmTemplate(spine_key)
-        ##add the action folder to the master folder
-        spine_folder.addParmTemplate(s_action_folder)
-        
-        ##create floats for the master control
-        COG_trans = hou.FloatParmTemplate('COG_trans', 'COG Translate', 3)
-        COG_rot = hou.FloatParmTemplate('COG_rot', 'COG Rotate', 3)
-        FK_C_rot = hou.FloatParmTemplate('FK_C_rot', 'FK C Rotate', 3)
-        FK_B_rot = hou.FloatParmTemplate('FK_B_rot', 'FK B Rotate', 3)
-        FK_A_rot = hou.FloatParmTemplate('FK_A_rot', 'FK A Rotate', 3)
-        chest_IK_trans = hou.FloatParmTemplate('chest_IK_trans', 'Chest IK Translate', 3)
-        chest_IK_rot = hou.FloatParmTemplate('chest_IK_rot', 'Chest IK Rotate', 3)
-        mid_IK_trans = hou.FloatParmTemplate('mid_IK_trans', 'Mid IK Translate', 3)
-        hip_IK_trans = hou.FloatParmTemplate('hip_IK_trans', 'Hip IK Translate', 3)
-        hip_IK_rot = hou.FloatParmTemplate('hip_IK_rot', 'Hip IK Rotate', 3)
-        pelvis_rot = hou.FloatParmTemplate('pelvis_rot', 'Pelvis Rotate', 3)
-        ##add the floats to the control folder
-        s_ctrl_folder.addParmTemplate(COG_trans)
-        s_ctrl_folder.addParmTemplate(COG_rot)
-        s_ctrl_folder.addParmTemplate(FK_C_rot)
-        s_ctrl_folder.addParmTemplate(FK_B_rot)
-        s_ctrl_folder.addParmTemplate(FK_A_rot)
-        s_ctrl_folder.addParmTemplate(chest_IK_trans)
-        s_ctrl_folder.addParmTemplate(chest_IK_rot)
-        s_ctrl_folder.addParmTemplate(mid_IK_trans)
-        s_ctrl_folder.addParmTemplate(hip_IK_trans)
-        s_ctrl_folder.addParmTemplate(hip_IK_rot)
-        s_ctrl_folder.addParmTemplate(pelvis_rot)
-        ##add the ctrl folder to master
-        spine_folder.addParmTemplate(s_ctrl_folder)
-        
-        ##add the spine folder to the template group
-        rig_ptg.addParmTemplate(spine_folder)
-        ##reset the rig_net template back to the copy we have been editing
-        rig_net.setParmTemplateGroup(rig_ptg)
-        
-        ##make sure that all the ctrls have clean transforms before creating references
-        for ctrl in ctrl_list:
-            ctrl.moveParmTransformIntoPreTransform()
-        
-        ####SPINE UI CONTROL IMPLEMENTATION####
-        COG.parm('tx').setExpression('ch("../COG_transx")')
-        COG.parm('ty').setExpression('ch("../COG_transy")')
-        COG.parm('tz').setExpression('ch("../COG_transz")')
-        COG.parm('rx').setExpression('ch("../COG_rotx")')
-        COG.parm('ry').setExpression('ch("../COG_roty")')
-        COG.parm('rz').setExpression('ch("../COG_rotz")')
-        FK_A.parm('rx').setExpression('ch("../FK_A_rotx")')
-        FK_A.parm('ry').setExpression('ch("../FK_A_roty")')
-        FK_A.parm('rz').setExpression('ch("../FK_A_rotz")')
-        FK_B.parm('rx').setExpression('ch("../FK_B_rotx")')
-        FK_B.parm('ry').setExpression('ch("../FK_B_roty")')
-        FK_B.parm('rz').setExpression('ch("../FK_B_rotz")')
-        FK_C.parm('rx').setExpression('ch("../FK_C_rotx")')
-        FK_C.parm('ry').setExpression('ch("../FK_C_roty")')
-        FK_C.parm('rz').setExpression('ch("../FK_C_rotz")')
-        chest_IK.parm('tx').setExpression('ch("../chest_IK_transx")')
-        chest_IK.parm('ty').setExpression('ch("../chest_IK_transy")')
-        chest_IK.parm('tz').setExpression('ch("../chest_IK_transz")')
-        chest_IK.parm('rx').setExpression('ch("../chest_IK_rotx")')
-        chest_IK.parm('ry').setExpression('ch("../chest_IK_roty")')
-        chest_IK.parm('rz').setExpression('ch("../chest_IK_rotz")')
-        mid_IK.parm('tx').setExpression('ch("../mid_IK_transx")')
-        mid_IK.parm('ty').setExpression('ch("../mid_IK_transy")')
-        mid_IK.parm('tz').setExpression('ch("../mid_IK_transz")')
-        hip_IK.parm('tx').setExpression('ch("../hip_IK_transx")')
-        hip_IK.parm('ty').setExpression('ch("../hip_IK_transy")')
-        hip_IK.parm('tz').setExpression('ch("../hip_IK_transz")')
-        hip_IK.parm('rx').setExpression('ch("../hip_IK_rotx")')
-        hip_IK.parm('ry').setExpression('ch("../hip_IK_roty")')
-        hip_IK.parm('rz').setExpression('ch("../hip_IK_rotz")')
-        pelvis_ctrl.parm('rx').setExpression('ch("../pelvis_rotx")')
-        pelvis_ctrl.parm('ry').setExpression('ch("../pelvis_roty")')
-        pelvis_ctrl.parm('rz').setExpression('ch("../pelvis_rotz")')
-        ##displayability options implementation
-        ##bones
-        ##if master bone display and spine bone display are on than set value 1, else 0
-        rig_net.node('split_spine_bone1').parm('tdisplay').set(True)
-        rig_net.node('split_spine_bone2').parm('tdisplay').set(True)
-        rig_net.node('split_spine_bone3').parm('tdisplay').set(True)
-        rig_net.node('split_spine_bone4').parm('tdisplay').set(True)
-        rig_net.node('split_spine_bone5').parm('tdisplay').set(True)
-        rig_net.node('split_spine_bone6').parm('tdisplay').set(True)
-        rig_net.node('pelvis_bone1').parm('tdisplay').set(True)
-        rig_net.node('split_spine_bone1').parm('display').setExpression('if (ch("../s_bone_display") == 1 && ch("../m_bone_display") == 1, 1, 0)')
-        rig_net.node('split_spine_bone2').parm('display').setExpression('if (ch("../s_bone_display") == 1 && ch("../m_bone_display") == 1, 1, 0)')
-        rig_net.node('split_spine_bone3').parm('display').setExpression('if (ch("../s_bone_display") == 1 && ch("../m_bone_display") == 1, 1, 0)')
-        rig_net.node('split_spine_bone4').parm('display').setExpression('if (ch("../s_bone_display") == 1 && ch("../m_bone_display") == 1, 1, 0)')
-        rig_net.node('split_spine_bone5').parm('display').setExpression('if (ch("../s_bone_display") == 1 && ch("../m_bone_display") == 1, 1, 0)')
-        rig_net.node('split_spine_bone6').parm('display').setExpression('if (ch("../s_bone_display") == 1 && ch("../m_bone_display") == 1, 1, 0)')
-        rig_net.node('pelvis_bone1').parm('display').setExpression('if (ch("../s_bone_display") == 1 && ch("../m_bone_display") == 1, 1, 0)')
-        ##ctrls
-        COG.parm('tdisplay').set(True)
-        FK_A.parm('tdisplay').set(True)
-        FK_B.parm('tdisplay').set(True)
-        FK_C.parm('tdisplay').set(True)
-        hip_IK.parm('tdisplay').set(True)
-        mid_IK.parm('tdisplay').set(True)
-        chest_IK.parm('tdisplay').set(True)
-        pelvis_ctrl.parm('tdisplay').set(True)
-        COG.parm('display').setExpression('if (ch("../s_ctrl_display") == 1 && ch("../m_ctrl_display") == 1, 1, 0)')
-        FK_A.parm('display').setExpression('if (ch("../s_ctrl_display") == 1 && ch("../m_ctrl_display") == 1, 1, 0)')
-        FK_B.parm('display').setExpression('if (ch("../s_ctrl_display") == 1 && ch("../m_ctrl_display") == 1, 1, 0)')
-        FK_C.parm('display').setExpression('if (ch("../s_ctrl_display") == 1 && ch("../m_ctrl_display") == 1, 1, 0)')
-        hip_IK.parm('display').setExpression('if (ch("../s_ctrl_display") == 1 && ch("../m_ctrl_display") == 1, 1, 0)')
-        mid_IK.parm('display').setExpression('if (ch("../s_ctrl_display") == 1 && ch("../m_ctrl_display") == 1, 1, 0)')
-        chest_IK.parm('display').setExpression('if (ch("../s_ctrl_display") == 1 && ch("../m_ctrl_display") == 1, 1, 0)')
-        pelvis_ctrl.parm('display').setExpression('if (ch("../s_ctrl_display") == 1 && ch("../m_ctrl_display") == 1, 1, 0)')
-        
-        ##left cotnrol list
-        L_ctrl_list = []
-        
-        ####Shoulder Control####
-        ##grab the shoulder bone and root
-        shoulder_bone = rig_net.node('L_shoulder_bone1')
-        shoulder_root = rig_net.node('L_shoulder_root')
-        ##create an fk control
-        shoulder_FK = create_FK_control(shoulder_bone, 1, 'L_shoulder_FK')
-        ##grab the auto and ctrl nodes frm the fk
-        shoulder_ctrl = shoulder_FK[2]
-        shoulder_auto = shoulder_FK[1]
-        shoulder_offset = shoulder_FK[0]
-        ##delete the ctrl
-        shoulder_ctrl.destroy()
-        ##create the stick ball ctrl
-        shoulder_ctrl = create_stick_ball_null(rig_net, shoulder_auto, 'L_shoulder_FK_ctrl')
-        ##set some parms to make it look nicer
-        shoulder_ctrl.parmTuple('georotate').set((-20,0,-35))
-        shoulder_ctrl.parm('geoscale').set(.035)
-        ##reparent the ctrl
-        shoulder_root.setFirstInput(chest_IK)
-        shoulder_ctrl.setFirstInput(shoulder_auto)
-        shoulder_offset.setFirstInput(shoulder_root)
-        ##add to ctrl lists
-        ctrl_list.append(shoulder_ctrl)
-        L_ctrl_list.append(shoulder_ctrl)
-        ##set up constraint
-        simple_constraint(shoulder_bone, shoulder_ctrl)
-        
-        ####L arm IK FK####
-        ##L arm bones
-        arm_bone1 = rig_net.node('L_arm_bone1')
-        arm_bone2 = rig_net.node('L_arm_bone2')
-        hand_bone = rig_net.node('L_hand_bone1')
-        ##create IK FK
-        arm_ctrls = create_IK_FK_controls(arm_bone1, arm_bone2, shoulder_ctrl, 'L_arm', -1)
-        ##extract the nodes created
-        arm_ctrl1 = arm_ctrls[0]
-        arm_ctrl2 = arm_ctrls[1]
-        arm_twist = arm_ctrls[2]
-        arm_twist_offset = rig_net.node('L_arm_twist_offset')
-        arm_goal = arm_ctrls[3]
-        arm_goal_offset = rig_net.node('L_arm_goal_offset')
-        arm_kin = arm_ctrls[4]
-        ##make controls size a bit more managable
-        arm_ctrl1.parm('geoscale').set(.35)
-        arm_ctrl2.parm('geoscale').set(.3)
-        ##parent the IK nodes
-        arm_twist_offset.setFirstInput(master)
-        arm_goal_offset.setFirstInput(master)
-        ##append them all to the L_side ctrls and ctrls list
-        L_ctrl_list.append(arm_ctrl1)
-        L_ctrl_list.append(arm_ctrl2)
-        L_ctrl_list.append(arm_twist)
-        L_ctrl_list.append(arm_goal)
-        ctrl_list.append(arm_ctrl1)
-        ctrl_list.append(arm_ctrl2)
-        ctrl_list.append(arm_twist)
-        ctrl_list.append(arm_goal)
-        ##create hand ctrls
-        hand_ctrls = create_IK_FK_controls(hand_bone, hand_bone, arm_ctrl2, 'L_hand', 1)
-        ##extract the created nodes
-        hand_ctrl = hand_ctrls[0]
-        hand_twist = hand_ctrls[1]
-        hand_twist_offset = rig_net.node('L_hand_twist_offset')
-        hand_goal = hand_ctrls[2]
-        hand_goal_offset = rig_net.node('L_hand_goal_offset')
-        hand_kin = hand_ctrls[3]
-        ##set Flags and parents so hand ik won't be seen and will simply follow the wrist IK
-        hand_twist.setDisplayFlag(False)
-        hand_twist.setSelectableInViewport(False)
-        hand_goal.setDisplayFlag(False)
-        hand_goal.setSelectableInViewport(False)
-        hand_goal_offset.setFirstInput(arm_goal)
-        hand_twist_offset.setFirstInput(arm_goal)
-        hand_ctrl.parm('geoscale').set(.25)
-        ##apend the FK ctrl
-        L_ctrl_list.append(hand_ctrl)
-        ctrl_list.append(hand_ctrl)
-        ##set the hand kin solver to do the same as arm solver, so if one is off so is the other
-        ##arm kin path
-        arm_kin_blend = 'ch("' + arm_kin.path() + '/blend")'
-        hand_kin.parm('blend').setExpression(arm_kin_blend)
-        
-        ####FINGER CONTROLS####
-        ##create a null at the hand bond that will hold all the finger controls under it and follow the hand bone via constraint
-        finger_grp = create_null_at_node(rig_net, hand_bone, 'finger_grp')
-        ##constraing the group so it follows the hand bone whether it is in IK or FK
-        simple_constraint(finger_grp, hand_bone)
-        ##parent 
-        finger_grp.setFirstInput(shoulder_ctrl)
-        ##flags
-        finger_grp.setDisplayFlag(False)
-        finger_grp.setSelectableInViewport(False)
-        ##grab bones
-        thumb_base_bone = rig_net.node('L_thumb_bone1')
-        thumb_mid_bone = rig_net.node('L_thumb_bone2')
-        thumb_end_bone = rig_net.node('L_thumb_bone3')
-        index_base_bone = rig_net.node('L_index_bone1')
-        index_mid_bone = rig_net.node('L_index_bone2')
-        index_end_bone = rig_net.node('L_index_bone3')
-        middle_base_bone = rig_net.node('L_middle_bone1')
-        middle_mid_bone = rig_net.node('L_middle_bone2')
-        middle_end_bone = rig_net.node('L_middle_bone3')
-        ring_base_bone = rig_net.node('L_ring_bone1')
-        ring_mid_bone = rig_net.node('L_ring_bone2')
-        ring_end_bone = rig_net.node('L_ring_bone3')
-        pinky_base_bone = rig_net.node('L_pinky_bone1')
-        pinky_mid_bone = rig_net.node('L_pinky_bone2')
-        pinky_end_bone = rig_net.node('L_pinky_bone3')
-        ##create the finger controls and constrain their bones
-        thumb_base_nodes = create_FK_control(thumb_base_bone, .08, 'L_thumb_base')
-        thumb_mid_nodes = create_FK_control(thumb_mid_bone, .065, 'L_thumb_mid')
-        thumb_end_nodes = create_FK_control(thumb_end_bone, .05, 'L_thumb_end')
-        index_base_nodes = create_FK_control(index_base_bone, .05, 'L_index_base')
-        index_mid_nodes = create_FK_control(index_mid_bone, .05, 'L_index_mid')
-        index_end_nodes = create_FK_control(index_end_bone, .05, 'L_index_end')
-        middle_base_nodes = create_FK_control(middle_base_bone, .05, 'L_middle_base')
-        middle_mid_nodes = create_FK_control(middle_mid_bone, .05, 'L_middle_mid')
-        middle_end_nodes = create_FK_control(middle_end_bone, .05, 'L_middle_end')
-        ring_base_nodes = create_FK_control(ring_base_bone, .05, 'L_ring_base')
-        ring_mid_nodes = create_FK_control(ring_mid_bone, .05, 'L_ring_mid')
-        ring_end_nodes = create_FK_control(ring_end_bone, .05, 'L_ring_end')
-        pinky_base_nodes = create_FK_control(pinky_base_bone, .05, 'L_pinky_base')
-        pinky_mid_nodes = create_FK_control(pinky_mid_bone, .05, 'L_pinky_mid')
-        pinky_end_nodes = create_FK_control(pinky_end_bone, .05, 'L_pinky_end')
-        ##extract the needed nodes
-        thumb_base_offset = thumb_base_nodes[0]
-        thumb_base_ctrl = thumb_base_nodes[2]
-        thumb_mid_offset = thumb_mid_nodes[0]
-        thumb_mid_ctrl = thumb_mid_nodes[2]
-        thumb_end_offset = thumb_end_nodes[0]
-        thumb_end_ctrl = thumb_end_nodes[2]
-        index_base_offset = index_base_nodes[0]
-        index_base_ctrl = index_base_nodes[2]
-        index_mid_offset = index_mid_nodes[0]
-        index_mid_ctrl = index_mid_nodes[2]
-        index_end_offset = index_end_nodes[0]
-        index_end_ctrl = index_end_nodes[2]
-        middle_base_offset = middle_base_nodes[0]
-        middle_base_ctrl = middle_base_nodes[2]
-        middle_mid_offset = middle_mid_nodes[0]
-        middle_mid_ctrl = middle_mid_nodes[2]
-        middle_end_offset = middle_end_nodes[0]
-        middle_end_ctrl = middle_end_nodes[2]
-        ring_base_offset = ring_base_nodes[0]
-        ring_base_ctrl = ring_base_nodes[2]
-        ring_mid_offset = ring_mid_nodes[0]
-        ring_mid_ctrl = ring_mid_nodes[2]
-        ring_end_offset = ring_end_nodes[0]
-        ring_end_ctrl = ring_end_nodes[2]
-        pinky_base_offset = pinky_base_nodes[0]
-        pinky_base_ctrl = pinky_base_nodes[2]
-        pinky_mid_offset = pinky_mid_nodes[0]
-        pinky_mid_ctrl = pinky_mid_nodes[2]
-        pinky_end_offset = pinky_end_nodes[0]
-        pinky_end_ctrl = pinky_end_nodes[2]
-        ##set up constraints
-        simple_constraint(thumb_base_bone, thumb_base_ctrl)
-        simple_constraint(thumb_mid_bone, thumb_mid_ctrl)
-        simple_constraint(thumb_end_bone, thumb_end_ctrl)
-        simple_constraint(index_base_bone, index_base_ctrl)
-        simple_constraint(index_mid_bone, index_mid_ctrl)
-        simple_constraint(index_end_bone, index_end_ctrl)
-        simple_constraint(middle_base_bone, middle_base_ctrl)
-        simple_constraint(middle_mid_bone, middle_mid_ctrl)
-        simple_constraint(middle_end_bone, middle_end_ctrl)
-        simple_constraint(ring_base_bone, ring_base_ctrl)
-        simple_constraint(ring_mid_bone, ring_mid_ctrl)
-        simple_constraint(ring_end_bone, ring_end_ctrl)
-        simple_constraint(pinky_base_bone, pinky_base_ctrl)
-        simple_constraint(pinky_mid_bone, pinky_mid_ctrl)
-        simple_constraint(pinky_end_bone, pinky_end_ctrl)
-        ##parent in order
-        thumb_base_offset.setFirstInput(finger_grp)
-        thumb_mid_offset.setFirstInput(thumb_base_ctrl)
-        thumb_end_offset.setFirstInput(thumb_mid_ctrl)
-        index_base_offset.setFirstInput(finger_grp)
-        index_mid_offset.setFirstInput(index_base_ctrl)
-        index_end_offset.setFirstInput(index_mid_ctrl)
-        middle_base_offset.setFirstInput(finger_grp)
-        middle_mid_offset.setFirstInput(middle_base_ctrl)
-        middle_end_offset.setFirstInput(middle_mid_ctrl)
-        ring_base_offset.setFirstInput(finger_grp)
-        ring_mid_offset.setFirstInput(ring_base_ctrl)
-        ring_end_offset.setFirstInput(ring_mid_ctrl)
-        pinky_base_offset.setFirstInput(finger_grp)
-        pinky_mid_offset.setFirstInput(pinky_base_ctrl)
-        pinky_end_offset.setFirstInput(pinky_mid_ctrl)
-        ##apend to lists
-        ctrl_list.append(thumb_base_ctrl)
-        L_ctrl_list.append(thumb_base_ctrl)
-        ctrl_list.append(thumb_mid_ctrl)
-        L_ctrl_list.append(thumb_mid_ctrl)
-        ctrl_list.append(thumb_end_ctrl)
-        L_ctrl_list.append(thumb_end_ctrl)
-        ctrl_list.append(index_base_ctrl)
-        L_ctrl_list.append(index_base_ctrl)
-        ctrl_list.append(index_mid_ctrl)
-        L_ctrl_list.append(index_mid_ctrl)
-        ctrl_list.append(index_end_ctrl)
-        L_ctrl_list.append(index_end_ctrl)
-        ctrl_list.append(middle_base_ctrl)
-        L_ctrl_list.append(middle_base_ctrl)
-        ctrl_list.append(middle_mid_ctrl)
-        L_ctrl_list.append(middle_mid_ctrl)
-        ctrl_list.append(middle_end_ctrl)
-        L_ctrl_list.append(middle_end_ctrl)
-        ctrl_list.append(ring_base_ctrl)
-        L_ctrl_list.append(ring_base_ctrl)
-        ctrl_list.append(ring_mid_ctrl)
-        L_ctrl_list.append(ring_mid_ctrl)
-        ctrl_list.append(ring_end_ctrl)
-        L_ctrl_list.append(ring_end_ctrl)
-        ctrl_list.append(pinky_base_ctrl)
-        L_ctrl_list.append(pinky_base_ctrl)
-        ctrl_list.append(pinky_mid_ctrl)
-        L_ctrl_list.append(pinky_mid_ctrl)
-        ctrl_list.append(pinky_end_ctrl)
-        L_ctrl_list.append(pinky_end_ctrl)
-        
-        ####ARM AND HAND UI#####
-        ##grab the hda parmTemplateGroup
-        rig_ptg = rig_net.parmTemplateGroup()
-        ##create arm folder
-        arm_folder = hou.FolderParmTemplate('L_arm_folder', 'L Arm')
-        
-        ##create the needed folders in master folder
-        arm_display_folder = hou.FolderParmTemplate('L_arm_display_folder', 'Display')
-        arm_action_folder = hou.FolderParmTemplate('L_arm_action_folder', 'Actions')
-        arm_ctrl_folder = hou.FolderParmTemplate('L_arm_ctrl_folder', 'Controls')
-        ##change to simple
-        arm_display_folder.setFolderType(hou.folderType.Simple)
-        arm_action_folder.setFolderType(hou.folderType.Simple)
-        arm_ctrl_folder.setFolderType(hou.folderType.Simple)
-        
-        ##create the needed menu parameters to the display folder
-        arm_bone_display = hou.MenuParmTemplate('L_arm_bone_display', 'Bone Display', ['0', '1'], ['OFF', 'ON'], 0)
-        arm_ctrl_dispaly = hou.MenuParmTemplate('L_arm_ctrl_display', 'Controls Display', ['0', '1'], ['OFF', 'ON'], 1)
-        ##add to the folder
-        arm_display_folder.addParmTemplate(arm_bone_display)
-        arm_display_folder.addParmTemplate(arm_ctrl_dispaly)
-        ##add folder to arm_folder
-        arm_folder.addParmTemplate(arm_display_folder)
-        
-        ##create buttons for the actions folder
-        arm_default = hou.ButtonParmTemplate('set_L_arm_to_default', 'Set L Arm to Default')
-        arm_key = hou.ButtonParmTemplate('set_L_arm_key', 'Set L Arm Keys')
-        ##add the buttons to the actions folder
-        arm_action_folder.addParmTemplate(arm_default)
-        arm_action_folder.addParmTemplate(arm_key)
-        ##add the action folder to the master folder
-        arm_folder.addParmTemplate(arm_action_folder)
-        
-        ##create floats for the control
-        arm_FK_IK = hou.FloatParmTemplate('L_arm_FK_IK', 'L Arm FK|IK', 1, [1], 0, 1, True, True)
-        shoulder_rot = hou.FloatParmTemplate('L_shoulder_rot', 'L Shoulder Rotate', 3)
-        arm_IK_trans = hou.FloatParmTemplate('L_arm_IK_trans', 'L Arm IK Translate', 3)
-        arm_IK_rot = hou.FloatParmTemplate('L_arm_IK_rot', 'L Arm IK Rotate', 3)
-        arm_twist_trans = hou.FloatParmTemplate('L_arm_twist_trans', 'L Arm Twist Translate', 3)
-        arm_bone1_FK = hou.FloatParmTemplate('L_arm_bone1_FK_rot', 'L Arm Bone1 FK Rotate', 3)
-        arm_bone2_FK = hou.FloatParmTemplate('L_arm_bone2_FK_rot', 'L Arm Bone2 FK Rotate', 3)
-        hand_FK = hou.FloatParmTemplate('L_hand_FK_rot', 'L Hand FK Rotate', 3)
-        ##add the floats to the control folder
-        arm_ctrl_folder.addParmTemplate(arm_FK_IK)
-        arm_ctrl_folder.addParmTemplate(shoulder_rot)
-        arm_ctrl_folder.addParmTemplate(arm_IK_trans)
-        arm_ctrl_folder.addParmTemplate(arm_IK_rot)
-        arm_ctrl_folder.addParmTemplate(arm_twist_trans)
-        arm_ctrl_folder.addParmTemplate(arm_bone1_FK)
-        arm_ctrl_folder.addParmTemplate(arm_bone2_FK)
-        arm_ctrl_folder.addParmTemplate(hand_FK)
-        ##add the ctrl folder to master
-        arm_folder.addParmTemplate(arm_ctrl_folder)
-        
-        ##create hand folder
-        hand_folder = hou.FolderParmTemplate('L_hand_folder', 'L hand')
-        hand_folder.setFolderType(hou.folderType.Simple)
-        
-        ##create the needed folders in master folder
-        hand_action_folder = hou.FolderParmTemplate('L_hand_action_folder', 'Actions')
-        ##change to simple
-        hand_action_folder.setFolderType(hou.folderType.Simple)
-        
-        ##create the needed menu parameters to the display folder
-        hand_bone_display = hou.MenuParmTemplate('L_hand_bone_display', 'Bone Display', ['0', '1'], ['OFF', 'ON'], 0)
-        hand_ctrl_dispaly = hou.MenuParmTemplate('L_hand_ctrl_display', 'Controls Display', ['0', '1'], ['OFF', 'ON'], 1)
-        ##add to the folder
-        hand_folder.addParmTemplate(hand_bone_display)
-        hand_folder.addParmTemplate(hand_ctrl_dispaly)
-        
-        ##create buttons for the actions folder
-        hand_default = hou.ButtonParmTemplate('set_L_hand_to_default', 'Set L hand to Default')
-        hand_key = hou.ButtonParmTemplate('set_L_hand_key', 'Set L hand Keys')
-        ##add the buttons to the actions folder
-        hand_action_folder.addParmTemplate(hand_default)
-        hand_action_folder.addParmTemplate(hand_key)
-        ##add the action folder to the master folder
-        hand_folder.addParmTemplate(hand_action_folder)
-        
-        ##create floats for specail hand quick poses WIP
-        
-        ##add the floats to the hand folder
-        
-        ##create a folder for each finger
-        thumb_folder = hou.FolderParmTemplate('L_thumb_folder', 'L Thumb')
-        index_folder = hou.FolderParmTemplate('L_index_folder', 'L Index')
-        middle_folder = hou.FolderParmTemplate('L_middle_folder', 'L Middle')
-        ring_folder = hou.FolderParmTemplate('L_ring_folder', 'L Ring')
-        pinky_folder = hou.FolderParmTemplate('L_pinky_folder', 'L Pinky')
-        ##create floats for rotation and quick pose(WIP)
-        thumb_base_rot = hou.FloatParmTemplate('L_thumb_base_rot', 'L Thumb Base Rotate', 3)
-        thumb_mid_rot = hou.FloatParmTemplate('L_thumb_mid_rot', 'L Thumb Mid Rotate', 3)
-        thumb_end_rot = hou.FloatParmTemplate('L_thumb_end_rot', 'L Thumb End Rotate', 3)
-        index_base_rot = hou.FloatParmTemplate('L_index_base_rot', 'L Index Base Rotate', 3)
-        index_mid_rot = hou.FloatParmTemplate('L_index_mid_rot', 'L Index Mid Rotate', 3)
-        index_end_rot = hou.FloatParmTemplate('L_index_end_rot', 'L Index End Rotate', 3)
-        middle_base_rot = hou.FloatParmTemplate('L_middle_base_rot', 'L Middle Base Rotate', 3)
-        middle_mid_rot = hou.FloatParmTemplate('L_middle_mid_rot', 'L Middle Mid Rotate', 3)
-        middle_end_rot = hou.FloatParmTemplate('L_middle_end_rot', 'L Middle End Rotate', 3)
-        ring_base_rot = hou.FloatParmTemplate('L_ring_base_rot', 'L Ring Base Rotate', 3)
-        ring_mid_rot = hou.FloatParmTemplate('L_ring_mid_rot', 'L Ring Mid Rotate', 3)
-        ring_end_rot = hou.FloatParmTemplate('L_ring_end_rot', 'L Ring End Rotate', 3)
-        pinky_base_rot = hou.FloatParmTemplate('L_pinky_base_rot', 'L Pinky Base Rotate', 3)
-        pinky_mid_rot = hou.FloatParmTemplate('L_pinky_mid_rot', 'L Pinky Mid Rotate', 3)
-        pinky_end_rot = hou.FloatParmTemplate('L_pinky_end_rot', 'L Pinky End Rotate', 3)
-        ##add the floats to the folders
-        thumb_folder.addParmTemplate(thumb_base_rot)
-        thumb_folder.addParmTemplate(thumb_mid_rot)
-        thumb_folder.addParmTemplate(thumb_end_rot)
-        index_folder.addParmTemplate(index_base_rot)
-        index_folder.addParmTemplate(index_mid_rot)
-        index_folder.addParmTemplate(index_end_rot)
-        middle_folder.addParmTemplate(middle_base_rot)
-        middle_folder.addParmTemplate(middle_mid_rot)
-        middle_folder.addParmTemplate(middle_end_rot)
-        ring_folder.addParmTemplate(ring_base_rot)
-        ring_folder.addParmTemplate(ring_mid_rot)
-        ring_folder.addParmTemplate(ring_end_rot)
-        pinky_folder.addParmTemplate(pinky_base_rot)
-        pinky_folder.addParmTemplate(pinky_mid_rot)
-        pinky_folder.addParmTemplate(pinky_end_rot)
-        ##add folders to hand folder
-        hand_folder.addParmTemplate(thumb_folder)
-        hand_folder.addParmTemplate(index_folder)
-        hand_folder.addParmTemplate(middle_folder)
-        hand_folder.addParmTemplate(ring_folder)
-        hand_folder.addParmTemplate(pinky_folder)
-        ##add hand folder to arm folder
-        arm_folder.addParmTemplate(hand_folder)
-        
-        ##add the spine folder to the template group
-        rig_ptg.addParmTemplate(arm_folder)
-        ##reset the rig_net template back to the copy we have been editing
-        rig_net.setParmTemplateGroup(rig_ptg)
-        
-        ####ARM UI INTEGRATION####
-        arm_kin.parm('blend').setExpression('ch("../../L_arm_FK_IK")')
-        shoulder_ctrl.parm('rx').setExpression('ch("../L_shoulder_rotx")')
-        shoulder_ctrl.parm('ry').setExpression('ch("../L_shoulder_roty")')
-        shoulder_ctrl.parm('rz').setExpression('ch("../L_shoulder_rotz")')
-        arm_goal.parm('tx').setExpression('ch("../L_arm_IK_transx")')
-        arm_goal.parm('ty').setExpression('ch("../L_arm_IK_transy")')
-        arm_goal.parm('tz').setExpression('ch("../L_arm_IK_transz")')
-        arm_goal.parm('rx').setExpression('ch("../L_arm_IK_rotx")')
-        arm_goal.parm('ry').setExpression('ch("../L_arm_IK_roty")')
-        arm_goal.parm('rz').setExpression('ch("../L_arm_IK_rotz")')
-        arm_twist.parm('tx').setExpression('ch("../L_arm_twist_transx")')
-        arm_twist.parm('ty').setExpression('ch("../L_arm_twist_transy")')
-        arm_twist.parm('tz').setExpression('ch("../L_arm_twist_transz")')
-        arm_ctrl1.parm('rx').setExpression('ch("../L_arm_bone1_FK_rotx")')
-        arm_ctrl1.parm('ry').setExpression('ch("../L_arm_bone1_FK_roty")')
-        arm_ctrl1.parm('rz').setExpression('ch("../L_arm_bone1_FK_rotz")')
-        arm_ctrl2.parm('rx').setExpression('ch("../L_arm_bone2_FK_rotx")')
-        arm_ctrl2.parm('ry').setExpression('ch("../L_arm_bone2_FK_roty")')
-        arm_ctrl2.parm('rz').setExpression('ch("../L_arm_bone2_FK_rotz")')
-        hand_ctrl.parm('rx').setExpression('ch("../L_hand_FK_rotx")')
-        hand_ctrl.parm('ry').setExpression('ch("../L_hand_FK_roty")')
-        hand_ctrl.parm('rz').setExpression('ch("../L_hand_FK_rotz")')
-        thumb_base_ctrl.parm('rx').setExpression('ch("../L_thumb_base_rotx")')
-        thumb_base_ctrl.parm('ry').setExpression('ch("../L_thumb_base_roty")')
-        thumb_base_ctrl.parm('rz').setExpression('ch("../L_thumb_base_rotz")')
-        thumb_mid_ctrl.parm('rx').setExpression('ch("../L_thumb_mid_rotx")')
-        thumb_mid_ctrl.parm('ry').setExpression('ch("../L_thumb_mid_roty")')
-        thumb_mid_ctrl.parm('rz').setExpression('ch("../L_thumb_mid_rotz")')
-        thumb_end_ctrl.parm('rx').setExpression('ch("../L_thumb_end_rotx")')
-        thumb_end_ctrl.parm('ry').setExpression('ch("../L_thumb_end_roty")')
-        thumb_end_ctrl.parm('rz').setExpression('ch("../L_thumb_end_rotz")')
-        index_base_ctrl.parm('rx').setExpression('ch("../L_index_base_rotx")')
-        index_base_ctrl.parm('ry').setExpression('ch("../L_index_base_roty")')
-        index_base_ctrl.parm('rz').setExpression('ch("../L_index_base_rotz")')
-        index_mid_ctrl.parm('rx').setExpression('ch("../L_index_mid_rotx")')
-        index_mid_ctrl.parm('ry').setExpression('ch("../L_index_mid_roty")')
-        index_mid_ctrl.parm('rz').setExpression('ch("../L_index_mid_rotz")')
-        index_end_ctrl.parm('rx').setExpression('ch("../L_index_end_rotx")')
-        index_end_ctrl.parm('ry').setExpression('ch("../L_index_end_roty")')
-        index_end_ctrl.parm('rz').setExpression('ch("../L_index_end_rotz")')
-        middle_base_ctrl.parm('rx').setExpression('ch("../L_middle_base_rotx")')
-        middle_base_ctrl.parm('ry').setExpression('ch("../L_middle_base_roty")')
-        middle_base_ctrl.parm('rz').setExpression('ch("../L_middle_base_rotz")')
-        middle_mid_ctrl.parm('rx').setExpression('ch("../L_middle_mid_rotx")')
-        middle_mid_ctrl.parm('ry').setExpression('ch("../L_middle_mid_roty")')
-        middle_mid_ctrl.parm('rz').setExpression('ch("../L_middle_mid_rotz")')
-        middle_end_ctrl.parm('rx').setExpression('ch("../L_middle_end_rotx")')
-        middle_end_ctrl.parm('ry').setExpression('ch("../L_middle_end_roty")')
-        middle_end_ctrl.parm('rz').setExpression('ch("../L_middle_end_rotz")')
-        ring_base_ctrl.parm('rx').setExpression('ch("../L_ring_base_rotx")')
-        ring_base_ctrl.parm('ry').setExpression('ch("../L_ring_base_roty")')
-        ring_base_ctrl.parm('rz').setExpression('ch("../L_ring_base_rotz")')
-        ring_mid_ctrl.parm('rx').setExpression('ch("../L_ring_mid_rotx")')
-        ring_mid_ctrl.parm('ry').setExpression('ch("../L_ring_mid_roty")')
-        ring_mid_ctrl.parm('rz').setExpression('ch("../L_ring_mid_rotz")')
-        ring_end_ctrl.parm('rx').setExpression('ch("../L_ring_end_rotx")')
-        ring_end_ctrl.parm('ry').setExpression('ch("../L_ring_end_roty")')
-        ring_end_ctrl.parm('rz').setExpression('ch("../L_ring_end_rotz")')
-        pinky_base_ctrl.parm('rx').setExpression('ch("../L_pinky_base_rotx")')
-        pinky_base_ctrl.parm('ry').setExpression('ch("../L_pinky_base_roty")')
-        pinky_base_ctrl.parm('rz').setExpression('ch("../L_pinky_base_rotz")')
-        pinky_mid_ctrl.parm('rx').setExpression('ch("../L_pinky_mid_rotx")')
-        pinky_mid_ctrl.parm('ry').setExpression('ch("../L_pinky_mid_roty")')
-        pinky_mid_ctrl.parm('rz').setExpression('ch("../L_pinky_mid_rotz")')
-        pinky_end_ctrl.parm('rx').setExpression('ch("../L_pinky_end_rotx")')
-        pinky_end_ctrl.parm('ry').setExpression('ch("../L_pinky_end_roty")')
-        pinky_end_ctrl.parm('rz').setExpression('ch("../L_pinky_end_rotz")')
-        
-        ##displayability options implementation
-        ##bones
-        ##if master bone display and arm bone display are on than set value 1, else 0
-        rig_net.node('L_shoulder_bone1').parm('tdisplay').set(True)
-        rig_net.node('L_arm_bone1').parm('tdisplay').set(True)
-        rig_net.node('L_arm_bone2').parm('tdisplay').set(True)
-        rig_net.node('L_hand_bone1').parm('tdisplay').set(True)
-        rig_net.node('L_shoulder_bone1').parm('display').setExpression('if (ch("../L_arm_bone_display") == 1 && ch("../m_bone_display") == 1, 1, 0)')
-        rig_net.node('L_arm_bone1').parm('display').setExpression('if (ch("../L_arm_bone_display") == 1 && ch("../m_bone_display") == 1, 1, 0)')
-        rig_net.node('L_arm_bone2').parm('display').setExpression('if (ch("../L_arm_bone_display") == 1 && ch("../m_bone_display") == 1, 1, 0)')
-        rig_net.node('L_hand_bone1').parm('display').setExpression('if (ch("../L_arm_bone_display") == 1 && ch("../m_bone_display") == 1, 1, 0)')
-        rig_net.node('L_thumb_bone1').parm('tdisplay').set(True)
-        rig_net.node('L_thumb_bone2').parm('tdisplay').set(True)
-        rig_net.node('L_thumb_bone3').parm('tdisplay').set(True)
-        rig_net.node('L_index_bone1').parm('tdisplay').set(True)
-        rig_net.node('L_index_bone2').parm('tdisplay').set(True)
-        rig_net.node('L_index_bone3').parm('tdisplay').set(True)
-        rig_net.node('L_middle_bone1').parm('tdisplay').set(True)
-        rig_net.node('L_middle_bone2').parm('tdisplay').set(True)
-        rig_net.node('L_middle_bone3').parm('tdisplay').set(True)
-        rig_net.node('L_ring_bone1').parm('tdisplay').set(True)
-        rig_net.node('L_ring_bone2').parm('tdisplay').set(True)
-        rig_net.node('L_ring_bone3').parm('tdisplay').set(True)
-        rig_net.node('L_pinky_bone1').parm('tdisplay').set(True)
-        rig_net.node('L_pinky_bone2').parm('tdisplay').set(True)
-        rig_net.node('L_pinky_bone3').parm('tdisplay').set(True)
-        rig_net.node('L_thumb_bone1').parm('display').setExpression('if (ch("../L_hand_bone_display") == 1 && ch("../m_bone_display") == 1, 1, 0)')
-        rig_net.node('L_thumb_bone2').parm('display').setExpression('if (ch("../L_hand_bone_display") == 1 && ch("../m_bone_display") == 1, 1, 0)')
-        rig_net.node('L_thumb_bone3').parm('display').setExpression('if (ch("../L_hand_bone_display") == 1 && ch("../m_bone_display") == 1, 1, 0)')
-        rig_net.node('L_index_bone1').parm('display').setExpression('if (ch("../L_hand_bone_display") == 1 && ch("../m_bone_display") == 1, 1, 0)')
-        rig_net.node('L_index_bone2').parm('display').setExpression('if (ch("../L_hand_bone_display") == 1 && ch("../m_bone_display") == 1, 1, 0)')
-        rig_net.node('L_index_bone3').parm('display').setExpression('if (ch("../L_hand_bone_display") == 1 && ch("../m_bone_display") == 1, 1, 0)')
-        rig_net.node('L_middle_bone1').parm('display').setExpression('if (ch("../L_hand_bone_display") == 1 && ch("../m_bone_display") == 1, 1, 0)')
-        rig_net.node('L_middle_bone2').parm('display').setExpression('if (ch("../L_hand_bone_display") == 1 && ch("../m_bone_display") == 1, 1, 0)')
-        rig_net.node('L_middle_bone3').parm('display').setExpression('if (ch("../L_hand_bone_display") == 1 && ch("../m_bone_display") == 1, 1, 0)')
-        rig_net.node('L_ring_bone1').parm('display').setExpression('if (ch("../L_hand_bone_display") == 1 && ch("../m_bone_display") == 1, 1, 0)')
-        rig_net.node('L_ring_bone2').parm('display').setExpression('if (ch("../L_hand_bone_display") == 1 && ch("../m_bone_display") == 1, 1, 0)')
-        rig_net.node('L_ring_bone3').parm('display').setExpression('if (ch("../L_hand_bone_display") == 1 && ch("../m_bone_display") == 1, 1, 0)')
-        rig_net.node('L_pinky_bone1').parm('display').setExpression('if (ch("../L_hand_bone_display") == 1 && ch("../m_bone_display") == 1, 1, 0)')
-        rig_net.node('L_pinky_bone2').parm('display').setExpression('if (ch("../L_hand_bone_display") == 1 && ch("../m_bone_display") == 1, 1, 0)')
-        rig_net.node('L_pinky_bone3').parm('display').setExpression('if (ch("../L_hand_bone_display") == 1 && ch("../m_bone_display") == 1, 1, 0)')
-        ##Ctrls
-        shoulder_ctrl.parm('tdisplay').set(True)
-        arm_goal.parm('tdisplay').set(True)
-        arm_twist.parm('tdisplay').set(True)
-        arm_ctrl1.parm('tdisplay').set(True)
-        arm_ctrl2.parm('tdisplay').set(True)
-        hand_ctrl.parm('tdisplay').set(True)
-        thumb_base_ctrl.parm('tdisplay').set(True)
-        thumb_mid_ctrl.parm('tdisplay').set(True)
-        thumb_end_ctrl.parm('tdisplay').set(True)
-        index_base_ctrl.parm('tdisplay').set(True)
-        index_mid_ctrl.parm('tdisplay').set(True)
-        index_end_ctrl.parm('tdisplay').set(True)
-        middle_base_ctrl.parm('tdisplay').set(True)
-        middle_mid_ctrl.parm('tdisplay').set(True)
-        middle_end_ctrl.parm('tdisplay').set(True)
-        ring_base_ctrl.parm('tdisplay').set(True)
-        ring_mid_ctrl.parm('tdisplay').set(True)
-        ring_end_ctrl.parm('tdisplay').set(True)
-        pinky_base_ctrl.parm('tdisplay').set(True)
-        pinky_mid_ctrl.parm('tdisplay').set(True)
-        pinky_end_ctrl.parm('tdisplay').set(True)
-        shoulder_ctrl.parm('display').setExpression('if (ch("../L_arm_ctrl_display") == 1 && ch("../m_ctrl_display") == 1, 1, 0)')
-        arm_goal.parm('display').setExpression('if (ch("../L_arm_ctrl_display") == 1 && ch("../m_ctrl_display") == 1 && ch("../L_arm_FK_IK") == 1, 1, 0)')
-        arm_twist.parm('display').setExpression('if (ch("../L_arm_ctrl_display") == 1 && ch("../m_ctrl_display") == 1 && ch("../L_arm_FK_IK") == 1, 1, 0)')
-        arm_ctrl1.parm('display').setExpression('if (ch("../L_arm_ctrl_display") == 1 && ch("../m_ctrl_display") == 1 && ch("../L_arm_FK_IK") == 0, 1, 0)')
-        arm_ctrl2.parm('display').setExpression('if (ch("../L_arm_ctrl_display") == 1 && ch("../m_ctrl_display") == 1 && ch("../L_arm_FK_IK") == 0, 1, 0)')
-        hand_ctrl.parm('display').setExpression('if (ch("../L_arm_ctrl_display") == 1 && ch("../m_ctrl_display") == 1 && ch("../L_arm_FK_IK") == 0, 1, 0)')
-        thumb_base_ctrl.parm('display').setExpression('if (ch("../L_hand_ctrl_display") == 1 && ch("../m_ctrl_display") == 1, 1, 0)')
-        thumb_mid_ctrl.parm('display').setExpression('if (ch("../L_hand_ctrl_display") == 1 && ch("../m_ctrl_display") == 1, 1, 0)')
-        thumb_end_ctrl.parm('display').setExpression('if (ch("../L_hand_ctrl_display") == 1 && ch("../m_ctrl_display") == 1, 1, 0)')
-        index_base_ctrl.parm('display').setExpression('if (ch("../L_hand_ctrl_display") == 1 && ch("../m_ctrl_display") == 1, 1, 0)')
-        index_mid_ctrl.parm('display').setExpression('if (ch("../L_hand_ctrl_display") == 1 && ch("../m_ctrl_display") == 1, 1, 0)')
-        index_end_ctrl.parm('display').setExpression('if (ch("../L_hand_ctrl_display") == 1 && ch("../m_ctrl_display") == 1, 1, 0)')
-        middle_base_ctrl.parm('display').setExpression('if (ch("../L_hand_ctrl_display") == 1 && ch("../m_ctrl_display") == 1, 1, 0)')
-        middle_mid_ctrl.parm('display').setExpression('if (ch("../L_hand_ctrl_display") == 1 && ch("../m_ctrl_display") == 1, 1, 0)')
-        middle_end_ctrl.parm('display').setExpression('if (ch("../L_hand_ctrl_display") == 1 && ch("../m_ctrl_display") == 1, 1, 0)')
-        ring_base_ctrl.parm('display').setExpression('if (ch("../L_hand_ctrl_display") == 1 && ch("../m_ctrl_display") == 1, 1, 0)')
-        ring_mid_ctrl.parm('display').setExpression('if (ch("../L_hand_ctrl_display") == 1 && ch("../m_ctrl_display") == 1, 1, 0)')
-        ring_end_ctrl.parm('display').setExpression('if (ch("../L_hand_ctrl_display") == 1 && ch("../m_ctrl_display") == 1, 1, 0)')
-        pinky_base_ctrl.parm('display').setExpression('if (ch("../L_hand_ctrl_display") == 1 && ch("../m_ctrl_display") == 1, 1, 0)')
-        pinky_mid_ctrl.parm('display').setExpression('if (ch("../L_hand_ctrl_display") == 1 && ch("../m_ctrl_display") == 1, 1, 0)')
-        pinky_end_ctrl.parm('display').setExpression('if (ch("../L_hand_ctrl_display") == 1 && ch("../m_ctrl_display") == 1, 1, 0)')
-        
-        ####LEG COTNROLS####
-        ##grab the bones
-        leg_bone1 = rig_net.node('L_leg_bone1')
-        leg_bone2 = rig_net.node('L_leg_bone2')
-        foot_bone1 = rig_net.node('L_foot_bone1')
-        foot_bone2 = rig_net.node('L_foot_bone2')
-        ##create IK FK for leg
-        leg_nodes = create_IK_FK_controls(leg_bone1, leg_bone2, pelvis_ctrl, 'L_leg', -1)
-        ##extract nodes
-        leg_ctrl1 = leg_nodes[0]
-        leg_ctrl2 = leg_nodes[1]
-        leg_twist = leg_nodes[2]
-        leg_twist_offset = rig_net.node('L_leg_twist_offset')
-        leg_goal = leg_nodes[3]
-        leg_goal_offset = rig_net.node('L_leg_goal_offset')
-        leg_kin = leg_nodes[4]
-        ##correct the rotation of the foot IK goal. MY IK FK creates a goal alligned with the end_bone at the end of it,
-        ##we don't want that in this case, we want it alligned with the world
-        leg_goal_offset.parmTuple('r').set((0,0,0))
-        ###create first foot bone controls
-        foot_nodes = create_IK_FK_controls(foot_bone1, foot_bone1, leg_ctrl2, 'L_foot', 1)
-        ##extract nodes
-        foot_ctrl = foot_nodes[0]
-        foot_twist = foot_nodes[1]
-        foot_twist_offset = rig_net.node('L_foot_twist_offset')
-        foot_goal = foot_nodes[2]
-        foot_goal_offset = rig_net.node('L_foot_goal_offset')
-        foot_kin = foot_nodes[3]
-        ##set flags
-        foot_twist.setDisplayFlag(False)
-        foot_twist.setSelectableInViewport(False)
-        foot_goal.setDisplayFlag(False)
-        foot_goal.setSelectableInViewport(False)
-        ##create secton foot bone (Toe) controls
-        toe_nodes = create_IK_FK_controls(foot_bone2, foot_bone2, foot_ctrl, 'L_toe', 1)
-        ##extract the nodes
-        toe_ctrl = toe_nodes[0]
-        toe_twist = toe_nodes[1]
-        toe_twist_offset = rig_net.node('L_toe_twist_offset')
-        toe_goal = toe_nodes[2]
-        toe_goal_offset = rig_net.node('L_toe_goal_offset')
-        toe_kin = toe_nodes[3]
-        ##set flags
-        toe_twist.setDisplayFlag(False)
-        toe_twist.setSelectableInViewport(False)
-        toe_goal.setDisplayFlag(False)
-        toe_goal.setSelectableInViewport(False)
-        ##set the foot kin to follow whatever the leg kin does
-        leg_kin_blend = 'ch("' + leg_kin.path() + '/blend")'
-        foot_kin.parm('blend').setExpression(leg_kin_blend)
-        toe_kin.parm('blend').setExpression(leg_kin_blend)
-        ##set some display parms so its a bit prettier in FK
-        foot_ctrl.parm('geoscale').set(.3)
-        foot_ctrl.parm('georotatex').set(-40)
-        toe_ctrl.parm('geoscale').set(.3)
-        toe_ctrl.parm('geosizey').set(.6)
-        ##append controls to lists
-        ctrl_list.append(leg_ctrl1)
-        L_ctrl_list.append(leg_ctrl1)
-        ctrl_list.append(leg_ctrl2)
-        L_ctrl_list.append(leg_ctrl2)
-        ctrl_list.append(leg_twist)
-        L_ctrl_list.append(leg_twist)
-        ctrl_list.append(leg_goal)
-        L_ctrl_list.append(leg_goal)
-        ctrl_list.append(foot_ctrl)
-        L_ctrl_list.append(foot_ctrl)
-        ctrl_list.append(toe_ctrl)
-        L_ctrl_list.append(toe_ctrl)
-        ##create roll nodes
-        ##grab foot locators
-        toe_loc = rig_net.node('L_toe_tip_locator')
-        ball_loc = rig_net.node('L_ball_locator')
-        heel_loc = rig_net.node('L_heel_locator')
-        outer_loc = rig_net.node('L_foot_outer_locator')
-        inner_loc = rig_net.node('L_foot_inner_locator')
-        ##create new nulls
-        toe_roll = create_null_at_node(rig_net, toe_loc, 'toe_roll')
-        ball_roll = create_null_at_node(rig_net, ball_loc, 'ball_roll')
-        heel_roll = create_null_at_node(rig_net, heel_loc, 'heel_roll')
-        outer_roll = create_null_at_node(rig_net, outer_loc, 'outer_roll')
-        inner_roll = create_null_at_node(rig_net, inner_loc, 'inner_roll')
-        ##set flags
-        toe_roll.setDisplayFlag(False)
-        toe_roll.setSelectableInViewport(False)
-        ball_roll.setDisplayFlag(False)
-        ball_roll.setSelectableInViewport(False)
-        heel_roll.setDisplayFlag(False)
-        heel_roll.setSelectableInViewport(False)
-        outer_roll.setDisplayFlag(False)
-        outer_roll.setSelectableInViewport(False)
-        inner_roll.setDisplayFlag(False)
-        inner_roll.setSelectableInViewport(False)
-        ##grab the leg_goal node
-        leg_IK_goal = rig_net.node('L_leg_goal_loc')
-        ##set up parents
-        leg_twist_offset.setFirstInput(master)
-        leg_goal_offset.setFirstInput(master)
-        heel_roll.setFirstInput(leg_goal)
-        toe_roll.setFirstInput(heel_roll)
-        outer_roll.setFirstInput(toe_roll)
-        inner_roll.setFirstInput(outer_roll)
-        ball_roll.setFirstInput(inner_roll)
-        leg_IK_goal.setFirstInput(ball_roll)
-        foot_goal_offset.setFirstInput(ball_roll)
-        foot_twist_offset.setFirstInput(ball_roll)
-        toe_goal_offset.setFirstInput(inner_roll)
-        toe_twist_offset.setFirstInput(inner_roll)
-        ##clean transforms
-        toe_roll.moveParmTransformIntoPreTransform()
-        ball_roll.moveParmTransformIntoPreTransform()
-        heel_roll.moveParmTransformIntoPreTransform()
-        outer_roll.moveParmTransformIntoPreTransform()
-        inner_roll.moveParmTransformIntoPreTransform()
-        
-        ####LEG UI####
-        ##grab the hda parmTemplateGroup
-        rig_ptg = rig_net.parmTemplateGroup()
-        ##create arm folder
-        leg_folder = hou.FolderParmTemplate('L_leg_folder', 'L Leg')
-        
-        ##create the needed folders in master folder
-        leg_display_folder = hou.FolderParmTemplate('L_leg_display_folder', 'Display')
-        leg_action_folder = hou.FolderParmTemplate('L_leg_action_folder', 'Actions')
-        leg_ctrl_folder = hou.FolderParmTemplate('L_leg_ctrl_folder', 'Controls')
-        ##change to simple
-        leg_display_folder.setFolderType(hou.folderType.Simple)
-        leg_action_folder.setFolderType(hou.folderType.Simple)
-        leg_ctrl_folder.setFolderType(hou.folderType.Simple)
-        
-        ##create the needed menu parameters to the display folder
-        leg_bone_display = hou.MenuParmTemplate('L_leg_bone_display', 'Bone Display', ['0', '1'], ['OFF', 'ON'], 0)
-        leg_ctrl_dispaly = hou.MenuParmTemplate('L_leg_ctrl_display', 'Controls Display', ['0', '1'], ['OFF', 'ON'], 1)
-        ##add to the folder
-        leg_display_folder.addParmTemplate(leg_bone_display)
-        leg_display_folder.addParmTemplate(leg_ctrl_dispaly)
-        ##add folder to leg_folder
-        leg_folder.addParmTemplate(leg_display_folder)
-        
-        ##create buttons for the actions folder
-        leg_default = hou.ButtonParmTemplate('set_L_leg_to_default', 'Set L Leg to Default')
-        leg_key = hou.ButtonParmTemplate('set_L_leg_key', 'Set L Leg Keys')
-        ##add the buttons to the actions folder
-        leg_action_folder.addParmTemplate(leg_default)
-        leg_action_folder.addParmTemplate(leg_key)
-        ##add the action folder to the master folder
-        leg_folder.addParmTemplate(leg_action_folder)
-        
-        ##create floats for the control
-        leg_FK_IK = hou.FloatParmTemplate('L_leg_FK_IK', 'L Leg FK|IK', 1, [1], 0, 1, True, True)
-        leg_IK_trans = hou.FloatParmTemplate('L_leg_IK_trans', 'L Leg IK Translate', 3)
-        leg_IK_rot = hou.FloatParmTemplate('L_leg_IK_rot', 'L Leg IK Rotate', 3)
-        leg_twist_trans = hou.FloatParmTemplate('L_leg_twist_trans', 'L Leg Twist Translate', 3)
-        leg_bone1_FK = hou.FloatParmTemplate('L_leg_bone1_FK_rot', 'L Leg Bone1 FK Rotate', 3)
-        leg_bone2_FK = hou.FloatParmTemplate('L_leg_bone2_FK_rot', 'L Leg Bone2 FK Rotate', 3)
-        foot_FK = hou.FloatParmTemplate('L_foot_FK_rot', 'L Foot FK Rotate', 3)
-        toe_FK = hou.FloatParmTemplate('L_toe_FK_rot', 'L Toe FK Rotate', 3)
-        ##add the floats to the control folder
-        leg_ctrl_folder.addParmTemplate(leg_FK_IK)
-        leg_ctrl_folder.addParmTemplate(leg_IK_trans)
-        leg_ctrl_folder.addParmTemplate(leg_IK_rot)
-        leg_ctrl_folder.addParmTemplate(leg_twist_trans)
-        leg_ctrl_folder.addParmTemplate(leg_bone1_FK)
-        leg_ctrl_folder.addParmTemplate(leg_bone2_FK)
-        leg_ctrl_folder.addParmTemplate(foot_FK)
-        leg_ctrl_folder.addParmTemplate(toe_FK)
-        ##add the ctrl folder to master
-        leg_folder.addParmTemplate(leg_ctrl_folder)
-        
-        ##create hand folder
-        foot_folder = hou.FolderParmTemplate('L_foot_folder', 'L Foot IK')
-        foot_folder.setFolderType(hou.folderType.Simple)
-        
-        ##create buttons for the actions folder
-        foot_default = hou.ButtonParmTemplate('set_L_foot_to_default', 'Set L foot to Default')
-        foot_key = hou.ButtonParmTemplate('set_L_foot_key', 'Set L foot Keys')
-        ##add the buttons to the actions folder
-        foot_folder.addParmTemplate(foot_default)
-        foot_folder.addParmTemplate(foot_key)
-        ##create floats different rolls
-        toe_roll_rot = hou.FloatParmTemplate('L_toe_roll_rot', 'L Toe Roll Rotate', 1, [0], 0, 10, True, True)
-        toe_twist_rot = hou.FloatParmTemplate('L_toe_twist_rot', 'L Toe Twist Rotate', 1, [0], -10, 10, True, True)
-        ball_roll_rot = hou.FloatParmTemplate('L_ball_roll_rot', 'L Ball Roll Rotate', 1, [0], 0, 10, True, True)
-        heel_roll_rot = hou.FloatParmTemplate('L_heel_roll_rot', 'L Heel Roll Rotate', 1, [0], -10, 10, True, True)
-        heel_twist_rot = hou.FloatParmTemplate('L_heel_twist_rot', 'L Heel Twist Rotate', 1, [0], -10, 10, True, True)
-        outer_roll_rot = hou.FloatParmTemplate('L_outer_roll_rot', 'L Outer Roll Rotate', 1, [0], -10, 10, True, True)
-        inner_roll_rot = hou.FloatParmTemplate('L_inner_roll_rot', 'L Inner Roll Rotate', 1, [0], -10, 10, True, True)
-        ##add the floats to the folders
-        foot_folder.addParmTemplate(toe_roll_rot)
-        foot_folder.addParmTemplate(toe_twist_rot)
-        foot_folder.addParmTemplate(ball_roll_rot)
-        foot_folder.addParmTemplate(heel_roll_rot)
-        foot_folder.addParmTemplate(heel_twist_rot)
-        foot_folder.addParmTemplate(outer_roll_rot)
-        foot_folder.addParmTemplate(inner_roll_rot)
-        
-        ##add hand folder to arm folder
-        leg_folder.addParmTemplate(foot_folder)
-        ##add the spine folder to the template group
-        rig_ptg.addParmTemplate(leg_folder)
-        ##reset the rig_net template back to the copy we have been editing
-        rig_net.setParmTemplateGroup(rig_ptg)
-        
-        ####LEG UI IMPLEMENTATION####
-        leg_kin.parm('blend').setExpression('ch("../../L_leg_FK_IK")')
-        leg_goal.parm('tx').setExpression('ch("../L_leg_IK_transx")')
-        leg_goal.parm('ty').setExpression('ch("../L_leg_IK_transy")')
-        leg_goal.parm('tz').setExpression('ch("../L_leg_IK_transz")')
-        leg_goal.parm('rx').setExpression('ch("../L_leg_IK_rotx")')
-        leg_goal.parm('ry').setExpression('ch("../L_leg_IK_roty")')
-        leg_goal.parm('rz').setExpression('ch("../L_leg_IK_rotz")')
-        leg_twist.parm('tx').setExpression('ch("../L_leg_twist_transx")')
-        leg_twist.parm('ty').setExpression('ch("../L_leg_twist_transy")')
-        leg_twist.parm('tz').setExpression('ch("../L_leg_twist_transz")')
-        leg_ctrl1.parm('rx').setExpression('ch("../L_leg_bone1_FK_rotx")')
-        leg_ctrl1.parm('ry').setExpression('ch("../L_leg_bone1_FK_roty")')
-        leg_ctrl1.parm('rz').setExpression('ch("../L_leg_bone1_FK_rotz")')
-        leg_ctrl2.parm('rx').setExpression('ch("../L_leg_bone2_FK_rotx")')
-        leg_ctrl2.parm('ry').setExpression('ch("../L_leg_bone2_FK_roty")')
-        leg_ctrl2.parm('rz').setExpression('ch("../L_leg_bone2_FK_rotz")')
-        foot_ctrl.parm('rx').setExpression('ch("../L_foot_FK_rotx")')
-        foot_ctrl.parm('ry').setExpression('ch("../L_foot_FK_roty")')
-        foot_ctrl.parm('rz').setExpression('ch("../L_foot_FK_rotz")')
-        toe_ctrl.parm('rx').setExpression('ch("../L_toe_FK_rotx")')
-        toe_ctrl.parm('ry').setExpression('ch("../L_toe_FK_roty")')
-        toe_ctrl.parm('rz').setExpression('ch("../L_toe_FK_rotz")')
-        toe_roll.parm('rx').setExpression('ch("../L_toe_roll_rot")*6')
-        toe_roll.parm('ry').setExpression('ch("../L_toe_twist_rot")*6')
-        ball_roll.parm('rx').setExpression('ch("../L_ball_roll_rot")*6')
-        heel_roll.parm('rx').setExpression('ch("../L_heel_roll_rot")*6')
-        heel_roll.parm('ry').setExpression('ch("../L_heel_twist_rot")*6')
-        outer_roll.parm('rz').setExpression('ch("../L_outer_roll_rot")*6')
-        inner_roll.parm('rz').setExpression('ch("../L_inner_roll_rot")*6')
-        ##display
-        leg_bone1.parm('tdisplay').set(True)
-        leg_bone2.parm('tdisplay').set(True)
-        foot_bone1.parm('tdisplay').set(True)
-        foot_bone2.parm('tdisplay').set(True)
-        leg_goal.parm('tdisplay').set(True)
-        leg_twist.parm('tdisplay').set(True)
-        leg_ctrl1.parm('tdisplay').set(True)
-        leg_ctrl2.parm('tdisplay').set(True)
-        foot_ctrl.parm('tdisplay').set(True)
-        toe_ctrl.parm('tdisplay').set(True)
-        leg_bone1.parm('display').setExpression('if (ch("../L_leg_bone_display") == 1 && ch("../m_bone_display") == 1, 1, 0)')
-        leg_bone2.parm('display').setExpression('if (ch("../L_leg_bone_display") == 1 && ch("../m_bone_display") == 1, 1, 0)')
-        foot_bone1.parm('display').setExpression('if (ch("../L_leg_bone_display") == 1 && ch("../m_bone_display") == 1, 1, 0)')
-        foot_bone2.parm('display').setExpression('if (ch("../L_leg_bone_display") == 1 && ch("../m_bone_display") == 1, 1, 0)')
-        leg_goal.parm('display').setExpression('if (ch("../L_leg_ctrl_display") == 1 && ch("../m_ctrl_display") == 1 && ch("../L_leg_FK_IK") == 1, 1, 0)')
-        leg_twist.parm('display').setExpression('if (ch("../L_leg_ctrl_display") == 1 && ch("../m_ctrl_display") == 1 && ch("../L_leg_FK_IK") == 1, 1, 0)')
-        leg_ctrl1.parm('display').setExpression('if (ch("../L_leg_ctrl_display") == 1 && ch("../m_ctrl_display") == 1 && ch("../L_leg_FK_IK") == 0, 1, 0)')
-        leg_ctrl2.parm('display').setExpression('if (ch("../L_leg_ctrl_display") == 1 && ch("../m_ctrl_display") == 1 && ch("../L_leg_FK_IK") == 0, 1, 0)')
-        foot_ctrl.parm('display').setExpression('if (ch("../L_leg_ctrl_display") == 1 && ch("../m_ctrl_display") == 1 && ch("../L_leg_FK_IK") == 0, 1, 0)')
-        toe_ctrl.parm('display').setExpression('if (ch("../L_leg_ctrl_display") == 1 && ch("../m_ctrl_display") == 1 && ch("../L_leg_FK_IK") == 0, 1, 0)')
-        
-        
-        ##NOTE TO SELF: USE THIS AFTER CREATING ALL THE CONTROLS AND CONSTRAINTS FOR THE PURPOSE OF MIRRORING
-        ##create an L_side list
-        L_side = []
-        ##for every node that has 'L_' in their name, add it to the L_side list
-        for child in rig_net.children():
-            ##pass through any name that has 'L_' in it
-            ##the is not -1 means it will only pass through names that match because names that don't will have a value of -1
-            if child.name().find('L_') is not -1:
-                    L_side.append(child)
-        
-        
-        rig_net.layoutChildren()
-        
-def run():
-    ##check to see if the QT widget already exists
-    for ui_item in hou.qt.mainWindow().children():
-        
-        if type(ui_item).__name__ == 'RigCreatorUI':
-            
-            ui_item.close()
-            ui_item.setParent(None)
+    hda_file_name = hda_file_name.replace(os.path.sep, '/')
+    
+    ##create a subnetwork node and save it to a varible for later use
+    rig_net = create_node(obj_level, 'subnet', rig_name)
+    #create the digital asset from the subnet
+    rig_net = rig_net.createDigitalAsset(rig_name, hda_file_name, None, 0, 1)
+    ##grab the true Hda definition
+    hda_def = rig_net.type().definition()
+    
+    ####set the HDA's default parameter folders to be hidden####
+    ##Make a copy of the parmTempalteGroup
+    parm_temp_group = rig_net.parmTemplateGroup()
+    ##fine the transform folder
+    trans_folder = parm_temp_group.findFolder('Transform')
+    ##set it to hidden
+    parm_temp_group.hide(trans_folder, True)
+    ##find the subnet folder
+    subnet_folder = parm_temp_group.findFolder('Subnet')
+    ##set it to hidden
+    parm_temp_group.hide(subnet_folder, True)
+    ##reset the template group to the HDA
+    rig_net.setParmTemplateGroup(parm_temp_group)
+    
+    ####create a geo node in the new HDA for referenceing the geo chosen by user####
+    #create a unique name for the geo node
+    geo_ref_name = rig_name + '_geo'
+    #create the node
+    geo_ref = create_node(rig_net, 'geo', geo_ref_name)
+    #create a file node in the geo node holding the user chosen geometry
+    file_ref_name = rig_name + '_ref'
+    file_ref = create_node(geo_ref, 'file', file_ref_name)
+    ##set the geometry file to reference the chosen geo
+    file_ref.parm('file').set(geo_file)
+    ##inject the user selected geo into the HDA itself
+    ##grab the name of the geo node earlier created
+    node_name = geo_ref.name()
+    ##create a name based on the geo node name that will be a Houdini geometry
+    geometry_name = node_name + '.bgeo'
+    ##grab the folder data
+    geometry = file_ref.geometry().data()
+    ##add the geometry to the hda
+    hda_def.addSection(geometry_name, geometry) 
+    ##set the file node to the new geometry in HDA
+    file_ref.parm('file').set('opdef:../..?'+geometry_name)
+    
+    ##check if it is being imported from maya and scale it down if it is
+    if from_maya == True:
+        ##create a transform to scale down the geo
+        scale_down = create_node(geo_ref, 'xform', 'maya_scale_down')
+        ##parent the node to the file ref
+        scale_down.setFirstInput(file_ref)
+        ##set the scale to be 1/100
+        scale_down.parm('scale').set(.01)
+        ##set render and display flag
+        scale_down.setRenderFlag(True)
+        scale_down.setDisplayFlag(True)
+        ##layout the nodes in the geo network
+        request_network_layout(geo_ref)
+    
+    
+    ##create starting null objects
+    hidden_trans = create_node(rig_net, 'null', 'hidden_transform')
+    master = create_node(rig_net, 'null', 'master')
+    
+    #parent the hidden transform under the subnet's indirect input by accessing it's indirect input and choosing first of the list
+    hidden_trans.setFirstInput(rig_net.indirectInputs()[0])
+    
+    ##set visibility and selectability and inputs
+    geo_ref.setSelectableInViewport(False)
+    hidden_trans.setDisplayFlag(False)
+    hidden_trans.setSelectableInViewport(False)
+    master.setDisplayFlag(False)
+    master.setSelectableInViewport(False)
+    master.setFirstInput(hidden_trans)
+    ####change master's shape####
+    ##a circle on the ZX plane, slightly larger
+    set_control_shape(master, 'circle_zx', 1.75)
+    
+    ##comment and color nodes
+    geo_ref.setComment('This node holds the Character Geo reference')
+    hidden_trans.setComment('This node is for any Layout Work when the charater needs to be moved without affecting the animation')
+    ##set a color rgb value
+    purple = hou.Color((.27,.185,.6))
+    grey = hou.Color((.3,.3,.3))
+    turquoise = hou.Color((0,.67,.5))
+    ##set the node color 
+    geo_ref.setColor(purple)
+    hidden_trans.setColor(grey)
+    master.setColor(turquoise)
+    
+    ##layout nodes in the rig net so far
+    request_network_layout(rig_net)
+    return (rig_net)
+
+##def for creating all null nodes that will be used as locators for creating bones
+@build_stage
+def create_locators(rig_name, template_name=None, scale=1.0):
+    """ Create the locators of a template for the user to move into place.
+
+    Input:
+        rig_name - name of the rig made by create_mesh
+        template_name - locator template, rig_templates.DEFAULT_TEMPLATE when None
+        scale - scale of the template for the size of the character
+    """
+    ####grab a reference back to the rig subnet network####
+    ##create a full directory to that node
+    hda_node = '/obj/' + rig_name
+    ##select that node
+    rig_net = hou.node(hda_node)
+    ##one scan of the rig, every lookup after this goes through the index
+    index = rig_index(rig_net)
+    
+    ##the template scaled to the size of the character
+    template = rig_templates.load_template(template_name)
+    build_locators(rig_net, template, scale)
+    ##re-layout everything
+    request_network_layout(rig_net)
+    
+@build_stage
+def create_bones(rig_name):
+    ##build the skeleton from the locators of the rig called rig_name
+    ##grab all the references back to the different levels of the node network
+    ##top level
+    obj_level = hou.node('/obj')
+    #reset rig name to be a full path
+    rig_name = rig_name + '/'
+    ##get the rig network
+    rig_net = obj_level.node(rig_name)
+    ##one scan of the rig, every lookup after this goes through the index
+    index = rig_index(rig_net)
+    ##grab the master null node
+    master = index.node('master')
+    
+    ##for every null node in the rig_net (locators) turn off its display and selectability
+    for each in index.find(node_type='null'):
+        each.setDisplayFlag(False)
+        each.setSelectableInViewport(False)
+    ##and the lines between them
+    guides = index.node(LOCATOR_GUIDES_NAME)
+    if guides is not None:
+        guides.setDisplayFlag(False)
+    
+    ##create a list of the spine locators
+    spine_nodes = []
+    spine_nodes.append(index.node('spine_base_locator'))
+    spine_nodes.append(index.node('spine_top_locator'))
+    
+    ##create a bone for the spine and split it 6 times
+    spine_bone = create_root_bone_chain(master, spine_nodes, 'spine')
+    spine_root = spine_bone[0]
+    spine_bone = spine_bone[1]
+    ##get the spine root from the created bones from earlier
+    spine_split = split_bone(spine_bone, 6)
+    
+    ##create a null in the middle of the last spine bone for creation of a shoulder bone
+    wing_locator = create_node(rig_net, 'null', 'wing_locator')
+    ##place that locator in the middle of the last spine bone by
+    ##moving halfway up the bone length from where the last spine bone places its children
+    spine_end = index.node('split_spine_bone6')
+    wing_world = hou.hmath.buildTranslate(0, 0, -spine_end.evalParm('length')/2) * child_frame(spine_end)
+    ##move the locator away fromt he center axis
+    wing_world.setAt(3, 0, .05)
+    place_world(wing_locator, wing_world)
+    ##set flags
+    wing_locator.setSelectableInViewport(False)
+    wing_locator.setDisplayFlag(False)
+    ##grab the locator box
+    locator_nulls = rig_net.findNetworkBox('locator_nulls')
+    locator_nulls.addItem(wing_locator)
+    
+    ##shoulder list
+    shoulder_list =  []
+    shoulder_list.append(wing_locator)
+    shoulder_list.append(index.node('L_shoulder_locator'))
+    
+    ##create a list for the arm locators
+    arm_locators = []
+    arm_locators.append(index.node('L_shoulder_locator'))
+    arm_locators.append(index.node('L_elbow_locator'))
+    arm_locators.append(index.node('L_wrist_locator'))
+    
+    ##hand
+    hand_locators = []
+    hand_locators.append(index.node('L_wrist_locator'))
+    hand_locators.append(index.node('L_middle_base_locator'))
+    
+    ##create a list for the finger locators
+    ##thumb
+    thumb_locators = []
+    thumb_locators.append(index.node('L_thumb_base_locator'))
+    thumb_locators.append(index.node('L_thumb_mid_locator'))
+    thumb_locators.append(index.node('L_thumb_end_locator'))
+    thumb_locators.append(index.node('L_thumb_tip_point_locator'))
+    ##index
+    index_locators = []
+    index_locators.append(index.node('L_index_base_locator'))
+    index_locators.append(index.node('L_index_mid_locator'))
+    index_locators.append(index.node('L_index_end_locator'))
+    index_locators.append(index.node('L_index_tip_point_locator'))
+    ##middle
+    middle_locators = []
+    middle_locators.append(index.node('L_middle_base_locator'))
+    middle_locators.append(index.node('L_middle_mid_locator'))
+    middle_locators.append(index.node('L_middle_end_locator'))
+    middle_locators.append(index.node('L_middle_tip_point_locator'))
+    ##ring
+    ring_locators = []
+    ring_locators.append(index.node('L_ring_base_locator'))
+    ring_locators.append(index.node('L_ring_mid_locator'))
+    ring_locators.append(index.node('L_ring_end_locator'))
+    ring_locators.append(index.node('L_ring_tip_point_locator'))
+    ##pinky
+    pinky_locators = []
+    pinky_locators.append(index.node('L_pinky_base_locator'))
+    pinky_locators.append(index.node('L_pinky_mid_locator'))
+    pinky_locators.append(index.node('L_pinky_end_locator'))
+    pinky_locators.append(index.node('L_pinky_tip_point_locator'))
+    
+    ##create a list for the leg locators
+    leg_locators = []
+    leg_locators.append(index.node('L_hip_locator'))
+    leg_locators.append(index.node('L_knee_locator'))
+    leg_locators.append(index.node('L_ankle_locator'))
+    
+    foot_locators = []
+    foot_locators.append(index.node('L_ankle_locator'))
+    foot_locators.append(index.node('L_ball_locator'))
+    foot_locators.append(index.node('L_toe_tip_locator'))
+    
+    ##tailbone list
+    tailbone_locators = []
+    tailbone_locators.append(index.node('spine_base_locator'))
+    tailbone_locators.append(index.node('tailbone_locator'))
+    
+    ##neck list
+    neck_locators = []
+    neck_locators.append(index.node('spine_top_locator'))
+    neck_locators.append(index.node('mid_neck_locator'))
+    neck_locators.append(index.node('skull_base_locator'))
+    
+    ##head list
+    head_locators = []
+    head_locators.append(index.node('skull_base_locator'))
+    head_locators.append(index.node('head_top_locator'))
+    
+    ##jaw locators
+    jaw_locators = []
+    jaw_locators.append(index.node('jaw_hindge_locator'))
+    jaw_locators.append(index.node('chin_locator'))
+    
+    ####creating the bones####
+    ##create pelvis root and bones
+    pelvis = create_root_bone_chain(spine_root, tailbone_locators, 'pelvis')
+    ##grab the pelvis bone
+    pelvis_bone = pelvis[1]
+    ##create neck root and bones
+    neck_bones = create_root_bone_chain(spine_split, neck_locators, 'neck')
+    ##grab the neck last bone
+    neck_last = neck_bones[2]
+    head_bone = create_root_bone_chain(neck_last, head_locators, 'head')
+    head_last = head_bone[1]
+    jaw_bone = create_root_bone_chain(head_last, jaw_locators, 'jaw')
+    jaw_last = jaw_bone[1]
+    shoulder_bone = create_root_bone_chain(spine_split, shoulder_list, 'L_shoulder')
+    shoulder_last = shoulder_bone[1]
+    ##Rotating the hand and shoulder bone to be a good position for my default model that I am basing this tool off of and will ship the tool with        
+    shoulder_last.parm('rz').set(-170)
+    arm_bones = create_root_bone_chain(shoulder_last, arm_locators, 'L_arm')
+    arm_last = arm_bones[2]
+    hand_bone = create_root_bone_chain(arm_last, hand_locators, 'L_hand')
+    hand_last = hand_bone[1]
+    ##Rotating the hand and shoulder bone to be a good position for my default model that I am basing this tool off of and will ship the tool with
+    hand_last.parm('rz').set(-20)
+    leg_bones = create_root_bone_chain(pelvis_bone, leg_locators, 'L_leg')
+    leg_last = leg_bones[2]
+    foot_bones = create_root_bone_chain(leg_last, foot_locators, 'L_foot')
+    foot_last = foot_bones[2]
+    thumb_bones = create_root_bone_chain(hand_last, thumb_locators, 'L_thumb')
+    index_bones = create_root_bone_chain(hand_last, index_locators, 'L_index')
+    middle_bones = create_root_bone_chain(hand_last, middle_locators, 'L_middle')
+    ring_bones = create_root_bone_chain(hand_last, ring_locators, 'L_ring')
+    pinky_bones = create_root_bone_chain(hand_last, pinky_locators, 'L_pinky')
+    
+    ####FACE BONES####
+    L_cheek_path = index.node('L_cheek_path')
+    makeBonesFromCurve(L_cheek_path, 'L_cheek', 6, 1, 1)
+    brow_path = index.node('L_brow_path')
+    makeBonesFromCurve(brow_path, 'L_brow', 6, 1, 1)
+    squint_path = index.node('L_squint_path')
+    makeBonesFromCurve(squint_path, 'L_squint', 3, 1, 1)
+    smile_line_path = index.node('L_smile_line_path')
+    makeBonesFromCurve(smile_line_path, 'L_smile_line', 4, 1, 1)
+    nostril_path = index.node('L_nostril_path')
+    makeBonesFromCurve(nostril_path, 'L_nostril', 3, 1, 1)
+    lower_lip_path = index.node('lower_lip_path')
+    makeBonesFromCurve(lower_lip_path, 'lower_lip', 6, 1, 1)
+    upper_lip_path = index.node('upper_lip_path')
+    makeBonesFromCurve(upper_lip_path, 'upper_lip', 6, 1, 1)
+    
+    ##turn keep position on in case user wants to reorient bones
+    for bone in index.find(node_type='bone'):
+        bone.parm('keeppos').set(True)
             
-    RigCreatorUI()
\ No newline at end of file
+    request_network_layout(rig_net)
+    
+@build_stage
+def capture_mesh(rig_name, capture_mode=CAPTURE_CLAMPED_BIHARMONIC):
+    """ Make the controls, mirror the rig and capture the character mesh.
+
+    Input:
+        rig_name - name of the rig made by create_mesh
+        capture_mode - CAPTURE_CLAMPED_BIHARMONIC, or CAPTURE_PROXIMITY for a quick preview of the weights
+    Raises:
+        ImportError when the biharmonic (clamped) capture can't find scipy, the rig is finished apart from its weights
+    """
+    ##grab all the references back to the different levels of the node network
+    ##top level
+    obj_level = hou.node('/obj')
+    #reset rig name to be a full path
+    rig_name = rig_name + '/'
+    ##get the rig network
+    rig_net = obj_level.node(rig_name)
+    ##one scan of the rig, every lookup after this goes through the index
+    index = rig_index(rig_net)
+    ##grab the master null node
+    master = index.node('master')
+    
+    ##colors
+    purple = hou.Color((.27,.185,.6))
+    dull_red = hou.Color((.5,.12,.12))
+    grey = hou.Color((.3,.3,.3))
+    turquoise = hou.Color((0,.67,.5))
+    
+    ##create a list for all the bones
+    bones_list = []
+    
+    ##gather all the bones into a list
+    for each in index.find(node_type='bone'):
+        bones_list.append(each)
+        each.setSelectableInViewport(False)
+        ##"zero" out the rotation and position of the bones
+        each.moveParmTransformIntoPreTransform()
+        ##set all rest angles to 0
+        each.parmTuple('R').set((0,0,0))
+    ##turn off all null display including root nulls
+    for each in index.find(node_type='null'):
+        each.setDisplayFlag(False)
+        each.setSelectableInViewport(False)
+    
+    ##create a list for ctrls
+    ctrl_list = []
+    
+    ####MASTER CONTROL####
+    ##turn master control back on
+    master.setDisplayFlag(True)
+    master.setSelectableInViewport(True)
+    ##add master to control list
+    ctrl_list.append(master)
+    
+    ####MASTER UI ELEMENTS####
+    ##the master folder of the HDA, written with the other limbs' folders once the build is done
+    add_interface(rig_net, MASTER_INTERFACE, {'master': master})
+    ##display
+    queue_parms(master, {'tdisplay': True})
+    
+    
+    ####CREATE COG CTRL####
+    spine_1 = index.node('split_spine_bone1')
+    COG = create_null_at_node(rig_net, spine_1, 'COG_ctrl')
+    ##up half the first spine bone and under the master in one placement
+    COG_world = hou.hmath.buildTranslate(0, spine_1.evalParm('length')/2, 0) * cached_world(COG)
+    place_world(COG, COG_world, master)
+    COG.setColor(turquoise)
+    set_control_shape(COG, 'circle_zx', color=(1, 0, 1))
+    ctrl_list.append(COG)
+    
+    
+    ####SPINE CURVE####
+    ##create the spine curve for FK and IK functions
+    spine_path = create_node(rig_net, 'path', 'spine_path')
+    ##find the points merge node in the path node
+    points_merge = spine_path.node('points_merge/')
+    ##allow for three objects to link to the path
+    points_merge.parm('numobj').set(3)
+    ##find the rest of the needed nodes in the path network
+    delete_endpoints = spine_path.node('delete_endpoints/')
+    connect_points = spine_path.node('connect_points/')
+    output_curve = spine_path.node('output_curve/')
+    ##create the path cv points
+    spine_base_cv = create_node(rig_net, 'pathcv', 'spine_base_cv')
+    spine_mid_cv = create_node(rig_net, 'pathcv', 'spine_mid_cv')
+    spine_top_cv = create_node(rig_net, 'pathcv', 'spine_top_cv')
+    ##shink the z axis on the cvs for a smoother path creation
+    spine_base_cv.parm('sz').set(.1)
+    spine_mid_cv.parm('sz').set(.1)
+    spine_top_cv.parm('sz').set(.1)
+    ##get the path to the cv's points node
+    spine_base_cv_path = spine_base_cv.path() + '/points'
+    spine_mid_cv_path = spine_mid_cv.path() + '/points'
+    spine_top_cv_path = spine_top_cv.path() + '/points'
+    ##input the cvs into the points merge
+    points_merge.parm('objpath1').set(spine_base_cv_path)
+    points_merge.parm('objpath2').set(spine_mid_cv_path)
+    points_merge.parm('objpath3').set(spine_top_cv_path)
+    ##delete the mid_cv's extension points in preperation of changing to a NURBS 
+    delete_mid = create_node(spine_path, 'delete', 'delete_midpoints')
+    delete_mid.setFirstInput(delete_endpoints)
+    connect_points.setFirstInput(delete_mid)
+    request_network_layout(spine_path)
+    ##set parms on the delete node for getting rid of those mid cvs
+    delete_mid.parm('entity').set(1)
+    delete_mid.parm('group').set('2 4')
+    ##turn the curve to a NURBS
+    output_curve.parm('totype').set(4)
+    ####position the cvs in the correct spots####
+    ##spine base
+    place_at(spine_base_cv, child_frame(index.node('split_spine_bone1')))
+    ##spine mid
+    place_at(spine_mid_cv, child_frame(index.node('split_spine_bone4')))
+    ##spine top, a bone length further down the last spine bone
+    spine_top_bone = index.node('split_spine_bone6')
+    place_at(spine_top_cv, hou.hmath.buildTranslate(0, 0, -spine_top_bone.evalParm('length')) * child_frame(spine_top_bone))
+    ##set flags
+    spine_base_cv.setSelectableInViewport(False)
+    spine_base_cv.setDisplayFlag(False)
+    spine_mid_cv.setSelectableInViewport(False)
+    spine_mid_cv.setDisplayFlag(False)
+    spine_top_cv.setSelectableInViewport(False)
+    spine_top_cv.setDisplayFlag(False)
+    spine_path.setSelectableInViewport(False)
+    spine_path.setDisplayFlag(False)
+    
+    ####Spine Controls####
+    ##create the IK controls
+    hip_IK = create_null_at_node(rig_net, spine_base_cv, 'hip_IK_ctrl')
+    mid_IK = create_null_at_node(rig_net, spine_mid_cv, 'mid_IK_ctrl')
+    chest_IK = create_null_at_node(rig_net, spine_top_cv, 'chest_IK_ctrl')
+    ##set some parameters so the ctrls look nicer
+    ##control shape to box
+    set_control_shape(hip_IK, 'box')
+    set_control_shape(mid_IK, 'box')
+    set_control_shape(chest_IK, 'box')
+    ##change display scale (not actual scale)
+    queue_parms(hip_IK, {'geosizex':.7, 'geosizey':.1, 'geosizez':.6})
+    queue_parms(mid_IK, {'geosizex':.6, 'geosizey':.025, 'geosizez':.5})
+    queue_parms(chest_IK, {'geosizex':.7, 'geosizey':.1, 'geosizez':.4})
+    ##move the center of the mid IK forward a bit to compensate for spine curve
+    queue_parms(mid_IK, {'geocenterz': .03})
+    ##changing the node color
+    hip_IK.setColor(turquoise)
+    mid_IK.setColor(turquoise)
+    chest_IK.setColor(turquoise)
+    ##create the FK controls
+    FK_A = create_null_at_node(rig_net, index.node('split_spine_bone1'), 'spine_A_FK_ctrl')
+    FK_B = create_null_at_node(rig_net, index.node('split_spine_bone3'), 'spine_B_FK_ctrl')
+    FK_C = create_null_at_node(rig_net, index.node('split_spine_bone5'), 'spine_C_FK_ctrl')
+    ##set parms for the looks
+    ##cotnrol shape to be circle in ZX plaen
+    set_control_shape(FK_A, 'circle_zx')
+    set_control_shape(FK_B, 'circle_zx')
+    set_control_shape(FK_C, 'circle_zx')
+    ##change display and center to be nice looking by default
+    queue_parms(FK_A, {'geosizex': .8, 'geosizey': .8, 'geosizez': .6})
+    queue_parms(FK_B, {'geosizex': .8, 'geosizey': .8, 'geosizez': .6})
+    queue_parms(FK_B, {'geocenterz': .02})
+    queue_parms(FK_C, {'geosizex': .8, 'geosizey': .8, 'geosizez': .6})
+    queue_parms(FK_C, {'geocenterz': .03})
+    ##changing the controls color
+    queue_parms(FK_A, {'dcolorr': 0, 'dcolorg': 1, 'dcolorb': .5})
+    queue_parms(FK_B, {'dcolorr': 0, 'dcolorg': 1, 'dcolorb': .5})
+    queue_parms(FK_C, {'dcolorr': 0, 'dcolorg': 1, 'dcolorb': .5})
+    ##change the node color
+    FK_A.setColor(turquoise)
+    FK_B.setColor(turquoise)
+    FK_C.setColor(turquoise)
+    ##set inputs
+    FK_A.setFirstInput(COG)
+    FK_B.setFirstInput(FK_A)
+    FK_C.setFirstInput(FK_B)
+    hip_IK.setFirstInput(FK_A)
+    mid_IK.setFirstInput(FK_B)
+    chest_IK.setFirstInput(FK_C)
+    spine_base_cv.setFirstInput(hip_IK)
+    spine_mid_cv.setFirstInput(mid_IK)
+    spine_top_cv.setFirstInput(chest_IK)
+    spine_root = index.node('spine_root')
+    spine_path.setFirstInput(spine_root)
+    spine_root.setFirstInput(hip_IK)
+    ##append controls to list
+    ctrl_list.append(FK_A)
+    ctrl_list.append(FK_B)
+    ctrl_list.append(FK_C)
+    ctrl_list.append(chest_IK)
+    ctrl_list.append(mid_IK)
+    ctrl_list.append(hip_IK)
+    
+    ####Spine Kinematics####
+    ##the rig's kinematics network, made if it doesn't exist yet
+    kin_net = kinematics_network(rig_net)
+    ##create a kinematics solver
+    spine_kin = create_node(kin_net, 'inversekin', 'KIN_spine')
+    ##change the solver type to follow curve
+    spine_kin.parm('solvertype').set(4)
+    ##set the root and end bones
+    spine_kin.parm('bonerootpath').set('../../split_spine_bone1')
+    spine_kin.parm('boneendpath').set('../../split_spine_bone6')
+    ##set the curve
+    spine_kin.parm('curvepath').set('../../spine_path')
+    ##set spine bones to follow the spine kinematics
+    index.node('split_spine_bone1').parm('solver').set('../KIN_Chops/KIN_spine/')
+    index.node('split_spine_bone2').parm('solver').set('../KIN_Chops/KIN_spine/')
+    index.node('split_spine_bone3').parm('solver').set('../KIN_Chops/KIN_spine/')
+    index.node('split_spine_bone4').parm('solver').set('../KIN_Chops/KIN_spine/')
+    index.node('split_spine_bone5').parm('solver').set('../KIN_Chops/KIN_spine/')
+    index.node('split_spine_bone6').parm('solver').set('../KIN_Chops/KIN_spine/')
+    ##set spine to be able to stretch with curve
+    stretch_chain(spine_path, [index.node('split_spine_bone' + str(num)) for num in range(1, 7)], 0)
+    
+    ####PELVIS CONTROL####
+    pelvis_root = index.node('pelvis_root')
+    pelvis_ctrl = create_stick_ball_null(rig_net, pelvis_root, 'pelvis_ctrl')
+    pelvis_ctrl.parm('rx').set(-85)
+    queue_parms(pelvis_ctrl, {'geoscale': .04})
+    queue_parms(pelvis_ctrl, {'dcolorr': .5, 'dcolorg': .25, 'dcolorb': 0})
+    pelvis_ctrl.setColor(turquoise)
+    pelvis_root.setFirstInput(pelvis_ctrl)
+    pelvis_ctrl.setFirstInput(hip_IK)
+    pelvis_ctrl.moveParmTransformIntoPreTransform()
+    ctrl_list.append(pelvis_ctrl)
+    
+    ####SPINE UI####
+    ##the spine folder of the HDA and the controls its Controls folder drives
+    add_interface(rig_net, SPINE_INTERFACE, {
+        'COG': COG,
+        'FK_A': FK_A,
+        'FK_B': FK_B,
+        'FK_C': FK_C,
+        'chest_IK': chest_IK,
+        'mid_IK': mid_IK,
+        'hip_IK': hip_IK,
+        'pelvis_ctrl': pelvis_ctrl})
+    
+    ##make sure that all the ctrls have clean transforms before creating references
+    for ctrl in ctrl_list:
+        ctrl.moveParmTransformIntoPreTransform()
+    
+    ####SPINE UI CONTROL IMPLEMENTATION####
+    ##displayability options implementation
+    ##bones
+    ##if master bone display and spine bone display are on than set value 1, else 0
+    queue_parms(index.node('split_spine_bone1'), {'tdisplay': True})
+    queue_parms(index.node('split_spine_bone2'), {'tdisplay': True})
+    queue_parms(index.node('split_spine_bone3'), {'tdisplay': True})
+    queue_parms(index.node('split_spine_bone4'), {'tdisplay': True})
+    queue_parms(index.node('split_spine_bone5'), {'tdisplay': True})
+    queue_parms(index.node('split_spine_bone6'), {'tdisplay': True})
+    queue_parms(index.node('pelvis_bone1'), {'tdisplay': True})
+    add_visibility_set(rig_net, 's_bone', [('s_bone_display', 1), ('m_bone_display', 1)], [
+        index.node('split_spine_bone1'),
+        index.node('split_spine_bone2'),
+        index.node('split_spine_bone3'),
+        index.node('split_spine_bone4'),
+        index.node('split_spine_bone5'),
+        index.node('split_spine_bone6'),
+        index.node('pelvis_bone1')])
+    ##ctrls
+    queue_parms(COG, {'tdisplay': True})
+    queue_parms(FK_A, {'tdisplay': True})
+    queue_parms(FK_B, {'tdisplay': True})
+    queue_parms(FK_C, {'tdisplay': True})
+    queue_parms(hip_IK, {'tdisplay': True})
+    queue_parms(mid_IK, {'tdisplay': True})
+    queue_parms(chest_IK, {'tdisplay': True})
+    queue_parms(pelvis_ctrl, {'tdisplay': True})
+    add_visibility_set(rig_net, 's_ctrl', [('s_ctrl_display', 1), ('m_ctrl_display', 1)], [
+        COG,
+        FK_A,
+        FK_B,
+        FK_C,
+        hip_IK,
+        mid_IK,
+        chest_IK,
+        pelvis_ctrl])
+    
+    ##left cotnrol list
+    L_ctrl_list = []
+    
+    ####Shoulder Control####
+    ##grab the shoulder bone and root
+    shoulder_bone = index.node('L_shoulder_bone1')
+    shoulder_root = index.node('L_shoulder_root')
+    ##create an fk control
+    shoulder_FK = create_FK_control(shoulder_bone, 1, 'L_shoulder_FK')
+    ##grab the auto and ctrl nodes frm the fk
+    shoulder_ctrl = shoulder_FK[2]
+    shoulder_auto = shoulder_FK[1]
+    shoulder_offset = shoulder_FK[0]
+    ##delete the ctrl
+    destroy_node(shoulder_ctrl)
+    ##create the stick ball ctrl
+    shoulder_ctrl = create_stick_ball_null(rig_net, shoulder_auto, 'L_shoulder_FK_ctrl')
+    ##set some parms to make it look nicer
+    queue_parms(shoulder_ctrl, {'georotatex': -20, 'georotatey': 0, 'georotatez': -35})
+    queue_parms(shoulder_ctrl, {'geoscale': .035})
+    ##reparent the ctrl
+    reparent(shoulder_root, chest_IK)
+    reparent(shoulder_ctrl, shoulder_auto)
+    reparent(shoulder_offset, shoulder_root)
+    ##add to ctrl lists
+    ctrl_list.append(shoulder_ctrl)
+    L_ctrl_list.append(shoulder_ctrl)
+    ##set up constraint
+    simple_constraint(shoulder_bone, shoulder_ctrl)
+    
+    ####L arm IK FK####
+    ##L arm bones
+    arm_bone1 = index.node('L_arm_bone1')
+    arm_bone2 = index.node('L_arm_bone2')
+    hand_bone = index.node('L_hand_bone1')
+    ##create IK FK
+    arm_ctrls = create_IK_FK_controls(arm_bone1, arm_bone2, shoulder_ctrl, 'L_arm', -1)
+    ##extract the nodes created
+    arm_ctrl1 = arm_ctrls[0]
+    arm_ctrl2 = arm_ctrls[1]
+    arm_twist = arm_ctrls[2]
+    arm_twist_offset = index.node('L_arm_twist_offset')
+    arm_goal = arm_ctrls[3]
+    arm_goal_offset = index.node('L_arm_goal_offset')
+    arm_kin = arm_ctrls[4]
+    ##make controls size a bit more managable
+    queue_parms(arm_ctrl1, {'geoscale': .35})
+    queue_parms(arm_ctrl2, {'geoscale': .3})
+    ##parent the IK nodes
+    reparent(arm_twist_offset, master)
+    reparent(arm_goal_offset, master)
+    ##append them all to the L_side ctrls and ctrls list
+    L_ctrl_list.append(arm_ctrl1)
+    L_ctrl_list.append(arm_ctrl2)
+    L_ctrl_list.append(arm_twist)
+    L_ctrl_list.append(arm_goal)
+    ctrl_list.append(arm_ctrl1)
+    ctrl_list.append(arm_ctrl2)
+    ctrl_list.append(arm_twist)
+    ctrl_list.append(arm_goal)
+    ##create hand ctrls
+    hand_ctrls = create_IK_FK_controls(hand_bone, hand_bone, arm_ctrl2, 'L_hand', 1)
+    ##extract the created nodes
+    hand_ctrl = hand_ctrls[0]
+    hand_twist = hand_ctrls[1]
+    hand_twist_offset = index.node('L_hand_twist_offset')
+    hand_goal = hand_ctrls[2]
+    hand_goal_offset = index.node('L_hand_goal_offset')
+    hand_kin = hand_ctrls[3]
+    ##set Flags and parents so hand ik won't be seen and will simply follow the wrist IK
+    hand_twist.setDisplayFlag(False)
+    hand_twist.setSelectableInViewport(False)
+    hand_goal.setDisplayFlag(False)
+    hand_goal.setSelectableInViewport(False)
+    reparent(hand_goal_offset, arm_goal)
+    reparent(hand_twist_offset, arm_goal)
+    queue_parms(hand_ctrl, {'geoscale': .25})
+    ##apend the FK ctrl
+    L_ctrl_list.append(hand_ctrl)
+    ctrl_list.append(hand_ctrl)
+    ##set the hand kin solver to do the same as arm solver, so if one is off so is the other
+    ##arm kin path
+    arm_kin_blend = 'ch("' + arm_kin.path() + '/blend")'
+    hand_kin.parm('blend').setExpression(arm_kin_blend)
+    
+    ####FINGER CONTROLS####
+    ##create a null at the hand bond that will hold all the finger controls under it and follow the hand bone via constraint
+    finger_grp = create_null_at_node(rig_net, hand_bone, 'L_finger_grp')
+    ##constraing the group so it follows the hand bone whether it is in IK or FK
+    simple_constraint(finger_grp, hand_bone)
+    ##parent 
+    reparent(finger_grp, shoulder_ctrl)
+    ##flags
+    finger_grp.setDisplayFlag(False)
+    finger_grp.setSelectableInViewport(False)
+    ##grab bones
+    thumb_base_bone = index.node('L_thumb_bone1')
+    thumb_mid_bone = index.node('L_thumb_bone2')
+    thumb_end_bone = index.node('L_thumb_bone3')
+    index_base_bone = index.node('L_index_bone1')
+    index_mid_bone = index.node('L_index_bone2')
+    index_end_bone = index.node('L_index_bone3')
+    middle_base_bone = index.node('L_middle_bone1')
+    middle_mid_bone = index.node('L_middle_bone2')
+    middle_end_bone = index.node('L_middle_bone3')
+    ring_base_bone = index.node('L_ring_bone1')
+    ring_mid_bone = index.node('L_ring_bone2')
+    ring_end_bone = index.node('L_ring_bone3')
+    pinky_base_bone = index.node('L_pinky_bone1')
+    pinky_mid_bone = index.node('L_pinky_bone2')
+    pinky_end_bone = index.node('L_pinky_bone3')
+    ##create the finger controls and constrain their bones
+    thumb_base_nodes = create_FK_control(thumb_base_bone, .08, 'L_thumb_base')
+    thumb_mid_nodes = create_FK_control(thumb_mid_bone, .065, 'L_thumb_mid')
+    thumb_end_nodes = create_FK_control(thumb_end_bone, .05, 'L_thumb_end')
+    index_base_nodes = create_FK_control(index_base_bone, .05, 'L_index_base')
+    index_mid_nodes = create_FK_control(index_mid_bone, .05, 'L_index_mid')
+    index_end_nodes = create_FK_control(index_end_bone, .05, 'L_index_end')
+    middle_base_nodes = create_FK_control(middle_base_bone, .05, 'L_middle_base')
+    middle_mid_nodes = create_FK_control(middle_mid_bone, .05, 'L_middle_mid')
+    middle_end_nodes = create_FK_control(middle_end_bone, .05, 'L_middle_end')
+    ring_base_nodes = create_FK_control(ring_base_bone, .05, 'L_ring_base')
+    ring_mid_nodes = create_FK_control(ring_mid_bone, .05, 'L_ring_mid')
+    ring_end_nodes = create_FK_control(ring_end_bone, .05, 'L_ring_end')
+    pinky_base_nodes = create_FK_control(pinky_base_bone, .05, 'L_pinky_base')
+    pinky_mid_nodes = create_FK_control(pinky_mid_bone, .05, 'L_pinky_mid')
+    pinky_end_nodes = create_FK_control(pinky_end_bone, .05, 'L_pinky_end')
+    ##extract the needed nodes
+    thumb_base_offset = thumb_base_nodes[0]
+    thumb_base_ctrl = thumb_base_nodes[2]
+    thumb_mid_offset = thumb_mid_nodes[0]
+    thumb_mid_ctrl = thumb_mid_nodes[2]
+    thumb_end_offset = thumb_end_nodes[0]
+    thumb_end_ctrl = thumb_end_nodes[2]
+    index_base_offset = index_base_nodes[0]
+    index_base_ctrl = index_base_nodes[2]
+    index_mid_offset = index_mid_nodes[0]
+    index_mid_ctrl = index_mid_nodes[2]
+    index_end_offset = index_end_nodes[0]
+    index_end_ctrl = index_end_nodes[2]
+    middle_base_offset = middle_base_nodes[0]
+    middle_base_ctrl = middle_base_nodes[2]
+    middle_mid_offset = middle_mid_nodes[0]
+    middle_mid_ctrl = middle_mid_nodes[2]
+    middle_end_offset = middle_end_nodes[0]
+    middle_end_ctrl = middle_end_nodes[2]
+    ring_base_offset = ring_base_nodes[0]
+    ring_base_ctrl = ring_base_nodes[2]
+    ring_mid_offset = ring_mid_nodes[0]
+    ring_mid_ctrl = ring_mid_nodes[2]
+    ring_end_offset = ring_end_nodes[0]
+    ring_end_ctrl = ring_end_nodes[2]
+    pinky_base_offset = pinky_base_nodes[0]
+    pinky_base_ctrl = pinky_base_nodes[2]
+    pinky_mid_offset = pinky_mid_nodes[0]
+    pinky_mid_ctrl = pinky_mid_nodes[2]
+    pinky_end_offset = pinky_end_nodes[0]
+    pinky_end_ctrl = pinky_end_nodes[2]
+    ##set up constraints
+    simple_constraint(thumb_base_bone, thumb_base_ctrl)
+    simple_constraint(thumb_mid_bone, thumb_mid_ctrl)
+    simple_constraint(thumb_end_bone, thumb_end_ctrl)
+    simple_constraint(index_base_bone, index_base_ctrl)
+    simple_constraint(index_mid_bone, index_mid_ctrl)
+    simple_constraint(index_end_bone, index_end_ctrl)
+    simple_constraint(middle_base_bone, middle_base_ctrl)
+    simple_constraint(middle_mid_bone, middle_mid_ctrl)
+    simple_constraint(middle_end_bone, middle_end_ctrl)
+    simple_constraint(ring_base_bone, ring_base_ctrl)
+    simple_constraint(ring_mid_bone, ring_mid_ctrl)
+    simple_constraint(ring_end_bone, ring_end_ctrl)
+    simple_constraint(pinky_base_bone, pinky_base_ctrl)
+    simple_constraint(pinky_mid_bone, pinky_mid_ctrl)
+    simple_constraint(pinky_end_bone, pinky_end_ctrl)
+    ##parent in order
+    reparent(thumb_base_offset, finger_grp)
+    reparent(thumb_mid_offset, thumb_base_ctrl)
+    reparent(thumb_end_offset, thumb_mid_ctrl)
+    reparent(index_base_offset, finger_grp)
+    reparent(index_mid_offset, index_base_ctrl)
+    reparent(index_end_offset, index_mid_ctrl)
+    reparent(middle_base_offset, finger_grp)
+    reparent(middle_mid_offset, middle_base_ctrl)
+    reparent(middle_end_offset, middle_mid_ctrl)
+    reparent(ring_base_offset, finger_grp)
+    reparent(ring_mid_offset, ring_base_ctrl)
+    reparent(ring_end_offset, ring_mid_ctrl)
+    reparent(pinky_base_offset, finger_grp)
+    reparent(pinky_mid_offset, pinky_base_ctrl)
+    reparent(pinky_end_offset, pinky_mid_ctrl)
+    ##apend to lists
+    ctrl_list.append(thumb_base_ctrl)
+    L_ctrl_list.append(thumb_base_ctrl)
+    ctrl_list.append(thumb_mid_ctrl)
+    L_ctrl_list.append(thumb_mid_ctrl)
+    ctrl_list.append(thumb_end_ctrl)
+    L_ctrl_list.append(thumb_end_ctrl)
+    ctrl_list.append(index_base_ctrl)
+    L_ctrl_list.append(index_base_ctrl)
+    ctrl_list.append(index_mid_ctrl)
+    L_ctrl_list.append(index_mid_ctrl)
+    ctrl_list.append(index_end_ctrl)
+    L_ctrl_list.append(index_end_ctrl)
+    ctrl_list.append(middle_base_ctrl)
+    L_ctrl_list.append(middle_base_ctrl)
+    ctrl_list.append(middle_mid_ctrl)
+    L_ctrl_list.append(middle_mid_ctrl)
+    ctrl_list.append(middle_end_ctrl)
+    L_ctrl_list.append(middle_end_ctrl)
+    ctrl_list.append(ring_base_ctrl)
+    L_ctrl_list.append(ring_base_ctrl)
+    ctrl_list.append(ring_mid_ctrl)
+    L_ctrl_list.append(ring_mid_ctrl)
+    ctrl_list.append(ring_end_ctrl)
+    L_ctrl_list.append(ring_end_ctrl)
+    ctrl_list.append(pinky_base_ctrl)
+    L_ctrl_list.append(pinky_base_ctrl)
+    ctrl_list.append(pinky_mid_ctrl)
+    L_ctrl_list.append(pinky_mid_ctrl)
+    ctrl_list.append(pinky_end_ctrl)
+    L_ctrl_list.append(pinky_end_ctrl)
+    
+    ####ARM AND HAND UI#####
+    ##the arm folder of the HDA with the hand and finger folders inside it
+    add_interface(rig_net, ARM_INTERFACE, {
+        'arm_kin': arm_kin,
+        'shoulder_ctrl': shoulder_ctrl,
+        'arm_goal': arm_goal,
+        'arm_twist': arm_twist,
+        'arm_ctrl1': arm_ctrl1,
+        'arm_ctrl2': arm_ctrl2,
+        'hand_ctrl': hand_ctrl,
+        'thumb_base_ctrl': thumb_base_ctrl,
+        'thumb_mid_ctrl': thumb_mid_ctrl,
+        'thumb_end_ctrl': thumb_end_ctrl,
+        'index_base_ctrl': index_base_ctrl,
+        'index_mid_ctrl': index_mid_ctrl,
+        'index_end_ctrl': index_end_ctrl,
+        'middle_base_ctrl': middle_base_ctrl,
+        'middle_mid_ctrl': middle_mid_ctrl,
+        'middle_end_ctrl': middle_end_ctrl,
+        'ring_base_ctrl': ring_base_ctrl,
+        'ring_mid_ctrl': ring_mid_ctrl,
+        'ring_end_ctrl': ring_end_ctrl,
+        'pinky_base_ctrl': pinky_base_ctrl,
+        'pinky_mid_ctrl': pinky_mid_ctrl,
+        'pinky_end_ctrl': pinky_end_ctrl})
+    
+    ####ARM UI INTEGRATION####
+    ##displayability options implementation
+    ##bones
+    ##if master bone display and arm bone display are on than set value 1, else 0
+    queue_parms(index.node('L_shoulder_bone1'), {'tdisplay': True})
+    queue_parms(index.node('L_arm_bone1'), {'tdisplay': True})
+    queue_parms(index.node('L_arm_bone2'), {'tdisplay': True})
+    queue_parms(index.node('L_hand_bone1'), {'tdisplay': True})
+    add_visibility_set(rig_net, 'L_arm_bone', [('L_arm_bone_display', 1), ('m_bone_display', 1)], [
+        index.node('L_shoulder_bone1'),
+        index.node('L_arm_bone1'),
+        index.node('L_arm_bone2'),
+        index.node('L_hand_bone1')])
+    queue_parms(index.node('L_thumb_bone1'), {'tdisplay': True})
+    queue_parms(index.node('L_thumb_bone2'), {'tdisplay': True})
+    queue_parms(index.node('L_thumb_bone3'), {'tdisplay': True})
+    queue_parms(index.node('L_index_bone1'), {'tdisplay': True})
+    queue_parms(index.node('L_index_bone2'), {'tdisplay': True})
+    queue_parms(index.node('L_index_bone3'), {'tdisplay': True})
+    queue_parms(index.node('L_middle_bone1'), {'tdisplay': True})
+    queue_parms(index.node('L_middle_bone2'), {'tdisplay': True})
+    queue_parms(index.node('L_middle_bone3'), {'tdisplay': True})
+    queue_parms(index.node('L_ring_bone1'), {'tdisplay': True})
+    queue_parms(index.node('L_ring_bone2'), {'tdisplay': True})
+    queue_parms(index.node('L_ring_bone3'), {'tdisplay': True})
+    queue_parms(index.node('L_pinky_bone1'), {'tdisplay': True})
+    queue_parms(index.node('L_pinky_bone2'), {'tdisplay': True})
+    queue_parms(index.node('L_pinky_bone3'), {'tdisplay': True})
+    add_visibility_set(rig_net, 'L_hand_bone', [('L_hand_bone_display', 1), ('m_bone_display', 1)], [
+        index.node('L_thumb_bone1'),
+        index.node('L_thumb_bone2'),
+        index.node('L_thumb_bone3'),
+        index.node('L_index_bone1'),
+        index.node('L_index_bone2'),
+        index.node('L_index_bone3'),
+        index.node('L_middle_bone1'),
+        index.node('L_middle_bone2'),
+        index.node('L_middle_bone3'),
+        index.node('L_ring_bone1'),
+        index.node('L_ring_bone2'),
+        index.node('L_ring_bone3'),
+        index.node('L_pinky_bone1'),
+        index.node('L_pinky_bone2'),
+        index.node('L_pinky_bone3')])
+    ##Ctrls
+    queue_parms(shoulder_ctrl, {'tdisplay': True})
+    queue_parms(arm_goal, {'tdisplay': True})
+    queue_parms(arm_twist, {'tdisplay': True})
+    queue_parms(arm_ctrl1, {'tdisplay': True})
+    queue_parms(arm_ctrl2, {'tdisplay': True})
+    queue_parms(hand_ctrl, {'tdisplay': True})
+    queue_parms(thumb_base_ctrl, {'tdisplay': True})
+    queue_parms(thumb_mid_ctrl, {'tdisplay': True})
+    queue_parms(thumb_end_ctrl, {'tdisplay': True})
+    queue_parms(index_base_ctrl, {'tdisplay': True})
+    queue_parms(index_mid_ctrl, {'tdisplay': True})
+    queue_parms(index_end_ctrl, {'tdisplay': True})
+    queue_parms(middle_base_ctrl, {'tdisplay': True})
+    queue_parms(middle_mid_ctrl, {'tdisplay': True})
+    queue_parms(middle_end_ctrl, {'tdisplay': True})
+    queue_parms(ring_base_ctrl, {'tdisplay': True})
+    queue_parms(ring_mid_ctrl, {'tdisplay': True})
+    queue_parms(ring_end_ctrl, {'tdisplay': True})
+    queue_parms(pinky_base_ctrl, {'tdisplay': True})
+    queue_parms(pinky_mid_ctrl, {'tdisplay': True})
+    queue_parms(pinky_end_ctrl, {'tdisplay': True})
+    add_visibility_set(rig_net, 'L_arm_ctrl', [('L_arm_ctrl_display', 1), ('m_ctrl_display', 1)], [
+        shoulder_ctrl])
+    add_visibility_set(rig_net, 'L_arm_ctrl_IK', [('L_arm_ctrl_display', 1), ('m_ctrl_display', 1), ('L_arm_FK_IK', 1)], [
+        arm_goal,
+        arm_twist])
+    add_visibility_set(rig_net, 'L_arm_ctrl_FK', [('L_arm_ctrl_display', 1), ('m_ctrl_display', 1), ('L_arm_FK_IK', 0)], [
+        arm_ctrl1,
+        arm_ctrl2,
+        hand_ctrl])
+    add_visibility_set(rig_net, 'L_hand_ctrl', [('L_hand_ctrl_display', 1), ('m_ctrl_display', 1)], [
+        thumb_base_ctrl,
+        thumb_mid_ctrl,
+        thumb_end_ctrl,
+        index_base_ctrl,
+        index_mid_ctrl,
+        index_end_ctrl,
+        middle_base_ctrl,
+        middle_mid_ctrl,
+        middle_end_ctrl,
+        ring_base_ctrl,
+        ring_mid_ctrl,
+        ring_end_ctrl,
+        pinky_base_ctrl,
+        pinky_mid_ctrl,
+        pinky_end_ctrl])
+    
+    ####LEG COTNROLS####
+    ##grab the bones
+    leg_bone1 = index.node('L_leg_bone1')
+    leg_bone2 = index.node('L_leg_bone2')
+    foot_bone1 = index.node('L_foot_bone1')
+    foot_bone2 = index.node('L_foot_bone2')
+    ##create IK FK for leg
+    leg_nodes = create_IK_FK_controls(leg_bone1, leg_bone2, pelvis_ctrl, 'L_leg', -1)
+    ##extract nodes
+    leg_ctrl1 = leg_nodes[0]
+    leg_ctrl2 = leg_nodes[1]
+    leg_twist = leg_nodes[2]
+    leg_twist_offset = index.node('L_leg_twist_offset')
+    leg_goal = leg_nodes[3]
+    leg_goal_offset = index.node('L_leg_goal_offset')
+    leg_kin = leg_nodes[4]
+    ##correct the rotation of the foot IK goal. MY IK FK creates a goal alligned with the end_bone at the end of it,
+    ##we don't want that in this case, we want it alligned with the world
+    place_world(leg_goal_offset, hou.hmath.buildTranslate(node_origin(leg_goal_offset)))
+    ###create first foot bone controls
+    foot_nodes = create_IK_FK_controls(foot_bone1, foot_bone1, leg_ctrl2, 'L_foot', 1)
+    ##extract nodes
+    foot_ctrl = foot_nodes[0]
+    foot_twist = foot_nodes[1]
+    foot_twist_offset = index.node('L_foot_twist_offset')
+    foot_goal = foot_nodes[2]
+    foot_goal_offset = index.node('L_foot_goal_offset')
+    foot_kin = foot_nodes[3]
+    ##set flags
+    foot_twist.setDisplayFlag(False)
+    foot_twist.setSelectableInViewport(False)
+    foot_goal.setDisplayFlag(False)
+    foot_goal.setSelectableInViewport(False)
+    ##create secton foot bone (Toe) controls
+    toe_nodes = create_IK_FK_controls(foot_bone2, foot_bone2, foot_ctrl, 'L_toe', 1)
+    ##extract the nodes
+    toe_ctrl = toe_nodes[0]
+    toe_twist = toe_nodes[1]
+    toe_twist_offset = index.node('L_toe_twist_offset')
+    toe_goal = toe_nodes[2]
+    toe_goal_offset = index.node('L_toe_goal_offset')
+    toe_kin = toe_nodes[3]
+    ##set flags
+    toe_twist.setDisplayFlag(False)
+    toe_twist.setSelectableInViewport(False)
+    toe_goal.setDisplayFlag(False)
+    toe_goal.setSelectableInViewport(False)
+    ##set the foot kin to follow whatever the leg kin does
+    leg_kin_blend = 'ch("' + leg_kin.path() + '/blend")'
+    foot_kin.parm('blend').setExpression(leg_kin_blend)
+    toe_kin.parm('blend').setExpression(leg_kin_blend)
+    ##set some display parms so its a bit prettier in FK
+    queue_parms(foot_ctrl, {'geoscale': .3})
+    queue_parms(foot_ctrl, {'georotatex': -40})
+    queue_parms(toe_ctrl, {'geoscale': .3})
+    queue_parms(toe_ctrl, {'geosizey': .6})
+    ##append controls to lists
+    ctrl_list.append(leg_ctrl1)
+    L_ctrl_list.append(leg_ctrl1)
+    ctrl_list.append(leg_ctrl2)
+    L_ctrl_list.append(leg_ctrl2)
+    ctrl_list.append(leg_twist)
+    L_ctrl_list.append(leg_twist)
+    ctrl_list.append(leg_goal)
+    L_ctrl_list.append(leg_goal)
+    ctrl_list.append(foot_ctrl)
+    L_ctrl_list.append(foot_ctrl)
+    ctrl_list.append(toe_ctrl)
+    L_ctrl_list.append(toe_ctrl)
+    ##create roll nodes
+    ##grab foot locators
+    toe_loc = index.node('L_toe_tip_locator')
+    ball_loc = index.node('L_ball_locator')
+    heel_loc = index.node('L_heel_locator')
+    outer_loc = index.node('L_foot_outer_locator')
+    inner_loc = index.node('L_foot_inner_locator')
+    ##create new nulls
+    toe_roll = create_null_at_node(rig_net, toe_loc, 'L_toe_roll')
+    ball_roll = create_null_at_node(rig_net, ball_loc, 'L_ball_roll')
+    heel_roll = create_null_at_node(rig_net, heel_loc, 'L_heel_roll')
+    outer_roll = create_null_at_node(rig_net, outer_loc, 'L_outer_roll')
+    inner_roll = create_null_at_node(rig_net, inner_loc, 'L_inner_roll')
+    ##set flags
+    toe_roll.setDisplayFlag(False)
+    toe_roll.setSelectableInViewport(False)
+    ball_roll.setDisplayFlag(False)
+    ball_roll.setSelectableInViewport(False)
+    heel_roll.setDisplayFlag(False)
+    heel_roll.setSelectableInViewport(False)
+    outer_roll.setDisplayFlag(False)
+    outer_roll.setSelectableInViewport(False)
+    inner_roll.setDisplayFlag(False)
+    inner_roll.setSelectableInViewport(False)
+    ##grab the leg_goal node
+    leg_IK_goal = index.node('L_leg_goal_loc')
+    ##set up parents
+    reparent(leg_twist_offset, master)
+    reparent(leg_goal_offset, master)
+    reparent(heel_roll, leg_goal)
+    reparent(toe_roll, heel_roll)
+    reparent(outer_roll, toe_roll)
+    reparent(inner_roll, outer_roll)
+    reparent(ball_roll, inner_roll)
+    reparent(leg_IK_goal, ball_roll)
+    reparent(foot_goal_offset, ball_roll)
+    reparent(foot_twist_offset, ball_roll)
+    reparent(toe_goal_offset, inner_roll)
+    reparent(toe_twist_offset, inner_roll)
+    
+    ####LEG UI####
+    ##the leg folder of the HDA with the foot roll folder inside it
+    add_interface(rig_net, LEG_INTERFACE, {
+        'leg_kin': leg_kin,
+        'leg_goal': leg_goal,
+        'leg_twist': leg_twist,
+        'leg_ctrl1': leg_ctrl1,
+        'leg_ctrl2': leg_ctrl2,
+        'foot_ctrl': foot_ctrl,
+        'toe_ctrl': toe_ctrl})
+    
+    ####LEG UI IMPLEMENTATION####
+    toe_roll.parm('rx').setExpression('ch("../L_toe_roll_rot")*6')
+    toe_roll.parm('ry').setExpression('ch("../L_toe_twist_rot")*6')
+    ball_roll.parm('rx').setExpression('ch("../L_ball_roll_rot")*6')
+    heel_roll.parm('rx').setExpression('ch("../L_heel_roll_rot")*6')
+    heel_roll.parm('ry').setExpression('ch("../L_heel_twist_rot")*6')
+    outer_roll.parm('rz').setExpression('ch("../L_outer_roll_rot")*6')
+    inner_roll.parm('rz').setExpression('ch("../L_inner_roll_rot")*6')
+    ##display
+    queue_parms(leg_bone1, {'tdisplay': True})
+    queue_parms(leg_bone2, {'tdisplay': True})
+    queue_parms(foot_bone1, {'tdisplay': True})
+    queue_parms(foot_bone2, {'tdisplay': True})
+    queue_parms(leg_goal, {'tdisplay': True})
+    queue_parms(leg_twist, {'tdisplay': True})
+    queue_parms(leg_ctrl1, {'tdisplay': True})
+    queue_parms(leg_ctrl2, {'tdisplay': True})
+    queue_parms(foot_ctrl, {'tdisplay': True})
+    queue_parms(toe_ctrl, {'tdisplay': True})
+    add_visibility_set(rig_net, 'L_leg_bone', [('L_leg_bone_display', 1), ('m_bone_display', 1)], [
+        leg_bone1,
+        leg_bone2,
+        foot_bone1,
+        foot_bone2])
+    add_visibility_set(rig_net, 'L_leg_ctrl_IK', [('L_leg_ctrl_display', 1), ('m_ctrl_display', 1), ('L_leg_FK_IK', 1)], [
+        leg_goal,
+        leg_twist])
+    add_visibility_set(rig_net, 'L_leg_ctrl_FK', [('L_leg_ctrl_display', 1), ('m_ctrl_display', 1), ('L_leg_FK_IK', 0)], [
+        leg_ctrl1,
+        leg_ctrl2,
+        foot_ctrl,
+        toe_ctrl])
+    
+    
+    ####HDA INTERFACE####
+    ##every limb's folders, their R side copies and the visibility parms in one write of the interface,
+    ##then the controls are bound to it before the L side is copied
+    commit_interface(rig_net)
+    
+    
+    ####MIRROR####
+    ##build the R side from the finished L side before capturing so both sides get weights
+    mirror_side(rig_net)
+    ##the display of both sides from the visibility parms, worked out again only when a display toggle changes
+    install_visibility(rig_net)
+    ##how many chop networks and constraint nodes the finished rig cooks
+    report = constraint_report(rig_net)
+    status_message('Rig constraints: {constrained} constrained objects, {constraint_nodes} constraint nodes, {chopnets} chop networks'.format(**report))
+    
+    
+    ####SKIN CAPTURE####
+    ##capture the character mesh now that the bones are at rest
+    geo_ref = rig_net.node(rig_net.name() + '_geo')
+    request_network_layout(rig_net)
+    capture_skin(rig_net, geo_ref, capture_mode)
+    
+
+def save_rig(rig_net):
+    ##write everything inside the rig into its HDA file
+    hda_def = rig_net.type().definition()
+    hda_def.updateFromNode(rig_net)
+    return (hda_def.libraryFilePath())
+
+def build_rig(geo_file, rig_name='', hda_save_loc='', from_maya=False, hda_file_name=None, template_name=None, scale=1.0,
+              capture_mode=CAPTURE_CLAMPED_BIHARMONIC):
+    """ Every stage in a row with the locators left where the template put them, then save the HDA.
+
+    Takes the arguments of the stages, see create_mesh, create_locators and capture_mesh.
+    Returns:
+        the rig HDA node and the file it was saved to
+    """
+    rig_net = create_mesh(geo_file, rig_name, hda_save_loc, from_maya, hda_file_name)
+    rig_name = rig_net.name()
+    create_locators(rig_name, template_name, scale)
+    create_bones(rig_name)
+    capture_mesh(rig_name, capture_mode)
+    return (rig_net, save_rig(rig_net))
+
+def run():
+    ##open the rig creator dialog, Qt is only loaded when the dialog is asked for
+    import rig_creator_dialog
+    rig_creator_dialog.run()
@@ -0,0 +1,100 @@
+"""
+#######################################
+filename    rig_creator_cli.py
+author      Owen McCubbin
+Brief Description:
+    Build a finished rig HDA from a character model without opening the
+    dialog, for batch rigging under hython on machines with no display.
+    The locators are left where the template puts them, so the model should
+    match the template's proportions (scale it with --scale).
+
+    hython rig_creator_cli.py model.fbx --name hero --output /rigs/hero.hda
+
+    The stage timings of a batched build and an unbatched one (--no-batch)
+    can be compared by writing both with --report.
+#######################################
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+##the pipeline stages in the order they run
+STAGES = ('create_mesh', 'create_locators', 'create_bones', 'capture_mesh')
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description='Build a rig HDA for a character model with the rig creator.')
+    parser.add_argument('model', help='character model to rig')
+    parser.add_argument('-n', '--name', default='character_rig', help='name of the rig and its HDA')
+    parser.add_argument('-o', '--output', default='',
+                        help='HDA file to write, or a folder to write <name>.hda into (default: the script folder)')
+    parser.add_argument('--from-maya', action='store_true', help='scale the model down from centimetres')
+    parser.add_argument('-t', '--template', default=None, help='locator template (default: biped)')
+    parser.add_argument('-s', '--scale', type=float, default=1.0, help='scale of the locator template')
+    parser.add_argument('--proximity', action='store_true', help='quick proximity capture instead of the biharmonic (clamped) one')
+    parser.add_argument('--hip', default=None, help='also save the scene with the rig in it to this hip file')
+    parser.add_argument('--report', default=None, help='write the HDA path and the stage timings to this json file')
+    parser.add_argument('--no-batch', action='store_true',
+                        help='write every parm straight away with its own undo entry, to time a build against the batched one')
+    parser.add_argument('--profile', default=None,
+                        help='time every helper of the build and write a Chrome trace of it to this json file')
+    return (parser.parse_args(argv))
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    ##the tool is imported from next to this script, hou has to be there already (run it with hython)
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+    import hou
+    import rig_creator
+    import rig_profiler
+
+    if args.output.endswith('.hda'):
+        hda_save_loc = os.path.dirname(os.path.abspath(args.output))
+        hda_file_name = os.path.abspath(args.output).replace(os.path.sep, '/')
+    else:
+        hda_save_loc = args.output
+        hda_file_name = None
+    if args.proximity:
+        capture_mode = rig_creator.CAPTURE_PROXIMITY
+    else:
+        capture_mode = rig_creator.CAPTURE_CLAMPED_BIHARMONIC
+    if args.no_batch:
+        rig_creator.set_batch_mode(rig_creator.BATCH_OFF)
+
+    ##the profiler only wraps the helpers while it runs, without --profile the build is left alone
+    if args.profile:
+        profiler = rig_profiler.Profiler().start()
+    start_time = time.time()
+    try:
+        rig_net, hda_file = rig_creator.build_rig(os.path.abspath(args.model), args.name, hda_save_loc, args.from_maya,
+                                                  hda_file_name, args.template, args.scale, capture_mode)
+    except (ValueError, ImportError, hou.Error) as error:
+        sys.stderr.write('rig_creator: %s\n' % error)
+        return (1)
+    finally:
+        if args.profile:
+            profiler.stop()
+            profiler.write_trace(args.profile)
+    if args.hip:
+        hou.hipFile.save(args.hip)
+    seconds = time.time() - start_time
+    stages = [(stage, rig_creator.stage_timings.get(stage, 0.0)) for stage in STAGES]
+    print('Wrote %s in %.1fs' % (hda_file, seconds))
+    for stage, stage_seconds in stages:
+        print('    %s %.2fs' % (stage, stage_seconds))
+    if args.report:
+        ##for rig_batch.py, which runs one of these per character
+        with open(args.report, 'w') as report_file:
+            json.dump({'hda': hda_file, 'seconds': seconds, 'stages': dict(stages)}, report_file)
+    if args.profile:
+        profiler.print_summary()
+        print('Wrote the trace to %s' % args.profile)
+    return (0)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,149 @@
+"""
+#######################################
+filename    rig_creator_dialog.py
+author      Owen McCubbin
+Brief Description:
+    The Qt dialog of the rig creator. It only gathers the arguments of the
+    pipeline stages in rig_creator and shows their errors, so the rig can also
+    be built without it (see rig_creator_cli.py).
+#######################################
+"""
+
+##import needed packages
+import hou
+import os
+
+from PySide2 import QtCore
+from PySide2 import QtWidgets
+
+import rig_creator
+import rig_templates
+import rig_ui
+
+##the open dialog, so run() doesn't have to look through every child of the main window for it
+dialog = None
+
+
+class RigCreatorUI(QtWidgets.QDialog):
+    
+    def __init__(self):
+        ##Rin the initialization on the inherited QDialog class
+        super(RigCreatorUI, self).__init__()
+        
+        ##set the window title
+        self.setWindowTitle('Rig Creator')
+        
+        ##build the widgets from the compiled ui file (see rig_ui.py), it falls back to QUiLoader by itself
+        ui_file_path = os.path.join(rig_creator.get_script_dir(), 'rig_creator_ui.ui')
+        self.ui = rig_ui.load_ui(self, ui_file_path)
+        
+        ######BUTTON CALLS#########
+        ##button call for browsing files to import
+        self.ui.btnImportBrowse.clicked.connect(self.import_browse)
+        
+        ##button call for browsing files to save to 
+        self.ui.btnHDABrowse.clicked.connect(self.save_browse)
+        
+        ##button call for importing the model
+        self.ui.btnImport.clicked.connect(self.create_mesh)
+        
+        ##button call for placing locators
+        self.ui.btnCreateLocators.clicked.connect(self.create_locators)
+        
+        ##button call for create bones
+        self.ui.btnCreateBones.clicked.connect(self.create_bones)
+        
+        ##button call for capturing skin wieghts
+        self.ui.btnCaptureMesh.clicked.connect(self.capture_mesh)
+        
+        ##fill the locator template list, the default template is picked to start with
+        self.ui.cmbLocatorTemplate.addItems(rig_templates.template_names())
+        self.ui.cmbLocatorTemplate.setCurrentText(rig_templates.DEFAULT_TEMPLATE)
+
+        
+        ##set window parent to houdini main window
+        self.setParent(hou.qt.mainWindow(), QtCore.Qt.Window)
+        
+        ##show the UI
+        self.show()
+        
+    ##def to close the window and unparent it from the main qt Window
+    def closeEvent(self, event):
+        self.setParent(None)
+        
+    ## defs needed for button calls and UI elements
+    def import_browse(self):
+        ##grab the script directory, we are going to use this as the starting point of our browse
+        default_folder = rig_creator.get_script_dir()
+        ##make sure that the directory has forward slashes and not backslashes
+        default_folder = default_folder.replace(os.path.sep, '/')
+        ##debug print
+        ##print (default_folder)
+        ##create a variable that calls a houdini browse function
+        result = hou.ui.selectFile(default_folder, 'Choose your Model')
+        ##if nothing was selected, do nothing
+        if result is None:
+            return
+        ##update the text feild next to the browse button with the selected file's path
+        self.ui.lineImportModel.setText(result)
+        
+    def save_browse(self):
+        ##grab the script directory, we are going to use this as the starting point of our browse
+        default_folder = rig_creator.get_script_dir()
+        ##make sure that the directory has forward slashes and not backslashes
+        default_folder = default_folder.replace(os.path.sep, '/')
+        ##debug print
+        ##print (default_folder)
+        ##create a variable that calls a houdini browse function
+        result = hou.ui.selectFile(default_folder, 'Choose HDA save directory', False, hou.fileType.Directory)
+        ##if nothing was selected, do nothing
+        if result is None:
+            return
+        ##update the text feild next to the browse button with the selected file's path
+        self.ui.lineHDASave.setText(result)
+    
+    ####PIPELINE STAGES####
+    ##each button runs its stage in rig_creator with what is filled in on the dialog
+    def create_mesh(self):
+        try:
+            rig_net = rig_creator.create_mesh(self.ui.lineImportModel.text(), self.ui.lineRigName.text(),
+                                              self.ui.lineHDASave.text(), self.ui.chkFromMaya.isChecked())
+        except ValueError as error:
+            hou.ui.displayMessage(str(error), ('OK',), hou.severityType.Warning)
+            return
+        ##the later stages find the rig by name, which is the default name when the field was left empty
+        self.ui.lineRigName.setText(rig_net.name())
+        ##Enable the group box holding the AutoRig Functions and disable import functions
+        self.ui.grpAutoRig.setEnabled(True)
+        self.ui.grpImport.setEnabled(False)
+    
+    def create_locators(self):
+        rig_creator.create_locators(self.ui.lineRigName.text(), self.ui.cmbLocatorTemplate.currentText(),
+                                    self.ui.spnLocatorScale.value())
+    
+    def create_bones(self):
+        rig_creator.create_bones(self.ui.lineRigName.text())
+    
+    def capture_mesh(self):
+        ##the quick proximity capture is for checking bone placement before the full solve
+        if self.ui.chkProximityCapture.isChecked() == True:
+            capture_mode = rig_creator.CAPTURE_PROXIMITY
+        else:
+            capture_mode = rig_creator.CAPTURE_CLAMPED_BIHARMONIC
+        try:
+            rig_creator.capture_mesh(self.ui.lineRigName.text(), capture_mode)
+        except ImportError as error:
+            hou.ui.displayMessage(str(error), ('OK',), hou.severityType.Warning)
+        
+
+def run():
+    global dialog
+    ##bring the open dialog to the front, a closed one is made again so it starts from an empty form
+    if dialog is not None and dialog.isVisible():
+        dialog.raise_()
+        dialog.activateWindow()
+        return (dialog)
+    if dialog is not None:
+        dialog.deleteLater()
+    dialog = RigCreatorUI()
+    return (dialog)
@@ -0,0 +1,220 @@
+"""
+#######################################
+filename    rig_math.py
+author      Owen McCubbin
+Brief Description:
+    Houdini free math for the rig creator. Everything in here works on plain
+    numpy arrays so the heavy lifting of a build can be done in one go and
+    Houdini is only asked to write the results.
+    Matrices follow the Houdini convention of row vectors (v * M), so the
+    first three rows of a transform are its x, y and z axes.
+#######################################
+"""
+
+import numpy as np
+
+##anything shorter than this is treated as zero length (collinear chains, degenerate up vectors)
+EPSILON = 1e-8
+
+
+def normalize_rows(vectors):
+    ##normalize every row of an (n, 3) array, rows with no length are left as zero
+    vectors = np.asarray(vectors, dtype=np.float64)
+    lengths = np.linalg.norm(vectors, axis=-1)[..., np.newaxis]
+    safe = np.where(lengths > EPSILON, lengths, 1.0)
+    return np.where(lengths > EPSILON, vectors / safe, 0.0)
+
+
+def fill_degenerate_rows(vectors, default=(0.0, 0.0, -1.0)):
+    ##rows with no length take the last row before them that has one (the first one at the start),
+    ##default when no row has a length, so coincident points follow the rest of their chain
+    vectors = np.array(vectors, dtype=np.float64)
+    good = np.linalg.norm(vectors, axis=-1) > EPSILON
+    if not np.any(good):
+        vectors[:] = default
+        return vectors
+    last_good = np.maximum.accumulate(np.where(good, np.arange(len(vectors)), -1))
+    last_good[last_good < 0] = np.argmax(good)
+    return vectors[last_good]
+
+
+def calculate_plane_normals(positions):
+    """ Plane normal for every bone of a chain of positions.
+
+    Bone 0 uses the plane of the first three positions and bone i uses the plane
+    it makes with its parent bone (positions i-1, i, i+1), which is what the
+    original node by node chain creation did. Collinear triples give a zero normal.
+    """
+    positions = np.asarray(positions, dtype=np.float64)
+    num_bones = len(positions) - 1
+    normals = np.zeros((num_bones, 3))
+    if len(positions) < 3:
+        return normals
+    segments = positions[1:] - positions[:-1]
+    ##normal of every consecutive pair of segments
+    pair_normals = normalize_rows(np.cross(segments[:-1], segments[1:]))
+    ##the first bone shares its plane with the second one
+    normals[0] = pair_normals[0]
+    normals[1:] = pair_normals
+    return normals
+
+
+def lookat_frames(directions, up=(0.0, 1.0, 0.0)):
+    """ Rotation (3x3, rows are axes) that points -Z down every direction.
+
+    Same convention as hou.hmath.buildLookat: z points away from the target, x is
+    up cross z and y completes the frame. When a direction runs along the up
+    vector world Z is used as the up vector instead, and a direction with no
+    length looks down -Z, which is no rotation.
+    """
+    directions = normalize_rows(directions)
+    directions[np.linalg.norm(directions, axis=1) < EPSILON] = (0.0, 0.0, -1.0)
+    z_axis = -directions
+    up = np.tile(np.asarray(up, dtype=np.float64), (len(directions), 1))
+    x_axis = np.cross(up, z_axis)
+    ##fall back to world Z for bones that point straight along the up vector
+    degenerate = np.linalg.norm(x_axis, axis=1) < EPSILON
+    if np.any(degenerate):
+        x_axis[degenerate] = np.cross(np.array([0.0, 0.0, 1.0]), z_axis[degenerate])
+    x_axis = normalize_rows(x_axis)
+    y_axis = np.cross(z_axis, x_axis)
+    return np.stack((x_axis, y_axis, z_axis), axis=1)
+
+
+def solve_bone_chain(positions, up=(0.0, 1.0, 0.0)):
+    """ Solve a whole bone chain in one pass.
+
+    Input:
+        positions - (n, 3) world positions of the locators, n >= 2
+        up - up vector used for the look at rotations
+    Returns:
+        lengths - (n-1,) bone lengths
+        frames - (n-1, 3, 3) world rotations of the bones, rows are the bone axes. Each is the
+                 look at frame rolled around its Z so X lies on the chain's plane normal,
+                 collinear bones have no plane and keep the look at frame
+    Bones between coincident positions get no length and point the same way as the bone before them.
+    """
+    positions = np.asarray(positions, dtype=np.float64)
+    segments = positions[1:] - positions[:-1]
+    lengths = np.linalg.norm(segments, axis=1)
+    frames = lookat_frames(fill_degenerate_rows(segments), up)
+    normals = calculate_plane_normals(positions)
+
+    ##bones with a plane take the normal as X, which rolls them around Z, collinear bones keep their look at frame
+    z_axis = frames[:, 2]
+    has_plane = np.linalg.norm(normals, axis=1) > EPSILON
+    oriented = frames.copy()
+    oriented[has_plane, 0] = normals[has_plane]
+    oriented[has_plane, 1] = np.cross(z_axis[has_plane], normals[has_plane])
+    return (lengths, oriented)
+
+
+def world_matrix(frame, position):
+    ##4x4 transform from a 3x3 rotation and a position
+    matrix = np.identity(4)
+    matrix[:3, :3] = frame
+    matrix[3, :3] = position
+    return matrix
+
+
+def translate_matrix(offset):
+    ##4x4 translation
+    matrix = np.identity(4)
+    matrix[3, :3] = offset
+    return matrix
+
+
+def chain_local_matrices(root_world, positions, lengths, frames):
+    """ Local (pre) transforms for a solved chain.
+
+    The first bone is parented to the root and every bone after that to the bone
+    before it, which Houdini places at its parent's tip (0, 0, -length).
+    Returns a list of 4x4 arrays ready for setPreTransform.
+    """
+    parent_world = np.asarray(root_world, dtype=np.float64)
+    locals_ = []
+    for i in range(len(lengths)):
+        world = world_matrix(frames[i], positions[i])
+        locals_.append(world.dot(np.linalg.inv(parent_world)))
+        parent_world = translate_matrix((0.0, 0.0, -lengths[i])).dot(world)
+    return locals_
+
+
+def resample_polyline(points, segments):
+    """ Resample a polyline into evenly spaced points by arc length.
+
+    Input:
+        points - (n, 3) points along the curve
+        segments - number of segments wanted
+    Returns:
+        (segments + 1, 3) points, the first and last point match the input ends
+    """
+    points = np.asarray(points, dtype=np.float64)
+    ##running arc length at every input point
+    distances = np.concatenate(([0.0], np.cumsum(np.linalg.norm(points[1:] - points[:-1], axis=1))))
+    targets = np.linspace(0.0, distances[-1], int(segments) + 1)
+    ##interpolate each axis on the arc length
+    return np.stack([np.interp(targets, distances, points[:, axis]) for axis in range(3)], axis=1)
+
+
+def curve_tangents(points):
+    ##tangent of every point, each point looks at the next one and the last point keeps the last segment,
+    ##a point on top of the next one keeps the tangent before it
+    points = np.asarray(points, dtype=np.float64)
+    segments = normalize_rows(fill_degenerate_rows(points[1:] - points[:-1]))
+    return np.concatenate((segments, segments[-1:]), axis=0)
+
+
+def householder_matrices(vectors):
+    ##(n, 3, 3) matrices reflecting over the plane each vector is the normal of,
+    ##a vector with no length leaves things where they are
+    vectors = np.asarray(vectors, dtype=np.float64)
+    lengths = np.einsum('ij,ij->i', vectors, vectors)
+    scales = np.where(lengths > EPSILON, 2.0 / np.where(lengths > EPSILON, lengths, 1.0), 0.0)
+    return (np.eye(3) - scales[:, np.newaxis, np.newaxis] * np.einsum('ni,nj->nij', vectors, vectors))
+
+
+def running_products(matrices):
+    ##running products M0 * M1 * ... * Mi of (n, 3, 3) matrices, done as a scan in log2(n) passes
+    ##over the whole array instead of one product per matrix
+    products = np.array(matrices, dtype=np.float64)
+    step = 1
+    while step < len(products):
+        products[step:] = np.einsum('nij,njk->nik', products[:-step], products[step:])
+        step *= 2
+    return (products)
+
+
+def rotation_minimizing_frames(points, up=(0.0, 1.0, 0.0)):
+    """ Rotation minimizing frames along a curve using the double reflection method.
+
+    Matches the slideframe VEX the curve bones used to be built with. The first
+    normal is up cross the first tangent (world Z when the curve starts along up),
+    and every following normal is slid along the curve by reflecting it twice.
+    Both reflections of a step only depend on the points and the tangents, so
+    every step is built at once as a matrix and the normals are the running
+    product of them applied to the first normal.
+    Input:
+        points - (n, 3) points along the curve, n >= 2
+        up - up vector for the first frame
+    Returns:
+        (n, 3, 3) frames with rows nml, binml and tan, where tan points back
+        along the curve so the rows can be used as a bone rotation (-Z down the bone)
+    """
+    points = np.asarray(points, dtype=np.float64)
+    tangents = curve_tangents(points)
+    normals = np.zeros_like(points)
+    up = np.asarray(up, dtype=np.float64)
+    ##the same parallel check the VEX did before crossing
+    if np.allclose(normalize_rows(up[np.newaxis])[0], tangents[0]):
+        up = np.array([0.0, 0.0, 1.0])
+    normals[0] = normalize_rows(np.cross(up, tangents[0])[np.newaxis])[0]
+    ##reflect the last frame over the plane bisecting the chord
+    reflections = householder_matrices(points[1:] - points[:-1])
+    reflected_tangents = np.einsum('ni,nij->nj', tangents[:-1], reflections)
+    ##reflect again so the tangent lands on the new one
+    steps = np.einsum('nij,njk->nik', reflections, householder_matrices(tangents[1:] - reflected_tangents))
+    normals[1:] = np.einsum('i,nij->nj', normals[0], running_products(steps))
+    normals = normalize_rows(normals)
+    binormals = -np.cross(tangents, normals)
+    return np.stack((normals, binormals, -tangents), axis=1)
@@ -0,0 +1,249 @@
+"""
+#######################################
+filename    rig_profiler.py
+author      Owen McCubbin
+Brief Description:
+    Opt in profiler for rig builds. While it runs, every function of
+    rig_creator and every method of the dialog is wrapped so each call records
+    its wall time and how many nodes it created, parms it set and expressions
+    it wrote (counted by wrapping the hou calls that do those). Nothing is
+    wrapped when the profiler is off, so normal builds don't pay for it.
+    The calls are written as a Chrome trace (chrome://tracing or
+    ui.perfetto.dev) and summed up per function in a table.
+
+    import rig_profiler
+    with rig_profiler.profile('create_bones.json') as profiler:
+        rig_creator.create_bones('character_rig')
+    profiler.print_summary()
+#######################################
+"""
+
+import functools
+import inspect
+import json
+import os
+import sys
+import time
+
+##counters every call records, every counts list is in this order
+COUNTERS = ('nodes', 'parms', 'expressions')
+##the modules whose functions are timed, the dialog is only done if it has been imported
+DEFAULT_MODULES = ('rig_creator', 'rig_creator_dialog')
+##helpers that are too small to time without the profiler costing more than they do
+SKIPPED = frozenset(('build_stage', 'run', 'node_origin', 'cached_world', 'child_frame', 'forget_world',
+                     'request_layout', 'request_network_layout', 'queue_parms', 'status_message'))
+##classes whose methods are timed too, the dialog's buttons and the deferred parm writes of a stage
+TIMED_CLASSES = frozenset(('RigCreatorUI', 'BuildTransaction'))
+
+##the running profiler, None when profiling is off
+active_profiler = None
+
+
+class Frame(object):
+    ##a call that hasn't returned yet
+
+    def __init__(self, name, category, start, counts):
+        self.name = name
+        self.category = category
+        self.start = start
+        self.start_counts = counts
+        ##time and counts of the calls made from this one, taken off to get its own
+        self.child_seconds = 0.0
+        self.child_counts = [0] * len(COUNTERS)
+
+
+class Profiler(object):
+
+    def __init__(self, modules=DEFAULT_MODULES):
+        self.module_names = modules
+        self.events = []
+        self.stack = []
+        self.counts = [0] * len(COUNTERS)
+        ##(owner, attribute name, original) of everything wrapped, put back by stop
+        self.patches = []
+        self.origin = 0.0
+
+    ####RECORDING####
+    def count(self, counter, amount=1):
+        self.counts[COUNTERS.index(counter)] += amount
+
+    def enter(self, name, category):
+        self.stack.append(Frame(name, category, time.time(), list(self.counts)))
+
+    def leave(self):
+        end = time.time()
+        frame = self.stack.pop()
+        seconds = end - frame.start
+        counts = [now - start for now, start in zip(self.counts, frame.start_counts)]
+        self.events.append({'name': frame.name, 'category': frame.category, 'start': frame.start - self.origin,
+                            'seconds': seconds, 'self_seconds': seconds - frame.child_seconds, 'counts': counts,
+                            'self_counts': [count - child for count, child in zip(counts, frame.child_counts)],
+                            'depth': len(self.stack),
+                            ##called from inside another call of itself, its time is already in that one
+                            'recursive': any(caller.name == frame.name for caller in self.stack)})
+        if self.stack:
+            parent = self.stack[-1]
+            parent.child_seconds += seconds
+            parent.child_counts = [child + count for child, count in zip(parent.child_counts, counts)]
+
+    def timed(self, function, name, category):
+        ##function with every call recorded under name
+        profiler = self
+
+        @functools.wraps(function)
+        def timed_call(*args, **kwargs):
+            profiler.enter(name, category)
+            try:
+                return function(*args, **kwargs)
+            finally:
+                profiler.leave()
+        return (timed_call)
+
+    def counted(self, function, counter, size=None):
+        ##function that adds to a counter on every call, size gives the amount from the arguments
+        profiler = self
+
+        @functools.wraps(function)
+        def counted_call(*args, **kwargs):
+            profiler.count(counter, size(*args, **kwargs) if size is not None else 1)
+            return function(*args, **kwargs)
+        return (counted_call)
+
+    ####PATCHING####
+    def patch(self, owner, attribute, replacement):
+        self.patches.append((owner, attribute, owner.__dict__.get(attribute)))
+        setattr(owner, attribute, replacement)
+
+    def patch_module(self, module):
+        ##every function defined in the module, and the methods of its TIMED_CLASSES
+        for name, value in list(vars(module).items()):
+            if name in SKIPPED or name.startswith('_'):
+                continue
+            if inspect.isfunction(value) and value.__module__ == module.__name__:
+                self.patch(module, name, self.timed(value, name, module.__name__))
+            elif inspect.isclass(value) and name in TIMED_CLASSES:
+                for method_name, method in list(vars(value).items()):
+                    if inspect.isfunction(method) and not method_name.startswith('_') and method_name not in SKIPPED:
+                        self.patch(value, method_name, self.timed(method, name + '.' + method_name, module.__name__))
+
+    def patch_hou(self, hou):
+        ##count what the build does to the scene, whichever helper (ours or rigtoolutils) does it
+        node_class = getattr(hou, 'OpNode', hou.Node)
+        self.patch(node_class, 'createNode', self.counted(node_class.createNode, 'nodes'))
+        self.patch(node_class, 'setParms', self.counted(node_class.setParms, 'parms', lambda node, parms, *args: len(parms)))
+        self.patch(node_class, 'setParmExpressions',
+                   self.counted(node_class.setParmExpressions, 'expressions', lambda node, parms, *args, **kwargs: len(parms)))
+        self.patch(hou.Parm, 'set', self.counted(hou.Parm.set, 'parms'))
+        self.patch(hou.Parm, 'setExpression', self.counted(hou.Parm.setExpression, 'expressions'))
+        self.patch(hou.ParmTuple, 'set', self.counted(hou.ParmTuple.set, 'parms', lambda parm_tuple, *args: len(parm_tuple)))
+
+    def start(self):
+        global active_profiler
+        if active_profiler is not None:
+            raise RuntimeError('The profiler is already running')
+        self.origin = time.time()
+        hou = sys.modules.get('hou')
+        if hou is not None:
+            self.patch_hou(hou)
+        for module_name in self.module_names:
+            module = sys.modules.get(module_name)
+            if module is not None:
+                self.patch_module(module)
+        active_profiler = self
+        return (self)
+
+    def stop(self):
+        global active_profiler
+        ##put back in reverse so a twice patched attribute ends up with its first value
+        for owner, attribute, original in reversed(self.patches):
+            if original is None:
+                delattr(owner, attribute)
+            else:
+                setattr(owner, attribute, original)
+        self.patches = []
+        ##calls still open (stop from inside a build) are closed now so their time isn't lost
+        while self.stack:
+            self.leave()
+        active_profiler = None
+
+    ####RESULTS####
+    def trace(self):
+        ##Chrome trace event format, one complete event per call, times in microseconds
+        pid = os.getpid()
+        trace_events = []
+        for event in sorted(self.events, key=lambda event: (event['start'], event['depth'])):
+            args = dict(zip(COUNTERS, event['counts']))
+            args.update(dict(('self_' + counter, count) for counter, count in zip(COUNTERS, event['self_counts'])))
+            trace_events.append({'name': event['name'], 'cat': event['category'], 'ph': 'X', 'pid': pid, 'tid': 0,
+                                 'ts': event['start'] * 1e6, 'dur': event['seconds'] * 1e6, 'args': args})
+        return ({'traceEvents': trace_events, 'displayTimeUnit': 'ms'})
+
+    def write_trace(self, trace_path):
+        with open(trace_path, 'w') as trace_file:
+            json.dump(self.trace(), trace_file)
+        return (trace_path)
+
+    def summary(self):
+        """ Calls summed up per function, slowest (by own time) first.
+
+        Returns:
+            list of (name, calls, total seconds, own seconds, own nodes, own parms, own expressions),
+            the total leaves out recursive calls so it isn't counted twice
+        """
+        rows = {}
+        for event in self.events:
+            row = rows.setdefault(event['name'], [0, 0.0, 0.0] + [0] * len(COUNTERS))
+            row[0] += 1
+            ##inclusive time only from the outermost call of each function
+            if not event['recursive']:
+                row[1] += event['seconds']
+            row[2] += event['self_seconds']
+            for number, count in enumerate(event['self_counts']):
+                row[3 + number] += count
+        table = [tuple([name] + row) for name, row in rows.items()]
+        return (sorted(table, key=lambda row: row[3], reverse=True))
+
+    def print_summary(self, limit=30):
+        print('%-36s %7s %10s %10s %7s %7s %11s' % (('function', 'calls', 'total ms', 'own ms') + COUNTERS))
+        for row in self.summary()[:limit]:
+            print('%-36s %7d %10.1f %10.1f %7d %7d %11d' % ((row[0][:36], row[1], row[2] * 1000.0, row[3] * 1000.0) + row[4:]))
+
+
+class profile(object):
+    """ Profile everything run inside a with block, and write the trace when it ends.
+
+    Input:
+        trace_path - Chrome trace file to write, or None to only keep the results on the profiler
+        modules - names of the modules to time, they have to be imported already
+    """
+
+    def __init__(self, trace_path=None, modules=DEFAULT_MODULES):
+        self.trace_path = trace_path
+        self.profiler = Profiler(modules)
+
+    def __enter__(self):
+        return (self.profiler.start())
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.profiler.stop()
+        if self.trace_path:
+            self.profiler.write_trace(self.trace_path)
+        return False
+
+
+def start(modules=DEFAULT_MODULES):
+    ##for the python shell, profile everything (like dialog button presses) until stop is called,
+    ##open the dialog after this, the buttons of a dialog that is already open are tied to the untimed methods
+    return (Profiler(modules).start())
+
+
+def stop(trace_path=None):
+    ##stop the running profiler, write its trace and print the table
+    profiler = active_profiler
+    if profiler is None:
+        raise RuntimeError('The profiler is not running')
+    profiler.stop()
+    if trace_path:
+        profiler.write_trace(trace_path)
+    profiler.print_summary()
+    return (profiler)
@@ -0,0 +1,115 @@
+"""
+#######################################
+filename    rig_startup_bench.py
+author      Owen McCubbin
+Brief Description:
+    Times how long the rig creator takes to get going.
+    import - importing rig_creator in a fresh hython, and which Qt and
+             rigtoolutils modules that pulled in (there should be none)
+    ui - building the dialog's widgets with QUiLoader against the compiled
+         ui file, and what the first compile of the ui file costs
+    The import part needs hython, the ui part only PySide2.
+
+    hython rig_startup_bench.py --repeat 10
+#######################################
+"""
+
+import argparse
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+##modules a headless import of rig_creator should stay clear of
+HEAVY_MODULES = ('PySide2', 'PySide2.QtUiTools', 'shiboken2', 'rigtoolutils.rigutils', 'rigtoolutils.iktwistcontrols',
+                 'rigtoolutils.fkikinterfacecontrol', 'rigtoolutils.iktwistnetworkeditor')
+##run in a fresh interpreter so nothing is imported yet
+IMPORT_SNIPPET = '''
+import json, sys, time
+sys.path.insert(0, %r)
+import hou
+start_time = time.time()
+import rig_creator
+seconds = time.time() - start_time
+print(json.dumps({'seconds': seconds, 'loaded': [name for name in %r if name in sys.modules]}))
+'''
+
+
+def time_import(repeat, python=None):
+    ##seconds of every import of rig_creator and the heavy modules it loaded
+    times = []
+    loaded = set()
+    for number in range(repeat):
+        output = subprocess.check_output([python or sys.executable, '-c', IMPORT_SNIPPET % (SCRIPT_DIR, HEAVY_MODULES)])
+        result = json.loads(output.decode('utf-8').strip().splitlines()[-1])
+        times.append(result['seconds'])
+        loaded.update(result['loaded'])
+    return (times, sorted(loaded))
+
+
+def time_ui(repeat):
+    ##seconds of every QUiLoader build, of the first compile and of every build from the compiled file
+    os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+    sys.path.insert(0, SCRIPT_DIR)
+    from PySide2 import QtWidgets
+    import rig_ui
+    app = QtWidgets.QApplication.instance() or QtWidgets.QApplication([])
+    parent = QtWidgets.QWidget()
+    loader_times = []
+    for number in range(repeat):
+        start_time = time.time()
+        rig_ui.load_with_loader(parent).deleteLater()
+        loader_times.append(time.time() - start_time)
+    ##a cache of its own so the first compile is really the first
+    cache_dir = tempfile.mkdtemp(prefix='rig_ui_bench')
+    try:
+        start_time = time.time()
+        compiled = rig_ui.compile_ui(cache_dir=cache_dir)
+        compile_time = time.time() - start_time
+        compiled_times = []
+        if compiled is not None:
+            for number in range(repeat):
+                start_time = time.time()
+                rig_ui.load_ui(parent, cache_dir=cache_dir).widget.deleteLater()
+                compiled_times.append(time.time() - start_time)
+    finally:
+        shutil.rmtree(cache_dir, ignore_errors=True)
+    app.processEvents()
+    return (loader_times, compile_time if compiled is not None else None, compiled_times)
+
+
+def describe(label, times):
+    if not times:
+        print('%-24s n/a' % label)
+        return
+    print('%-24s mean %8.2fms  best %8.2fms  (%d runs)' % (label, 1000.0 * sum(times) / len(times),
+                                                           1000.0 * min(times), len(times)))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Time the start up of the rig creator.')
+    parser.add_argument('-r', '--repeat', type=int, default=5, help='runs of every measurement')
+    parser.add_argument('--skip-import', action='store_true', help="don't time the import, for pythons without hou")
+    parser.add_argument('--skip-ui', action='store_true', help="don't time the ui, for pythons without PySide2")
+    args = parser.parse_args(argv)
+    if not args.skip_import:
+        times, loaded = time_import(args.repeat)
+        describe('import rig_creator', times)
+        print('%-24s %s' % ('heavy modules loaded', ', '.join(loaded) or 'none'))
+    if not args.skip_ui:
+        loader_times, compile_time, compiled_times = time_ui(args.repeat)
+        describe('QUiLoader', loader_times)
+        if compile_time is None:
+            print('%-24s no ui compiler found, the dialog will use QUiLoader' % 'compile')
+        else:
+            describe('compile (first open)', [compile_time])
+            describe('compiled ui', compiled_times)
+    return (0)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
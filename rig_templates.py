@@ -0,0 +1,163 @@
+"""
+#######################################
+filename    rig_templates.py
+author      Owen McCubbin
+Brief Description:
+    Locator templates for the rig creator. A template is a json file in the
+    templates folder that holds the name, parent, position and category of
+    every locator and the points of every face path, so a body type can be
+    shipped as data instead of code. A template can start from another one with
+    "base" and only list the locators and paths it changes or adds.
+    Templates are read the first time they are asked for and kept until their
+    files change. The positions are kept as numpy arrays so a template is fitted
+    to a character with a single scale and offset.
+#######################################
+"""
+
+import json
+import os
+
+import numpy as np
+
+##bump this when the file format changes
+TEMPLATE_VERSION = 1
+##where the templates live, can be set from the environment to use a studio's own
+TEMPLATE_DIR = os.environ.get('RIG_CREATOR_TEMPLATE_DIR',
+                              os.path.join(os.path.dirname(os.path.abspath(__file__)), 'templates'))
+DEFAULT_TEMPLATE = 'biped'
+##display scale of every locator category, a template can change them with its own "categories"
+CATEGORY_SCALES = {'body': .2, 'foot': .1, 'finger': .03, 'face': .02}
+
+##file path -> ([(path, modified time)] the template was read from, LocatorTemplate)
+template_cache = {}
+
+
+class LocatorTemplate(object):
+    """ A loaded template, locators are in creation order so parents always come before their children.
+
+    names - locator names
+    parents - (n,) index of every locator's parent, -1 for the root
+    positions - (n, 3) world positions
+    categories - category of every locator
+    display_scales - (n,) display scale of every locator
+    paths - list of (name, (k, 3) cv positions, display scale) for the face paths
+    """
+
+    def __init__(self, name, locators, paths, categories):
+        self.name = name
+        self.names = [locator['name'] for locator in locators]
+        lookup = dict((locator_name, number) for number, locator_name in enumerate(self.names))
+        self.parents = np.full(len(locators), -1, dtype=np.int64)
+        for number, locator in enumerate(locators):
+            parent = locator.get('parent')
+            if parent is None:
+                continue
+            if parent not in lookup:
+                raise ValueError('Locator %s in template %s has an unknown parent %s' % (locator['name'], name, parent))
+            if lookup[parent] >= number:
+                raise ValueError('Locator %s in template %s comes before its parent %s' % (locator['name'], name, parent))
+            self.parents[number] = lookup[parent]
+        self.positions = np.array([locator['position'] for locator in locators], dtype=np.float64).reshape(-1, 3)
+        self.categories = [locator.get('category', 'body') for locator in locators]
+        self.display_scales = np.array([category_scale(categories, category, name) for category in self.categories])
+        self.paths = [(path['name'], np.array(path['points'], dtype=np.float64).reshape(-1, 3),
+                       category_scale(categories, path.get('category', 'face'), name)) for path in paths]
+
+    def fitted(self, scale=1.0, offset=(0.0, 0.0, 0.0)):
+        """ Positions of every locator and path cv for a character of a different size.
+
+        The locators and the path cvs are scaled and offset together in one go.
+        Returns:
+            (n, 3) locator positions and a list with the (k, 3) cvs of every path
+        """
+        sizes = [len(points) for name, points, display_scale in self.paths]
+        every_point = np.concatenate([self.positions] + [points for name, points, display_scale in self.paths])
+        every_point = every_point * scale + np.asarray(offset, dtype=np.float64)
+        split = np.split(every_point, np.cumsum([len(self.positions)] + sizes)[:-1])
+        return (split[0], split[1:])
+
+    def local_positions(self, positions):
+        ##position of every locator relative to its parent, the root keeps its world position
+        has_parent = self.parents >= 0
+        local = positions.copy()
+        local[has_parent] -= positions[self.parents[has_parent]]
+        return (local)
+
+
+def category_scale(categories, category, template_name):
+    if category not in categories:
+        raise ValueError('Unknown locator category %s in template %s' % (category, template_name))
+    return (categories[category])
+
+
+def template_path(name, template_dir=None):
+    return (os.path.join(template_dir or TEMPLATE_DIR, name + '.json'))
+
+
+def template_names(template_dir=None):
+    ##every template that can be picked, by file name
+    template_dir = template_dir or TEMPLATE_DIR
+    if not os.path.isdir(template_dir):
+        return ([])
+    return (sorted(os.path.splitext(name)[0] for name in os.listdir(template_dir) if name.endswith('.json')))
+
+
+def read_template_data(name, template_dir=None, seen=None):
+    """ The raw data of a template with its base template merged in.
+
+    Locators and paths that share a name with the base replace its fields,
+    new ones are added after the base's.
+    Returns:
+        the merged data and the [(path, modified time)] of every file it came from
+    """
+    seen = seen or []
+    if name in seen:
+        raise ValueError('Template %s is its own base' % name)
+    file_path = template_path(name, template_dir)
+    with open(file_path) as template_file:
+        data = json.load(template_file)
+    if data.get('version', TEMPLATE_VERSION) > TEMPLATE_VERSION:
+        raise ValueError('Template %s needs a newer rig creator' % name)
+    sources = [(file_path, os.path.getmtime(file_path))]
+    if data.get('base'):
+        base, base_sources = read_template_data(data['base'], template_dir, seen + [name])
+        sources.extend(base_sources)
+        categories = dict(base.get('categories', {}))
+        categories.update(data.get('categories', {}))
+        data = {'name': data.get('name', name),
+                'categories': categories,
+                'locators': merge_entries(base.get('locators', []), data.get('locators', [])),
+                'paths': merge_entries(base.get('paths', []), data.get('paths', []))}
+    return (data, sources)
+
+
+def merge_entries(base_entries, entries):
+    ##entries of a template on top of its base's, matched by name
+    merged = [dict(entry) for entry in base_entries]
+    lookup = dict((entry['name'], number) for number, entry in enumerate(merged))
+    for entry in entries:
+        if entry['name'] in lookup:
+            merged[lookup[entry['name']]].update(entry)
+        else:
+            lookup[entry['name']] = len(merged)
+            merged.append(dict(entry))
+    return (merged)
+
+
+def load_template(name=None, template_dir=None):
+    """ The LocatorTemplate called name, read from disk only when it is new or one of its files changed. """
+    name = name or DEFAULT_TEMPLATE
+    file_path = template_path(name, template_dir)
+    cached = template_cache.get(file_path)
+    if cached is not None:
+        try:
+            if all(os.path.getmtime(path) == modified for path, modified in cached[0]):
+                return (cached[1])
+        except OSError:
+            pass
+    data, sources = read_template_data(name, template_dir)
+    categories = dict(CATEGORY_SCALES)
+    categories.update(data.get('categories', {}))
+    template = LocatorTemplate(data.get('name', name), data.get('locators', []), data.get('paths', []), categories)
+    template_cache[file_path] = (sources, template)
+    return (template)
@@ -0,0 +1,183 @@
+"""
+#######################################
+filename    rig_ui.py
+author      Owen McCubbin
+Brief Description:
+    Loads rig_creator_ui.ui for the dialog. Instead of parsing the xml with
+    QUiLoader every time the dialog opens, the file is compiled to python once
+    (with pyside2uic, or the uic that ships with PySide2) and the result is kept
+    in a cache folder. The compiled file is made again whenever the .ui file or
+    PySide2 changes. When neither compiler is around the dialog falls back to
+    QUiLoader, so nothing has to be installed for it to work.
+    Only needs PySide2, not hou, so it can be timed outside Houdini.
+#######################################
+"""
+
+import json
+import os
+import subprocess
+import sys
+
+import PySide2
+from PySide2 import QtCore
+from PySide2 import QtWidgets
+
+UI_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'rig_creator_ui.ui')
+##where the compiled ui files go, next to the capture cache unless set from the environment
+UI_CACHE_DIR = os.environ.get('RIG_CREATOR_UI_CACHE_DIR',
+                              os.path.join(os.environ.get('HOUDINI_USER_PREF_DIR', os.path.expanduser('~')),
+                                           'rig_creator_cache', 'ui'))
+##first line of every compiled file, followed by the stamp it was compiled for
+STAMP_PREFIX = '# rig_creator ui stamp: '
+
+##compiled file path -> (stamp, Ui_ class) of the ui classes already loaded in this session
+ui_classes = {}
+
+
+def ui_stamp(ui_file):
+    ##what the compiled file depends on, it is made again as soon as any of it changes
+    return ({'file': os.path.abspath(ui_file), 'mtime': os.path.getmtime(ui_file), 'size': os.path.getsize(ui_file),
+             'pyside': PySide2.__version__, 'python': sys.version_info[0]})
+
+
+def compiled_path(ui_file, cache_dir=None):
+    name = os.path.splitext(os.path.basename(ui_file))[0]
+    return (os.path.join(cache_dir or UI_CACHE_DIR, '%s_py%d.py' % (name, sys.version_info[0])))
+
+
+def read_stamp(py_file):
+    ##stamp a compiled file was made for, None when it is missing or not one of ours
+    try:
+        with open(py_file) as compiled_file:
+            line = compiled_file.readline()
+    except (IOError, OSError):
+        return (None)
+    if not line.startswith(STAMP_PREFIX):
+        return (None)
+    try:
+        return (json.loads(line[len(STAMP_PREFIX):]))
+    except ValueError:
+        return (None)
+
+
+def compile_source(ui_file):
+    """ Python source of a .ui file.
+
+    Tries pyside2uic first (Houdini ships it with its python), then the uic
+    executable PySide2 5.14 and up keep in their package folder, then pyside2-uic.
+    Returns:
+        the source, or None when there is no compiler
+    """
+    try:
+        from pyside2uic import compileUi
+    except ImportError:
+        compileUi = None
+    if compileUi is not None:
+        try:
+            from StringIO import StringIO
+        except ImportError:
+            from io import StringIO
+        source = StringIO()
+        ##the old pyside2uic doesn't run on every python, then one of the executables has to do
+        try:
+            with open(ui_file) as ui_input:
+                compileUi(ui_input, source)
+            return (source.getvalue())
+        except Exception:
+            pass
+    pyside_dir = os.path.dirname(PySide2.__file__)
+    for command in ([os.path.join(pyside_dir, 'uic'), '-g', 'python', ui_file],
+                    [os.path.join(pyside_dir, 'uic.exe'), '-g', 'python', ui_file],
+                    ['pyside2-uic', ui_file]):
+        try:
+            process = subprocess.Popen(command, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+        except OSError:
+            continue
+        output = process.communicate()[0]
+        if process.returncode == 0:
+            return (output.decode('utf-8'))
+    return (None)
+
+
+def compile_ui(ui_file=None, cache_dir=None):
+    """ Compile a .ui file into the cache, unless the file there is still up to date.
+
+    Returns:
+        path of the compiled file, or None when it could not be compiled
+    """
+    ui_file = ui_file or UI_FILE
+    py_file = compiled_path(ui_file, cache_dir)
+    stamp = ui_stamp(ui_file)
+    if read_stamp(py_file) == stamp:
+        return (py_file)
+    source = compile_source(ui_file)
+    if source is None:
+        return (None)
+    folder = os.path.dirname(py_file)
+    try:
+        if not os.path.isdir(folder):
+            os.makedirs(folder)
+        ##written to a temporary file first so another Houdini never reads half a file
+        temp_file = '%s.%d.tmp' % (py_file, os.getpid())
+        with open(temp_file, 'w') as compiled_file:
+            compiled_file.write(STAMP_PREFIX + json.dumps(stamp, sort_keys=True) + '\n')
+            compiled_file.write(source)
+        if os.path.exists(py_file):
+            os.remove(py_file)
+        os.rename(temp_file, py_file)
+    except (IOError, OSError):
+        return (None)
+    return (py_file)
+
+
+def load_ui_class(ui_file=None, cache_dir=None):
+    """ The generated Ui_ class of a .ui file, compiled first if needed.
+
+    Returns:
+        the class, or None when the file could not be compiled
+    """
+    ui_file = ui_file or UI_FILE
+    py_file = compiled_path(ui_file, cache_dir)
+    stamp = ui_stamp(ui_file)
+    loaded = ui_classes.get(py_file)
+    if loaded is not None and loaded[0] == stamp:
+        return (loaded[1])
+    if compile_ui(ui_file, cache_dir) is None:
+        return (None)
+    with open(py_file) as compiled_file:
+        source = compiled_file.read()
+    namespace = {'__name__': 'rig_creator_compiled_ui'}
+    exec(compile(source, py_file, 'exec'), namespace)
+    ui_class = None
+    for name, value in namespace.items():
+        if name.startswith('Ui_') and isinstance(value, type):
+            ui_class = value
+    ui_classes[py_file] = (stamp, ui_class)
+    return (ui_class)
+
+
+def load_with_loader(parent, ui_file=None):
+    ##the old way, parse the xml with QUiLoader, the widgets are attributes of the returned widget
+    from PySide2 import QtUiTools
+    qfile_object = QtCore.QFile((ui_file or UI_FILE).replace(os.path.sep, '/'))
+    qfile_object.open(QtCore.QFile.ReadOnly)
+    ui = QtUiTools.QUiLoader().load(qfile_object, parentWidget=parent)
+    qfile_object.close()
+    return (ui)
+
+
+def load_ui(parent, ui_file=None, cache_dir=None):
+    """ Build the widgets of a .ui file as a child of parent.
+
+    Returns:
+        an object with every named widget of the file as an attribute, like QUiLoader gives
+    """
+    ui_class = load_ui_class(ui_file, cache_dir)
+    if ui_class is None:
+        return (load_with_loader(parent, ui_file))
+    ##the widgets go on their own child widget, the same as QUiLoader puts them
+    widget = QtWidgets.QWidget(parent)
+    ui = ui_class()
+    ui.setupUi(widget)
+    ui.widget = widget
+    return (ui)
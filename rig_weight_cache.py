@@ -0,0 +1,184 @@
+"""
+#######################################
+filename    rig_weight_cache.py
+author      Owen McCubbin
+Brief Description:
+    On disk cache for capture results so a capture only gets solved again when
+    the mesh or the skeleton actually changed. Every entry is a folder named by
+    the hash of the mesh and the bone rest data and holds plain .npy files that
+    can be memory mapped. The cache is kept under a size cap by removing the
+    least recently used entries.
+    Weights can also be exported to and imported from a single file keyed by
+    bone name, so they survive a full rebuild of the rig.
+#######################################
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import time
+
+import numpy as np
+
+##bump this whenever the solvers change so old results are not reused
+CACHE_VERSION = 1
+##where the cache lives and how big it can get, both can be set from the environment
+CACHE_DIR = os.environ.get('RIG_CREATOR_CACHE_DIR',
+                           os.path.join(os.environ.get('HOUDINI_USER_PREF_DIR', os.path.expanduser('~')), 'rig_creator_cache'))
+CACHE_SIZE_LIMIT = int(os.environ.get('RIG_CREATOR_CACHE_SIZE_MB', '2048')) * 1024 * 1024
+##rest data is rounded before hashing so float noise from a rebuild does not miss the cache
+REST_DECIMALS = 5
+
+
+def rest_data(matrices, lengths):
+    ##one (b, 17) array per skeleton, the flattened world rest transform and length of every bone
+    matrices = np.asarray(matrices, dtype=np.float64).reshape(-1, 16)
+    lengths = np.asarray(lengths, dtype=np.float64).reshape(-1, 1)
+    return (np.hstack((matrices, lengths)))
+
+
+def mesh_hash(mesh_data):
+    ##hash of the embedded mesh, kept separate so entries of the same mesh can be found again
+    return (hashlib.sha1(mesh_data).hexdigest())
+
+
+def cache_key(mesh_key, bone_names, rest, mode):
+    """ Content address of a capture.
+
+    Input:
+        mesh_key - mesh_hash of the embedded character mesh
+        bone_names - names of the bones in capture region order
+        rest - rest_data of those bones
+        mode - capture mode, a preview never answers for a full solve
+    """
+    key = hashlib.sha1()
+    key.update(('%d %s %d\n' % (CACHE_VERSION, mesh_key, mode)).encode('utf-8'))
+    key.update('\n'.join(bone_names).encode('utf-8'))
+    key.update(np.ascontiguousarray(np.round(rest, REST_DECIMALS)).tobytes())
+    return (key.hexdigest())
+
+
+def entry_dir(key, cache_dir=None):
+    return (os.path.join(cache_dir or CACHE_DIR, key))
+
+
+def load(key, cache_dir=None):
+    """ Cached capture for key, or None.
+
+    Returns:
+        dict with memory mapped 'indices' and 'weights', the 'rest' data and the
+        'bones' and 'mesh' the entry was solved for
+    """
+    folder = entry_dir(key, cache_dir)
+    if not os.path.isdir(folder):
+        return (None)
+    try:
+        with open(os.path.join(folder, 'entry.json')) as entry_file:
+            entry = json.load(entry_file)
+        entry['indices'] = np.load(os.path.join(folder, 'indices.npy'), mmap_mode='r')
+        entry['weights'] = np.load(os.path.join(folder, 'weights.npy'), mmap_mode='r')
+        entry['rest'] = np.load(os.path.join(folder, 'rest.npy'))
+    except (IOError, OSError, ValueError):
+        ##a broken entry is as good as a miss
+        return (None)
+    ##mark it as used for the eviction
+    os.utime(folder, None)
+    return (entry)
+
+
+def store(key, mesh_key, bone_names, rest, mode, indices, weights, cache_dir=None):
+    ##write a capture into the cache, the folder is renamed into place so readers never see half an entry
+    cache_dir = cache_dir or CACHE_DIR
+    folder = entry_dir(key, cache_dir)
+    if os.path.isdir(folder):
+        return (folder)
+    temp_folder = '%s.%d.tmp' % (folder, os.getpid())
+    if not os.path.isdir(temp_folder):
+        os.makedirs(temp_folder)
+    np.save(os.path.join(temp_folder, 'indices.npy'), np.asarray(indices, dtype=np.int32))
+    np.save(os.path.join(temp_folder, 'weights.npy'), np.asarray(weights, dtype=np.float32))
+    np.save(os.path.join(temp_folder, 'rest.npy'), np.asarray(rest, dtype=np.float64))
+    with open(os.path.join(temp_folder, 'entry.json'), 'w') as entry_file:
+        json.dump({'bones': list(bone_names), 'mesh': mesh_key, 'mode': mode, 'time': time.time()}, entry_file)
+    try:
+        os.rename(temp_folder, folder)
+    except OSError:
+        ##someone else stored the same capture first
+        shutil.rmtree(temp_folder, ignore_errors=True)
+    evict(cache_dir=cache_dir)
+    return (folder)
+
+
+def entries(cache_dir=None):
+    ##(last used, size, folder) of every entry in the cache
+    cache_dir = cache_dir or CACHE_DIR
+    if not os.path.isdir(cache_dir):
+        return ([])
+    found = []
+    for name in os.listdir(cache_dir):
+        folder = os.path.join(cache_dir, name)
+        if not os.path.isdir(folder) or name.endswith('.tmp'):
+            continue
+        size = sum(os.path.getsize(os.path.join(folder, each)) for each in os.listdir(folder))
+        found.append((os.path.getmtime(folder), size, folder))
+    return (found)
+
+
+def latest(mesh_key, mode, cache_dir=None):
+    ##most recently used entry for the same mesh and mode, the starting point of an incremental re-capture
+    for used, size, folder in sorted(entries(cache_dir), reverse=True):
+        try:
+            with open(os.path.join(folder, 'entry.json')) as entry_file:
+                entry = json.load(entry_file)
+        except (IOError, OSError, ValueError):
+            continue
+        if entry.get('mesh') == mesh_key and entry.get('mode') == mode:
+            return (load(os.path.basename(folder), cache_dir))
+    return (None)
+
+
+def evict(size_limit=None, cache_dir=None):
+    ##remove the least recently used entries until the cache fits under the size limit
+    size_limit = CACHE_SIZE_LIMIT if size_limit is None else size_limit
+    found = sorted(entries(cache_dir))
+    total = sum(size for used, size, folder in found)
+    for used, size, folder in found:
+        if total <= size_limit:
+            break
+        shutil.rmtree(folder, ignore_errors=True)
+        total -= size
+    return (total)
+
+
+def export_weights(file_path, bone_names, indices, weights):
+    ##write weights to a single file with the bones stored by name instead of by region number
+    with open(file_path, 'wb') as export_file:
+        np.savez_compressed(export_file, bones=np.array([str(name) for name in bone_names]),
+                            indices=np.asarray(indices, dtype=np.int32), weights=np.asarray(weights, dtype=np.float32))
+
+
+def import_weights(file_path, bone_names, num_points=None):
+    """ Read exported weights and remap them onto the current bones by name.
+
+    Influences of bones that no longer exist are dropped and every point is
+    normalized again.
+    Returns:
+        (n, k) indices into bone_names and (n, k) weights, and the names that were not found
+    """
+    with np.load(file_path) as exported:
+        saved_bones = [str(name) for name in exported['bones']]
+        indices = exported['indices']
+        weights = exported['weights'].astype(np.float64)
+    if num_points is not None and len(indices) != num_points:
+        raise ValueError('Exported weights are for %d points, the mesh has %d' % (len(indices), num_points))
+    ##saved region number to current region number, -1 for bones that are gone
+    lookup = dict((name, number) for number, name in enumerate(bone_names))
+    remap = np.array([lookup.get(name, -1) for name in saved_bones], dtype=np.int64)
+    indices = remap[indices]
+    missing = [name for name in saved_bones if name not in lookup]
+    weights[indices < 0] = 0.0
+    indices[indices < 0] = 0
+    totals = weights.sum(axis=1)
+    weights[totals > 0] /= totals[totals > 0, np.newaxis]
+    return (indices, weights, missing)
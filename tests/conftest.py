@@ -0,0 +1,14 @@
+"""
+#######################################
+filename    conftest.py
+author      Owen McCubbin
+Brief Description:
+    The tool's modules sit at the top of the repo, not in a package, so the
+    tests import them from there.
+#######################################
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,65 @@
+"""
+#######################################
+filename    test_bind_parms.py
+author      Owen McCubbin
+Brief Description:
+    The channel references bind_parms leaves on a whole rig build, run
+    against fake_hou.
+#######################################
+"""
+
+import io
+import sys
+import tempfile
+import unittest
+
+import fake_hou
+fake_hou.install()
+
+import hou
+import rig_benchmark
+import rig_creator
+
+
+class BindParmsTest(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        fake_hou.add_file(rig_benchmark.MESH_FILE, rig_benchmark.character_mesh())
+        ##every binding the build makes, on top of it being bound
+        cls.bindings = []
+        bind_parms = rig_creator.bind_parms
+        def recording_bind_parms(rig_net, bindings):
+            cls.bindings.extend(bindings)
+            return (bind_parms(rig_net, bindings))
+        rig_creator.bind_parms = recording_bind_parms
+        stdout = sys.stdout
+        sys.stdout = io.StringIO() if sys.version_info[0] > 2 else io.BytesIO()
+        try:
+            rig_benchmark.run_build(rig_creator.CAPTURE_PROXIMITY, tempfile.mkdtemp())
+        finally:
+            sys.stdout = stdout
+            rig_creator.bind_parms = bind_parms
+        cls.rig_net = hou.node('/obj/' + rig_benchmark.RIG_NAME)
+
+    def test_every_component_references_its_interface_parm(self):
+        components = 0
+        for node, parm_name, hda_parm_name in self.bindings:
+            for parm, hda_parm in zip(node.parmTuple(parm_name), self.rig_net.parmTuple(hda_parm_name)):
+                self.assertEqual(parm.expression(),
+                                 'ch("' + node.relativePathTo(self.rig_net) + '/' + hda_parm.name() + '")')
+                components += 1
+        self.assertEqual((len(self.bindings), components), (46, 130))
+        self.assertEqual(self.rig_net.node('master').parm('tx').expression(), 'ch("../master_transx")')
+
+    def test_one_call_per_binding(self):
+        ##binding again changes nothing, so the calls of a bind can be counted on the built rig
+        fake_hou.reset_stats()
+        rig_creator.bind_parms(self.rig_net, self.bindings)
+        self.assertEqual(fake_hou.stats['ParmTuple.set'], 46)
+        self.assertNotIn('Parm.setExpression', fake_hou.stats)
+        self.test_every_component_references_its_interface_parm()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,77 @@
+"""
+#######################################
+filename    test_build_transaction.py
+author      Owen McCubbin
+Brief Description:
+    Queued parm writes of a build transaction, run against fake_hou.
+#######################################
+"""
+
+import unittest
+
+import fake_hou
+fake_hou.install()
+
+import hou
+import rig_creator
+
+
+class BuildTransactionTest(unittest.TestCase):
+
+    def setUp(self):
+        hou.hipFile.clear(suppress_save_prompt=True)
+        self.network = hou.node('/obj')
+
+    def test_writes_are_applied_when_the_stage_ends(self):
+        node = rig_creator.create_node(self.network, 'null', 'ctrl')
+        with rig_creator.BuildTransaction('test'):
+            rig_creator.queue_parms(node, {'geoscale': .5})
+            rig_creator.queue_parms(node, {'geoscale': .25, 'controltype': 7})
+            self.assertEqual(node.evalParm('geoscale'), 1.0)
+        self.assertEqual(node.evalParm('geoscale'), .25)
+        self.assertEqual(node.evalParm('controltype'), 7)
+
+    def test_node_made_again_under_the_same_path_gets_its_writes(self):
+        ##like the shoulder FK ctrl, which is destroyed and made again with the same name
+        with rig_creator.BuildTransaction('test'):
+            old_node = rig_creator.create_node(self.network, 'null', 'ctrl')
+            rig_creator.queue_parms(old_node, {'controltype': 4})
+            rig_creator.destroy_node(old_node)
+            new_node = rig_creator.create_node(self.network, 'null', 'ctrl')
+            self.assertEqual(new_node.path(), '/obj/ctrl')
+            rig_creator.queue_parms(new_node, {'geoscale': .035, 'controltype': 7})
+        self.assertEqual(new_node.evalParm('geoscale'), .035)
+        self.assertEqual(new_node.evalParm('controltype'), 7)
+
+    def test_writes_inside_a_destroyed_node_are_dropped(self):
+        with rig_creator.BuildTransaction('test'):
+            node = rig_creator.create_node(self.network, 'geo', 'geo')
+            merge = rig_creator.create_node(node, 'object_merge', 'merge')
+            rig_creator.queue_parms(merge, {'objpath1': '/obj/other'})
+            rig_creator.destroy_node(node)
+
+    def test_node_destroyed_behind_the_transaction_raises(self):
+        with self.assertRaises(hou.ObjectWasDeleted):
+            with rig_creator.BuildTransaction('test'):
+                node = rig_creator.create_node(self.network, 'null', 'ctrl')
+                rig_creator.queue_parms(node, {'geoscale': .5})
+                node.destroy()
+
+    def test_batch_off_writes_straight_away(self):
+        ##the old behaviour, kept to time a build both ways
+        node = rig_creator.create_node(self.network, 'null', 'ctrl')
+        fake_hou.reset_stats()
+        rig_creator.set_batch_mode(rig_creator.BATCH_OFF)
+        try:
+            with rig_creator.BuildTransaction('test'):
+                rig_creator.queue_parms(node, {'geoscale': .5})
+                self.assertEqual(node.evalParm('geoscale'), .5)
+                self.assertEqual(hou.updateModeSetting(), hou.updateMode.AutoUpdate)
+        finally:
+            rig_creator.set_batch_mode(rig_creator.BATCH_ON)
+        self.assertNotIn('undos.group', fake_hou.snapshot())
+        self.assertIn('test', rig_creator.stage_timings)
+
+
+if __name__ == '__main__':
+    unittest.main()
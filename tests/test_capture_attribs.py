@@ -0,0 +1,125 @@
+"""
+#######################################
+filename    test_capture_attribs.py
+author      Owen McCubbin
+Brief Description:
+    How the capture reads the mesh and writes the weights in bulk, and the
+    capture a built rig stores, run against fake_hou.
+#######################################
+"""
+
+import io
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+import numpy as np
+
+import fake_hou
+fake_hou.install()
+
+import hou
+import rig_benchmark
+import rig_capture
+import rig_creator
+
+
+class CaptureWeightsTest(unittest.TestCase):
+
+    def unpacked_geometry(self, num_points):
+        ##what the region capture hands over, the capture arrays are there but not the weights
+        geo = fake_hou.mesh_geometry(np.zeros((num_points, 3)), [])
+        geo.add_point_attrib('boneCapture_index', [])
+        geo.add_point_attrib('boneCapture_data', [])
+        return (geo)
+
+    def test_round_trip(self):
+        geo = self.unpacked_geometry(3)
+        indices = np.array([(2, 0, 1, 3), (0, 1, 2, 3), (1, 0, 2, 3)])
+        weights = np.array([(.5, .25, .125, .125), (1, 0, 0, 0), (.7, .1, .1, .1)])
+        rig_creator.set_capture_weights(geo, indices, weights)
+        read_indices, read_weights = rig_creator.read_capture_weights(geo)
+        np.testing.assert_array_equal(read_indices, indices)
+        ##stored as 32 bit floats, like Houdini's capture data
+        np.testing.assert_allclose(read_weights, weights, rtol=1e-6)
+        ##the region capture's arrays would only be stored and thrown away
+        self.assertIsNone(geo.findPointAttrib('boneCapture_index'))
+        self.assertIsNone(geo.findPointAttrib('boneCapture_data'))
+
+    def test_fewer_influences_are_padded(self):
+        geo = self.unpacked_geometry(2)
+        rig_creator.set_capture_weights(geo, np.array([(1, 0), (0, 1)]), np.array([(.75, .25), (.5, .5)]))
+        self.assertEqual(geo.findPointAttrib(rig_creator.CAPTURE_INDEX_ATTRIB).size(), rig_capture.MAX_INFLUENCES)
+        self.assertEqual(geo.point(0).attribValue(rig_creator.CAPTURE_INDEX_ATTRIB), (1, 0, -1, -1))
+        ##the padding reads back as no weight on region 0
+        indices, weights = rig_creator.read_capture_weights(geo)
+        np.testing.assert_array_equal(indices, [(1, 0, 0, 0), (0, 1, 0, 0)])
+        np.testing.assert_allclose(weights, [(.75, .25, 0, 0), (.5, .5, 0, 0)])
+
+    def test_capture_from_before_the_tuples(self):
+        with self.assertRaises(ValueError):
+            rig_creator.read_capture_weights(self.unpacked_geometry(2))
+
+
+class ReadMeshArraysTest(unittest.TestCase):
+
+    def test_triangles_of_every_polygon(self):
+        hou.hipFile.clear(suppress_save_prompt=True)
+        polygons = [(0, 1, 2, 3), (1, 4, 5, 2), (3, 2, 6)]
+        points = np.random.RandomState(2).uniform(size=(7, 3))
+        fake_hou.add_file('capture_test/mesh.bgeo', fake_hou.mesh_geometry(points, polygons))
+        geo_ref = hou.node('/obj').createNode('geo', 'mesh')
+        mesh = geo_ref.createNode('file', 'mesh_file')
+        mesh.parm('file').set('capture_test/mesh.bgeo')
+        read_points, triangles = rig_creator.read_mesh_arrays(geo_ref, mesh)
+        np.testing.assert_allclose(read_points, points)
+        np.testing.assert_array_equal(triangles, rig_capture.triangulate(polygons))
+        ##the wrangle is only there for the read
+        self.assertEqual([child.name() for child in geo_ref.children()], ['mesh_file'])
+
+
+class StoredCaptureTest(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        fake_hou.add_file(rig_benchmark.MESH_FILE, rig_benchmark.character_mesh())
+        stdout = sys.stdout
+        sys.stdout = io.StringIO() if sys.version_info[0] > 2 else io.BytesIO()
+        try:
+            rig_benchmark.run_build(rig_creator.CAPTURE_PROXIMITY, tempfile.mkdtemp())
+        finally:
+            sys.stdout = stdout
+        cls.rig_net = hou.node('/obj/' + rig_benchmark.RIG_NAME)
+        cls.geo_ref = cls.rig_net.node(rig_benchmark.RIG_NAME + '_geo')
+
+    def test_pack_gets_the_arrays(self):
+        stored = self.geo_ref.node('capture_weights').geometry()
+        self.assertIsNone(stored.findPointAttrib('boneCapture_index'))
+        arrays = self.geo_ref.node('capture_pack').input(0)
+        self.assertEqual(arrays.name(), 'capture_arrays')
+        unpacked = arrays.geometry()
+        for number in (0, len(stored.points()) // 2, len(stored.points()) - 1):
+            regions = np.array(stored.point(number).attribValue(rig_creator.CAPTURE_INDEX_ATTRIB))
+            weights = np.array(stored.point(number).attribValue(rig_creator.CAPTURE_WEIGHT_ATTRIB))
+            point = unpacked.point(number)
+            self.assertEqual(list(point.attribValue('boneCapture_index')), regions[regions >= 0].tolist())
+            np.testing.assert_allclose(point.attribValue('boneCapture_data'), weights[regions >= 0])
+
+    def test_export(self):
+        export_dir = tempfile.mkdtemp(prefix='capture_test')
+        try:
+            file_path = os.path.join(export_dir, 'weights.npz')
+            rig_creator.export_capture_weights(self.rig_net, file_path)
+            with np.load(file_path) as exported:
+                np.testing.assert_allclose(exported['weights'].sum(axis=1), 1.0, rtol=1e-5)
+                self.assertEqual(exported['indices'].shape, (len(rig_benchmark.character_mesh().positions),
+                                                             rig_capture.MAX_INFLUENCES))
+                self.assertIn('pelvis_bone1', exported['bones'].tolist())
+        finally:
+            shutil.rmtree(export_dir, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,52 @@
+"""
+#######################################
+filename    test_capture_mesh_key.py
+author      Owen McCubbin
+Brief Description:
+    The weight cache key of an embedded mesh, from binary and from text
+    HDA sections, run against fake_hou.
+#######################################
+"""
+
+import unittest
+
+import fake_hou
+fake_hou.install()
+
+import hou
+import rig_creator
+
+
+class TextSection(object):
+    ##a section of a Houdini without binaryContents, contents() hands back text
+    def __init__(self, contents):
+        self.text = contents
+
+    def contents(self):
+        return (self.text)
+
+
+class CaptureMeshKeyTest(unittest.TestCase):
+
+    def setUp(self):
+        hou.hipFile.clear(suppress_save_prompt=True)
+        self.rig_net = hou.node('/obj').createNode('subnet', 'rig').createDigitalAsset('rig', 'rig.hda')
+        self.geo_ref = self.rig_net.createNode('geo', 'rig_geo')
+        self.definition = self.rig_net.type().definition()
+
+    def test_text_section_hashes_like_its_bytes(self):
+        self.definition.addSection('rig_geo.bgeo', b'mesh data')
+        binary_key = rig_creator.capture_mesh_key(self.rig_net, self.geo_ref)
+        self.definition.section_map['rig_geo.bgeo'] = TextSection(u'mesh data')
+        self.assertEqual(rig_creator.capture_mesh_key(self.rig_net, self.geo_ref), binary_key)
+
+    def test_text_section_with_maya_scale_down(self):
+        self.definition.section_map['rig_geo.bgeo'] = TextSection(u'mesh data')
+        plain_key = rig_creator.capture_mesh_key(self.rig_net, self.geo_ref)
+        scale_down = self.geo_ref.createNode('xform', 'maya_scale_down')
+        scale_down.parm('scale').set(.01)
+        self.assertNotEqual(rig_creator.capture_mesh_key(self.rig_net, self.geo_ref), plain_key)
+
+
+if __name__ == '__main__':
+    unittest.main()
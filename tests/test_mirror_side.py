@@ -0,0 +1,136 @@
+"""
+#######################################
+filename    test_mirror_side.py
+author      Owen McCubbin
+Brief Description:
+    The R side made by mirror_side against the L side it was copied from,
+    parm by parm and transform by transform, run against fake_hou.
+#######################################
+"""
+
+import io
+import sys
+import tempfile
+import unittest
+from contextlib import contextmanager
+
+import numpy as np
+
+import fake_hou
+fake_hou.install()
+
+import hou
+import rig_benchmark
+import rig_creator
+
+
+@contextmanager
+def quiet():
+    ##the build prints its constraint and capture reports
+    stdout = sys.stdout
+    sys.stdout = io.StringIO() if sys.version_info[0] > 2 else io.BytesIO()
+    try:
+        yield
+    finally:
+        sys.stdout = stdout
+
+
+def mirrored_world(world):
+    return (rig_creator.MIRROR_MATRIX * world * rig_creator.MIRROR_MATRIX)
+
+
+class MirrorBuiltRigTest(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        fake_hou.add_file(rig_benchmark.MESH_FILE, rig_benchmark.character_mesh())
+        with quiet():
+            rig_benchmark.run_build(rig_creator.CAPTURE_PROXIMITY, tempfile.mkdtemp())
+        cls.rig_net = hou.node('/obj/' + rig_benchmark.RIG_NAME)
+        cls.pairs = []
+        for left_node in cls.rig_net.children():
+            if rig_creator.LEFT_PREFIX.match(left_node.name()):
+                cls.pairs.append((left_node, cls.rig_net.node(rig_creator.mirror_string(left_node.name()))))
+
+    def test_every_left_node_has_a_right_node(self):
+        self.assertTrue(self.pairs)
+        missing = [left_node.name() for left_node, right_node in self.pairs if right_node is None]
+        self.assertEqual(missing, [])
+
+    def test_parms_match(self):
+        ##every parm of the node and the nodes inside it, mirrored the way mirror_side promises
+        flipped = set((name, component) for name, components in rig_creator.MIRRORED_PARMS for component in components)
+        mismatches = []
+        for left_top, right_top in self.pairs:
+            for left_node in (left_top,) + left_top.allSubChildren():
+                right_node = right_top.node(rig_creator.mirror_string(left_top.relativePathTo(left_node)))
+                self.assertIsNotNone(right_node, left_node.path())
+                for left_parm in left_node.parms():
+                    right_parm = right_node.parm(left_parm.name())
+                    if left_parm.keyframes():
+                        expected = rig_creator.mirror_string(left_parm.expression())
+                        actual = right_parm.expression() if right_parm.keyframes() else None
+                    elif left_parm.parmTemplate().type() == hou.parmTemplateType.String:
+                        expected = rig_creator.mirror_string(left_parm.unexpandedString())
+                        actual = right_parm.unexpandedString()
+                    elif (left_parm.tuple().name(), list(left_parm.tuple()).index(left_parm)) in flipped:
+                        expected = -left_parm.eval()
+                        actual = right_parm.eval()
+                    else:
+                        expected = left_parm.eval()
+                        actual = right_parm.eval()
+                    if expected != actual:
+                        mismatches.append((right_parm.path(), expected, actual))
+        self.assertEqual(mismatches, [])
+
+    def test_controls_keep_their_shapes(self):
+        for name in ('shoulder_FK_ctrl', 'arm_bone1_FK_ctrl', 'leg_goal_ctrl'):
+            right_node = self.rig_net.node('R_' + name)
+            self.assertEqual(right_node.evalParm('controltype'), 7)
+            self.assertEqual(right_node.node('shape').evalParm('objpath1'),
+                             self.rig_net.node('L_' + name).node('shape').evalParm('objpath1'))
+            self.assertTrue(right_node.node('shape').evalParm('objpath1'))
+
+    def test_worlds_are_mirrored(self):
+        for left_node, right_node in self.pairs:
+            if isinstance(left_node, hou.ObjNode):
+                np.testing.assert_allclose(right_node.worldTransform().matrix,
+                                           mirrored_world(left_node.worldTransform()).matrix, atol=1e-9,
+                                           err_msg=right_node.path())
+
+
+class MirrorCentreParentTest(unittest.TestCase):
+
+    def setUp(self):
+        hou.hipFile.clear(suppress_save_prompt=True)
+        self.rig_net = rig_creator.create_node(hou.node('/obj'), 'subnet', 'rig')
+
+    def check_mirrored(self, parent):
+        left_node = rig_creator.create_node(self.rig_net, 'null', 'L_arm_ctrl')
+        left_node.setFirstInput(parent)
+        left_node.setPreTransform(hou.hmath.buildTransform({'translate': (.4, .1, -.2), 'rotate': (10, 25, -40)}))
+        left_node.parmTuple('t').set((.05, .3, .1))
+        left_node.parmTuple('r').set((5, -15, 30))
+        ##inside a stage like the build, which also starts it with empty indices and world caches
+        with rig_creator.BuildTransaction('test'):
+            right_node = rig_creator.mirror_side(self.rig_net)[0]
+        self.assertEqual(right_node.name(), 'R_arm_ctrl')
+        self.assertIs(right_node.input(0), parent)
+        np.testing.assert_allclose(right_node.worldTransform().matrix,
+                                   mirrored_world(left_node.worldTransform()).matrix, atol=1e-9)
+
+    def test_off_centre_bone_parent(self):
+        ##the child hangs off the end of the bone, not its origin
+        bone = rig_creator.create_node(self.rig_net, 'bone', 'spine_bone')
+        bone.setPreTransform(hou.hmath.buildTransform({'translate': (.3, 1, .1), 'rotate': (20, -35, 15)}))
+        bone.parm('length').set(.7)
+        self.check_mirrored(bone)
+
+    def test_off_centre_null_parent(self):
+        null = rig_creator.create_node(self.rig_net, 'null', 'chest_ctrl')
+        null.setPreTransform(hou.hmath.buildTransform({'translate': (-.2, 1.2, .3), 'rotate': (0, 30, 10)}))
+        self.check_mirrored(null)
+
+
+if __name__ == '__main__':
+    unittest.main()
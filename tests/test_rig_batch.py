@@ -0,0 +1,197 @@
+"""
+#######################################
+filename    test_rig_batch.py
+author      Owen McCubbin
+Brief Description:
+    The manifest, journal and job handling of rig_batch. The hython the jobs
+    run is a stub script that writes the report and HDA rig_creator_cli.py
+    would, fails or hangs, depending on the model it is given.
+#######################################
+"""
+
+import json
+import os
+import shutil
+import stat
+import sys
+import tempfile
+import time
+import unittest
+
+import rig_batch
+
+##stands in for hython running rig_creator_cli.py, the name of the model picks what it does
+STUB_HYTHON = '''#!%s
+import json
+import sys
+import time
+
+arguments = sys.argv[2:]
+model = arguments[0]
+options = dict(zip(arguments[1::2], arguments[2::2]))
+if 'hang' in model:
+    time.sleep(60)
+if 'fail' in model:
+    print('rigging %%s failed' %% model)
+    sys.exit(1)
+with open(options['--output'], 'w') as hda_file:
+    hda_file.write('hda')
+with open(options['--report'], 'w') as report_file:
+    json.dump({'hda': options['--output'], 'stages': {'create_mesh': 1.0, 'capture_mesh': 2.0}}, report_file)
+'''
+
+
+class BatchFolderTest(unittest.TestCase):
+
+    def setUp(self):
+        self.batch_dir = tempfile.mkdtemp(prefix='rig_batch_test')
+
+    def tearDown(self):
+        shutil.rmtree(self.batch_dir, ignore_errors=True)
+
+    def path(self, *names):
+        return (os.path.join(self.batch_dir, *names))
+
+    def write_manifest(self, entries):
+        with open(self.path('characters.json'), 'w') as manifest_file:
+            json.dump(entries, manifest_file)
+        return (self.path('characters.json'))
+
+
+class ReadManifestTest(BatchFolderTest):
+
+    def test_relative_paths_and_defaults(self):
+        jobs = rig_batch.read_manifest(self.write_manifest([
+            {'model': 'geo/hero.fbx'},
+            {'model': 'geo/villain.fbx', 'name': 'boss', 'output': 'rigs/boss_rig.hda', 'scale': 2, 'proximity': True}]))
+        self.assertEqual(jobs[0], {'model': self.path('geo', 'hero.fbx'), 'name': 'hero', 'output': self.path('hero.hda'),
+                                   'template': None, 'scale': 1.0, 'from_maya': False, 'proximity': False})
+        self.assertEqual((jobs[1]['name'], jobs[1]['output'], jobs[1]['scale'], jobs[1]['proximity']),
+                         ('boss', self.path('rigs', 'boss_rig.hda'), 2.0, True))
+
+    def test_duplicate_names(self):
+        with self.assertRaises(ValueError):
+            rig_batch.read_manifest(self.write_manifest([{'model': 'a.fbx', 'name': 'hero'},
+                                                         {'model': 'b.fbx', 'name': 'hero'}]))
+        ##the same model name in two folders is a duplicate too
+        with self.assertRaises(ValueError):
+            rig_batch.read_manifest(self.write_manifest([{'model': 'old/hero.fbx'}, {'model': 'new/hero.fbx'}]))
+
+    def test_entry_without_a_model(self):
+        with self.assertRaises(ValueError):
+            rig_batch.read_manifest(self.write_manifest([{'model': 'hero.fbx'}, {'name': 'villain'}]))
+
+
+class JournalTest(BatchFolderTest):
+
+    def test_truncated_last_line(self):
+        journal = rig_batch.Journal(self.path('characters.journal'))
+        journal.write({'name': 'hero', 'status': 'failed'})
+        journal.write({'name': 'villain', 'status': 'done'})
+        journal.write({'name': 'hero', 'status': 'done'})
+        ##the batch was killed part way through writing the next line
+        with open(self.path('characters.journal'), 'a') as journal_file:
+            journal_file.write('{"name": "villain", "stat')
+        records = rig_batch.read_journal(self.path('characters.journal'))
+        self.assertEqual(records, {'hero': {'name': 'hero', 'status': 'done'},
+                                   'villain': {'name': 'villain', 'status': 'done'}})
+
+    def test_no_journal_yet(self):
+        self.assertEqual(rig_batch.read_journal(self.path('missing.journal')), {})
+
+
+class PendingJobsTest(BatchFolderTest):
+
+    def setUp(self):
+        BatchFolderTest.setUp(self)
+        self.jobs = rig_batch.read_manifest(self.write_manifest([{'model': name + '.fbx'}
+                                                                  for name in ('done', 'gone', 'failed', 'new')]))
+        with open(self.path('done.hda'), 'w') as hda_file:
+            hda_file.write('hda')
+        ##gone.hda was deleted since the journal said it was done
+        self.records = {'done': {'name': 'done', 'status': 'done'}, 'gone': {'name': 'gone', 'status': 'done'},
+                        'failed': {'name': 'failed', 'status': 'failed'}}
+
+    def names(self, jobs):
+        return ([job['name'] for job in jobs])
+
+    def test_done_but_the_hda_is_missing(self):
+        self.assertEqual(self.names(rig_batch.pending_jobs(self.jobs, self.records)), ['gone', 'failed', 'new'])
+
+    def test_retry_failed(self):
+        self.assertEqual(self.names(rig_batch.pending_jobs(self.jobs, self.records, retry_failed=False)),
+                         ['gone', 'new'])
+
+
+class StageSummaryTest(unittest.TestCase):
+
+    def test_only_finished_characters(self):
+        records = [{'name': 'a', 'status': 'done', 'stages': {'create_mesh': 1.0, 'capture_mesh': 4.0}},
+                   {'name': 'b', 'status': 'done', 'stages': {'create_mesh': 3.0}},
+                   {'name': 'c', 'status': 'failed', 'stages': {'create_mesh': 100.0}}]
+        self.assertEqual(rig_batch.stage_summary(records), {'create_mesh': (2, 4.0, 2.0, 3.0),
+                                                            'capture_mesh': (1, 4.0, 4.0, 4.0)})
+        self.assertEqual(rig_batch.stage_summary(records[2:]), {})
+
+
+@unittest.skipIf(os.name == 'nt', 'the stub hython is started through its #! line')
+class RunJobTest(BatchFolderTest):
+
+    def setUp(self):
+        BatchFolderTest.setUp(self)
+        self.hython = self.path('hython')
+        with open(self.hython, 'w') as stub_file:
+            stub_file.write(STUB_HYTHON % sys.executable)
+        os.chmod(self.hython, os.stat(self.hython).st_mode | stat.S_IXUSR)
+        os.makedirs(self.path('logs'))
+
+    def job(self, name):
+        return (rig_batch.read_manifest(self.write_manifest([{'model': name + '.fbx'}]))[0])
+
+    def test_done(self):
+        record = rig_batch.run_job(self.job('hero'), self.path('logs'), self.hython)
+        self.assertEqual((record['status'], record['returncode'], record['hda']), ('done', 0, self.path('hero.hda')))
+        self.assertEqual(record['stages'], {'create_mesh': 1.0, 'capture_mesh': 2.0})
+
+    def test_failed(self):
+        record = rig_batch.run_job(self.job('fail'), self.path('logs'), self.hython)
+        self.assertEqual((record['status'], record['returncode']), ('failed', 1))
+        with open(record['log']) as log_file:
+            self.assertIn('rigging', log_file.read())
+
+    def test_timeout(self):
+        start_time = time.time()
+        record = rig_batch.run_job(self.job('hang'), self.path('logs'), self.hython, timeout=1.0)
+        ##killed, not waited on for the whole minute
+        self.assertLess(time.time() - start_time, 30.0)
+        self.assertEqual((record['status'], record['error']), ('failed', 'timed out'))
+        self.assertNotEqual(record['returncode'], 0)
+
+    def test_hython_that_is_not_there(self):
+        record = rig_batch.run_job(self.job('hero'), self.path('logs'), self.path('no_hython'))
+        self.assertEqual(record['status'], 'failed')
+        self.assertTrue(record['error'].startswith('could not start hython'))
+
+    def run_batch(self, manifest_path, **kwargs):
+        ##without the progress lines
+        ##a file, the names from the manifest are unicode under python 2
+        stdout = sys.stdout
+        sys.stdout = open(os.devnull, 'w')
+        try:
+            return (rig_batch.run_batch(manifest_path, self.path('characters.journal'), hython=self.hython, **kwargs))
+        finally:
+            sys.stdout.close()
+            sys.stdout = stdout
+
+    def test_batch_picks_up_where_it_stopped(self):
+        manifest_path = self.write_manifest([{'model': 'hero.fbx'}, {'model': 'fail.fbx'}])
+        records = self.run_batch(manifest_path, workers=2)
+        self.assertEqual(sorted((record['name'], record['status']) for record in records),
+                         [('fail', 'failed'), ('hero', 'done')])
+        ##only the failed character runs again, and not at all when failures are skipped
+        self.assertEqual([record['name'] for record in self.run_batch(manifest_path)], ['fail'])
+        self.assertEqual(self.run_batch(manifest_path, retry_failed=False), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,331 @@
+"""
+#######################################
+filename    test_rig_capture.py
+author      Owen McCubbin
+Brief Description:
+    The skin weight solves of rig_capture on small meshes, numpy and scipy only.
+#######################################
+"""
+
+import math
+import unittest
+
+import numpy as np
+
+import rig_capture
+
+
+def grid(columns=6, rows=4):
+    ##flat grid in XY of unit squares, split into triangles
+    points = [(x, y, 0.0) for y in range(rows) for x in range(columns)]
+    polygons = []
+    for y in range(rows - 1):
+        for x in range(columns - 1):
+            a = y * columns + x
+            polygons.append((a, a + 1, a + columns + 1, a + columns))
+    return (np.array(points, dtype=np.float64), rig_capture.triangulate(polygons))
+
+
+def tube(rings=17, segments=8, height=2.0, radius=.25):
+    ##closed tube up Y with a point in the middle of both caps, triangulated the same way on both sides of X
+    points = [(0.0, 0.0, 0.0)]
+    for ring in range(rings):
+        for segment in range(segments):
+            angle = 2.0 * math.pi * segment / segments
+            points.append((radius * math.cos(angle), height * ring / (rings - 1.0), radius * math.sin(angle)))
+    points.append((0.0, height, 0.0))
+    top = len(points) - 1
+    triangles = []
+    for ring in range(rings - 1):
+        for segment in range(segments):
+            a = 1 + ring * segments + segment
+            b = 1 + ring * segments + (segment + 1) % segments
+            ##the diagonal of every quad is the mirror of the one across X
+            if math.cos(2.0 * math.pi * (segment + .5) / segments) > 0:
+                triangles.extend(((a, b, b + segments), (a, b + segments, a + segments)))
+            else:
+                triangles.extend(((a, b, a + segments), (b, b + segments, a + segments)))
+    for segment in range(segments):
+        triangles.append((0, 1 + (segment + 1) % segments, 1 + segment))
+        triangles.append((top, top - segments + segment, top - segments + (segment + 1) % segments))
+    return (np.array(points, dtype=np.float64), np.array(triangles, dtype=np.int64))
+
+
+class FanTrianglesTest(unittest.TestCase):
+
+    def test_matches_the_polygon_lists(self):
+        polygons = [(0, 1, 2, 3), (4, 5), (6, 7, 8), (9, 10, 11, 12, 13)]
+        np.testing.assert_array_equal(rig_capture.triangulate(polygons),
+                                      [(0, 1, 2), (0, 2, 3), (6, 7, 8), (9, 10, 11), (9, 11, 12), (9, 12, 13)])
+        self.assertEqual(rig_capture.triangulate([]).shape, (0, 3))
+
+    def test_flat_vertices_skip_what_is_not_a_polygon(self):
+        ##the second prim is a curve, its vertices are there but it has no sides
+        vertex_points = [3, 4, 5, 0, 1, 1, 2, 6]
+        np.testing.assert_array_equal(rig_capture.fan_triangles(vertex_points, (0, 3, 5), (3, 0, 3)),
+                                      [(3, 4, 5), (1, 2, 6)])
+
+
+class CotangentLaplacianTest(unittest.TestCase):
+
+    def test_single_right_triangle(self):
+        ##the 45 degree corners weight their opposite legs by half cot 45, the right angle gives the hypotenuse nothing
+        points = np.array([(0, 0, 0), (1, 0, 0), (0, 1, 0)], dtype=np.float64)
+        laplacian, mass = rig_capture.cotangent_laplacian(points, np.array([(0, 1, 2)]))
+        np.testing.assert_allclose(laplacian.toarray(), [(-1, .5, .5), (.5, -.5, 0), (.5, 0, -.5)], atol=1e-12)
+        np.testing.assert_allclose(mass, [1 / 6.0] * 3)
+
+    def test_symmetric_rows_sum_to_zero(self):
+        points, triangles = tube()
+        laplacian, mass = rig_capture.cotangent_laplacian(points, triangles)
+        dense = laplacian.toarray()
+        np.testing.assert_allclose(dense, dense.T, atol=1e-12)
+        np.testing.assert_allclose(dense.sum(axis=1), 0, atol=1e-12)
+        ##negative semi definite
+        self.assertLess(np.linalg.eigvalsh(dense).max(), 1e-9)
+
+    def test_linear_functions_are_harmonic_inside(self):
+        points, triangles = grid()
+        laplacian, mass = rig_capture.cotangent_laplacian(points, triangles)
+        inside = (points[:, 0] > 0) & (points[:, 0] < 5) & (points[:, 1] > 0) & (points[:, 1] < 3)
+        for values in (points[:, 0], points[:, 1], 2 * points[:, 0] - points[:, 1] + 3):
+            np.testing.assert_allclose(laplacian.dot(values)[inside], 0, atol=1e-12)
+        self.assertAlmostEqual(mass.sum(), 15.0)
+
+
+class LimitInfluencesTest(unittest.TestCase):
+
+    def test_strongest_kept_and_normalized(self):
+        weights = [(.1, .5, .2, -.3, .05, .4), (2.0, 0, .1, 0, 0, .5)]
+        indices, kept = rig_capture.limit_influences(weights, 3)
+        np.testing.assert_array_equal(indices, [(1, 5, 2), (0, 5, 2)])
+        ##clamped to 0-1 before normalizing, so the 2 counts as 1
+        np.testing.assert_allclose(kept, [(.5 / 1.1, .4 / 1.1, .2 / 1.1), (1 / 1.6, .5 / 1.6, .1 / 1.6)])
+
+    def test_sum_to_one_and_never_negative(self):
+        weights = np.random.RandomState(3).uniform(-.5, 1.5, (50, 7))
+        indices, kept = rig_capture.limit_influences(weights)
+        self.assertEqual(kept.shape, (50, rig_capture.MAX_INFLUENCES))
+        self.assertGreaterEqual(kept.min(), 0.0)
+        np.testing.assert_allclose(kept.sum(axis=1), 1.0)
+
+    def test_fewer_bones_than_influences(self):
+        indices, kept = rig_capture.limit_influences([(.2, .6), (0, 0)])
+        self.assertEqual(indices.shape, (2, 2))
+        ##a row with no weight goes fully to one bone
+        np.testing.assert_allclose(kept, [(.75, .25), (1, 0)])
+
+    def test_no_bones(self):
+        with self.assertRaises(ValueError):
+            rig_capture.limit_influences(np.zeros((5, 0)))
+        points, triangles = tube()
+        no_segments = np.zeros((0, 2, 3))
+        with self.assertRaises(ValueError):
+            rig_capture.biharmonic_weights(points, triangles, no_segments)
+        with self.assertRaises(ValueError):
+            rig_capture.proximity_weights(points, no_segments, [])
+        with self.assertRaises(ValueError):
+            rig_capture.capture_weights(points, triangles, no_segments, [])
+
+
+class SolveFreePointsTest(unittest.TestCase):
+
+    def test_fixed_rows_are_kept_and_a_constant_is_solved_exactly(self):
+        points, triangles = tube()
+        bilaplacian = rig_capture.bilaplacian_matrix(points, triangles)
+        weights = np.zeros((len(points), 2))
+        fixed = np.arange(0, len(points), 7)
+        weights[fixed] = (1.0, .25)
+        free = np.setdiff1d(np.arange(len(points)), fixed)
+        rig_capture.solve_free_points(bilaplacian, weights, free)
+        np.testing.assert_allclose(weights[fixed], [(1.0, .25)] * len(fixed))
+        ##the Laplacian of a constant is zero, only the touch of mass pulls on it
+        np.testing.assert_allclose(weights[free], [(1.0, .25)] * len(free), atol=1e-6)
+
+    def test_nothing_free(self):
+        points, triangles = tube()
+        weights = np.random.RandomState(1).uniform(size=(len(points), 3))
+        solved = rig_capture.solve_free_points(rig_capture.bilaplacian_matrix(points, triangles), weights.copy(), [])
+        np.testing.assert_array_equal(solved, weights)
+
+
+class BiharmonicWeightsTest(unittest.TestCase):
+
+    def setUp(self):
+        ##two bones up the middle of the tube, one over the other
+        self.points, self.triangles = tube()
+        self.segments = np.array([((0, 0, 0), (0, 1, 0)), ((0, 1, 0), (0, 2, 0))], dtype=np.float64)
+
+    def test_partition_of_unity(self):
+        indices, weights = rig_capture.biharmonic_weights(self.points, self.triangles, self.segments)
+        self.assertEqual(indices.shape, (len(self.points), 2))
+        self.assertGreaterEqual(weights.min(), 0.0)
+        np.testing.assert_allclose(weights.sum(axis=1), 1.0)
+
+    def test_handles_own_their_points(self):
+        indices, weights = rig_capture.biharmonic_weights(self.points, self.triangles, self.segments)
+        handle_points, handle_bones = rig_capture.find_handles(self.points, self.segments)
+        self.assertEqual(set(handle_bones), set((0, 1)))
+        np.testing.assert_array_equal(indices[handle_points, 0], handle_bones)
+        np.testing.assert_allclose(weights[handle_points, 0], 1.0)
+        ##and the weight of the lower bone falls off up the tube
+        lower = rig_capture.dense_weights(indices, weights, 2)[:, 0]
+        ring_weights = lower[1:-1].reshape(-1, 8).mean(axis=1)
+        self.assertTrue(np.all(np.diff(ring_weights) <= 1e-9))
+        self.assertAlmostEqual(ring_weights[0], 1.0)
+        self.assertAlmostEqual(ring_weights[-1], 0.0)
+
+
+class SymmetricWeightsTest(unittest.TestCase):
+
+    def setUp(self):
+        ##a centre bone and a pair of side bones, far enough off the centre line that none of their handles is on it
+        self.names = ['spine', 'L_arm', 'R_arm']
+        self.segments = np.array([((0, 0, 0), (0, 1, 0)), ((.15, 1.1, 0), (.15, 1.9, 0)), ((-.15, 1.1, 0), (-.15, 1.9, 0))])
+        self.radii = [.35, .35, .35]
+        self.bone_partners = rig_capture.mirror_bones(self.names)
+
+    def mesh(self, rings, segments):
+        points, triangles = tube(rings, segments)
+        partners, unmatched = rig_capture.mirror_points(points)
+        self.assertEqual(unmatched, 0.0)
+        return (points, triangles, partners)
+
+    def assert_mirrored(self, weights, partners):
+        ##the weight of a point on a bone is the weight of its partner on the partner bone
+        np.testing.assert_allclose(weights, weights[partners][:, self.bone_partners], atol=1e-12)
+
+    def test_biharmonic_matches_the_full_solve(self):
+        points, triangles, partners = self.mesh(9, 8)
+        ##the full solve finds mirrored handles on this mesh, so the two solves are the same problem
+        handle_points, handle_bones = rig_capture.find_handles(points, self.segments)
+        self.assertEqual(set(zip(handle_points, handle_bones)),
+                         set(zip(partners[handle_points], self.bone_partners[handle_bones])))
+        result, unmatched = rig_capture.symmetric_weights(points, triangles, self.segments, self.names)
+        symmetric = rig_capture.dense_weights(result[0], result[1], 3)
+        full = rig_capture.dense_weights(*rig_capture.biharmonic_weights(points, triangles, self.segments), num_bones=3)
+        np.testing.assert_allclose(symmetric, full, atol=1e-9)
+        self.assert_mirrored(symmetric, partners)
+
+    def test_biharmonic_matches_a_full_solve_with_the_same_handles(self):
+        ##here the full solve breaks distance ties between partners one way, so give it the mirrored handles instead
+        points, triangles, partners = self.mesh(17, 16)
+        size = np.linalg.norm(points.max(axis=0) - points.min(axis=0))
+        centre = np.abs(points[:, 0]) <= size * rig_capture.SYMMETRY_TOLERANCE
+        half = (points[:, 0] > 0.0) | centre
+        weights = rig_capture.symmetric_biharmonic(points, triangles, self.segments, partners, self.bone_partners,
+                                                   half, centre)
+        handle_points, handle_bones = rig_capture.find_handles(points, self.segments[:2])
+        on_half = half[handle_points]
+        handle_points = handle_points[on_half]
+        handle_bones = handle_bones[on_half]
+        self.assertFalse(np.any(centre[handle_points] & (handle_bones == 1)))
+        full = np.zeros((len(points), 3))
+        full[handle_points, handle_bones] = 1.0
+        full[partners[handle_points], self.bone_partners[handle_bones]] = 1.0
+        free = np.ones(len(points), dtype=bool)
+        free[handle_points] = False
+        free[partners[handle_points]] = False
+        rig_capture.solve_free_points(rig_capture.bilaplacian_matrix(points, triangles), full, np.nonzero(free)[0])
+        np.testing.assert_allclose(weights, full, atol=1e-9)
+        self.assert_mirrored(weights, partners)
+
+    def test_proximity_matches_the_full_capture(self):
+        points, triangles, partners = self.mesh(17, 16)
+        result, unmatched = rig_capture.symmetric_weights(points, triangles, self.segments, self.names, self.radii)
+        symmetric = rig_capture.dense_weights(result[0], result[1], 3)
+        full = rig_capture.dense_weights(*rig_capture.proximity_weights(points, self.segments, self.radii), num_bones=3)
+        np.testing.assert_allclose(symmetric, full, atol=1e-12)
+        self.assert_mirrored(symmetric, partners)
+
+    def test_proximity_splits_the_centre_line(self):
+        ##with thin capsules the centre line is outside both arms, the full capture hands it to one of them
+        points, triangles, partners = self.mesh(17, 16)
+        result, unmatched = rig_capture.symmetric_weights(points, triangles, self.segments, self.names, [.3, .1, .1])
+        symmetric = rig_capture.dense_weights(result[0], result[1], 3)
+        self.assert_mirrored(symmetric, partners)
+        centre = partners == np.arange(len(points))
+        self.assertTrue(np.any(symmetric[centre, 1] == .5))
+        full = rig_capture.dense_weights(*rig_capture.proximity_weights(points, self.segments, [.3, .1, .1]),
+                                         num_bones=3)
+        np.testing.assert_allclose(symmetric[~centre], full[~centre], atol=1e-12)
+
+    def test_unmatched_bones_are_solved_whole(self):
+        points, triangles, partners = self.mesh(9, 8)
+        result, unmatched = rig_capture.symmetric_weights(points, triangles, self.segments, ['spine', 'L_arm', 'arm'])
+        self.assertIsNone(result)
+
+
+def bone_rest(segments):
+    ##rest data of bones along segments, -Z down the bone like segments_from_rest reads it
+    rest = []
+    for start, end in np.asarray(segments, dtype=np.float64):
+        length = np.linalg.norm(end - start)
+        z_axis = (start - end) / length
+        x_axis = np.cross((0.0, 0.0, 1.0), z_axis)
+        x_axis /= np.linalg.norm(x_axis)
+        matrix = np.identity(4)
+        matrix[0, :3] = x_axis
+        matrix[1, :3] = np.cross(z_axis, x_axis)
+        matrix[2, :3] = z_axis
+        matrix[3, :3] = start
+        rest.append(np.append(matrix.ravel(), length))
+    return (np.array(rest))
+
+
+class UpdateWeightsTest(unittest.TestCase):
+
+    def setUp(self):
+        ##a chain of eight bones up a long tube, and the same chain with the fourth bone moved off the middle
+        self.names = ['spine%d' % bone for bone in range(8)]
+        self.old_segments = np.array([((0, y, 0), (0, y + 1, 0)) for y in range(8)], dtype=np.float64)
+        self.new_segments = self.old_segments.copy()
+        self.new_segments[3] = ((.1, 3.2, 0), (.1, 3.8, 0))
+        np.testing.assert_allclose(rig_capture.segments_from_rest(bone_rest(self.new_segments)), self.new_segments)
+
+    def update_error(self, points, triangles, radii=None, rings=rig_capture.REGION_MARGIN_RINGS):
+        ##largest difference between the re-capture after the move and a full capture of the moved chain
+        if radii is None:
+            capture = lambda segments: rig_capture.biharmonic_weights(points, triangles, segments)
+        else:
+            capture = lambda segments: rig_capture.proximity_weights(points, segments, radii)
+        old_indices, old_weights = capture(self.old_segments)
+        result = rig_capture.update_weights(points, triangles, self.new_segments, old_indices, old_weights,
+                                            self.names, bone_rest(self.old_segments), self.names,
+                                            bone_rest(self.new_segments), radii, rings=rings)
+        self.assertIsNotNone(result)
+        updated = rig_capture.dense_weights(result[0], result[1], 8)
+        full = rig_capture.dense_weights(*capture(self.new_segments), num_bones=8)
+        ##the move did change the weights
+        self.assertGreater(np.abs(rig_capture.dense_weights(old_indices, old_weights, 8) - full).max(), .1)
+        return (np.abs(updated - full).max())
+
+    def test_biharmonic_matches_a_full_solve(self):
+        ##the handles take up whole rings of this tube and cut it into pieces, so solving around the move is exact
+        points, triangles = tube(33, 8, height=8.0)
+        self.assertLess(self.update_error(points, triangles), 1e-9)
+
+    def test_biharmonic_margin(self):
+        ##on a finer tube the held points pull on the solve a little, less the more rings of margin there are
+        points, triangles = tube(33, 16, height=8.0)
+        errors = [self.update_error(points, triangles, rings=rings) for rings in (0, 1, 3)]
+        self.assertLess(errors[2], 1e-3)
+        self.assertLess(errors[2], errors[1])
+        self.assertLess(errors[1], errors[0])
+
+    def test_proximity_matches_a_full_capture(self):
+        points, triangles = tube(33, 16, height=8.0)
+        self.assertLess(self.update_error(points, triangles, [.4] * 8), 1e-9)
+
+    def test_nothing_changed(self):
+        points, triangles = tube(33, 8, height=8.0)
+        indices, weights = rig_capture.biharmonic_weights(points, triangles, self.old_segments)
+        rest = bone_rest(self.old_segments)
+        result = rig_capture.update_weights(points, triangles, self.old_segments, indices, weights,
+                                            self.names, rest, self.names, rest)
+        np.testing.assert_array_equal(result[0], indices)
+        np.testing.assert_allclose(result[1], weights)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,90 @@
+"""
+#######################################
+filename    test_rig_index.py
+author      Owen McCubbin
+Brief Description:
+    The node index of a rig network kept up to date through create_node,
+    destroy_node and rename_node, run against fake_hou.
+#######################################
+"""
+
+import unittest
+
+import fake_hou
+fake_hou.install()
+
+import hou
+import rig_creator
+
+
+class RigIndexTest(unittest.TestCase):
+
+    def setUp(self):
+        hou.hipFile.clear(suppress_save_prompt=True)
+        rig_creator.rig_indices.clear()
+        rig_creator.world_cache.clear()
+        self.rig_net = hou.node('/obj').createNode('subnet', 'rig')
+        ##made before the index, it has to find these with its first scan
+        self.rig_net.createNode('null', 'L_arm_ctrl')
+        self.rig_net.createNode('bone', 'split_spine_bone1')
+        self.index = rig_creator.rig_index(self.rig_net)
+
+    def names(self, nodes):
+        return ([node.name() for node in nodes])
+
+    def test_first_scan_and_lookups(self):
+        rig_creator.create_node(self.rig_net, 'null', 'R_arm_ctrl')
+        rig_creator.create_node(self.rig_net, 'bone', 'L_arm_bone1')
+        self.assertIs(rig_creator.rig_index(self.rig_net), self.index)
+        self.assertEqual(self.names(self.index.find(limb='arm')), ['L_arm_ctrl', 'R_arm_ctrl', 'L_arm_bone1'])
+        self.assertEqual(self.names(self.index.find(role='ctrl', side='L')), ['L_arm_ctrl'])
+        self.assertEqual(self.names(self.index.find(node_type='bone', side='C')), ['split_spine_bone1'])
+        self.assertIs(self.index.node('L_arm_ctrl'), self.rig_net.node('L_arm_ctrl'))
+
+    def test_destroyed_node_is_gone(self):
+        ctrl = self.index.node('L_arm_ctrl')
+        rig_creator.destroy_node(ctrl)
+        self.assertIsNone(self.index.node('L_arm_ctrl'))
+        self.assertEqual(self.index.find(limb='arm'), [])
+        ##made again under the same name, the index hands out the new node
+        new_ctrl = rig_creator.create_node(self.rig_net, 'null', 'L_arm_ctrl')
+        self.assertIs(self.index.node('L_arm_ctrl'), new_ctrl)
+        self.assertEqual(self.index.find(role='ctrl'), [new_ctrl])
+
+    def test_renamed_node_is_filed_again(self):
+        ctrl = self.index.node('L_arm_ctrl')
+        rig_creator.rename_node(ctrl, 'R_leg_ctrl')
+        self.assertIsNone(self.index.node('L_arm_ctrl'))
+        self.assertIs(self.index.node('R_leg_ctrl'), ctrl)
+        self.assertEqual(self.index.find(side='L'), [])
+        self.assertEqual(self.index.find(side='R', limb='leg', role='ctrl'), [ctrl])
+
+    def test_rename_behind_the_index(self):
+        ##a node renamed straight through hou is still filed under the old name until it is added again
+        ctrl = self.index.node('L_arm_ctrl')
+        ctrl.setName('R_arm_ctrl')
+        self.assertIs(self.index.node('L_arm_ctrl'), ctrl)
+        self.index.add(ctrl)
+        self.assertIsNone(self.index.node('L_arm_ctrl'))
+        self.assertEqual(self.index.find(limb='arm'), [ctrl])
+
+    def test_reparented_node_keeps_its_place(self):
+        ##parenting objects doesn't move them between networks, the index stays as it was
+        ctrl = self.index.node('L_arm_ctrl')
+        bone = self.index.node('split_spine_bone1')
+        rig_creator.reparent(ctrl, bone)
+        self.assertIs(ctrl.input(0), bone)
+        self.assertIs(self.index.node('L_arm_ctrl'), ctrl)
+        self.assertEqual(self.index.find(role='ctrl'), [ctrl])
+        rig_creator.reparent(ctrl, None)
+        self.assertEqual(self.names(self.index.find()), ['L_arm_ctrl', 'split_spine_bone1'])
+
+    def test_every_stage_starts_with_a_new_index(self):
+        ##the user may have changed the rig between stages
+        with rig_creator.BuildTransaction('test'):
+            self.assertIsNot(rig_creator.rig_index(self.rig_net), self.index)
+        self.assertEqual(rig_creator.rig_indices, {})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,214 @@
+"""
+#######################################
+filename    test_rig_math.py
+author      Owen McCubbin
+Brief Description:
+    The Houdini free bone chain and curve math of rig_math, numpy only.
+#######################################
+"""
+
+import math
+import unittest
+
+import numpy as np
+
+import rig_math
+
+
+def houdini_rotate(rx, ry, rz):
+    ##what hou.hmath.buildRotate((rx, ry, rz)) gives, row vectors with x applied first
+    matrix = np.identity(3)
+    for axis, degrees in zip('xyz', (rx, ry, rz)):
+        c = math.cos(math.radians(degrees))
+        s = math.sin(math.radians(degrees))
+        if axis == 'x':
+            rotation = np.array(((1, 0, 0), (0, c, s), (0, -s, c)))
+        elif axis == 'y':
+            rotation = np.array(((c, 0, -s), (0, 1, 0), (s, 0, c)))
+        else:
+            rotation = np.array(((c, s, 0), (-s, c, 0), (0, 0, 1)))
+        matrix = matrix.dot(rotation)
+    return (matrix)
+
+
+class RotationAssertions(unittest.TestCase):
+
+    def assert_rotations(self, frames):
+        ##every frame is orthonormal and right handed
+        for frame in np.asarray(frames).reshape(-1, 3, 3):
+            np.testing.assert_allclose(frame.dot(frame.T), np.identity(3), atol=1e-9)
+            self.assertAlmostEqual(np.linalg.det(frame), 1.0)
+
+
+class LookatFramesTest(RotationAssertions):
+
+    def test_looking_down_minus_z_is_no_rotation(self):
+        np.testing.assert_allclose(rig_math.lookat_frames([(0, 0, -2)])[0], np.identity(3), atol=1e-12)
+
+    def test_matches_houdini_rotations(self):
+        ##-Z of a Houdini object rotated by these angles points down the direction
+        np.testing.assert_allclose(rig_math.lookat_frames([(1, 0, 0)])[0], houdini_rotate(0, -90, 0), atol=1e-12)
+        np.testing.assert_allclose(rig_math.lookat_frames([(0, 0, 1)])[0], houdini_rotate(0, 180, 0), atol=1e-12)
+        direction = np.array((0.0, 0.0, -1.0)).dot(houdini_rotate(30, 40, 0))
+        np.testing.assert_allclose(rig_math.lookat_frames([direction])[0], houdini_rotate(30, 40, 0), atol=1e-12)
+
+    def test_direction_along_up_uses_world_z(self):
+        frames = rig_math.lookat_frames([(0, 1, 0), (0, -3, 0)])
+        self.assert_rotations(frames)
+        np.testing.assert_allclose(frames[:, 2], [(0, -1, 0), (0, 1, 0)], atol=1e-12)
+
+    def test_direction_with_no_length_is_no_rotation(self):
+        np.testing.assert_allclose(rig_math.lookat_frames([(0, 0, 0)])[0], np.identity(3))
+
+
+class SolveBoneChainTest(RotationAssertions):
+
+    def test_straight_chain(self):
+        positions = [(0, 1, 0), (1, 1, 0), (3, 1, 0), (6, 1, 0)]
+        lengths, frames = rig_math.solve_bone_chain(positions)
+        np.testing.assert_allclose(lengths, (1, 2, 3))
+        ##collinear bones have no plane, they keep their look at frame and get no roll
+        np.testing.assert_allclose(frames, rig_math.lookat_frames([(1, 0, 0)] * 3), atol=1e-12)
+        self.assert_rotations(frames)
+
+    def test_bent_chain_lies_on_its_plane(self):
+        positions = np.array([(0, 1.5, 0), (.3, 1.1, -.1), (.6, .8, .2)])
+        lengths, frames = rig_math.solve_bone_chain(positions)
+        self.assert_rotations(frames)
+        normal = np.cross(positions[1] - positions[0], positions[2] - positions[1])
+        normal /= np.linalg.norm(normal)
+        for bone in range(2):
+            direction = (positions[bone + 1] - positions[bone]) / lengths[bone]
+            ##-Z down the bone and X on the chain's plane normal
+            np.testing.assert_allclose(frames[bone, 2], -direction, atol=1e-12)
+            np.testing.assert_allclose(frames[bone, 0], normal, atol=1e-12)
+
+    def test_frames_are_the_lookat_frames_rolled(self):
+        ##the old node by node build looked at the next locator and then rolled the bone around its Z
+        positions = [(0, 1.5, 0), (.3, 1.1, -.1), (.6, .8, .2), (.7, .4, .4)]
+        lengths, frames = rig_math.solve_bone_chain(positions)
+        lookat = rig_math.lookat_frames(np.diff(positions, axis=0))
+        for bone in range(3):
+            np.testing.assert_allclose(frames[bone, 2], lookat[bone, 2], atol=1e-12)
+            roll = math.atan2(frames[bone, 0].dot(lookat[bone, 1]), frames[bone, 0].dot(lookat[bone, 0]))
+            np.testing.assert_allclose(frames[bone, 1], math.cos(roll) * lookat[bone, 1] - math.sin(roll) * lookat[bone, 0],
+                                       atol=1e-12)
+
+    def test_coincident_points(self):
+        positions = [(0, 1, 0), (0, 1, 0), (1, 1, 0), (1, 1, 0), (1, 2, 0)]
+        lengths, frames = rig_math.solve_bone_chain(positions)
+        np.testing.assert_allclose(lengths, (0, 1, 0, 1))
+        self.assertTrue(np.all(np.isfinite(frames)))
+        self.assert_rotations(frames)
+        ##a bone with no length points the way of the bone before it, or the one after it at the start
+        np.testing.assert_allclose(frames[0], frames[1], atol=1e-12)
+        np.testing.assert_allclose(frames[2], frames[1], atol=1e-12)
+        ##and the chain can still be parented
+        local_matrices = rig_math.chain_local_matrices(np.identity(4), positions, lengths, frames)
+        self.assertTrue(all(np.all(np.isfinite(local)) for local in local_matrices))
+
+    def test_every_point_the_same(self):
+        lengths, frames = rig_math.solve_bone_chain([(1, 2, 3)] * 3)
+        np.testing.assert_allclose(lengths, 0)
+        np.testing.assert_allclose(frames, [np.identity(3)] * 2)
+
+
+class ChainLocalMatricesTest(unittest.TestCase):
+
+    def test_locals_put_every_bone_back_at_its_locator(self):
+        positions = np.array([(0, 1.5, 0), (.3, 1.1, -.1), (.6, .8, .2), (.7, .4, .4)])
+        lengths, frames = rig_math.solve_bone_chain(positions)
+        root_world = rig_math.world_matrix(houdini_rotate(10, 20, 30), (.1, 1.6, -.2))
+        local_matrices = rig_math.chain_local_matrices(root_world, positions, lengths, frames)
+        ##the first bone hangs off the root, every other bone off the tip of the bone before it
+        parent_world = root_world
+        for bone, local in enumerate(local_matrices):
+            world = local.dot(parent_world)
+            np.testing.assert_allclose(world[3, :3], positions[bone], atol=1e-12)
+            np.testing.assert_allclose(world[:3, :3], frames[bone], atol=1e-12)
+            parent_world = rig_math.translate_matrix((0, 0, -lengths[bone])).dot(world)
+            np.testing.assert_allclose(parent_world[3, :3], positions[bone + 1], atol=1e-12)
+
+
+class ResamplePolylineTest(unittest.TestCase):
+
+    def test_straight_line_is_evenly_spaced(self):
+        points = rig_math.resample_polyline([(0, 0, 0), (1, 0, 0), (4, 0, 0)], 4)
+        np.testing.assert_allclose(points, [(0, 0, 0), (1, 0, 0), (2, 0, 0), (3, 0, 0), (4, 0, 0)])
+
+    def test_ends_are_kept(self):
+        source = [(0, 0, 0), (.2, .5, 0), (.9, .7, .3), (1.4, .2, .1)]
+        points = rig_math.resample_polyline(source, 7)
+        self.assertEqual(len(points), 8)
+        np.testing.assert_allclose(points[0], source[0])
+        np.testing.assert_allclose(points[-1], source[-1])
+        ##every step covers the same length of the source polyline
+        source_lengths = np.concatenate(([0], np.cumsum(np.linalg.norm(np.diff(source, axis=0), axis=1))))
+        for number, point in enumerate(points):
+            segment = min(np.searchsorted(source_lengths, source_lengths[-1] * number / 7.0, side='right') - 1, 2)
+            along = source_lengths[-1] * number / 7.0 - source_lengths[segment]
+            direction = np.subtract(source[segment + 1], source[segment])
+            expected = source[segment] + direction / np.linalg.norm(direction) * along
+            np.testing.assert_allclose(point, expected, atol=1e-12)
+
+    def test_closed_loop(self):
+        ##a unit square walked all the way round, every point lands on the square at an even arc length
+        square = [(0, 0, 0), (1, 0, 0), (1, 0, 1), (0, 0, 1), (0, 0, 0)]
+        points = rig_math.resample_polyline(square, 8)
+        np.testing.assert_allclose(points, [(0, 0, 0), (.5, 0, 0), (1, 0, 0), (1, 0, .5), (1, 0, 1), (.5, 0, 1),
+                                            (0, 0, 1), (0, 0, .5), (0, 0, 0)])
+
+    def test_coincident_points(self):
+        points = rig_math.resample_polyline([(0, 0, 0), (0, 0, 0), (2, 0, 0), (2, 0, 0)], 2)
+        np.testing.assert_allclose(points, [(0, 0, 0), (1, 0, 0), (2, 0, 0)])
+
+
+class RotationMinimizingFramesTest(RotationAssertions):
+
+    def test_straight_curve_never_twists(self):
+        points = [(0, 0, -step) for step in range(6)]
+        frames = rig_math.rotation_minimizing_frames(points)
+        self.assert_rotations(frames)
+        np.testing.assert_allclose(frames, [frames[0]] * 6, atol=1e-12)
+        ##like the slideframe VEX, the normal is up cross the tangent, the binormal tangent cross normal and -Z runs down the curve
+        np.testing.assert_allclose(frames[0], [(-1, 0, 0), (0, -1, 0), (0, 0, 1)], atol=1e-12)
+
+    def test_tan_row_points_back_along_the_curve(self):
+        points = np.array([(0, 0, 0), (.3, .2, -.1), (.5, .6, -.2), (.6, 1.1, -.1)])
+        frames = rig_math.rotation_minimizing_frames(points)
+        self.assert_rotations(frames)
+        np.testing.assert_allclose(frames[:, 2], -rig_math.curve_tangents(points), atol=1e-12)
+
+    def test_full_circle_comes_back_without_twist(self):
+        ##a planar curve has no twist, so after 360 degrees the binormal is still the one it started with
+        angles = np.linspace(0, 2 * math.pi, 65)
+        points = np.stack((np.cos(angles), np.zeros_like(angles), np.sin(angles)), axis=1)
+        frames = rig_math.rotation_minimizing_frames(points)
+        self.assert_rotations(frames)
+        np.testing.assert_allclose(frames[:, 1], [frames[0, 1]] * len(points), atol=1e-9)
+        np.testing.assert_allclose(frames[-1], frames[-2], atol=1e-12)
+        np.testing.assert_allclose(abs(frames[0, 1, 1]), 1.0, atol=1e-12)
+
+    def test_coincident_points(self):
+        frames = rig_math.rotation_minimizing_frames([(0, 0, 0), (0, .5, -.5), (0, .5, -.5), (0, 1, -1.2)])
+        self.assertTrue(np.all(np.isfinite(frames)))
+        self.assert_rotations(frames)
+        ##the point on top of the next one keeps the tangent before it
+        np.testing.assert_allclose(frames[1], frames[0], atol=1e-12)
+
+    def test_running_products_match_one_at_a_time(self):
+        ##the scan has to keep the order of the products, rotations don't commute
+        matrices = rig_math.lookat_frames(np.random.RandomState(4).normal(size=(11, 3)))
+        expected = [matrices[0]]
+        for matrix in matrices[1:]:
+            expected.append(expected[-1].dot(matrix))
+        np.testing.assert_allclose(rig_math.running_products(matrices), expected, atol=1e-12)
+
+    def test_reflecting_over_nothing(self):
+        reflections = rig_math.householder_matrices([(0, 0, 0), (0, 2, 0)])
+        np.testing.assert_allclose(reflections[0], np.eye(3))
+        np.testing.assert_allclose(reflections[1], np.diag((1, -1, 1)))
+
+
+if __name__ == '__main__':
+    unittest.main()
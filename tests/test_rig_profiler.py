@@ -0,0 +1,142 @@
+"""
+#######################################
+filename    test_rig_profiler.py
+author      Owen McCubbin
+Brief Description:
+    The call tree, counts and summary of the build profiler and how it puts
+    everything back, run against fake_hou with a clock the tests move.
+#######################################
+"""
+
+import sys
+import types
+import unittest
+
+import fake_hou
+fake_hou.install()
+
+import hou
+import rig_creator
+import rig_profiler
+
+##profiled in place of rig_creator, every function moves the clock by a known amount
+PROFILED_SOURCE = '''
+import hou
+
+def outer(clock):
+    clock.advance(1.0)
+    hou.node('/obj').createNode('null')
+    inner(clock)
+    inner(clock)
+    clock.advance(.5)
+
+def inner(clock):
+    clock.advance(2.0)
+    node = hou.node('/obj').createNode('null')
+    node.parm('tx').set(1)
+    node.parm('ty').setExpression('$F')
+
+def countdown(clock, number):
+    clock.advance(1.0)
+    if number:
+        countdown(clock, number - 1)
+'''
+
+
+class Clock(object):
+    ##stands in for the time module, only moves when it is told to
+
+    def __init__(self):
+        self.now = 100.0
+
+    def time(self):
+        return (self.now)
+
+    def advance(self, seconds):
+        self.now += seconds
+
+
+def attributes(owner):
+    ##everything the profiler could patch on a module or class, to compare before and after
+    return (dict(vars(owner)))
+
+
+class ProfilerTest(unittest.TestCase):
+
+    def setUp(self):
+        hou.hipFile.clear(suppress_save_prompt=True)
+        self.clock = Clock()
+        self.old_time = rig_profiler.time
+        rig_profiler.time = self.clock
+        self.module = types.ModuleType('profiled_module')
+        exec(compile(PROFILED_SOURCE, 'profiled_module', 'exec'), vars(self.module))
+        sys.modules['profiled_module'] = self.module
+
+    def tearDown(self):
+        rig_profiler.time = self.old_time
+        del sys.modules['profiled_module']
+        if rig_profiler.active_profiler is not None:
+            rig_profiler.active_profiler.stop()
+
+    def profile(self, call, *args):
+        with rig_profiler.profile(modules=('profiled_module',)) as profiler:
+            call(*args)
+        return (profiler)
+
+    def test_nested_calls(self):
+        profiler = self.profile(lambda: self.module.outer(self.clock))
+        events = dict((event['name'], event) for event in profiler.events)
+        outer = events['outer']
+        self.assertEqual((outer['seconds'], outer['self_seconds'], outer['depth']), (5.5, 1.5, 0))
+        ##nodes, parms, expressions
+        self.assertEqual((outer['counts'], outer['self_counts']), ([3, 2, 2], [1, 0, 0]))
+        inner_calls = [event for event in profiler.events if event['name'] == 'inner']
+        self.assertEqual([(event['start'], event['seconds'], event['self_seconds'], event['depth'], event['self_counts'])
+                          for event in inner_calls], [(1.0, 2.0, 2.0, 1, [1, 1, 1]), (3.0, 2.0, 2.0, 1, [1, 1, 1])])
+        self.assertEqual(profiler.summary(), [('inner', 2, 4.0, 4.0, 2, 2, 2), ('outer', 1, 5.5, 1.5, 1, 0, 0)])
+
+    def test_trace(self):
+        trace = self.profile(lambda: self.module.outer(self.clock)).trace()['traceEvents']
+        self.assertEqual([(event['name'], event['ts'], event['dur']) for event in trace],
+                         [('outer', 0.0, 5.5e6), ('inner', 1e6, 2e6), ('inner', 3e6, 2e6)])
+        self.assertEqual(trace[0]['args'], {'nodes': 3, 'parms': 2, 'expressions': 2,
+                                            'self_nodes': 1, 'self_parms': 0, 'self_expressions': 0})
+
+    def test_recursion_is_not_counted_twice(self):
+        profiler = self.profile(lambda: (self.module.countdown(self.clock, 2), self.module.countdown(self.clock, 0)))
+        self.assertEqual([event['seconds'] for event in profiler.events], [1.0, 2.0, 3.0, 1.0])
+        ##the second call starts the moment the first one ends, it is still a call of its own
+        self.assertEqual(profiler.summary(), [('countdown', 4, 4.0, 4.0, 0, 0, 0)])
+
+    def test_everything_is_put_back_when_the_build_raises(self):
+        owners = (rig_creator, rig_creator.BuildTransaction, hou.Node, hou.ObjNode, hou.Parm, hou.ParmTuple)
+        before = [attributes(owner) for owner in owners]
+        with self.assertRaises(ValueError):
+            with rig_profiler.profile() as profiler:
+                ##a stage wrapped in its build transaction that fails part way
+                rig_creator.create_mesh('')
+        self.assertIsNone(rig_profiler.active_profiler)
+        self.assertEqual([event['name'] for event in profiler.events], ['BuildTransaction.flush', 'flush_layouts', 'create_mesh'])
+        for owner, old_attributes in zip(owners, before):
+            new_attributes = attributes(owner)
+            self.assertEqual(sorted(new_attributes), sorted(old_attributes), owner)
+            for name, value in old_attributes.items():
+                self.assertIs(new_attributes[name], value, '%s.%s' % (owner.__name__, name))
+        ##and the hou calls aren't counted any more
+        fake_hou.reset_stats()
+        hou.node('/obj').createNode('null')
+        self.assertEqual(profiler.counts, [0, 0, 0])
+
+    def test_only_one_at_a_time(self):
+        rig_profiler.start(modules=('profiled_module',))
+        wrapped = self.module.outer
+        with self.assertRaises(RuntimeError):
+            rig_profiler.Profiler(('profiled_module',)).start()
+        ##the second one didn't wrap anything on top
+        self.assertIs(self.module.outer, wrapped)
+        rig_profiler.active_profiler.stop()
+        self.assertIsNot(self.module.outer, wrapped)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,176 @@
+"""
+#######################################
+filename    test_rig_templates.py
+author      Owen McCubbin
+Brief Description:
+    Locator templates read from a scratch template folder, their bases,
+    the checks on their locators, the cache and fitting them to a character.
+#######################################
+"""
+
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+import numpy as np
+
+import rig_templates
+
+BASE = {'version': 1, 'name': 'base',
+        'categories': {'body': .2, 'face': .02},
+        'locators': [{'name': 'root', 'parent': None, 'position': [0, 1, 0]},
+                     {'name': 'arm', 'parent': 'root', 'position': [.5, 1.5, 0]},
+                     {'name': 'hand', 'parent': 'arm', 'position': [.9, 1.2, 0], 'category': 'face'}],
+        'paths': [{'name': 'brow', 'points': [[0, 2, .1], [.1, 2, .1]]},
+                  {'name': 'lip', 'points': [[0, 1.8, .1], [.05, 1.79, .1], [.1, 1.8, .1]]}]}
+
+
+class TemplateFolderTest(unittest.TestCase):
+
+    def setUp(self):
+        self.template_dir = tempfile.mkdtemp(prefix='rig_templates_test')
+        rig_templates.template_cache.clear()
+
+    def tearDown(self):
+        shutil.rmtree(self.template_dir, ignore_errors=True)
+        rig_templates.template_cache.clear()
+
+    def write_template(self, name, data, modified=None):
+        file_path = rig_templates.template_path(name, self.template_dir)
+        with open(file_path, 'w') as template_file:
+            json.dump(data, template_file)
+        ##set the modified time outright, a rewrite inside the same second would keep the old one
+        if modified is not None:
+            os.utime(file_path, (modified, modified))
+        return (file_path)
+
+    def load(self, name):
+        return (rig_templates.load_template(name, self.template_dir))
+
+
+class ReadTemplateDataTest(TemplateFolderTest):
+
+    def test_base_is_merged_by_name(self):
+        self.write_template('base', BASE)
+        self.write_template('child', {'name': 'child', 'base': 'base', 'categories': {'face': .05},
+                                      'locators': [{'name': 'arm', 'position': [.6, 1.6, 0]},
+                                                   {'name': 'finger', 'parent': 'hand', 'position': [1, 1.1, 0]}],
+                                      'paths': [{'name': 'lip', 'points': [[0, 1.7, .1], [.1, 1.7, .1]]}]})
+        data, sources = rig_templates.read_template_data('child', self.template_dir)
+        self.assertEqual(data['name'], 'child')
+        self.assertEqual(data['categories'], {'body': .2, 'face': .05})
+        ##changed fields replace the base's, the rest of the entry and its place stay, new entries go last
+        self.assertEqual([locator['name'] for locator in data['locators']], ['root', 'arm', 'hand', 'finger'])
+        self.assertEqual(data['locators'][1], {'name': 'arm', 'parent': 'root', 'position': [.6, 1.6, 0]})
+        self.assertEqual(data['paths'][1]['points'], [[0, 1.7, .1], [.1, 1.7, .1]])
+        self.assertEqual([path for path, modified in sources],
+                         [rig_templates.template_path(name, self.template_dir) for name in ('child', 'base')])
+
+    def test_base_entries_are_not_changed(self):
+        base_entries = [{'name': 'arm', 'position': [0, 0, 0]}]
+        merged = rig_templates.merge_entries(base_entries, [{'name': 'arm', 'position': [1, 1, 1]}])
+        self.assertEqual(merged, [{'name': 'arm', 'position': [1, 1, 1]}])
+        self.assertEqual(base_entries, [{'name': 'arm', 'position': [0, 0, 0]}])
+
+    def test_template_that_is_its_own_base(self):
+        self.write_template('loop', {'base': 'loop', 'locators': []})
+        with self.assertRaises(ValueError):
+            rig_templates.read_template_data('loop', self.template_dir)
+        ##and the same through another template
+        self.write_template('first', {'base': 'second', 'locators': []})
+        self.write_template('second', {'base': 'first', 'locators': []})
+        with self.assertRaises(ValueError):
+            rig_templates.read_template_data('first', self.template_dir)
+
+    def test_newer_version(self):
+        self.write_template('future', dict(BASE, version=rig_templates.TEMPLATE_VERSION + 1))
+        with self.assertRaises(ValueError):
+            rig_templates.read_template_data('future', self.template_dir)
+
+
+class LocatorTemplateTest(unittest.TestCase):
+
+    def make(self, locators, paths=()):
+        return (rig_templates.LocatorTemplate('test', locators, list(paths), rig_templates.CATEGORY_SCALES))
+
+    def test_parents(self):
+        template = self.make(BASE['locators'])
+        np.testing.assert_array_equal(template.parents, (-1, 0, 1))
+        np.testing.assert_allclose(template.display_scales, (.2, .2, .02))
+        np.testing.assert_allclose(template.local_positions(template.positions), [(0, 1, 0), (.5, .5, 0), (.4, -.3, 0)])
+
+    def test_child_before_its_parent(self):
+        with self.assertRaises(ValueError):
+            self.make([BASE['locators'][0], BASE['locators'][2], BASE['locators'][1]])
+
+    def test_own_parent(self):
+        with self.assertRaises(ValueError):
+            self.make([{'name': 'root', 'parent': 'root', 'position': [0, 0, 0]}])
+
+    def test_unknown_parent_and_category(self):
+        with self.assertRaises(ValueError):
+            self.make([{'name': 'arm', 'parent': 'root', 'position': [0, 0, 0]}])
+        with self.assertRaises(ValueError):
+            self.make([{'name': 'root', 'position': [0, 0, 0], 'category': 'tail'}])
+
+    def test_fitted(self):
+        template = self.make(BASE['locators'], BASE['paths'])
+        positions, paths = template.fitted(2.0, (1, 0, -1))
+        np.testing.assert_allclose(positions, template.positions * 2.0 + (1, 0, -1))
+        self.assertEqual(len(paths), 2)
+        for fitted_points, (name, points, display_scale) in zip(paths, template.paths):
+            np.testing.assert_allclose(fitted_points, points * 2.0 + (1, 0, -1))
+        ##the template itself is left as it was
+        np.testing.assert_allclose(template.positions[0], (0, 1, 0))
+
+    def test_fitted_without_paths(self):
+        positions, paths = self.make(BASE['locators']).fitted(.5)
+        self.assertEqual(paths, [])
+        np.testing.assert_allclose(positions[1], (.25, .75, 0))
+
+
+class LoadTemplateTest(TemplateFolderTest):
+
+    def test_cached_until_a_file_changes(self):
+        self.write_template('base', BASE, modified=1000000)
+        self.write_template('child', {'base': 'base', 'locators': [{'name': 'arm', 'position': [1, 1, 1]}]},
+                            modified=1000000)
+        template = self.load('child')
+        self.assertIs(self.load('child'), template)
+        ##a change to the base is a change to the child
+        base = dict(BASE, locators=BASE['locators'][:2])
+        self.write_template('base', base, modified=1000010)
+        reloaded = self.load('child')
+        self.assertIsNot(reloaded, template)
+        self.assertEqual(reloaded.names, ['root', 'arm'])
+        np.testing.assert_allclose(reloaded.positions[1], (1, 1, 1))
+        self.assertIs(self.load('child'), reloaded)
+
+    def test_removed_file(self):
+        file_path = self.write_template('base', BASE)
+        self.load('base')
+        os.remove(file_path)
+        with self.assertRaises(IOError):
+            self.load('base')
+
+    def test_template_categories_over_the_defaults(self):
+        self.write_template('base', BASE)
+        template = self.load('base')
+        np.testing.assert_allclose(template.display_scales, (.2, .2, .02))
+        self.assertEqual([name for name, points, display_scale in template.paths], ['brow', 'lip'])
+
+    def test_shipped_templates(self):
+        ##every template that ships with the tool loads and fits
+        names = rig_templates.template_names()
+        self.assertIn(rig_templates.DEFAULT_TEMPLATE, names)
+        for name in names:
+            template = rig_templates.load_template(name)
+            positions, paths = template.fitted()
+            np.testing.assert_allclose(positions, template.positions)
+            self.assertEqual(len(paths), len(template.paths))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,92 @@
+"""
+#######################################
+filename    test_visibility.py
+author      Owen McCubbin
+Brief Description:
+    The visibility sets of a built rig, the hidden parms on the HDA and the
+    display references to them, run against fake_hou. fake_hou doesn't
+    evaluate expressions so the few the sets use are worked out here.
+#######################################
+"""
+
+import io
+import re
+import sys
+import tempfile
+import unittest
+
+import fake_hou
+fake_hou.install()
+
+import hou
+import rig_benchmark
+import rig_creator
+
+CHANNEL = re.compile(r'^ch\("([^"]+)"\)$')
+CONDITION = re.compile(r'^ch\("([^"]+)"\) == (\d+)$')
+
+
+class VisibilityTest(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        fake_hou.add_file(rig_benchmark.MESH_FILE, rig_benchmark.character_mesh())
+        stdout = sys.stdout
+        sys.stdout = io.StringIO() if sys.version_info[0] > 2 else io.BytesIO()
+        try:
+            rig_benchmark.run_build(rig_creator.CAPTURE_PROXIMITY, tempfile.mkdtemp())
+        finally:
+            sys.stdout = stdout
+        cls.rig_net = hou.node('/obj/' + rig_benchmark.RIG_NAME)
+
+    def visibility_parm(self, node):
+        ##the HDA parm the display of a node refers to
+        match = CHANNEL.match(node.parm('display').expression())
+        self.assertIsNotNone(match, node.path())
+        self.assertTrue(match.group(1).startswith('../' + rig_creator.VISIBILITY_PARM % ''))
+        return (self.rig_net.parm(match.group(1)[3:]))
+
+    def shown(self, node):
+        ##what Houdini would work out for the display of a node with the toggles as they are
+        visible = True
+        for condition in self.visibility_parm(node).expression().split(' && '):
+            parm_name, value = CONDITION.match(condition).groups()
+            visible = visible and self.rig_net.evalParm(parm_name) == int(value)
+        return (visible)
+
+    def test_sets_are_hidden_parms(self):
+        for name in ('vis_L_arm_ctrl_IK', 'vis_R_arm_ctrl_IK', 'vis_s_bone'):
+            template = self.rig_net.parmTemplateGroup().find(name)
+            self.assertTrue(template.isHidden())
+        self.assertEqual(self.rig_net.parm('vis_R_leg_ctrl_FK').expression(),
+                         'ch("R_leg_ctrl_display") == 1 && ch("m_ctrl_display") == 1 && ch("R_leg_FK_IK") == 0')
+
+    def test_every_display_refers_to_its_set(self):
+        ##the master is bound to the Master Display menu straight away
+        referenced = [node for node in self.rig_net.children() if node.parm('display') is not None
+                      and node.parm('display').keyframes() and node.name() != 'master']
+        self.assertEqual(len(referenced), 115)
+        for node in referenced:
+            self.assertIsNotNone(self.visibility_parm(node), node.path())
+            self.assertEqual(node.evalParm('tdisplay'), 1)
+        ##both sides of a limb
+        self.assertEqual(self.rig_net.node('L_leg_goal_ctrl').parm('display').expression(), 'ch("../vis_L_leg_ctrl_IK")')
+        self.assertEqual(self.rig_net.node('R_leg_goal_ctrl').parm('display').expression(), 'ch("../vis_R_leg_ctrl_IK")')
+
+    def test_toggles_switch_the_sets(self):
+        ik_ctrl = self.rig_net.node('R_leg_goal_ctrl')
+        fk_ctrl = self.rig_net.node('R_leg_bone1_FK_ctrl')
+        try:
+            self.assertEqual((self.shown(ik_ctrl), self.shown(fk_ctrl)), (True, False))
+            ##the FK|IK slider can be keyed, the display follows it without a callback
+            self.rig_net.parm('R_leg_FK_IK').set(0)
+            self.assertEqual((self.shown(ik_ctrl), self.shown(fk_ctrl)), (False, True))
+            self.rig_net.parm('m_ctrl_display').set(0)
+            self.assertEqual((self.shown(ik_ctrl), self.shown(fk_ctrl)), (False, False))
+        finally:
+            self.rig_net.parm('R_leg_FK_IK').set(1)
+            self.rig_net.parm('m_ctrl_display').set(1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,105 @@
+"""
+#######################################
+filename    test_world_cache.py
+author      Owen McCubbin
+Brief Description:
+    The cached world transforms the placement helpers work from, checked
+    against what fake_hou evaluates for the same nodes.
+#######################################
+"""
+
+import unittest
+
+import numpy as np
+
+import fake_hou
+fake_hou.install()
+
+import hou
+import rig_creator
+
+
+def assert_same_transform(first, second):
+    np.testing.assert_allclose(first.asTuple(), second.asTuple(), atol=1e-9)
+
+
+class WorldCacheTest(unittest.TestCase):
+
+    def setUp(self):
+        hou.hipFile.clear(suppress_save_prompt=True)
+        rig_creator.rig_indices.clear()
+        rig_creator.world_cache.clear()
+        self.rig_net = hou.node('/obj').createNode('subnet', 'rig')
+        self.bone = rig_creator.create_node(self.rig_net, 'bone', 'arm_bone1')
+        self.bone.parm('length').set(2.0)
+        self.bone.parmTuple('t').set((1, 2, 3))
+        self.bone.parmTuple('r').set((0, 90, 0))
+        self.ctrl = rig_creator.create_node(self.rig_net, 'null', 'arm_ctrl')
+        self.ctrl.setFirstInput(self.bone)
+        self.ctrl.parmTuple('t').set((0, 1, 0))
+
+    def test_evaluated_once(self):
+        fake_hou.reset_stats()
+        first = rig_creator.cached_world(self.ctrl)
+        self.assertIs(rig_creator.cached_world(self.ctrl), first)
+        self.assertEqual(fake_hou.stats['ObjNode.worldTransform'], 1)
+        assert_same_transform(first, self.ctrl.worldTransform())
+
+    def test_forget_after_a_transform_change(self):
+        old_world = rig_creator.cached_world(self.ctrl)
+        rig_creator.cached_world(self.bone)
+        self.bone.parmTuple('t').set((4, 0, 0))
+        ##the cache doesn't know until it is told
+        self.assertIs(rig_creator.cached_world(self.ctrl), old_world)
+        rig_creator.forget_world(self.bone)
+        ##the ctrl hangs off the bone, so it went too
+        self.assertNotIn(self.ctrl.path(), rig_creator.world_cache)
+        assert_same_transform(rig_creator.cached_world(self.bone), self.bone.worldTransform())
+        assert_same_transform(rig_creator.cached_world(self.ctrl), self.ctrl.worldTransform())
+        self.assertFalse(np.allclose(rig_creator.cached_world(self.ctrl).asTuple(), old_world.asTuple()))
+
+    def test_place_world(self):
+        rig_creator.cached_world(self.ctrl)
+        world = hou.hmath.buildTranslate(5, 0, 0) * hou.hmath.buildRotate(30, 0, 0)
+        fake_hou.reset_stats()
+        rig_creator.place_world(self.bone, world)
+        ##nothing was evaluated, the cache has what Houdini would work out
+        self.assertNotIn('ObjNode.worldTransform', fake_hou.stats)
+        self.assertNotIn('keeppos_compensations', fake_hou.stats)
+        assert_same_transform(self.bone.worldTransform(), self.bone.parmTransform() * world)
+        assert_same_transform(rig_creator.cached_world(self.bone), self.bone.worldTransform())
+        ##the ctrl moved with the bone
+        assert_same_transform(rig_creator.cached_world(self.ctrl), self.ctrl.worldTransform())
+
+    def test_place_world_under_a_parent(self):
+        null = rig_creator.create_node(self.rig_net, 'null', 'arm_root')
+        world = hou.hmath.buildTranslate(0, 3, 0)
+        rig_creator.place_world(null, world, self.bone)
+        self.assertIs(null.input(0), self.bone)
+        assert_same_transform(null.worldTransform(), world)
+        assert_same_transform(rig_creator.cached_world(null), world)
+
+    def test_reparent_keeps_everything_in_place(self):
+        bone_world = self.bone.worldTransform()
+        ctrl_world = self.ctrl.worldTransform()
+        rig_creator.cached_world(self.ctrl)
+        null = rig_creator.create_node(self.rig_net, 'null', 'arm_root')
+        null.parmTuple('t').set((0, 0, -2))
+        rig_creator.reparent(self.bone, null)
+        self.assertIs(self.bone.input(0), null)
+        assert_same_transform(self.bone.worldTransform(), bone_world)
+        ##nothing under the bone moved, so its cache is still right
+        assert_same_transform(rig_creator.cached_world(self.ctrl), ctrl_world)
+        assert_same_transform(self.ctrl.worldTransform(), ctrl_world)
+
+    def test_rename_drops_the_old_path(self):
+        rig_creator.cached_world(self.ctrl)
+        rig_creator.rename_node(self.ctrl, 'hand_ctrl')
+        self.assertEqual(rig_creator.world_cache, {})
+        ##a new node under the old path doesn't get the old one's world
+        other = rig_creator.create_node(self.rig_net, 'null', 'arm_ctrl')
+        assert_same_transform(rig_creator.cached_world(other), hou.Matrix4(1))
+
+
+if __name__ == '__main__':
+    unittest.main()